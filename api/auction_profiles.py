@@ -17,6 +17,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
+from api.cache_versions import PROFILES, VersionedCache, bump_version
 from api.database import get_connection
 
 
@@ -335,7 +336,9 @@ class AuctionProfileRepository:
                 ),
             )
             conn.commit()
-            return cursor.lastrowid
+            row_id = cursor.lastrowid
+        bump_version(PROFILES)
+        return row_id
 
     @staticmethod
     def get_by_id(id: int) -> Optional[AuctionProfile]:
@@ -411,7 +414,8 @@ class AuctionProfileRepository:
                 ),
             )
             conn.commit()
-            return True
+        bump_version(PROFILES)
+        return True
 
     @staticmethod
     def delete(id: int) -> bool:
@@ -422,7 +426,8 @@ class AuctionProfileRepository:
                 (datetime.utcnow().isoformat(), id),
             )
             conn.commit()
-            return True
+        bump_version(PROFILES)
+        return True
 
     @staticmethod
     def seed_defaults():
@@ -457,16 +462,11 @@ class AuctionProfileService:
     """Service for working with auction profiles."""
 
     def __init__(self):
-        self._profiles_cache: dict[str, AuctionProfile] = {}
+        self._profiles_cache = VersionedCache(PROFILES)
 
     def get_profile(self, auction_code: str) -> Optional[AuctionProfile]:
-        """Get auction profile by code (cached)."""
-        code = auction_code.upper()
-        if code not in self._profiles_cache:
-            profile = AuctionProfileRepository.get_by_code(code)
-            if profile:
-                self._profiles_cache[code] = profile
-        return self._profiles_cache.get(code)
+        """Get auction profile by code (cached until any profile is edited)."""
+        return self._profiles_cache.get(auction_code.upper(), AuctionProfileRepository.get_by_code)
 
     def apply_defaults(self, auction_code: str, extracted_fields: dict[str, Any]) -> dict[str, Any]:
         """
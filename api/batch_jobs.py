@@ -24,6 +24,7 @@ from typing import Any, Optional
 
 from api.database import get_connection
 from api.models import DocumentRepository, ExtractionRunRepository
+from core.telemetry import BATCH_EXPORT_IN_FLIGHT, BATCH_EXPORT_WAITING
 
 logger = logging.getLogger(__name__)
 
@@ -481,12 +482,18 @@ class BatchJobProcessor:
             return result
 
         # Send to CD with rate limiting
+        BATCH_EXPORT_WAITING.inc()
         async with self.semaphore:
-            success, response, cd_listing_id = await send_to_cd_with_retry(
-                payload,
-                sandbox=sandbox,
-                run_id=run_id,
-            )
+            BATCH_EXPORT_WAITING.dec()
+            BATCH_EXPORT_IN_FLIGHT.inc()
+            try:
+                success, response, cd_listing_id = await send_to_cd_with_retry(
+                    payload,
+                    sandbox=sandbox,
+                    run_id=run_id,
+                )
+            finally:
+                BATCH_EXPORT_IN_FLIGHT.dec()
 
         result.processed_at = datetime.utcnow().isoformat()
 
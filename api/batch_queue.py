@@ -14,6 +14,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Optional
 
+from core.telemetry import REGISTRY
+
 logger = logging.getLogger(__name__)
 
 
@@ -273,6 +275,22 @@ class BatchQueue:
             jobs.append(self.get_status(job.job_id))
         return jobs
 
+    def is_alive(self) -> bool:
+        """Whether the worker pool still accepts jobs."""
+        return not getattr(self._executor, "_shutdown", False)
+
+    def depth(self) -> dict[str, int]:
+        """Item counts by status across all jobs (queue depth for metrics)."""
+        counts = {"pending": 0, "processing": 0}
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if job.status in (JobStatus.PENDING, JobStatus.RUNNING, JobStatus.CANCELLING):
+                for item in job.items:
+                    if item.status in counts:
+                        counts[item.status] += 1
+        return counts
+
     def cleanup_completed(self, older_than_hours: int = 24) -> int:
         """Remove completed jobs older than specified hours."""
         from datetime import datetime, timedelta
@@ -306,3 +324,25 @@ def get_batch_queue() -> BatchQueue:
     if _batch_queue is None:
         _batch_queue = BatchQueue()
     return _batch_queue
+
+
+def peek_batch_queue() -> Optional[BatchQueue]:
+    """Global batch queue if one has been created (never creates it)."""
+    return _batch_queue
+
+
+def _collect_queue_depth():
+    if _batch_queue is None:
+        return []
+    depth = _batch_queue.depth()
+    return [
+        (
+            "batch_queue_items",
+            "gauge",
+            "BatchQueue items in unfinished jobs by status",
+            [({"status": status}, count) for status, count in depth.items()],
+        )
+    ]
+
+
+REGISTRY.add_collector(_collect_queue_depth)
@@ -0,0 +1,215 @@
+"""
+Cross-process cache invalidation for configuration caches.
+
+Auction profiles, warehouse constants and field mappings are cached per
+process. With several uvicorn workers, an edit made through one worker has
+to reach the others, so:
+
+1. Every write bumps a counter for its namespace in the cache_versions table
+2. Every VersionedCache compares its namespace's counter before serving
+3. The counters for all namespaces are read with one query, at most once
+   per CHECK_INTERVAL seconds per process
+
+Bumps made in this process take effect immediately; other workers pick them
+up within CHECK_INTERVAL seconds. Misses (e.g. an auction with no profile)
+are cached as well, so a long-lived cache never re-queries the same key.
+
+Example usage:
+    _cache = VersionedCache(PROFILES)
+    profile = _cache.get("COPART", AuctionProfileRepository.get_by_code)
+
+    AuctionProfileRepository.update(profile)  # calls bump_version(PROFILES)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections.abc import Hashable
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from api.database import get_connection
+from core.telemetry import REGISTRY
+
+# Namespaces
+PROFILES = "auction_profiles"
+WAREHOUSE_CONSTANTS = "warehouse_constants"
+FIELD_MAPPINGS = "field_mappings"
+
+# How stale another worker's edit may be, in seconds
+CHECK_INTERVAL = float(os.getenv("CACHE_VERSION_CHECK_SECONDS", "1.0"))
+
+_MISSING = object()
+
+
+def _ensure_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            namespace TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def get_versions() -> dict[str, int]:
+    """Read the current version of every namespace."""
+    try:
+        with get_connection() as conn:
+            rows = conn.execute("SELECT namespace, version FROM cache_versions").fetchall()
+    except sqlite3.OperationalError:
+        # Table not created yet: nothing has been edited
+        return {}
+    return {row["namespace"]: row["version"] for row in rows}
+
+
+def bump_version(*namespaces: str):
+    """
+    Invalidate every process's cache for the given namespaces.
+
+    Call after the write has been committed, so a worker that reloads on the
+    new version is guaranteed to see the new data.
+    """
+    now = datetime.utcnow().isoformat()
+    with get_connection() as conn:
+        _ensure_table(conn)
+        conn.executemany(
+            """INSERT INTO cache_versions (namespace, version, updated_at) VALUES (?, 1, ?)
+               ON CONFLICT(namespace) DO UPDATE SET
+               version = version + 1, updated_at = excluded.updated_at""",
+            [(namespace, now) for namespace in namespaces],
+        )
+        conn.commit()
+    _board.expire()
+
+
+class _VersionBoard:
+    """Per-process copy of the cache_versions table, refreshed on an interval."""
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self.checks = 0
+        self._versions: dict[str, int] = {}
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def version(self, namespace: str) -> int:
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            with self._lock:
+                if time.monotonic() - self._checked_at >= self.check_interval:
+                    self._versions = get_versions()
+                    self._checked_at = time.monotonic()
+                    self.checks += 1
+        return self._versions.get(namespace, 0)
+
+    def expire(self):
+        """Force the next lookup to re-read the table."""
+        self._checked_at = float("-inf")
+
+
+_board = _VersionBoard(CHECK_INTERVAL)
+_caches: "weakref.WeakSet[VersionedCache]" = weakref.WeakSet()
+
+
+class VersionedCache:
+    """
+    Key/value cache that empties itself when its namespace's version changes.
+
+    Loaded values are cached as-is, including None.
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 1024):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, Any] = {}
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        _caches.add(self)
+
+    def get(self, key: Hashable, loader: Callable[[Hashable], Any]) -> Any:
+        """
+        Get the cached value for key, calling loader(key) on a miss.
+
+        Args:
+            key: Cache key
+            loader: Loads the value from the database
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        version = _board.version(self.namespace)
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = loader(key)
+
+        with self._lock:
+            # Skip storing if an edit landed while loading
+            if self._version == version:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+                self._entries[key] = value
+        return value
+
+    def clear(self):
+        """Drop all entries in this process."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this cache."""
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "version": self._version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def cache_stats() -> dict[str, Any]:
+    """Stats for every live VersionedCache in this process."""
+    caches = sorted((cache.stats() for cache in _caches), key=lambda s: s["namespace"])
+    return {
+        "check_interval_seconds": _board.check_interval,
+        "version_checks": _board.checks,
+        "caches": caches,
+    }
+
+
+def _collect_cache_stats():
+    # Summed per namespace: each service instance has its own cache
+    totals: dict[str, dict[str, int]] = {}
+    for stats in cache_stats()["caches"]:
+        total = totals.setdefault(stats["namespace"], {"hits": 0, "misses": 0})
+        total["hits"] += stats["hits"]
+        total["misses"] += stats["misses"]
+    return [
+        (
+            f"config_cache_{field}_total",
+            "counter",
+            f"Config cache {field} by namespace",
+            [({"cache": namespace}, total[field]) for namespace, total in sorted(totals.items())],
+        )
+        for field in ("hits", "misses")
+    ]
+
+
+REGISTRY.add_collector(_collect_cache_stats)
@@ -15,6 +15,8 @@ from typing import Any, Optional
 
 import requests
 
+from core.telemetry import cd_response_hook
+
 logger = logging.getLogger(__name__)
 
 
@@ -141,6 +143,7 @@ class CDClient:
                     json=payload,
                     headers=self._get_headers(idempotency_key=idempotency_key),
                     timeout=self.timeout,
+                    hooks={"response": cd_response_hook},
                 )
 
                 if response.status_code == 201:
@@ -204,6 +207,7 @@ class CDClient:
                     json=payload,
                     headers=self._get_headers(etag=current_etag),
                     timeout=self.timeout,
+                    hooks={"response": cd_response_hook},
                 )
 
                 if response.status_code == 200:
@@ -256,6 +260,7 @@ class CDClient:
                 f"{self.base_url}/listings/{listing_id}",
                 headers=self._get_headers(),
                 timeout=self.timeout,
+                hooks={"response": cd_response_hook},
             )
 
             if response.status_code == 200:
@@ -289,6 +294,7 @@ class CDClient:
                 params={"partnerReferenceId": ref_id},
                 headers=self._get_headers(),
                 timeout=self.timeout,
+                hooks={"response": cd_response_hook},
             )
 
             if response.status_code == 200:
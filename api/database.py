@@ -1,17 +1,40 @@
 """SQLite database for Run History and API state."""
 
+import atexit
 import json
+import logging
+import os
+import re
 import sqlite3
+import threading
+import time
 import uuid
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from core.telemetry import (
+    DB_QUERIES,
+    DB_QUERY_LATENCY,
+    LOG_BATCH_FLUSHES,
+    LOG_RECORDS_DROPPED,
+    statement_op,
+)
+
+logger = logging.getLogger(__name__)
+
 # Database path
 DB_PATH = Path(__file__).parent.parent / "data" / "control_panel.db"
 
+# Run log batching: rows per insert, max wait before a partial batch is
+# written, and entries buffered before new ones are dropped
+RUN_LOG_BATCH_SIZE = int(os.getenv("RUN_LOG_BATCH_SIZE", "100"))
+RUN_LOG_FLUSH_MS = float(os.getenv("RUN_LOG_FLUSH_MS", "200"))
+RUN_LOG_BUFFER_SIZE = int(os.getenv("RUN_LOG_BUFFER_SIZE", "10000"))
+
 
 def init_db():
     """Initialize the database with required tables."""
@@ -57,6 +80,9 @@ def init_db():
             )
         """)
 
+        # Full-text index over log messages (kept in sync by triggers)
+        init_logs_search(conn)
+
         # Config snapshots - for versioning
         conn.execute("""
             CREATE TABLE IF NOT EXISTS config_snapshots (
@@ -71,10 +97,91 @@ def init_db():
         conn.commit()
 
 
+# unicode61 splits on anything that is not a letter or digit
+_FTS_TOKEN = re.compile(r"[^\W_]+")
+
+
+def fts_query(text: Optional[str]) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word must match, as a prefix ("lot 5883" finds "58831234"), and
+    FTS5 operators in user input are quoted rather than interpreted.
+
+    Returns:
+        MATCH expression, or None if the text has no searchable words
+    """
+    tokens = _FTS_TOKEN.findall(text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return (
+        conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+    )
+
+
+def init_logs_search(conn: sqlite3.Connection):
+    """
+    Create the logs_fts index over logs.message and its sync triggers.
+
+    logs_fts is an external-content table (the text lives only in logs), so
+    the index adds tokens, not a second copy of every message. Existing
+    rows are indexed when the table is first created.
+    """
+    created = not _table_exists(conn, "logs_fts")
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts
+        USING fts5(message, content='logs', content_rowid='id')
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+            INSERT INTO logs_fts (rowid, message) VALUES (new.id, new.message);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN
+            INSERT INTO logs_fts (logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS logs_fts_update AFTER UPDATE OF message ON logs BEGIN
+            INSERT INTO logs_fts (logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            INSERT INTO logs_fts (rowid, message) VALUES (new.id, new.message);
+        END
+    """)
+    if created:
+        conn.execute("INSERT INTO logs_fts (logs_fts) VALUES ('rebuild')")
+
+
+class MeteredConnection(sqlite3.Connection):
+    """Connection that records statement counts and execution time."""
+
+    def execute(self, sql, parameters=(), /):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            op = statement_op(sql)
+            DB_QUERIES.inc(op=op)
+            DB_QUERY_LATENCY.observe(time.perf_counter() - start, op=op)
+
+    def executemany(self, sql, parameters, /):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            op = statement_op(sql)
+            DB_QUERIES.inc(op=op)
+            DB_QUERY_LATENCY.observe(time.perf_counter() - start, op=op)
+
+
 @contextmanager
 def get_connection():
     """Get a database connection."""
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(DB_PATH), factory=MeteredConnection)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -232,23 +339,141 @@ class RunHistory:
             }
 
 
+class RunLogBuffer:
+    """
+    Batches run log inserts on a background thread.
+
+    add() appends to a bounded buffer and returns. The writer thread inserts
+    everything buffered in one transaction once batch_size entries are
+    waiting or flush_ms has passed, and sleeps while the buffer is empty.
+    A batch that hits an operational error (e.g. "database is locked") goes
+    back to the front of the buffer and is retried every flush_ms. Entries
+    are dropped and counted (log_records_dropped_total{sink="run_logs"})
+    only when the buffer is full, or when a batch can never be written, so
+    a slow or locked database never stalls the caller.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = RUN_LOG_BATCH_SIZE,
+        flush_ms: float = RUN_LOG_FLUSH_MS,
+        max_entries: int = RUN_LOG_BUFFER_SIZE,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.max_entries = max_entries
+        self.dropped = 0
+        self.written = 0
+        self._entries: deque[tuple] = deque()
+        self._cond = threading.Condition()
+        # One batch at a time, so entries reach the table in order
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._retrying = False  # Last batch failed; wait flush_ms before the next try
+
+    def add(self, entry: tuple) -> bool:
+        """Buffer a (run_id, timestamp, level, message, details) row; False if dropped."""
+        with self._cond:
+            if len(self._entries) >= self.max_entries:
+                self._drop(1)
+                return False
+            self._entries.append(entry)
+            # Wake the writer when it is idle (empty buffer) or a batch is full
+            if len(self._entries) == 1 or len(self._entries) >= self.batch_size:
+                self._cond.notify()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="run-log-writer", daemon=True
+                )
+                self._thread.start()
+        return True
+
+    def flush(self) -> int:
+        """Write everything buffered now. Returns the number of rows written."""
+        with self._write_lock:
+            with self._cond:
+                batch = list(self._entries)
+                self._entries.clear()
+            if not batch:
+                return 0
+            try:
+                with get_connection() as conn:
+                    conn.executemany(
+                        """INSERT INTO logs (run_id, timestamp, level, message, details)
+                           VALUES (?, ?, ?, ?, ?)""",
+                        batch,
+                    )
+                    conn.commit()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Run log batch of {len(batch)} not written, will retry: {e}")
+                self._requeue(batch)
+                return 0
+            except sqlite3.Error as e:
+                # Not transient (bad row, schema problem) - retrying would block the buffer
+                logger.warning(f"Dropping {len(batch)} run log entries: {e}")
+                self._drop(len(batch))
+                return 0
+            self._retrying = False
+            self.written += len(batch)
+            LOG_BATCH_FLUSHES.inc()
+            return len(batch)
+
+    def pending(self) -> int:
+        """Entries waiting to be written."""
+        with self._cond:
+            return len(self._entries)
+
+    def _requeue(self, batch: list[tuple]):
+        """Put a failed batch back in front of newer entries, within max_entries."""
+        with self._cond:
+            self._retrying = True
+            self._entries.extendleft(reversed(batch))
+            overflow = len(self._entries) - self.max_entries
+            for _ in range(max(overflow, 0)):
+                # Same as add() on a full buffer: the newest entries are lost
+                self._entries.pop()
+            if overflow > 0:
+                self._drop(overflow)
+
+    def _drop(self, count: int):
+        self.dropped += count
+        LOG_RECORDS_DROPPED.inc(count, sink="run_logs")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._entries:
+                    self._cond.wait()
+                if len(self._entries) < self.batch_size or self._retrying:
+                    self._cond.wait(self.flush_interval)
+            self.flush()
+
+
+run_log_buffer = RunLogBuffer()
+atexit.register(run_log_buffer.flush)
+
+
 class RunLogs:
     """Manage logs for runs."""
 
     @staticmethod
     def add_log(run_id: str, level: str, message: str, details: dict = None):
-        """Add a log entry for a run."""
-        with get_connection() as conn:
-            conn.execute(
-                """INSERT INTO logs (run_id, level, message, details)
-                   VALUES (?, ?, ?, ?)""",
-                (run_id, level, message, json.dumps(details) if details else None),
+        """Add a log entry for a run (written by the batching writer thread)."""
+        run_log_buffer.add(
+            (
+                run_id,
+                # Same format as CURRENT_TIMESTAMP, taken now rather than at flush time
+                datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+                level,
+                message,
+                json.dumps(details) if details else None,
             )
-            conn.commit()
+        )
 
     @staticmethod
     def get_logs(run_id: str) -> list[dict]:
         """Get all logs for a run."""
+        run_log_buffer.flush()
         with get_connection() as conn:
             rows = conn.execute(
                 "SELECT * FROM logs WHERE run_id = ? ORDER BY timestamp", (run_id,)
@@ -269,26 +494,48 @@ class RunLogs:
         level: str = None,
         limit: int = 100,
     ) -> list[dict]:
-        """Search logs with filters."""
-        sql = "SELECT * FROM logs WHERE 1=1"
-        params = []
+        """
+        Search logs with filters.
+
+        With a query, matches come from the logs_fts index, best first, and
+        each carries a "highlight" copy of the message with matched words in
+        <mark> tags. Without one, the newest logs are returned; a query with
+        no searchable words (e.g. "-") matches nothing.
+        """
+        match = fts_query(query)
+        if match is None and query and query.strip():
+            return []
+        if match:
+            sql = """SELECT logs.*, highlight(logs_fts, 0, '<mark>', '</mark>') AS highlight
+                     FROM logs_fts JOIN logs ON logs.id = logs_fts.rowid
+                     WHERE logs_fts MATCH ?"""
+            params = [match]
+        else:
+            sql = "SELECT * FROM logs WHERE 1=1"
+            params = []
 
         if run_id:
-            sql += " AND run_id = ?"
+            sql += " AND logs.run_id = ?"
             params.append(run_id)
         if level:
-            sql += " AND level = ?"
+            sql += " AND logs.level = ?"
             params.append(level)
-        if query:
-            sql += " AND message LIKE ?"
-            params.append(f"%{query}%")
 
-        sql += " ORDER BY timestamp DESC LIMIT ?"
+        sql += " ORDER BY logs_fts.rank" if match else " ORDER BY timestamp DESC"
+        sql += " LIMIT ?"
         params.append(limit)
 
+        run_log_buffer.flush()
+
         with get_connection() as conn:
             rows = conn.execute(sql, params).fetchall()
-            return [dict(row) for row in rows]
+            logs = []
+            for row in rows:
+                log = dict(row)
+                if log.get("details"):
+                    log["details"] = json.loads(log["details"])
+                logs.append(log)
+            return logs
 
 
 class ConfigSnapshots:
@@ -13,9 +13,15 @@ Endpoints:
 - /api/review - Review items and submit workflow
 - /api/exports - Central Dispatch export
 - /api/models - ML model versions and training
+- /api/profiles - Opt-in per-request profiles (PROFILING_ENABLED)
+- /api/retention - Data retention, archive runs and archived-data queries
+- /metrics - Prometheus text exposition
 """
 
+import logging
 import sys
+import threading
+import time
 import uuid
 from contextvars import ContextVar
 from pathlib import Path
@@ -26,7 +32,8 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 
 # Context variable for request ID - accessible throughout the request lifecycle
@@ -44,6 +51,8 @@ from api.routes import (
     integrations,
     metrics,
     models,
+    profiles,
+    retention,
     reviews,
     runs,
     settings,
@@ -51,6 +60,10 @@ from api.routes import (
     training,
     warehouses,
 )
+from core import profiling
+from core.telemetry import CONTENT_TYPE, HTTP_LATENCY, HTTP_REQUESTS, render_latest
+
+logger = logging.getLogger(__name__)
 
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
@@ -81,6 +94,100 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         return response
 
 
+def _route_template(request: Request) -> str:
+    """Path template of the matched route, or "unmatched"."""
+    template = getattr(request.scope.get("route"), "path", None)
+    if not template:
+        return "unmatched"
+    # Newer FastAPI keeps included routers nested, so route.path lacks the
+    # router prefix; recover it from the leading segments of the request path
+    segments = request.url.path.rstrip("/").split("/")
+    extra = len(segments) - len(template.rstrip("/").split("/"))
+    if extra > 0 and ":path}" not in template:
+        template = "/".join(segments[: extra + 1]) + template
+    return template
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware that records request count and latency per route template.
+
+    Uses the matched route's path template (e.g. /api/documents/{id}) so
+    label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            path = _route_template(request)
+            HTTP_REQUESTS.inc(method=request.method, route=path, status=status)
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=request.method, route=path)
+
+
+class ProfilingMiddleware:
+    """
+    Middleware that profiles opted-in requests (see core/profiling.py).
+
+    Plain ASGI rather than BaseHTTPMiddleware so that, with profiling
+    disabled, a request costs one attribute check. Sits inside
+    RequestIDMiddleware so the profile is stored under the request ID,
+    returned in the X-Profile-ID header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not profiling.settings.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = Request(scope).headers.get("X-Profile")
+        if not profiling.should_profile(scope["path"], header):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profiling.profile_id_for(scope.get("state", {}).get("request_id"))
+        # Handlers run on this thread; work they push to worker threads is not sampled
+        profiler = profiling.SamplingProfiler(threading.get_ident()).start()
+        finished = False
+
+        def finish(status: int):
+            nonlocal finished
+            finished = True
+            profiler.stop()
+            try:
+                profiling.save_profile(
+                    profile_id,
+                    profiler,
+                    method=scope["method"],
+                    path=scope["path"],
+                    status=status,
+                )
+            except OSError as e:
+                logger.warning(f"Failed to save profile {profile_id}: {e}")
+
+        async def send_with_profile(message):
+            # Save before the response goes out so the profile is downloadable
+            # as soon as the client has the X-Profile-ID
+            if message["type"] == "http.response.start":
+                finish(message["status"])
+                MutableHeaders(scope=message).append("X-Profile-ID", profile_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            if not finished:
+                # No response was started (unhandled exception)
+                finish(500)
+
+
 def get_request_id() -> str:
     """Get the current request ID from context."""
     return request_id_var.get()
@@ -94,8 +201,11 @@ app = FastAPI(
     redoc_url="/api/redoc",
 )
 
+# Profiling - innermost, so the request ID is already set
+app.add_middleware(ProfilingMiddleware)
 # Request ID middleware - add first so it runs for all requests
 app.add_middleware(RequestIDMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # CORS for frontend
 app.add_middleware(
@@ -104,7 +214,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Request-ID"],  # Allow frontend to read request ID
+    expose_headers=["X-Request-ID", "X-Profile-ID"],  # Allow frontend to read request ID
 )
 
 # Include original routers
@@ -125,6 +235,8 @@ app.include_router(warehouses.router)
 app.include_router(field_mappings.router)
 app.include_router(training.router, prefix="/api")
 app.include_router(metrics.router)  # M3.P1.5: Metrics endpoints
+app.include_router(profiles.router)
+app.include_router(retention.router)
 
 
 # =============================================================================
@@ -140,10 +252,16 @@ async def poll_email_now():
     Triggers an immediate poll of the configured email inbox.
     Returns processing results.
     """
-    from api.workers.email_worker import get_worker
+    import asyncio
+
+    from api.workers.email_worker import PollInProgressError, get_worker
 
     worker = get_worker()
-    results = worker.poll_once()
+    # Polling blocks on IMAP and extraction - keep it off the event loop
+    try:
+        results = await asyncio.to_thread(worker.poll_once)
+    except PollInProgressError as e:
+        return {"status": "already_polling", "message": str(e), "results": []}
 
     return {
         "status": "ok",
@@ -173,6 +291,14 @@ async def start_email_worker():
     return {"status": "ok", "message": "Email worker started"}
 
 
+@app.get("/api/email/worker/stats", tags=["Email"])
+async def email_worker_stats():
+    """Email worker pipeline stats: per-stage throughput and queue depth."""
+    from api.workers.email_worker import get_worker
+
+    return get_worker().get_stats()
+
+
 @app.post("/api/email/worker/stop", tags=["Email"])
 async def stop_email_worker():
     """Stop the background email polling worker."""
@@ -182,6 +308,12 @@ async def stop_email_worker():
     return {"status": "ok", "message": "Email worker stopped"}
 
 
+# Prometheus scrape endpoint (operational metrics; dashboards live under /api/metrics)
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(content=render_latest(), media_type=CONTENT_TYPE)
+
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup():
@@ -203,6 +335,13 @@ async def startup():
     from api.routes.training import init_training_schema
 
     init_training_schema()
+    # Health/readiness state is refreshed in the background from here on
+    health.monitor.refresh()
+    health.monitor.start()
+    # Archive cold rows in the background (RETENTION_ENABLED)
+    from api.retention import start_archiver
+
+    start_archiver()
 
 
 # Serve frontend (simple HTML for now)
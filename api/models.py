@@ -19,7 +19,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
-from api.database import get_connection
+from api.cache_versions import FIELD_MAPPINGS, PROFILES, bump_version
+from api.database import fts_query, get_connection
 
 # =============================================================================
 # ENUMS
@@ -611,6 +612,7 @@ def seed_default_field_mappings():
                     )
 
         conn.commit()
+    bump_version(FIELD_MAPPINGS)
 
 
 # =============================================================================
@@ -697,6 +699,7 @@ class ExtractionMetrics:
     detected_source: Optional[str] = None
     classification_score: float = 0.0
     classification_patterns: list[str] = field(default_factory=list)
+    classification_pages_used: Optional[int] = None  # Pages read by progressive triage
 
     # Extraction metrics
     fields_extracted_count: int = 0
@@ -1001,7 +1004,9 @@ class AuctionTypeRepository:
         with get_connection() as conn:
             conn.execute(f"UPDATE auction_types SET {set_clause} WHERE id = ?", values)
             conn.commit()
-            return True
+        # Profiles and field mappings are looked up by auction code / type
+        bump_version(PROFILES, FIELD_MAPPINGS)
+        return True
 
     @staticmethod
     def delete(id: int) -> bool:
@@ -1017,7 +1022,8 @@ class AuctionTypeRepository:
                 (datetime.utcnow().isoformat(), id),
             )
             conn.commit()
-            return True
+        bump_version(PROFILES, FIELD_MAPPINGS)
+        return True
 
 
 class DocumentRepository:
@@ -1139,6 +1145,49 @@ class DocumentRepository:
             conn.commit()
             return True
 
+    @staticmethod
+    def search(
+        query: str,
+        auction_type_id: int = None,
+        include_test: bool = False,
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """
+        Full-text search over filename, raw text and extracted VIN/lot.
+
+        Every word of the query must match (as a prefix). Results are ranked
+        best first, with VIN/lot and filename hits weighted above body text.
+
+        Returns:
+            Dicts with document fields (without raw_text), rank, the matched
+            vin/lot, and a snippet with matched words in <mark> tags
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+
+        sql = """SELECT d.id, d.uuid, d.auction_type_id, d.dataset_split, d.filename,
+                        d.source, d.created_at, f.vin, f.lot,
+                        bm25(documents_fts, 5.0, 1.0, 10.0, 10.0) AS rank,
+                        snippet(documents_fts, -1, '<mark>', '</mark>', '...', 16) AS snippet
+                 FROM documents_fts f JOIN documents d ON d.id = f.rowid
+                 WHERE documents_fts MATCH ?"""
+        params: list[Any] = [match]
+
+        if auction_type_id:
+            sql += " AND d.auction_type_id = ?"
+            params.append(auction_type_id)
+        if not include_test:
+            sql += " AND (d.is_test IS NULL OR d.is_test = 0)"
+            sql += " AND (d.source IS NULL OR d.source != 'test_lab')"
+
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+            return [dict(row) for row in rows]
+
     @staticmethod
     def list_all(
         auction_type_id: int = None,
@@ -2285,6 +2334,12 @@ def _run_migrations():
         except Exception:
             pass  # Column already exists
 
+        # Migration: Add error_message column to export_jobs (written on failed exports)
+        try:
+            conn.execute("ALTER TABLE export_jobs ADD COLUMN error_message TEXT")
+        except Exception:
+            pass  # Column already exists
+
         # Migration: Add source index
         try:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_source ON documents(source)")
@@ -2297,4 +2352,73 @@ def _run_migrations():
         except Exception:
             pass
 
+        # Migration: Full-text index over documents
+        init_documents_search(conn)
+
         conn.commit()
+
+
+# Extracted fields copied into documents_fts from a document's latest run
+_RUN_VIN = "json_extract(new.outputs_json, '$.vehicle_vin')"
+_RUN_LOT = "json_extract(new.outputs_json, '$.vehicle_lot')"
+
+
+def init_documents_search(conn):
+    """
+    Create the documents_fts index and the triggers that keep it in sync.
+
+    Columns are filename, raw_text and the VIN/lot of the document's latest
+    extraction run (rowid = documents.id). The index stores its own copy
+    because VIN and lot come from extraction_runs, not documents. Existing
+    documents are indexed when the table is first created.
+    """
+    created = (
+        conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'documents_fts'").fetchone() is None
+    )
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts
+        USING fts5(filename, raw_text, vin, lot)
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+            INSERT INTO documents_fts (rowid, filename, raw_text, vin, lot)
+            VALUES (new.id, new.filename, coalesce(new.raw_text, ''), '', '');
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS documents_fts_update
+        AFTER UPDATE OF filename, raw_text ON documents BEGIN
+            UPDATE documents_fts SET filename = new.filename, raw_text = coalesce(new.raw_text, '')
+            WHERE rowid = new.id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+            DELETE FROM documents_fts WHERE rowid = old.id;
+        END
+    """)
+    # Outputs are written on completion (UPDATE) or, for some paths, on INSERT;
+    # malformed JSON is skipped rather than failing the write
+    for event in ("INSERT", "UPDATE OF outputs_json"):
+        name = "insert" if event == "INSERT" else "update"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS documents_fts_run_{name}
+            AFTER {event} ON extraction_runs
+            WHEN json_valid(new.outputs_json) BEGIN
+                UPDATE documents_fts
+                SET vin = coalesce({_RUN_VIN}, ''), lot = coalesce({_RUN_LOT}, '')
+                WHERE rowid = new.document_id;
+            END
+        """)
+    if created:
+        conn.execute("""
+            INSERT INTO documents_fts (rowid, filename, raw_text, vin, lot)
+            SELECT d.id, d.filename, coalesce(d.raw_text, ''),
+                   coalesce(json_extract(r.outputs_json, '$.vehicle_vin'), ''),
+                   coalesce(json_extract(r.outputs_json, '$.vehicle_lot'), '')
+            FROM documents d
+            LEFT JOIN extraction_runs r ON r.id = (
+                SELECT MAX(id) FROM extraction_runs
+                WHERE document_id = d.id AND json_valid(outputs_json)
+            )
+        """)
@@ -0,0 +1,514 @@
+"""
+Retention, archival and compaction for the control panel database.
+
+Append-only tables (run logs, audit trails, layout blocks, field evidence,
+finished export and batch jobs) otherwise grow forever. Each table has a
+RetentionPolicy: rows older than its age limit (and, for job tables, in a
+finished state) are cold. The archiver:
+
+1. Copies cold rows, oldest first in chunks, into gzipped JSON Lines files
+   partitioned by table and day: ARCHIVE_DIR/<table>/<YYYY-MM-DD>.jsonl.gz
+2. Deletes them from the database once the chunk is written
+3. Frees pages with PRAGMA incremental_vacuum (or a one-off VACUUM that
+   switches the database to incremental auto-vacuum), refreshes statistics
+   with ANALYZE, and reports the bytes reclaimed
+
+Rows are written before they are deleted, so a crash can at worst archive a
+chunk twice, never lose it. Archived rows stay queryable through
+query_archive() and GET /api/retention/archive/{table}.
+
+Retention is off by default (RETENTION_ENABLED). Age limits are
+RETENTION_<TABLE>_DAYS, 0 keeps a table forever. With several workers,
+each run is claimed through the retention_runs table, so only one worker
+archives per RETENTION_INTERVAL_HOURS.
+
+Example usage:
+    report = run_retention()                 # archive, delete, compact
+    report = run_retention(dry_run=True)     # only count cold rows
+    rows = query_archive("logs", start="2026-01-01", contains="58831234")
+"""
+
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+from api import database
+from api.database import get_connection
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = Path(os.getenv("ARCHIVE_DIR", str(Path(__file__).parent.parent / "data" / "archive")))
+
+RETENTION_ENABLED = os.getenv("RETENTION_ENABLED", "false").lower() in ("1", "true", "yes")
+INTERVAL_HOURS = float(os.getenv("RETENTION_INTERVAL_HOURS", "24"))
+
+# Rows moved per transaction; keeps write locks short on a busy database
+CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", "5000"))
+
+# Pages released per incremental_vacuum call (4 KiB pages: ~160 MB)
+VACUUM_PAGES = int(os.getenv("RETENTION_VACUUM_PAGES", "40000"))
+
+
+@dataclass
+class RetentionPolicy:
+    """How long rows of one table stay in the database."""
+
+    table: str
+    days: int
+    timestamp_column: str = "created_at"
+    # Extra SQL condition a row must meet to be archived (e.g. finished jobs only)
+    condition: Optional[str] = None
+
+    def cutoff(self, now: Optional[datetime] = None) -> str:
+        """Timestamps before this are cold (same format as CURRENT_TIMESTAMP)."""
+        now = now or datetime.utcnow()
+        return (now - timedelta(days=self.days)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _days(table: str, default: int) -> int:
+    return int(os.getenv(f"RETENTION_{table.upper()}_DAYS", str(default)))
+
+
+def default_policies() -> list[RetentionPolicy]:
+    """Policies for every managed table, with RETENTION_<TABLE>_DAYS overrides."""
+    return [
+        RetentionPolicy("logs", _days("logs", 90), timestamp_column="timestamp"),
+        RetentionPolicy("audit_events", _days("audit_events", 365)),
+        RetentionPolicy(
+            "integration_audit_log",
+            _days("integration_audit_log", 365),
+            timestamp_column="timestamp",
+        ),
+        RetentionPolicy("field_evidence", _days("field_evidence", 180)),
+        # After field_evidence, so blocks it just released can go in the same run
+        RetentionPolicy(
+            "layout_blocks",
+            _days("layout_blocks", 180),
+            condition=(
+                "NOT EXISTS (SELECT 1 FROM field_evidence e WHERE e.block_id = layout_blocks.id)"
+            ),
+        ),
+        RetentionPolicy(
+            "export_jobs",
+            _days("export_jobs", 180),
+            condition="status IN ('completed', 'failed')",
+        ),
+        RetentionPolicy(
+            "batch_jobs",
+            _days("batch_jobs", 90),
+            condition="status IN ('completed', 'failed', 'cancelled')",
+        ),
+    ]
+
+
+POLICIES: dict[str, RetentionPolicy] = {p.table: p for p in default_policies()}
+
+
+# =============================================================================
+# ARCHIVING
+# =============================================================================
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def _cold_filter(policy: RetentionPolicy) -> str:
+    sql = f"{policy.timestamp_column} < ?"
+    if policy.condition:
+        sql += f" AND ({policy.condition})"
+    return sql
+
+
+def _partition(value: Any) -> str:
+    """Archive partition (YYYY-MM-DD) for a row timestamp."""
+    text = str(value or "")
+    try:
+        return date.fromisoformat(text[:10]).isoformat()
+    except ValueError:
+        return "undated"
+
+
+def _write_partitions(table: str, rows: list[dict]):
+    by_day: dict[str, list[dict]] = {}
+    policy = POLICIES.get(table)
+    column = policy.timestamp_column if policy else "created_at"
+    for row in rows:
+        by_day.setdefault(_partition(row.get(column)), []).append(row)
+
+    directory = ARCHIVE_DIR / table
+    directory.mkdir(parents=True, exist_ok=True)
+    for day, day_rows in by_day.items():
+        data = "".join(json.dumps(row, default=str, ensure_ascii=False) + "\n" for row in day_rows)
+        # Appending adds a gzip member; readers see one continuous stream
+        with open(directory / f"{day}.jsonl.gz", "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+                gz.write(data.encode("utf-8"))
+            # On disk before the rows are deleted from the database
+            raw.flush()
+            os.fsync(raw.fileno())
+
+
+def archive_table(
+    policy: RetentionPolicy, dry_run: bool = False, now: Optional[datetime] = None
+) -> int:
+    """
+    Move a table's cold rows to the archive.
+
+    Args:
+        policy: Table and age limit
+        dry_run: Only count the cold rows
+        now: Reference time (tests)
+
+    Returns:
+        Number of rows archived (or that would be)
+    """
+    if policy.days <= 0:
+        return 0
+    cutoff = policy.cutoff(now)
+    where = _cold_filter(policy)
+
+    with get_connection() as conn:
+        if not _table_exists(conn, policy.table):
+            return 0
+        if dry_run:
+            return conn.execute(
+                f"SELECT COUNT(*) FROM {policy.table} WHERE {where}", (cutoff,)
+            ).fetchone()[0]
+
+        moved = 0
+        while True:
+            rows = conn.execute(
+                f"""SELECT rowid AS _rowid, * FROM {policy.table}
+                    WHERE {where} ORDER BY rowid LIMIT ?""",
+                (cutoff, CHUNK_SIZE),
+            ).fetchall()
+            if not rows:
+                break
+            records = [dict(row) for row in rows]
+            rowids = [record.pop("_rowid") for record in records]
+
+            _write_partitions(policy.table, records)
+            placeholders = ",".join("?" * len(rowids))
+            conn.execute(f"DELETE FROM {policy.table} WHERE rowid IN ({placeholders})", rowids)
+            conn.commit()
+            moved += len(rowids)
+            if len(rowids) < CHUNK_SIZE:
+                break
+
+    if moved:
+        logger.info(f"Archived {moved} rows from {policy.table} older than {cutoff}")
+    return moved
+
+
+# =============================================================================
+# COMPACTION
+# =============================================================================
+
+
+def database_size() -> dict[str, int]:
+    """File size, page size and free pages of the control panel database."""
+    with get_connection() as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    return {
+        "bytes": page_size * page_count,
+        "free_bytes": page_size * freelist,
+        "page_size": page_size,
+        "auto_vacuum": auto_vacuum,
+    }
+
+
+def compact(tables: list[str], full_vacuum: bool = False) -> dict[str, Any]:
+    """
+    Release free pages and refresh planner statistics.
+
+    In incremental auto-vacuum mode up to VACUUM_PAGES free pages are
+    returned to the OS per call. Otherwise pages are only reclaimed with
+    full_vacuum, which runs one VACUUM and switches the database to
+    incremental mode so later runs are incremental.
+
+    Args:
+        tables: Tables to ANALYZE (those rows were deleted from)
+        full_vacuum: Allow a full VACUUM when not in incremental mode
+
+    Returns:
+        Sizes before/after, bytes reclaimed and the vacuum mode used
+    """
+    before = database_size()
+    with get_connection() as conn:
+        if before["auto_vacuum"] == 2:
+            # Each step of the pragma frees one page; executescript runs it to completion
+            conn.executescript(f"PRAGMA incremental_vacuum({VACUUM_PAGES});")
+            mode = "incremental"
+        elif full_vacuum:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            mode = "full"
+        else:
+            mode = "skipped"
+        for table in tables:
+            conn.execute(f"ANALYZE {table}")
+        conn.commit()
+    after = database_size()
+    return {
+        "vacuum": mode,
+        "bytes_before": before["bytes"],
+        "bytes_after": after["bytes"],
+        "bytes_reclaimed": max(before["bytes"] - after["bytes"], 0),
+        "free_bytes": after["free_bytes"],
+    }
+
+
+# =============================================================================
+# RUNS
+# =============================================================================
+
+
+def _ensure_runs_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS retention_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TIMESTAMP NOT NULL,
+            finished_at TIMESTAMP,
+            dry_run BOOLEAN DEFAULT FALSE,
+            archived_json TEXT,
+            compaction_json TEXT,
+            error TEXT
+        )
+    """)
+
+
+def _claim_run(interval_hours: Optional[float], dry_run: bool) -> Optional[int]:
+    """Record a run start; with interval_hours, only if no run started within it."""
+    now = datetime.utcnow()
+    with get_connection() as conn:
+        _ensure_runs_table(conn)
+        # Claim inside one write transaction so concurrent workers can't both win
+        conn.execute("BEGIN IMMEDIATE")
+        if interval_hours is not None:
+            since = (now - timedelta(hours=interval_hours)).isoformat()
+            recent = conn.execute(
+                "SELECT 1 FROM retention_runs WHERE started_at > ? AND dry_run = 0", (since,)
+            ).fetchone()
+            if recent:
+                conn.rollback()
+                return None
+        cursor = conn.execute(
+            "INSERT INTO retention_runs (started_at, dry_run) VALUES (?, ?)",
+            (now.isoformat(), dry_run),
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+
+def run_retention(
+    dry_run: bool = False,
+    full_vacuum: bool = False,
+    tables: Optional[list[str]] = None,
+    interval_hours: Optional[float] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    Archive cold rows of every policy table, then compact.
+
+    Args:
+        dry_run: Count cold rows without moving anything
+        full_vacuum: Allow a full VACUUM (see compact)
+        tables: Limit to these tables
+        interval_hours: Skip (return None) if another run started this recently
+
+    Returns:
+        Report with rows archived per table and compaction results
+    """
+    run_id = _claim_run(interval_hours, dry_run)
+    if run_id is None:
+        return None
+
+    archived: dict[str, int] = {}
+    compaction: Optional[dict[str, Any]] = None
+    error = None
+    try:
+        for policy in POLICIES.values():
+            if tables and policy.table not in tables:
+                continue
+            archived[policy.table] = archive_table(policy, dry_run=dry_run)
+        if not dry_run:
+            touched = [table for table, count in archived.items() if count]
+            compaction = compact(touched, full_vacuum=full_vacuum)
+    except Exception as e:
+        error = str(e)
+        logger.error(f"Retention run {run_id} failed: {e}")
+
+    with get_connection() as conn:
+        conn.execute(
+            """UPDATE retention_runs
+               SET finished_at = ?, archived_json = ?, compaction_json = ?, error = ?
+               WHERE id = ?""",
+            (
+                datetime.utcnow().isoformat(),
+                json.dumps(archived),
+                json.dumps(compaction) if compaction else None,
+                error,
+                run_id,
+            ),
+        )
+        conn.commit()
+
+    return {
+        "run_id": run_id,
+        "dry_run": dry_run,
+        "archived": archived,
+        "compaction": compaction,
+        "error": error,
+    }
+
+
+def list_runs(limit: int = 20) -> list[dict[str, Any]]:
+    """Recent retention runs, newest first."""
+    with get_connection() as conn:
+        _ensure_runs_table(conn)
+        rows = conn.execute(
+            "SELECT * FROM retention_runs ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+    runs = []
+    for row in rows:
+        run = dict(row)
+        for key in ("archived_json", "compaction_json"):
+            if run.get(key):
+                run[key] = json.loads(run[key])
+        runs.append(run)
+    return runs
+
+
+# =============================================================================
+# ARCHIVE QUERIES
+# =============================================================================
+
+
+def list_partitions(table: Optional[str] = None) -> list[dict[str, Any]]:
+    """Archive files per table and day, oldest first."""
+    if not ARCHIVE_DIR.is_dir():
+        return []
+    partitions = []
+    for path in sorted(ARCHIVE_DIR.glob("*/*.jsonl.gz")):
+        if table and path.parent.name != table:
+            continue
+        partitions.append(
+            {
+                "table": path.parent.name,
+                "date": path.name.removesuffix(".jsonl.gz"),
+                "bytes": path.stat().st_size,
+            }
+        )
+    return partitions
+
+
+def query_archive(
+    table: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    contains: Optional[str] = None,
+    filters: Optional[dict[str, Any]] = None,
+    limit: int = 100,
+) -> list[dict[str, Any]]:
+    """
+    Read archived rows of one table.
+
+    Args:
+        table: Archived table name
+        start: First day (YYYY-MM-DD), inclusive
+        end: Last day (YYYY-MM-DD), inclusive
+        contains: Case-insensitive text that must appear in the row
+        filters: Column values that must match exactly (compared as strings)
+        limit: Maximum rows returned
+
+    Returns:
+        Matching rows, oldest partition first
+    """
+    if table not in POLICIES:
+        raise ValueError(f"Unknown archive table: {table}")
+    needle = contains.lower() if contains else None
+    results: list[dict[str, Any]] = []
+
+    for partition in list_partitions(table):
+        day = partition["date"]
+        if (start and day < start) or (end and day > end):
+            continue
+        with gzip.open(ARCHIVE_DIR / table / f"{day}.jsonl.gz", "rt", encoding="utf-8") as f:
+            for line in f:
+                # Cheap text test before parsing
+                if needle and needle not in line.lower():
+                    continue
+                row = json.loads(line)
+                if filters and any(str(row.get(k)) != str(v) for k, v in filters.items()):
+                    continue
+                results.append(row)
+                if len(results) >= limit:
+                    return results
+    return results
+
+
+def status() -> dict[str, Any]:
+    """Policies, database size, archive size and recent runs."""
+    partitions = list_partitions()
+    return {
+        "enabled": RETENTION_ENABLED,
+        "interval_hours": INTERVAL_HOURS,
+        "database": {"path": str(database.DB_PATH), **database_size()},
+        "policies": [asdict(policy) for policy in POLICIES.values()],
+        "archive": {
+            "path": str(ARCHIVE_DIR),
+            "partitions": len(partitions),
+            "bytes": sum(p["bytes"] for p in partitions),
+        },
+        "runs": list_runs(5),
+    }
+
+
+# =============================================================================
+# BACKGROUND ARCHIVER
+# =============================================================================
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _archiver_loop():
+    # Check hourly; _claim_run makes it one run per interval across workers
+    while True:
+        try:
+            report = run_retention(interval_hours=INTERVAL_HOURS)
+            if report:
+                logger.info(f"Retention run finished: {report['archived']}")
+        except Exception as e:
+            logger.error(f"Retention run failed: {e}")
+        if _stop.wait(min(INTERVAL_HOURS, 1.0) * 3600):
+            return
+
+
+def start_archiver() -> bool:
+    """Start the background archiver if RETENTION_ENABLED (idempotent)."""
+    global _thread
+    if not RETENTION_ENABLED or (_thread and _thread.is_alive()):
+        return False
+    _stop.clear()
+    _thread = threading.Thread(target=_archiver_loop, name="retention-archiver", daemon=True)
+    _thread.start()
+    return True
+
+
+def stop_archiver():
+    """Stop the background archiver after its current run."""
+    _stop.set()
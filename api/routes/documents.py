@@ -81,6 +81,30 @@ class DocumentUploadResponse(BaseModel):
     classification_score: Optional[float] = None
 
 
+class DocumentSearchHit(BaseModel):
+    """Ranked full-text search match."""
+
+    id: int
+    uuid: str
+    auction_type_id: int
+    dataset_split: str
+    filename: str
+    source: Optional[str] = None
+    created_at: Optional[str] = None
+    vin: Optional[str] = None
+    lot: Optional[str] = None
+    rank: float
+    snippet: str
+
+
+class DocumentSearchResponse(BaseModel):
+    """Response model for document search."""
+
+    query: str
+    items: list[DocumentSearchHit]
+    total: int
+
+
 class DocumentStatsResponse(BaseModel):
     """Response model for document statistics."""
 
@@ -225,12 +249,8 @@ async def upload_document(
             if page_count == 0:
                 raise HTTPException(status_code=422, detail="Invalid PDF: Document has no pages")
             # Extract text to validate PDF is readable
-            text_parts = []
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-            raw_text = "\n".join(text_parts)
+            page_texts = [page.extract_text() or "" for page in pdf.pages]
+            raw_text = "\n".join(t for t in page_texts if t)
     except HTTPException:
         raise
     except Exception as e:
@@ -250,13 +270,16 @@ async def upload_document(
     # Auto-classify document if auction_type not provided
     detected_source = None
     classification_score = None
+    classification_pages_used = None
     if auto_classify and not auction_type_id and raw_text and text_length >= 100:
         try:
             from extractors import ExtractorManager
 
             manager = ExtractorManager()
-            classification = manager.classify(str(file_path))
+            # Text is already extracted - classify page by page, stopping early
+            classification = manager.classify_pages(page_texts)
             if classification:
+                classification_pages_used = classification.pages_used
                 detected_source = classification.source.value
                 classification_score = round(classification.score * 100, 1)
                 # Map detected source to auction type
@@ -324,15 +347,23 @@ async def upload_document(
                     from extractors import ExtractorManager
 
                     manager = ExtractorManager()
-                    classification = manager.classify(str(file_path))
+                    classification = manager.classify_pages(page_texts)
                     if classification:
                         detected_source = classification.source.value
                         classification_score = round(classification.score * 100, 1)
+                        classification_pages_used = classification.pages_used
 
                 # Run extraction
                 from api.routes.extractions import run_extraction
 
-                run_extraction(run_id, doc_id, auction_type_id, "rule", None)
+                run_extraction(
+                    run_id,
+                    doc_id,
+                    auction_type_id,
+                    "rule",
+                    None,
+                    classification_pages_used=classification_pages_used,
+                )
 
                 # Get updated status
                 run = ExtractionRunRepository.get_by_id(run_id)
@@ -434,6 +465,32 @@ async def list_documents(
     )
 
 
+@router.get("/search", response_model=DocumentSearchResponse)
+async def search_documents(
+    q: str = Query(..., min_length=1, description="Words to find, e.g. a lot number or VIN"),
+    auction_type_id: Optional[int] = Query(None, description="Filter by auction type"),
+    include_test_lab: bool = Query(False, description="Include Test Lab documents"),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """
+    Full-text search over document filenames, text and extracted VIN/lot.
+
+    Every word must match (as a prefix). Results are ranked best first and
+    carry a snippet with matched words wrapped in <mark>.
+    """
+    hits = DocumentRepository.search(
+        q,
+        auction_type_id=auction_type_id,
+        include_test=include_test_lab,
+        limit=limit,
+    )
+    return DocumentSearchResponse(
+        query=q,
+        items=[DocumentSearchHit(**hit) for hit in hits],
+        total=len(hits),
+    )
+
+
 @router.get("/{id}", response_model=DocumentResponse)
 async def get_document(id: int):
     """Get a single document by ID."""
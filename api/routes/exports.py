@@ -12,12 +12,15 @@ Includes:
 import asyncio
 import json
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from core.telemetry import cd_response_hook
+
 logger = logging.getLogger(__name__)
 
 # Throttling configuration for CD API
@@ -26,6 +29,9 @@ CD_RETRY_ATTEMPTS = 3  # Number of retry attempts on failure
 CD_BACKOFF_BASE = 2.0  # Base for exponential backoff (seconds)
 CD_BACKOFF_MAX = 30.0  # Maximum backoff time (seconds)
 
+CD_SANDBOX_BASE_URL = "https://api.sandbox.centraldispatch.com"
+CD_PRODUCTION_BASE_URL = "https://api.centraldispatch.com"
+
 # Semaphore for rate limiting
 _cd_semaphore: Optional[asyncio.Semaphore] = None
 
@@ -38,6 +44,19 @@ def get_cd_semaphore() -> asyncio.Semaphore:
     return _cd_semaphore
 
 
+def cd_base_url(sandbox: bool = True) -> str:
+    """
+    Base URL of the CD Listings API.
+
+    CD_API_BASE_URL, when set, replaces both the sandbox and production
+    hosts (e.g. to point exports at a local stand-in server).
+    """
+    override = os.getenv("CD_API_BASE_URL")
+    if override:
+        return override.rstrip("/")
+    return CD_SANDBOX_BASE_URL if sandbox else CD_PRODUCTION_BASE_URL
+
+
 from api.listing_fields import (
     get_registry,
 )
@@ -178,9 +197,10 @@ def build_cd_payload(run_id: int, warehouse_code: str = None) -> tuple[dict, lis
     # M3.P0.2: FIELD RESOLUTION WITH PRECEDENCE
     # Use FieldResolver to combine values from multiple sources
     # =================================================================
-    from extractors.field_resolver import FieldResolver, ResolutionContext
+    from extractors.field_resolver import ResolutionContext, get_field_resolver
 
-    resolver = FieldResolver()
+    # Shared resolver: compiled auction/warehouse plans are reused across runs
+    resolver = get_field_resolver()
     context = ResolutionContext(
         auction_code=at.code,
         warehouse_code=warehouse_code,
@@ -449,10 +469,7 @@ def get_cd_listing_etag(
     """
     import requests
 
-    if sandbox:
-        base_url = "https://api.sandbox.centraldispatch.com"
-    else:
-        base_url = "https://api.centraldispatch.com"
+    base_url = cd_base_url(sandbox)
 
     # CD API V2 uses /listings/id/{id} for GET by ID
     endpoint = f"{base_url}/listings/id/{cd_listing_id}"
@@ -469,6 +486,7 @@ def get_cd_listing_etag(
             endpoint,
             headers=headers,
             timeout=30,
+            hooks={"response": cd_response_hook},
         )
 
         if response.status_code == 200:
@@ -501,10 +519,7 @@ def find_listing_by_partner_ref(partner_ref_id: str, sandbox: bool = True) -> Op
     """
     import requests
 
-    if sandbox:
-        base_url = "https://api.sandbox.centraldispatch.com"
-    else:
-        base_url = "https://api.centraldispatch.com"
+    base_url = cd_base_url(sandbox)
 
     # CD API V2: search listings by partnerReferenceId
     endpoint = f"{base_url}/listings"
@@ -521,6 +536,7 @@ def find_listing_by_partner_ref(partner_ref_id: str, sandbox: bool = True) -> Op
             params=params,
             headers=headers,
             timeout=30,
+            hooks={"response": cd_response_hook},
         )
 
         if response.status_code == 200:
@@ -560,10 +576,7 @@ def send_to_cd(
     """
     import requests
 
-    if sandbox:
-        base_url = "https://api.sandbox.centraldispatch.com"
-    else:
-        base_url = "https://api.centraldispatch.com"
+    base_url = cd_base_url(sandbox)
 
     # CD V2 uses Content-Type versioning
     headers = {
@@ -586,6 +599,7 @@ def send_to_cd(
                 json=payload,
                 headers=headers,
                 timeout=30,
+                hooks={"response": cd_response_hook},
             )
 
             # CD API returns 204 No Content for successful PUT
@@ -606,6 +620,7 @@ def send_to_cd(
                 json=payload,
                 headers=headers,
                 timeout=30,
+                hooks={"response": cd_response_hook},
             )
 
         # Handle response
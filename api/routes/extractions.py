@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from extractors.spatial_parser import DocumentStructure
 from pydantic import BaseModel, Field
 
+from api.cache_versions import FIELD_MAPPINGS, VersionedCache
 from api.models import (
     AuctionTypeRepository,
     DocumentRepository,
@@ -23,9 +24,14 @@ from api.models import (
     ModelVersionRepository,
     ReviewItemRepository,
 )
+from core.telemetry import EXTRACTION_STAGE_LATENCY, EXTRACTIONS, EXTRACTIONS_IN_FLIGHT
+from core.timing import StageTimer, span
 
 router = APIRouter(prefix="/api/extractions", tags=["Extractions"])
 
+# Active field mappings per auction type, invalidated by template edits
+_field_mappings_cache = VersionedCache(FIELD_MAPPINGS)
+
 
 # =============================================================================
 # BLOCK EXTRACTION IMPORTS (M3.P0.1)
@@ -254,7 +260,8 @@ def _run_block_extraction(
     try:
         # 1. Parse document structure with spatial awareness
         parser = _get_spatial_parser()
-        structure = parser.parse(file_path)
+        with span("spatial_parse"):
+            structure = parser.parse(file_path)
 
         # Update metrics with layout info (M3.P1.1 column detection)
         metrics["layout_blocks_count"] = len(structure.blocks)
@@ -267,11 +274,13 @@ def _run_block_extraction(
 
         # 2. Store layout blocks in database
         if structure.blocks and document_id:
-            _store_layout_blocks(document_id, structure)
+            with span("db_write"):
+                _store_layout_blocks(document_id, structure)
 
         # 3. Run block-based extraction
         extractor = _get_block_extractor()
-        results = extractor.extract_all_fields(structure, use_fallback=True)
+        with span("block_extraction"):
+            results = extractor.extract_all_fields(structure, use_fallback=True)
 
         # 4. Collect extracted values and evidence
         for field_key, result in results.items():
@@ -523,6 +532,7 @@ class ExtractionMetricsResponse(BaseModel):
     detected_source: Optional[str] = None
     classification_score: float = 0.0
     classification_patterns: list[str] = []
+    classification_pages_used: Optional[int] = None
     fields_extracted_count: int = 0
     fields_filled_count: int = 0
     required_fields_filled: int = 0
@@ -533,6 +543,7 @@ class ExtractionMetricsResponse(BaseModel):
     has_vehicle_ymm: bool = False
     extractor_version: str = "1.0"
     extraction_timestamp: Optional[str] = None
+    stage_timings_ms: dict[str, float] = {}
 
 
 class FieldSourceInfo(BaseModel):
@@ -589,13 +600,48 @@ def run_extraction(
     auction_type_id: int,
     extractor_kind: str = "rule",
     model_version_id: int = None,
+    classification_pages_used: Optional[int] = None,
 ):
     """
     Execute extraction on a document.
 
     This function is called synchronously or as a background task.
     Tracks extraction metrics and field sources for diagnostics.
+
+    classification_pages_used is the page count read by the caller's
+    progressive triage (upload / email ingest), recorded in metrics.
+
+    Per-stage durations are recorded in metrics["stage_timings_ms"].
     """
+    EXTRACTIONS_IN_FLIGHT.inc()
+    try:
+        with StageTimer() as timer:
+            _run_extraction(
+                run_id,
+                document_id,
+                auction_type_id,
+                extractor_kind,
+                model_version_id,
+                classification_pages_used,
+                timer,
+            )
+    finally:
+        EXTRACTIONS_IN_FLIGHT.dec()
+        EXTRACTIONS.inc()
+        for stage, duration_ms in timer.stages.items():
+            EXTRACTION_STAGE_LATENCY.observe(duration_ms / 1000, stage=stage)
+
+
+def _run_extraction(
+    run_id: int,
+    document_id: int,
+    auction_type_id: int,
+    extractor_kind: str,
+    model_version_id: Optional[int],
+    classification_pages_used: Optional[int],
+    timer: StageTimer,
+):
+    """Body of run_extraction, timed by the caller's StageTimer."""
     start_time = time.time()
 
     # Initialize metrics tracking
@@ -607,6 +653,7 @@ def run_extraction(
         "detected_source": None,
         "classification_score": 0.0,
         "classification_patterns": [],
+        "classification_pages_used": classification_pages_used,
         "fields_extracted_count": 0,
         "fields_filled_count": 0,
         "required_fields_filled": 0,
@@ -656,7 +703,7 @@ def run_extraction(
             # Try to extract text
             import pdfplumber
 
-            with pdfplumber.open(doc.file_path) as pdf:
+            with span("text_extraction"), pdfplumber.open(doc.file_path) as pdf:
                 pages_count = len(pdf.pages)
                 text_parts = []
                 for page in pdf.pages:
@@ -677,9 +724,10 @@ def run_extraction(
         # =================================================================
         if doc.file_path:
             try:
-                raw_text, ocr_applied = _run_ocr_if_needed(
-                    doc.file_path, raw_text, metrics, timeout_seconds=120
-                )
+                with span("ocr"):
+                    raw_text, ocr_applied = _run_ocr_if_needed(
+                        doc.file_path, raw_text, metrics, timeout_seconds=120
+                    )
                 # Update metrics after OCR
                 if ocr_applied:
                     metrics["raw_text_length"] = len(raw_text)
@@ -691,6 +739,7 @@ def run_extraction(
                 metrics["ocr_error"] = str(e)
 
         if not raw_text:
+            metrics["stage_timings_ms"] = timer.to_dict()
             ExtractionRunRepository.update(
                 run_id,
                 status="failed",
@@ -747,15 +796,18 @@ def run_extraction(
         manager = ExtractorManager()
 
         # Classify and extract
-        classification = manager.get_extractor_for_text(raw_text)
+        with span("classification"):
+            classification = manager.get_extractor_for_text(raw_text)
         if classification:
             extractor = classification
-            score, patterns = extractor.score(raw_text)
+            with span("classification"):
+                score, patterns = extractor.score(raw_text)
             metrics["classification_score"] = score
             metrics["classification_patterns"] = patterns[:10] if patterns else []
             metrics["detected_source"] = extractor.source.value
 
-            result = extractor.extract_with_result(doc.file_path, raw_text)
+            with span("pattern_extraction"):
+                result = extractor.extract_with_result(doc.file_path, raw_text)
 
             if result.invoice:
                 inv = result.invoice
@@ -913,8 +965,6 @@ def run_extraction(
         required_fields = ["vehicle_vin", "pickup_address", "pickup_city", "pickup_state"]
         metrics["required_fields_filled"] = sum(1 for f in required_fields if outputs.get(f))
 
-        processing_time_ms = int((time.time() - start_time) * 1000)
-
         # =================================================================
         # PIPELINE INVARIANT CHECKS (M0.2)
         # Must pass for extraction to be considered valid for review
@@ -996,28 +1046,14 @@ def run_extraction(
             run_status = "needs_review"
             errors_to_save = None
 
-        # Update run with results including metrics and field sources
-        update_kwargs = {
-            "status": run_status,
-            "extraction_score": extraction_score,
-            "outputs_json": outputs,
-            "metrics_json": metrics,
-            "field_sources_json": field_sources,
-            "processing_time_ms": processing_time_ms,
-            "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-        }
-        if errors_to_save:
-            update_kwargs["errors_json"] = errors_to_save
-
-        ExtractionRunRepository.update(run_id, **update_kwargs)
-
         # =================================================================
         # M3.P0.1: STORE FIELD EVIDENCE
         # Store extraction evidence for transparency and debugging
         # =================================================================
         if evidence_list:
             try:
-                evidence_count = _store_field_evidence(run_id, evidence_list, document_id)
+                with span("db_write"):
+                    evidence_count = _store_field_evidence(run_id, evidence_list, document_id)
                 metrics["evidence_records_stored"] = evidence_count
             except Exception as e:
                 import logging
@@ -1027,9 +1063,27 @@ def run_extraction(
         # Create review items from outputs
         # CRITICAL: Always create review items for ALL configured field mappings,
         # not just the extracted fields. This ensures consistent field display.
-        if True:  # Always create review items, even if outputs is empty
+        with span("db_write"):
             _create_review_items_for_all_fields(run_id, auction_type_id, outputs or {})
 
+        # Update run last so it only leaves "processing" once review items
+        # exist, and its metrics and processing time include the writes above
+        metrics["stage_timings_ms"] = timer.to_dict()
+        processing_time_ms = int((time.time() - start_time) * 1000)
+        update_kwargs = {
+            "status": run_status,
+            "extraction_score": extraction_score,
+            "outputs_json": outputs,
+            "metrics_json": metrics,
+            "field_sources_json": field_sources,
+            "processing_time_ms": processing_time_ms,
+            "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        if errors_to_save:
+            update_kwargs["errors_json"] = errors_to_save
+
+        ExtractionRunRepository.update(run_id, **update_kwargs)
+
     except Exception as e:
         import traceback
 
@@ -1039,6 +1093,7 @@ def run_extraction(
         }
         # Update metrics with error info
         metrics["extraction_timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%SZ")
+        metrics["stage_timings_ms"] = timer.to_dict()
 
         ExtractionRunRepository.update(
             run_id,
@@ -1052,6 +1107,18 @@ def run_extraction(
         _create_empty_review_items(run_id, auction_type_id)
 
 
+def _load_active_field_mappings(auction_type_id: int) -> list[dict]:
+    """Load active field mappings for an auction type in display order."""
+    from api.database import get_connection
+
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT * FROM field_mappings WHERE auction_type_id = ? AND is_active = TRUE ORDER BY display_order",
+            (auction_type_id,),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
 def _create_review_items_for_all_fields(run_id: int, auction_type_id: int, outputs: dict):
     """
     Create review items for ALL configured field mappings.
@@ -1064,14 +1131,8 @@ def _create_review_items_for_all_fields(run_id: int, auction_type_id: int, outpu
         auction_type_id: Auction type ID for field mappings
         outputs: Dict of extracted field values (may be incomplete)
     """
-    from api.database import get_connection
-
     # Get ALL field mappings for this auction type (ordered for consistent display)
-    with get_connection() as conn:
-        mappings = conn.execute(
-            "SELECT * FROM field_mappings WHERE auction_type_id = ? AND is_active = TRUE ORDER BY display_order",
-            (auction_type_id,),
-        ).fetchall()
+    mappings = _field_mappings_cache.get(auction_type_id, _load_active_field_mappings)
 
     # Default field set if no mappings configured
     DEFAULT_FIELDS = [
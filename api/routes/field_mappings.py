@@ -15,6 +15,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from api.cache_versions import FIELD_MAPPINGS, bump_version
 from api.database import get_connection
 
 router = APIRouter(prefix="/api/templates", tags=["Templates"])
@@ -450,6 +451,7 @@ async def create_field(auction_type_id: int, data: FieldMappingCreate):
             ),
         )
         conn.commit()
+        bump_version(FIELD_MAPPINGS)
 
         field_id = cursor.lastrowid
 
@@ -518,6 +520,7 @@ async def update_field(auction_type_id: int, field_id: int, data: FieldMappingUp
             f"UPDATE field_mappings SET {set_clause} WHERE id = ? AND auction_type_id = ?", values
         )
         conn.commit()
+        bump_version(FIELD_MAPPINGS)
 
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Field not found")
@@ -545,6 +548,7 @@ async def delete_field(
                 (datetime.utcnow().isoformat(), field_id, auction_type_id),
             )
         conn.commit()
+        bump_version(FIELD_MAPPINGS)
 
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Field not found")
@@ -562,6 +566,7 @@ async def reorder_fields(auction_type_id: int, field_ids: list[int]):
                 (i, field_id, auction_type_id),
             )
         conn.commit()
+        bump_version(FIELD_MAPPINGS)
 
     return {"status": "ok", "reordered": len(field_ids)}
 
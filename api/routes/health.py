@@ -1,20 +1,53 @@
-"""Health check endpoints."""
+"""
+Health check endpoints.
 
+/api/health, /api/ready and /api/live answer from cached state so k8s probes
+and dashboard polling cost microseconds per call:
+
+- Version and git info are resolved once per process, from the build stamp
+  written by scripts/write_build_info.py (BUILD_INFO_FILE, default
+  build_info.json) or, without one, from `git rev-parse`.
+- Directory, config and dependency checks run on a background thread every
+  HEALTH_REFRESH_SECONDS (default 5) and the endpoints return the last result.
+
+Readiness fails when the database is not writable, the batch worker pool has
+shut down, queued work exceeds READY_MAX_QUEUE_DEPTH, a CD rate limiter is
+saturated (paused by Retry-After, or as many callers waiting as it has slots),
+or the cached state is stale because the refresher stopped. A write lock held
+longer than READY_DB_PROBE_TIMEOUT is reported as "busy" and does not fail it.
+"""
+
+import json
+import logging
 import os
+import sqlite3
 import subprocess
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-# Version info - updated on build/deploy
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Version info - overridden by the build stamp when present
 APP_VERSION = "1.1.0"
 BUILD_TIME = datetime.utcnow().isoformat() + "Z"
 
+REFRESH_SECONDS = float(os.getenv("HEALTH_REFRESH_SECONDS", "5"))
+MAX_QUEUE_DEPTH = int(os.getenv("READY_MAX_QUEUE_DEPTH", "500"))
+# Seconds the write probe waits for the lock; a longer write reports "busy"
+DB_PROBE_TIMEOUT = float(os.getenv("READY_DB_PROBE_TIMEOUT", "0.5"))
+
 
 def get_git_info() -> dict[str, str]:
     """Get git commit info for version tracking."""
@@ -38,29 +71,43 @@ def get_git_info() -> dict[str, str]:
         return {"sha": "unknown", "branch": "unknown"}
 
 
-class HealthResponse(BaseModel):
-    """Health check response."""
+@lru_cache(maxsize=1)
+def get_build_info() -> dict[str, str]:
+    """
+    Version, git and build time for this process (resolved once).
 
-    status: str
-    version: str
-    git_sha: str
-    git_branch: str
-    build_time: str
-    checks: dict[str, Any]
+    Returns:
+        Dict with version, git_sha, git_branch and build_time
+    """
+    stamp = Path(os.getenv("BUILD_INFO_FILE", str(PROJECT_ROOT / "build_info.json")))
+    info: dict[str, str] = {}
+    if stamp.is_file():
+        try:
+            info = json.loads(stamp.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable build stamp {stamp}: {e}")
+            info = {}
+    if not info.get("git_sha"):
+        git_info = get_git_info()
+        info.setdefault("git_sha", git_info["sha"])
+        info.setdefault("git_branch", git_info["branch"])
+    return {
+        "version": str(info.get("version") or APP_VERSION),
+        "git_sha": str(info.get("git_sha") or "unknown"),
+        "git_branch": str(info.get("git_branch") or "unknown"),
+        "build_time": str(info.get("build_time") or BUILD_TIME),
+    }
 
 
-@router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """
-    Health check endpoint.
+# =============================================================================
+# CHECKS (run on the refresher thread, never on a request)
+# =============================================================================
 
-    Returns system health status including:
-    - Database connectivity
-    - Required directories
-    - Configuration status
-    """
+
+def check_environment() -> tuple[dict[str, Any], bool]:
+    """Database file, data directories, config files and export targets."""
     checks = {}
-    overall_status = "healthy"
+    healthy = True
 
     # Check database
     try:
@@ -72,7 +119,7 @@ async def health_check():
         }
     except Exception as e:
         checks["database"] = {"status": "error", "error": str(e)}
-        overall_status = "unhealthy"
+        healthy = False
 
     # Check data directories
     data_dirs = ["data", "datasets", "datasets/runs", "config"]
@@ -107,22 +154,203 @@ async def health_check():
     except Exception as e:
         checks["export_targets"] = {"status": "error", "error": str(e)}
 
-    git_info = get_git_info()
+    return checks, healthy
+
+
+def check_database_writable() -> dict[str, Any]:
+    """
+    Take and release the SQLite write lock without changing anything.
+
+    The probe waits at most DB_PROBE_TIMEOUT for the lock. A lock held by
+    another writer (a retention chunk, a batch import) is reported as
+    "busy" and does not fail readiness; only other errors (read-only file,
+    missing database, I/O errors) do.
+    """
+    from api import database
+
+    if not database.DB_PATH.exists():
+        return {"ok": False, "error": "not_initialized"}
+    conn = None
+    try:
+        conn = sqlite3.connect(str(database.DB_PATH), timeout=DB_PROBE_TIMEOUT)
+        conn.execute("BEGIN IMMEDIATE")
+        conn.rollback()
+        return {"ok": True, "state": "writable"}
+    except sqlite3.OperationalError as e:
+        if "locked" in str(e) or "busy" in str(e):
+            return {"ok": True, "state": "busy"}
+        return {"ok": False, "state": "not_writable", "error": str(e)}
+    except sqlite3.Error as e:
+        return {"ok": False, "state": "not_writable", "error": str(e)}
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def check_batch_pool() -> dict[str, Any]:
+    """Whether the batch export worker pool still accepts jobs."""
+    from api.batch_queue import peek_batch_queue
+
+    queue = peek_batch_queue()
+    # Not created yet = nothing submitted; it starts on first use
+    return {"ok": queue.is_alive() if queue else True, "started": queue is not None}
+
+
+def check_queue_depth() -> dict[str, Any]:
+    """Queued work across batch export jobs and the email worker backlog."""
+    from api.batch_queue import peek_batch_queue
+    from api.workers.email_worker import peek_worker
+
+    queue = peek_batch_queue()
+    worker = peek_worker()
+    batch_depth = sum(queue.depth().values()) if queue else 0
+    email_backlog = worker.backlog if worker else 0
+    return {
+        "ok": batch_depth + email_backlog <= MAX_QUEUE_DEPTH,
+        "batch_items": batch_depth,
+        "email_backlog": email_backlog,
+        "max": MAX_QUEUE_DEPTH,
+    }
+
+
+def check_cd_limiter() -> dict[str, Any]:
+    """Saturation of the Central Dispatch rate limiters in this process."""
+    from services.central_dispatch import limiter_stats
+
+    limiters = limiter_stats()
+    saturated = [
+        stats
+        for stats in limiters
+        if stats["paused_for"] > 1.0 or stats["waiting"] >= stats["max_concurrent"]
+    ]
+    return {"ok": not saturated, "limiters": len(limiters), "saturated": saturated}
+
+
+def _run_check(name: str, check) -> Any:
+    try:
+        return check()
+    except Exception as e:
+        logger.warning(f"Health check {name} failed: {e}")
+        return {"ok": False, "error": str(e)}
+
+
+class HealthMonitor:
+    """
+    Background thread that refreshes health and readiness state.
+
+    The first read refreshes synchronously and starts the thread; after that
+    reads return the cached snapshot.
+    """
+
+    def __init__(self, interval: float = REFRESH_SECONDS):
+        self.interval = interval
+        self._snapshot: Optional[dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> dict[str, Any]:
+        """Run every check now and cache the result."""
+        environment, healthy = check_environment()
+        readiness = {
+            "database": _run_check("database", check_database_writable),
+            "batch_pool": _run_check("batch_pool", check_batch_pool),
+            "queue_depth": _run_check("queue_depth", check_queue_depth),
+            "cd_limiter": _run_check("cd_limiter", check_cd_limiter),
+        }
+        snapshot = {
+            "healthy": healthy,
+            "environment": environment,
+            "readiness": readiness,
+            "checked_at": datetime.utcnow().isoformat() + "Z",
+            "monotonic": time.monotonic(),
+        }
+        self._snapshot = snapshot
+        return snapshot
+
+    def start(self):
+        """Start the refresher thread (idempotent)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Health refresh failed: {e}")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Last cached state, refreshing once if there is none yet."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+            self.start()
+        return snapshot
+
+    def age(self, snapshot: dict[str, Any]) -> float:
+        """Seconds since the snapshot was taken."""
+        return time.monotonic() - snapshot["monotonic"]
+
+
+monitor = HealthMonitor()
+
+
+class HealthResponse(BaseModel):
+    """Health check response."""
+
+    status: str
+    version: str
+    git_sha: str
+    git_branch: str
+    build_time: str
+    checks: dict[str, Any]
+    checked_at: Optional[str] = None
+
+
+@router.get("/health", response_model=HealthResponse)
+async def health_check():
+    """
+    Health check endpoint.
+
+    Returns system health status including:
+    - Database connectivity
+    - Required directories
+    - Configuration status
+    - Readiness dependencies (as of checked_at)
+    """
+    snapshot = monitor.snapshot()
+    build = get_build_info()
 
     return HealthResponse(
-        status=overall_status,
-        version=APP_VERSION,
-        git_sha=git_info["sha"],
-        git_branch=git_info["branch"],
-        build_time=BUILD_TIME,
-        checks=checks,
+        status="healthy" if snapshot["healthy"] else "unhealthy",
+        version=build["version"],
+        git_sha=build["git_sha"],
+        git_branch=build["git_branch"],
+        build_time=build["build_time"],
+        checks={**snapshot["environment"], "readiness": snapshot["readiness"]},
+        checked_at=snapshot["checked_at"],
     )
 
 
 @router.get("/ready")
 async def readiness_check():
-    """Simple readiness probe for k8s/docker."""
-    return {"ready": True}
+    """Readiness probe for k8s/docker: 503 while a dependency check fails."""
+    snapshot = monitor.snapshot()
+    checks = dict(snapshot["readiness"])
+    age = monitor.age(snapshot)
+    checks["fresh"] = {"ok": age <= max(3 * monitor.interval, 30.0), "age_seconds": round(age, 1)}
+
+    ready = all(check.get("ok", False) for check in checks.values())
+    body = {"ready": ready, "checks": checks, "checked_at": snapshot["checked_at"]}
+    return JSONResponse(body, status_code=200 if ready else 503)
 
 
 @router.get("/live")
@@ -76,11 +76,9 @@ async def test_cd_connection():
             message="Central Dispatch not configured. Set username and password in settings.",
         )
 
-    base_url = (
-        "https://api.sandbox.centraldispatch.com"
-        if use_sandbox
-        else "https://api.centraldispatch.com"
-    )
+    from api.routes.exports import cd_base_url
+
+    base_url = cd_base_url(use_sandbox)
 
     try:
         import httpx
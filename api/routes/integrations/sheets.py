@@ -56,13 +56,15 @@ async def test_sheets_connection():
         from google.oauth2.service_account import Credentials
         from googleapiclient.discovery import build
 
+        from core.telemetry import sheets_request_builder
+
         creds_dict = (
             json.loads(credentials_json) if isinstance(credentials_json, str) else credentials_json
         )
         creds = Credentials.from_service_account_info(
             creds_dict, scopes=["https://www.googleapis.com/auth/spreadsheets"]
         )
-        service = build("sheets", "v4", credentials=creds)
+        service = build("sheets", "v4", credentials=creds, requestBuilder=sheets_request_builder())
 
         result = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
         title = result.get("properties", {}).get("title", "Unknown")
@@ -8,6 +8,9 @@ Endpoints:
 - GET /metrics/quality - Quality and fill rate metrics
 - GET /metrics/drift/alerts - Drift detection alerts
 - GET /metrics/summary - Dashboard summary
+- GET /metrics/latency - Per-stage extraction latency percentiles and histograms
+- GET /metrics/geocode-cache - Geocode/distance cache hit ratio
+- GET /metrics/config-caches - Profile/constants/field-mapping cache hit ratio
 """
 
 import json
@@ -496,3 +499,126 @@ async def get_metrics_summary(
             for row in trend
         ],
     }
+
+
+# =============================================================================
+# STAGE LATENCY
+# =============================================================================
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+LATENCY_BUCKETS_MS = [10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Linearly interpolated percentile (q in 0-100) of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def _latency_summary(values: list[float]) -> dict:
+    """p50/p95/p99, max and cumulative bucket counts for a list of durations."""
+    values = sorted(values)
+    buckets = {}
+    index = 0
+    for bound in LATENCY_BUCKETS_MS:
+        while index < len(values) and values[index] <= bound:
+            index += 1
+        buckets[str(bound)] = index
+    buckets["+Inf"] = len(values)
+    return {
+        "count": len(values),
+        "p50": round(_percentile(values, 50), 2),
+        "p95": round(_percentile(values, 95), 2),
+        "p99": round(_percentile(values, 99), 2),
+        "max": round(values[-1], 2) if values else 0.0,
+        "buckets": buckets,
+    }
+
+
+@router.get("/latency")
+async def get_latency_metrics(
+    days: int = Query(7, ge=1, le=90),
+    auction_code: Optional[str] = None,
+):
+    """
+    Get extraction latency by stage and auction type.
+
+    Stages come from metrics_json.stage_timings_ms (text_extraction, ocr,
+    spatial_parse, block_extraction, classification, pattern_extraction,
+    db_write); "total" is processing_time_ms. Buckets are cumulative counts
+    of runs at or under each bound in milliseconds.
+    """
+    start_date, end_date = _get_date_range(days)
+
+    with get_connection() as conn:
+        sql = """
+            SELECT
+                COALESCE(at.code, 'UNKNOWN') as auction,
+                r.processing_time_ms,
+                json_extract(r.metrics_json, '$.stage_timings_ms') as stage_timings
+            FROM extraction_runs r
+            LEFT JOIN auction_types at ON r.auction_type_id = at.id
+            WHERE DATE(r.created_at) >= ? AND DATE(r.created_at) <= ?
+        """
+        params = [start_date, end_date]
+
+        if auction_code:
+            sql += " AND at.code = ?"
+            params.append(auction_code)
+
+        rows = conn.execute(sql, params).fetchall()
+
+    # auction -> stage -> durations
+    durations: dict[str, dict[str, list[float]]] = {}
+    for row in rows:
+        stages = durations.setdefault(row["auction"], {})
+        if row["processing_time_ms"] is not None:
+            stages.setdefault("total", []).append(float(row["processing_time_ms"]))
+        for stage, ms in _parse_metrics_json(row["stage_timings"]).items():
+            stages.setdefault(stage, []).append(float(ms))
+
+    return {
+        "days": days,
+        "start_date": start_date,
+        "end_date": end_date,
+        "bucket_bounds_ms": LATENCY_BUCKETS_MS,
+        "by_auction": {
+            auction: {stage: _latency_summary(values) for stage, values in sorted(stages.items())}
+            for auction, stages in sorted(durations.items())
+        },
+    }
+
+
+# =============================================================================
+# GEOCODE CACHE
+# =============================================================================
+
+
+@router.get("/geocode-cache")
+async def get_geocode_cache_metrics():
+    """
+    Get geocode/distance cache statistics for this process.
+
+    Returns the combined hit ratio plus memory/db hits, misses and pending
+    writes per cache database.
+    """
+    from services.warehouse import geocode_cache_stats
+
+    return geocode_cache_stats()
+
+
+@router.get("/config-caches")
+async def get_config_cache_metrics():
+    """
+    Get configuration cache statistics for this process.
+
+    Returns hits, misses, invalidations and hit ratio for the auction profile,
+    warehouse constants and field mapping caches.
+    """
+    from api.cache_versions import cache_stats
+
+    return cache_stats()
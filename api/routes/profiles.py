@@ -0,0 +1,35 @@
+"""
+Request Profile Routes
+
+Download collapsed-stack profiles recorded by ProfilingMiddleware
+(see core/profiling.py; disabled unless PROFILING_ENABLED is set).
+
+Endpoints:
+- GET /api/profiles - Recent profiles, newest first
+- GET /api/profiles/{profile_id} - Collapsed stacks for one request
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from core import profiling
+
+router = APIRouter(prefix="/api/profiles", tags=["Profiling"])
+
+
+@router.get("")
+async def list_profiles(limit: int = Query(50, ge=1, le=500)):
+    """List stored request profiles with their path, status, samples and duration."""
+    return {"enabled": profiling.settings.enabled, "profiles": profiling.list_profiles(limit)}
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def download_profile(profile_id: str):
+    """Download a profile in collapsed-stack format (flamegraph.pl, speedscope, inferno)."""
+    content = profiling.load_profile(profile_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(
+        content,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.collapsed"'},
+    )
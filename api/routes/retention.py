@@ -0,0 +1,81 @@
+"""
+Retention API Routes
+
+Data retention status, manual archive runs and archived-data queries
+(see api/retention.py).
+
+Endpoints:
+- GET /api/retention/status - Policies, database/archive size, recent runs
+- POST /api/retention/run - Archive cold rows and compact now
+- GET /api/retention/archive - Archive partitions per table and day
+- GET /api/retention/archive/{table} - Query archived rows
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from api import retention
+
+router = APIRouter(prefix="/api/retention", tags=["Retention"])
+
+
+@router.get("/status")
+async def retention_status():
+    """Retention policies, database and archive size, and the last runs."""
+    return await asyncio.to_thread(retention.status)
+
+
+@router.post("/run")
+async def run_retention(
+    dry_run: bool = Query(False, description="Only count cold rows"),
+    full_vacuum: bool = Query(
+        False, description="Allow a one-off full VACUUM that enables incremental vacuum"
+    ),
+    table: Optional[list[str]] = Query(None, description="Limit to these tables"),
+):
+    """Archive cold rows to the archive files, delete them and compact the database."""
+    unknown = [t for t in table or [] if t not in retention.POLICIES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown tables: {', '.join(unknown)}")
+    return await asyncio.to_thread(
+        retention.run_retention, dry_run=dry_run, full_vacuum=full_vacuum, tables=table
+    )
+
+
+@router.get("/archive")
+async def list_archive(table: Optional[str] = Query(None, description="Filter by table")):
+    """Archive partitions (one gzipped JSON Lines file per table and day)."""
+    return {"partitions": retention.list_partitions(table)}
+
+
+@router.get("/archive/{table}")
+async def query_archive(
+    request: Request,
+    table: str,
+    start: Optional[str] = Query(None, description="First day, YYYY-MM-DD"),
+    end: Optional[str] = Query(None, description="Last day, YYYY-MM-DD"),
+    contains: Optional[str] = Query(None, description="Text that must appear in the row"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Query archived rows of one table.
+
+    Any other query parameter filters on that column, e.g.
+    /api/retention/archive/logs?run_id=run_20260101_000000_abcd1234
+    """
+    if table not in retention.POLICIES:
+        raise HTTPException(status_code=404, detail=f"No archive for table {table}")
+    reserved = {"start", "end", "contains", "limit"}
+    filters = {k: v for k, v in request.query_params.items() if k not in reserved}
+    rows = await asyncio.to_thread(
+        retention.query_archive,
+        table,
+        start=start,
+        end=end,
+        contains=contains,
+        filters=filters,
+        limit=limit,
+    )
+    return {"table": table, "rows": rows, "count": len(rows)}
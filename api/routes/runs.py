@@ -57,6 +57,7 @@ class LogEntry(BaseModel):
     level: str
     message: str
     details: Optional[dict[str, Any]] = None
+    highlight: Optional[str] = None
 
 
 class StatsResponse(BaseModel):
@@ -219,6 +220,9 @@ async def search_logs(
 ):
     """
     Search logs across all runs.
+
+    Matches every word of the query (as a prefix) via the full-text index,
+    ranked best first, with matched words wrapped in <mark> in "highlight".
     """
     logs = RunLogs.search_logs(
         query=query,
@@ -236,6 +240,7 @@ async def search_logs(
                 level=log["level"],
                 message=log["message"],
                 details=log.get("details"),
+                highlight=log.get("highlight"),
             )
             for log in logs
         ],
@@ -252,8 +257,10 @@ async def delete_run(run_id: str):
     if not run:
         raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
 
-    from api.database import get_connection
+    from api.database import get_connection, run_log_buffer
 
+    # Write buffered entries first so none land after the delete
+    run_log_buffer.flush()
     with get_connection() as conn:
         # Delete logs first (foreign key)
         conn.execute("DELETE FROM logs WHERE run_id = ?", (run_id,))
@@ -16,6 +16,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field, field_validator
 
+from api.cache_versions import WAREHOUSE_CONSTANTS, bump_version
 from api.database import get_connection
 
 router = APIRouter(prefix="/api/warehouses", tags=["Warehouses"])
@@ -229,6 +230,7 @@ async def create_warehouse(data: WarehouseCreate):
             ),
         )
         conn.commit()
+        bump_version(WAREHOUSE_CONSTANTS)
 
         warehouse_id = cursor.lastrowid
 
@@ -337,6 +339,7 @@ async def update_warehouse(id: int, data: WarehouseUpdate):
     with get_connection() as conn:
         result = conn.execute(f"UPDATE warehouses SET {set_clause} WHERE id = ?", values)
         conn.commit()
+        bump_version(WAREHOUSE_CONSTANTS)
 
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Warehouse not found")
@@ -360,6 +363,7 @@ async def delete_warehouse(
                 (datetime.utcnow().isoformat(), id),
             )
         conn.commit()
+        bump_version(WAREHOUSE_CONSTANTS)
 
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Warehouse not found")
@@ -23,6 +23,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
+from api.cache_versions import WAREHOUSE_CONSTANTS, VersionedCache, bump_version
 from api.database import get_connection
 
 
@@ -164,7 +165,9 @@ class WarehouseConstantsRepository:
                 (wc.warehouse_id, wc.warehouse_code, json.dumps(wc.to_dict()), wc.is_active),
             )
             conn.commit()
-            return cursor.lastrowid
+            row_id = cursor.lastrowid
+        bump_version(WAREHOUSE_CONSTANTS)
+        return row_id
 
     @staticmethod
     def get_by_id(id: int) -> Optional[WarehouseConstants]:
@@ -246,7 +249,8 @@ class WarehouseConstantsRepository:
                 (json.dumps(wc.to_dict()), wc.is_active, wc.updated_at, wc.id),
             )
             conn.commit()
-            return True
+        bump_version(WAREHOUSE_CONSTANTS)
+        return True
 
     @staticmethod
     def set_constant(
@@ -315,16 +319,11 @@ class WarehouseConstantsService:
     """Service for applying warehouse constants to field values."""
 
     def __init__(self):
-        self._cache: dict[str, WarehouseConstants] = {}
+        self._cache = VersionedCache(WAREHOUSE_CONSTANTS)
 
     def get_constants(self, warehouse_code: str) -> Optional[WarehouseConstants]:
-        """Get warehouse constants (cached)."""
-        code = warehouse_code.upper()
-        if code not in self._cache:
-            wc = WarehouseConstantsRepository.get_by_code(code)
-            if wc:
-                self._cache[code] = wc
-        return self._cache.get(code)
+        """Get warehouse constants (cached until any constants are edited)."""
+        return self._cache.get(warehouse_code.upper(), WarehouseConstantsRepository.get_by_code)
 
     def apply_constants(self, warehouse_code: str, fields: dict[str, Any]) -> dict[str, Any]:
         """Apply warehouse constants to field values."""
@@ -9,6 +9,8 @@ Features:
 - Rule-based filtering
 - Activity logging
 - Configurable polling interval
+- Staged pipeline: batched fetch -> parse/hash -> extract pool -> persist/move
+- IMAP IDLE push mode (mode="idle") with reconnect backoff and poll fallback
 """
 
 import asyncio
@@ -16,14 +18,22 @@ import email
 import imaplib
 import json
 import re
+import threading
+import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from email.header import decode_header
 from pathlib import Path
 from typing import Any, Optional
 
 from api.database import get_connection
+from api.workers.pipeline import Stage, StagedPipeline, StageStats
+from ingest.imap_idle import IdleLoop
+
+
+class PollInProgressError(RuntimeError):
+    """Raised when a poll is requested while another one owns the connection."""
 
 
 @dataclass
@@ -52,6 +62,39 @@ class ProcessingResult:
     error: Optional[str]
 
 
+@dataclass
+class _MessageWork:
+    """A message moving through the worker pipeline."""
+
+    uid: str
+    raw: Optional[bytes]
+    rules: list[dict]
+    message_id: str = ""
+    subject: str = ""
+    sender: str = ""
+    rule_name: Optional[str] = None
+    auction_type_id: Optional[int] = None
+    attachments: list[tuple[Path, int, str]] = field(default_factory=list)
+    results: list[ProcessingResult] = field(default_factory=list)
+    activity_error: Optional[str] = None
+    move: bool = False
+    error: Optional[str] = None
+
+    def skip(self, reason: str, result_error: Optional[str] = None):
+        """Record a skipped result."""
+        self.activity_error = reason
+        self.results.append(
+            ProcessingResult(
+                message_id=self.message_id,
+                status="skipped",
+                rule_matched=self.rule_name,
+                document_id=None,
+                run_id=None,
+                error=result_error or reason,
+            )
+        )
+
+
 class EmailWorker:
     """
     Email polling worker.
@@ -70,6 +113,22 @@ class EmailWorker:
         self.upload_path = Path(self.config.get("upload_path", "uploads/email"))
         self.upload_path.mkdir(parents=True, exist_ok=True)
 
+        # Pipeline tuning
+        self.fetch_batch_size = self.config.get("fetch_batch_size", 25)
+        self.extract_workers = self.config.get("extract_workers", 4)
+        self.queue_size = self.config.get("queue_size", 10)
+
+        # Pipeline state
+        self.stage_stats: dict[str, StageStats] = {}
+        self.backlog = 0  # Unseen messages left for the next poll
+        self._pending_expunge = False
+        self._idle_loop: Optional[IdleLoop] = None
+        # One poll at a time owns self.imap; manual polls don't wait for it
+        self._poll_lock = threading.Lock()
+        # Serialises duplicate check + create per attachment hash across extract workers
+        self._hash_locks: dict[str, threading.Lock] = {}
+        self._hash_locks_guard = threading.Lock()
+
     def _load_config(self) -> dict[str, Any]:
         """Load email config from settings."""
         from api.routes.settings import load_settings
@@ -112,13 +171,13 @@ class EmailWorker:
                     )
                     return False
 
-                self.imap = imaplib.IMAP4_SSL(server, port)
+                self.imap = self._open_imap(server, port, config)
                 # OAuth2 authentication
                 auth_string = f"user={email_addr}\x01auth=Bearer {access_token}\x01\x01"
                 self.imap.authenticate("XOAUTH2", lambda x: auth_string)
             else:
                 # Standard password auth
-                self.imap = imaplib.IMAP4_SSL(server, port)
+                self.imap = self._open_imap(server, port, config)
                 self.imap.login(email_addr, password)
 
             return True
@@ -127,6 +186,13 @@ class EmailWorker:
             self._log_activity("SYSTEM", "connect", "failed", error=str(e))
             return False
 
+    @staticmethod
+    def _open_imap(server: str, port: int, config: dict[str, Any]) -> imaplib.IMAP4:
+        """Open an IMAP connection (SSL unless use_ssl is false, e.g. a local stand-in)."""
+        if config.get("use_ssl", True):
+            return imaplib.IMAP4_SSL(server, port)
+        return imaplib.IMAP4(server, port)
+
     def _disconnect(self):
         """Disconnect from IMAP server."""
         if self.imap:
@@ -226,8 +292,13 @@ class EmailWorker:
 
         return None
 
-    def _save_attachment(self, msg: EmailMessage, filename: str) -> Optional[Path]:
-        """Save PDF attachment to disk."""
+    def _save_attachment(self, msg: EmailMessage, filename: str) -> Optional[tuple[Path, int, str]]:
+        """
+        Stream PDF attachment to disk, hashing while writing.
+        Returns (file_path, file_size, sha256) or None.
+        """
+        from ingest.email_reader import spool_part
+
         for part in msg.raw_message.walk():
             content_type = part.get_content_type()
             part_filename = part.get_filename()
@@ -244,10 +315,9 @@ class EmailWorker:
                 file_path = self.upload_path / unique_filename
 
                 try:
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        file_path.write_bytes(payload)
-                        return file_path
+                    file_size, sha256 = spool_part(part, str(file_path))
+                    if file_size:
+                        return file_path, file_size, sha256
                 except Exception:
                     pass
 
@@ -279,51 +349,90 @@ class EmailWorker:
             other = conn.execute("SELECT id FROM auction_types WHERE code = 'OTHER'").fetchone()
             return other["id"] if other else 1
 
+    def _classify_attachment(self, file_path: Path) -> tuple[int, Optional[int]]:
+        """
+        Detect auction type reading as few pages as possible.
+
+        Uses the progressive classifier (usually page 1 only); falls back to
+        the configured auction type patterns on the sampled text.
+        Returns (auction_type_id, pages_used).
+        """
+        from api.models import AuctionTypeRepository
+        from extractors import ExtractorManager
+
+        try:
+            classification = ExtractorManager().classify_progressive(str(file_path))
+        except Exception:
+            return 1, None  # Default
+
+        if classification.extractor is not None:
+            detected_type = AuctionTypeRepository.get_by_code(classification.source.value.upper())
+            if detected_type:
+                return detected_type.id, classification.pages_used
+
+        return self._detect_auction_type(classification.text), classification.pages_used
+
     def _process_pdf(
-        self, file_path: Path, auction_type_id: int
+        self,
+        file_path: Path,
+        auction_type_id: Optional[int],
+        file_size: Optional[int] = None,
+        sha256: Optional[str] = None,
     ) -> tuple[Optional[int], Optional[int]]:
         """
         Process PDF file: create document and run extraction.
+
+        file_size/sha256 are taken from the spooling step when available so
+        the file is not read back into memory. Duplicates are detected
+        before any PDF parsing; the auction type is auto-detected if not given.
         Returns (document_id, run_id).
         """
-        import hashlib
-
         import pdfplumber
 
         from api.models import DocumentRepository, ExtractionRunRepository
         from api.routes.extractions import run_extraction
+        from ingest.email_reader import hash_file
+
+        if sha256 is None:
+            sha256 = hash_file(str(file_path))
+        if file_size is None:
+            file_size = file_path.stat().st_size
+
+        # The same PDF can arrive in several messages of one batch; hold the
+        # hash lock until the document exists so only one worker creates it
+        with self._hash_lock(sha256):
+            # Check for duplicate
+            existing = DocumentRepository.get_by_sha256(sha256)
+            if existing:
+                return existing.id, None  # Already processed
+
+            # Auto-detect auction type if not specified
+            classification_pages_used = None
+            if not auction_type_id:
+                auction_type_id, classification_pages_used = self._classify_attachment(file_path)
+
+            # Extract text
+            raw_text = ""
+            try:
+                with pdfplumber.open(file_path) as pdf:
+                    for page in pdf.pages:
+                        text = page.extract_text()
+                        if text:
+                            raw_text += text + "\n"
+            except Exception:
+                pass
 
-        # Calculate hash
-        file_bytes = file_path.read_bytes()
-        sha256 = hashlib.sha256(file_bytes).hexdigest()
-
-        # Check for duplicate
-        existing = DocumentRepository.get_by_sha256(sha256)
-        if existing:
-            return existing.id, None  # Already processed
-
-        # Extract text
-        raw_text = ""
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        raw_text += text + "\n"
-        except Exception:
-            pass
-
-        # Create document with source=email
-        doc_id = DocumentRepository.create(
-            auction_type_id=auction_type_id,
-            dataset_split="train",
-            filename=file_path.name,
-            file_path=str(file_path),
-            file_size=len(file_bytes),
-            sha256=sha256,
-            raw_text=raw_text,
-            uploaded_by="email_worker",
-        )
+            # Create document with source=email
+            doc_id = DocumentRepository.create(
+                auction_type_id=auction_type_id,
+                dataset_split="train",
+                filename=file_path.name,
+                file_path=str(file_path),
+                file_size=file_size,
+                sha256=sha256,
+                raw_text=raw_text,
+                uploaded_by="email_worker",
+            )
 
         # Check if scanned (low text content)
         if len(raw_text.strip()) < 100:
@@ -347,10 +456,20 @@ class EmailWorker:
             extractor_kind="rule",
         )
 
-        run_extraction(run_id, doc_id, auction_type_id)
+        run_extraction(
+            run_id,
+            doc_id,
+            auction_type_id,
+            classification_pages_used=classification_pages_used,
+        )
 
         return doc_id, run_id
 
+    def _hash_lock(self, sha256: str) -> threading.Lock:
+        """Lock for one attachment hash, shared by the extract workers of a poll."""
+        with self._hash_locks_guard:
+            return self._hash_locks.setdefault(sha256, threading.Lock())
+
     def _log_activity(
         self,
         message_id: str,
@@ -401,8 +520,8 @@ class EmailWorker:
             )
             conn.commit()
 
-    def _move_to_processed(self, uid: str):
-        """Move email to processed folder."""
+    def _move_to_processed(self, uid: str, expunge: bool = True):
+        """Move email (by UID) to processed folder."""
         try:
             # Create folder if not exists
             self.imap.create(self.processed_folder)
@@ -411,199 +530,324 @@ class EmailWorker:
 
         try:
             # Copy and delete
-            self.imap.copy(uid, self.processed_folder)
-            self.imap.store(uid, "+FLAGS", "\\Deleted")
-            self.imap.expunge()
+            self.imap.uid("COPY", uid, self.processed_folder)
+            self.imap.uid("STORE", uid, "+FLAGS", "\\Deleted")
+            if expunge:
+                self.imap.expunge()
         except Exception:
             pass
 
+    def _search_unseen(self) -> list[str]:
+        """Return UIDs of unseen messages in the selected folder."""
+        status, messages = self.imap.uid("SEARCH", None, "UNSEEN")
+        if status != "OK" or not messages or not messages[0]:
+            return []
+        return [u.decode() if isinstance(u, bytes) else u for u in messages[0].split()]
+
+    def _fetch_batch(self, uids: list[str]) -> list[tuple[str, bytes]]:
+        """
+        Fetch several messages with a single UID FETCH.
+        Returns [(uid, raw_rfc822_bytes), ...].
+        """
+        status, data = self.imap.uid("FETCH", ",".join(uids), "(RFC822)")
+        if status != "OK" or not data:
+            return []
+
+        fetched = []
+        for entry in data:
+            # Message entries are (b'<seq> (UID <uid> RFC822 {<size>}', raw); others are b')'
+            if not isinstance(entry, tuple) or len(entry) < 2:
+                continue
+            header = entry[0].decode(errors="replace") if isinstance(entry[0], bytes) else entry[0]
+            uid_match = re.search(r"UID (\d+)", header)
+            if uid_match:
+                fetched.append((uid_match.group(1), entry[1]))
+        return fetched
+
+    # -------------------------------------------------------------------------
+    # Pipeline stages: fetch -> parse/hash -> classify/extract -> persist/move
+    # -------------------------------------------------------------------------
+
+    def _stage_parse(self, item: "_MessageWork") -> "_MessageWork":
+        """Parse message, match rules and spool PDF attachments to disk."""
+        msg = self._parse_message(item.uid, item.raw)
+        item.raw = None  # Parsed; drop the raw bytes
+        item.message_id = msg.message_id
+        item.subject = msg.subject
+        item.sender = msg.sender
+
+        rule = self._match_rule(msg, item.rules)
+        if not rule:
+            # No rule matched - skip
+            item.skip("No matching rule")
+            return item
+
+        item.rule_name = rule.get("name")
+        action = rule.get("action", "process")
+
+        if action == "ignore":
+            item.skip("Rule action: ignore")
+            item.move = True
+            return item
+
+        if action == "process" and msg.has_pdf:
+            item.auction_type_id = rule.get("auction_type_id")
+            for pdf_filename in msg.pdf_filenames:
+                saved = self._save_attachment(msg, pdf_filename)
+                if saved:
+                    item.attachments.append(saved)
+            item.move = True
+        else:
+            # No PDF or unsupported action
+            item.skip(
+                "No PDF attachment" if not msg.has_pdf else f"Unsupported action: {action}",
+                result_error="No PDF attachment",
+            )
+        return item
+
+    def _stage_extract(self, item: "_MessageWork") -> "_MessageWork":
+        """Create documents and run extraction for spooled attachments."""
+        for file_path, file_size, sha256 in item.attachments:
+            doc_id, run_id = self._process_pdf(
+                file_path,
+                item.auction_type_id,
+                file_size=file_size,
+                sha256=sha256,
+            )
+            item.results.append(
+                ProcessingResult(
+                    message_id=item.message_id,
+                    status="processed",
+                    rule_matched=item.rule_name,
+                    document_id=doc_id,
+                    run_id=run_id,
+                    error=None,
+                )
+            )
+        return item
+
+    def _persist(self, item: "_MessageWork") -> list[ProcessingResult]:
+        """Log activity and move the message. Runs on the IMAP-owning thread."""
+        if item.error:
+            self._log_activity(item.message_id or item.uid, "", "failed", error=item.error)
+            return [
+                ProcessingResult(
+                    message_id=item.message_id or item.uid,
+                    status="failed",
+                    rule_matched=None,
+                    document_id=None,
+                    run_id=None,
+                    error=item.error,
+                )
+            ]
+
+        for result in item.results:
+            self._log_activity(
+                item.message_id,
+                item.subject,
+                result.status,
+                sender=item.sender,
+                rule_matched=item.rule_name,
+                run_id=result.run_id,
+                error=item.activity_error if result.status == "skipped" else None,
+            )
+
+        if item.move:
+            self._move_to_processed(item.uid, expunge=False)
+            self._pending_expunge = True
+
+        return item.results
+
+    def _build_pipeline(self) -> StagedPipeline:
+        return StagedPipeline(
+            [
+                Stage("parse", self._stage_parse, workers=1, queue_size=self.queue_size),
+                Stage(
+                    "extract",
+                    self._stage_extract,
+                    workers=self.extract_workers,
+                    queue_size=self.queue_size,
+                ),
+            ],
+            stats=self.stage_stats,
+        ).start()
+
     def poll_once(self) -> list[ProcessingResult]:
         """
-        Poll inbox once and process emails.
+        Connect, process unseen emails once, and disconnect.
+        Blocking - run it off the event loop.
         Returns list of processing results.
-        """
-        results = []
 
-        if not self._connect():
-            return results
+        Raises:
+            PollInProgressError: Another poll or IDLE mode owns the connection
+        """
+        if self._idle_loop is not None and not self._idle_loop.stopped:
+            raise PollInProgressError("Email worker is in IDLE mode")
+        if not self._poll_lock.acquire(blocking=False):
+            raise PollInProgressError("Email worker is already polling")
 
         try:
-            rules = self._load_rules()
+            # Left over from an earlier poll; only a successful poll sets it again
+            self.backlog = 0
+            if not self._connect():
+                return []
 
-            # Select inbox
-            self.imap.select("INBOX")
+            try:
+                # Select inbox
+                self.imap.select("INBOX")
+                return self._process_unseen()
+            except Exception:
+                self.backlog = 0
+                raise
+            finally:
+                self._disconnect()
+        finally:
+            self._poll_lock.release()
 
-            # Search for unread emails
-            status, messages = self.imap.search(None, "UNSEEN")
-            if status != "OK":
-                return results
+    def _process_unseen(self) -> list[ProcessingResult]:
+        """
+        Process unseen emails on the current (selected) connection.
 
-            uids = messages[0].split()[: self.max_emails_per_poll]
+        Messages are fetched in batches of fetch_batch_size with a single
+        UID FETCH, parsed and extracted on worker threads, and persisted/moved
+        here as they complete.
+        """
+        results = []
+        self._pending_expunge = False
+        self._hash_locks.clear()
+        fetch_stats = self.stage_stats.setdefault("fetch", StageStats(name="fetch"))
+        persist_stats = self.stage_stats.setdefault("persist", StageStats(name="persist"))
 
-            for uid in uids:
-                uid_str = uid.decode() if isinstance(uid, bytes) else uid
+        def _drain(items: list) -> None:
+            for item in items:
+                started = time.perf_counter()
+                results.extend(self._persist(item))
+                persist_stats.record(time.perf_counter() - started, not item.error)
 
-                try:
-                    # Fetch email
-                    status, data = self.imap.fetch(uid, "(RFC822)")
-                    if status != "OK":
-                        continue
-
-                    raw_email = data[0][1]
-                    msg = self._parse_message(uid_str, raw_email)
-
-                    # Match rules
-                    rule = self._match_rule(msg, rules)
-
-                    if not rule:
-                        # No rule matched - skip
-                        self._log_activity(
-                            msg.message_id,
-                            msg.subject,
-                            "skipped",
-                            sender=msg.sender,
-                            error="No matching rule",
-                        )
-                        results.append(
-                            ProcessingResult(
-                                message_id=msg.message_id,
-                                status="skipped",
-                                rule_matched=None,
-                                document_id=None,
-                                run_id=None,
-                                error="No matching rule",
-                            )
-                        )
-                        continue
-
-                    action = rule.get("action", "process")
-
-                    if action == "ignore":
-                        self._log_activity(
-                            msg.message_id,
-                            msg.subject,
-                            "skipped",
-                            sender=msg.sender,
-                            rule_matched=rule.get("name"),
-                            error="Rule action: ignore",
-                        )
-                        results.append(
-                            ProcessingResult(
-                                message_id=msg.message_id,
-                                status="skipped",
-                                rule_matched=rule.get("name"),
-                                document_id=None,
-                                run_id=None,
-                                error="Rule action: ignore",
-                            )
-                        )
-                        self._move_to_processed(uid)
-                        continue
-
-                    if action == "process" and msg.has_pdf:
-                        # Process PDF attachments
-                        auction_type_id = rule.get("auction_type_id")
-
-                        for pdf_filename in msg.pdf_filenames:
-                            file_path = self._save_attachment(msg, pdf_filename)
-
-                            if file_path:
-                                # Auto-detect auction type if not specified
-                                if not auction_type_id:
-                                    try:
-                                        with open(file_path, "rb") as f:
-                                            import pdfplumber
-
-                                            with pdfplumber.open(f) as pdf:
-                                                text = ""
-                                                for page in pdf.pages[:3]:
-                                                    t = page.extract_text()
-                                                    if t:
-                                                        text += t
-                                        auction_type_id = self._detect_auction_type(text)
-                                    except Exception:
-                                        auction_type_id = 1  # Default
-
-                                doc_id, run_id = self._process_pdf(file_path, auction_type_id)
-
-                                self._log_activity(
-                                    msg.message_id,
-                                    msg.subject,
-                                    "processed",
-                                    sender=msg.sender,
-                                    rule_matched=rule.get("name"),
-                                    run_id=run_id,
-                                )
-                                results.append(
-                                    ProcessingResult(
-                                        message_id=msg.message_id,
-                                        status="processed",
-                                        rule_matched=rule.get("name"),
-                                        document_id=doc_id,
-                                        run_id=run_id,
-                                        error=None,
-                                    )
-                                )
-
-                        self._move_to_processed(uid)
-                    else:
-                        # No PDF or unsupported action
-                        self._log_activity(
-                            msg.message_id,
-                            msg.subject,
-                            "skipped",
-                            sender=msg.sender,
-                            rule_matched=rule.get("name"),
-                            error=(
-                                "No PDF attachment"
-                                if not msg.has_pdf
-                                else f"Unsupported action: {action}"
-                            ),
-                        )
-                        results.append(
-                            ProcessingResult(
-                                message_id=msg.message_id,
-                                status="skipped",
-                                rule_matched=rule.get("name"),
-                                document_id=None,
-                                run_id=None,
-                                error="No PDF attachment",
-                            )
-                        )
+        rules = self._load_rules()
 
-                except Exception as e:
-                    self._log_activity(uid_str, "", "failed", error=str(e))
-                    results.append(
-                        ProcessingResult(
-                            message_id=uid_str,
-                            status="failed",
-                            rule_matched=None,
-                            document_id=None,
-                            run_id=None,
-                            error=str(e),
-                        )
-                    )
+        # Search for unread emails
+        unseen = self._search_unseen()
+        uids = unseen[: self.max_emails_per_poll]
+        self.backlog = len(unseen) - len(uids)
 
+        pipeline = self._build_pipeline()
+        try:
+            for i in range(0, len(uids), self.fetch_batch_size):
+                batch = uids[i : i + self.fetch_batch_size]
+                started = time.perf_counter()
+                try:
+                    fetched = self._fetch_batch(batch)
+                except Exception as e:
+                    self._log_activity("SYSTEM", "fetch", "failed", error=str(e))
+                    fetched = []
+                fetch_stats.record(time.perf_counter() - started, bool(fetched))
+
+                for uid, raw in fetched:
+                    pipeline.submit(_MessageWork(uid=uid, raw=raw, rules=rules))
+                    # Persist whatever finished meanwhile
+                    _drain(pipeline.completed())
         finally:
-            self._disconnect()
+            _drain(pipeline.close())
+
+        if self._pending_expunge:
+            try:
+                self.imap.expunge()
+            except Exception:
+                pass
 
         return results
 
+    def _connect_selected(self) -> Optional[imaplib.IMAP4]:
+        """Connect and select INBOX; used by IDLE mode."""
+        if not self._connect():
+            return None
+        self.imap.select("INBOX")
+        return self.imap
+
+    def run_idle(self):
+        """
+        Run in IMAP IDLE push mode on one persistent connection.
+
+        Reacts to new-mail notifications within seconds, reconnects with
+        backoff, and polls on the same connection if the server lacks IDLE.
+        Blocking - run it off the event loop.
+        """
+
+        def on_new_mail() -> bool:
+            with self._poll_lock:
+                self._process_unseen()
+            return self.backlog > 0
+
+        self._idle_loop = IdleLoop(
+            connect=self._connect_selected,
+            disconnect=self._disconnect,
+            on_new_mail=on_new_mail,
+            poll_interval=self.poll_interval,
+            idle_timeout=self.config.get("idle_timeout", 25 * 60),
+        )
+        self._idle_loop.run()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Per-stage throughput and queue depth."""
+        order = ["fetch", "parse", "extract", "persist"]
+        stats = {
+            "running": self.running,
+            "mode": self._resolve_mode(),
+            "backlog": self.backlog,
+            "stages": [self.stage_stats[n].to_dict() for n in order if n in self.stage_stats],
+        }
+        if self._idle_loop:
+            stats["idle"] = {
+                "state": self._idle_loop.mode,
+                "notifications": self._idle_loop.notifications,
+                "reconnects": self._idle_loop.reconnects,
+                "last_error": self._idle_loop.last_error,
+            }
+        return stats
+
+    def _resolve_mode(self) -> str:
+        """Worker mode: "idle" (push) or "poll"; from worker config, then email settings."""
+        mode = self.config.get("mode")
+        if not mode:
+            try:
+                mode = self._load_config().get("mode")
+            except Exception:
+                mode = None
+        return mode if mode in ("idle", "poll") else "poll"
+
     async def run(self):
-        """Run worker loop."""
+        """Run worker loop. Polling runs on a thread so the event loop stays free."""
         self.running = True
 
+        if self._resolve_mode() == "idle":
+            await asyncio.to_thread(self.run_idle)
+            return
+
         while self.running:
+            succeeded = False
             try:
-                self.poll_once()
+                await asyncio.to_thread(self.poll_once)
+                succeeded = True
+            except PollInProgressError:
+                pass  # A manual poll is running; it reports its own results
             except Exception as e:
+                self.backlog = 0
                 self._log_activity("SYSTEM", "poll_error", "failed", error=str(e))
 
+            # More unseen mail than one poll takes - keep draining
+            if succeeded and self.backlog > 0:
+                continue
+
             await asyncio.sleep(self.poll_interval)
 
     def stop(self):
         """Stop worker loop."""
         self.running = False
+        if self._idle_loop and not self._idle_loop.stopped:
+            # The IDLE thread owns the connection and disconnects itself
+            self._idle_loop.stop()
+            return
         self._disconnect()
 
 
@@ -620,6 +864,11 @@ def get_worker() -> EmailWorker:
     return _worker_instance
 
 
+def peek_worker() -> Optional[EmailWorker]:
+    """Worker instance if one has been created (never creates it)."""
+    return _worker_instance
+
+
 async def start_worker():
     """Start the email worker in background."""
     global _worker_task
@@ -0,0 +1,196 @@
+"""
+Staged Pipeline
+
+Minimal thread-based pipeline: items flow through a chain of stages, each
+with its own worker threads and a bounded input queue. Producers block when
+the first queue is full (backpressure); finished items are collected on the
+caller's thread so the caller can do work that must stay single-threaded
+(e.g. IMAP commands on one connection).
+
+Used by the email worker:
+    fetch (caller) -> parse/hash -> classify/extract -> persist/move (caller)
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentinel marking the end of input for a stage's workers
+_STOP = object()
+
+
+@dataclass
+class StageStats:
+    """Cumulative counters for one pipeline stage."""
+
+    name: str
+    workers: int = 1
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    queue_capacity: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, duration: float, ok: bool) -> None:
+        with self._lock:
+            self.processed += 1
+            if not ok:
+                self.failed += 1
+            self.busy_seconds += duration
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for API responses."""
+        avg_ms = (self.busy_seconds / self.processed * 1000) if self.processed else 0.0
+        # Items/sec the stage sustains with all its workers busy
+        throughput = (
+            (self.processed / self.busy_seconds * self.workers) if self.busy_seconds else 0.0
+        )
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "avg_ms": round(avg_ms, 1),
+            "throughput_per_sec": round(throughput, 2),
+            "queue_depth": self.queue_depth,
+            "queue_capacity": self.queue_capacity,
+        }
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline stage.
+
+    fn receives an item and returns it (possibly mutated). If fn raises, the
+    exception is stored on the item's ``error`` attribute and later stages
+    are skipped for that item, which is still delivered to the caller.
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 10
+
+
+class StagedPipeline:
+    """
+    Run items through stages on background threads.
+
+    Usage:
+        pipeline = StagedPipeline([Stage("parse", parse), Stage("extract", extract, workers=4)])
+        pipeline.start()
+        for item in items:
+            pipeline.submit(item)           # blocks if the first queue is full
+            for done in pipeline.completed():
+                handle(done)
+        for done in pipeline.close():       # waits for in-flight items
+            handle(done)
+    """
+
+    def __init__(self, stages: list[Stage], stats: Optional[dict[str, StageStats]] = None):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+
+        self.stages = stages
+        # Stats may be shared across pipeline instances to accumulate totals
+        self.stats = stats if stats is not None else {}
+        for stage in stages:
+            stage_stats = self.stats.setdefault(stage.name, StageStats(name=stage.name))
+            stage_stats.workers = stage.workers
+            stage_stats.queue_capacity = stage.queue_size
+
+        self._queues = [queue.Queue(maxsize=s.queue_size) for s in stages]
+        # Output is unbounded: the caller drains it between submissions
+        self._output: queue.Queue = queue.Queue()
+        self._threads: list[list[threading.Thread]] = []
+        self._started = False
+
+    def start(self) -> "StagedPipeline":
+        """Spawn worker threads for every stage."""
+        for idx, stage in enumerate(self.stages):
+            threads = []
+            for n in range(stage.workers):
+                t = threading.Thread(
+                    target=self._worker,
+                    args=(idx,),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                )
+                t.start()
+                threads.append(t)
+            self._threads.append(threads)
+        self._started = True
+        return self
+
+    def submit(self, item: Any) -> None:
+        """Queue an item for the first stage, blocking while it is full."""
+        if not self._started:
+            raise RuntimeError("Pipeline not started")
+        self._queues[0].put(item)
+        self._update_depth(0)
+
+    def completed(self) -> list[Any]:
+        """Return items that have finished all stages so far (non-blocking)."""
+        done = []
+        while True:
+            try:
+                done.append(self._output.get_nowait())
+            except queue.Empty:
+                return done
+
+    def close(self) -> list[Any]:
+        """Signal end of input, wait for all stages to finish, return remaining items."""
+        for idx, threads in enumerate(self._threads):
+            for _ in threads:
+                self._queues[idx].put(_STOP)
+            for t in threads:
+                t.join()
+            self._update_depth(idx)
+        return self.completed()
+
+    def _update_depth(self, idx: int) -> None:
+        self.stats[self.stages[idx].name].queue_depth = self._queues[idx].qsize()
+
+    def _forward(self, idx: int, item: Any) -> None:
+        if idx + 1 < len(self.stages):
+            self._queues[idx + 1].put(item)
+            self._update_depth(idx + 1)
+        else:
+            self._output.put(item)
+
+    def _worker(self, idx: int) -> None:
+        stage = self.stages[idx]
+        stage_stats = self.stats[stage.name]
+        q = self._queues[idx]
+
+        while True:
+            item = q.get()
+            self._update_depth(idx)
+            if item is _STOP:
+                return
+
+            if getattr(item, "error", None):
+                # Failed upstream - pass straight through
+                self._forward(idx, item)
+                continue
+
+            started = time.perf_counter()
+            ok = True
+            try:
+                item = stage.fn(item)
+            except Exception as e:
+                ok = False
+                logger.warning(f"Pipeline stage {stage.name} failed: {e}")
+                try:
+                    item.error = str(e)
+                except AttributeError:
+                    pass
+            stage_stats.record(time.perf_counter() - started, ok)
+            self._forward(idx, item)
@@ -0,0 +1,619 @@
+"""
+Offline Load Test
+
+Drives the Central Dispatch and Google Sheets export paths and the email
+worker against local stand-in servers (benchmarks/stubs.py) at a fixed
+arrival rate. Nothing leaves the machine; runs use a scratch database.
+
+Scenarios:
+    batch   - BatchJobProcessor posting extraction runs to the CD stub
+              (send_to_cd_with_retry: ETag, 429/5xx backoff, partnerReferenceId)
+    sheets  - CDSheetExporterV2 polling READY rows from the Sheets stub and
+              posting them through CentralDispatchClient
+    email   - EmailWorker polling the IMAP stub and extracting the attachments
+
+Work arrives at --qps for --duration seconds. Latency is measured from each
+item's scheduled arrival, so queueing behind slow calls is included.
+
+Reported per scenario: throughput, latency p50/p95/p99/max and, per upstream,
+requests received, 429/503/dropped responses and retry amplification
+(requests received / requests served).
+
+Usage:
+    python -m benchmarks.load_test --scenario batch --qps 5 --duration 30
+    python -m benchmarks.load_test --cd-rate-limit 3 --error-rate 0.05 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from pathlib import Path
+from typing import Any, Optional
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.run_benchmarks import discover_documents, scratch_database  # noqa: E402
+from benchmarks.stubs import (  # noqa: E402
+    CDStubServer,
+    FaultConfig,
+    IMAPStubServer,
+    SheetsStubServer,
+)
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ("batch", "sheets", "email")
+
+SHEET_NAME = "Pickups"
+
+
+@dataclass
+class LoadOptions:
+    """Offered load and injected faults for a load test run."""
+
+    qps: float = 2.0  # Arrivals per second (batch jobs, sheet rows or emails)
+    duration: float = 10.0  # Seconds of arrivals
+    batch_size: int = 1  # Runs per batch job
+    poll_interval: float = 1.0  # Sheets/email poll period in seconds
+    drain_timeout: float = 60.0  # Seconds to wait for stragglers after the last arrival
+    latency_ms: float = 20.0  # Stub latency per request
+    jitter_ms: float = 20.0  # Extra uniform stub latency
+    error_rate: float = 0.0  # Fraction of CD/Sheets requests answered with 503
+    drop_rate: float = 0.0  # Fraction of CD/Sheets responses dropped after processing
+    cd_rate_limit: float = 0.0  # CD requests per second before 429 (0 = unlimited)
+    retry_after: Optional[float] = None  # Retry-After sent with CD 429s
+    sheets_quota: int = 0  # Sheets requests per quota window (0 = unlimited)
+    quota_window: float = 60.0
+    imap_latency_ms: float = 5.0
+    seed: int = 42
+
+    @property
+    def arrivals(self) -> int:
+        return max(1, round(self.qps * self.duration))
+
+    def faults(self) -> FaultConfig:
+        return FaultConfig(
+            latency_ms=self.latency_ms,
+            jitter_ms=self.jitter_ms,
+            error_rate=self.error_rate,
+            drop_rate=self.drop_rate,
+            seed=self.seed,
+        )
+
+
+@dataclass
+class ItemOutcome:
+    """Result of one unit of work (a run, sheet row or email)."""
+
+    latency_ms: float
+    ok: bool
+    error: Optional[str] = None
+
+
+@contextmanager
+def _environ(**values: str):
+    """Set environment variables for the duration of the block."""
+    previous = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _upstream_summary(stats: dict[str, Any], items: int, exclude: tuple = ()) -> dict[str, Any]:
+    """Add per-item request counts and retry amplification to stub stats."""
+    requests = stats["requests"] - sum(stats.get("by_route", {}).get(r, 0) for r in exclude)
+    served = requests - stats.get("rejected", 0)
+    return {
+        **stats,
+        "requests_per_item": round(requests / items, 3) if items else 0.0,
+        "retry_amplification": round(requests / served, 3) if served else 0.0,
+    }
+
+
+def _scenario_report(
+    scenario: str,
+    items: int,
+    outcomes: list[ItemOutcome],
+    elapsed: float,
+    upstream: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    from api.routes.metrics import _percentile
+
+    missing = items - len(outcomes)
+    outcomes = outcomes + [
+        ItemOutcome(0.0, False, "Not completed within drain timeout") for _ in range(missing)
+    ]
+    succeeded = [o for o in outcomes if o.ok]
+    latencies = sorted(o.latency_ms for o in succeeded)
+    errors = Counter((o.error or "Unknown error")[:200] for o in outcomes if not o.ok)
+    return {
+        "scenario": scenario,
+        "items": items,
+        "succeeded": len(succeeded),
+        "failed": items - len(succeeded),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_sec": round(len(succeeded) / elapsed, 3) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 1),
+            "p95": round(_percentile(latencies, 95), 1),
+            "p99": round(_percentile(latencies, 99), 1),
+            "max": round(latencies[-1], 1) if latencies else 0.0,
+        },
+        "upstream": upstream,
+        "errors": dict(errors.most_common(10)),
+    }
+
+
+# =============================================================================
+# BATCH: BatchJobProcessor -> CD stub
+# =============================================================================
+
+
+def _seed_runs(count: int, seed: int) -> list[int]:
+    """Create documents and extracted runs carrying synthetic ground-truth fields."""
+    from api.models import AuctionTypeRepository, DocumentRepository, ExtractionRunRepository
+    from tests.fixtures.generate_test_pdfs import CorpusOptions, build_document_spec
+
+    options = CorpusOptions(seed=seed, bundle_ratio=0.0)
+    fallback = AuctionTypeRepository.list_all()[0]
+    run_ids = []
+    for index in range(count):
+        spec = build_document_spec(index, options)
+        auction = AuctionTypeRepository.get_by_code(spec["auction_type"]) or fallback
+        doc_id = DocumentRepository.create(
+            auction_type_id=auction.id,
+            dataset_split="train",
+            filename=spec["source_file"],
+            sha256=f"load-test-{seed}-{index}",
+            uploaded_by="load_test",
+        )
+        run_id = ExtractionRunRepository.create(document_id=doc_id, auction_type_id=auction.id)
+        ExtractionRunRepository.update(run_id, status="needs_review", outputs_json=spec["fields"])
+        run_ids.append(run_id)
+    return run_ids
+
+
+async def _drive_batch(run_ids: list[int], options: LoadOptions) -> tuple[list, float]:
+    import api.routes.exports as exports
+    from api.batch_jobs import BatchJobProcessor, create_batch_job
+
+    # The shared CD semaphore binds to the loop that first waits on it
+    exports._cd_semaphore = None
+    processor = BatchJobProcessor()
+    outcomes: list[ItemOutcome] = []
+
+    async def process(job_id: int, size: int, scheduled: float):
+        try:
+            result = await processor.process_job(job_id, sandbox=True, post_only_ready=False)
+        except Exception as e:
+            outcomes.extend(ItemOutcome(0.0, False, str(e)) for _ in range(size))
+            return
+        latency_ms = (time.perf_counter() - scheduled) * 1000
+        for item in result["results"]:
+            ok = item["status"] == "success"
+            outcomes.append(ItemOutcome(latency_ms, ok, None if ok else item.get("error_message")))
+
+    started = time.perf_counter()
+    tasks = []
+    for i in range(options.arrivals):
+        scheduled = started + i / options.qps
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        chunk = run_ids[i * options.batch_size : (i + 1) * options.batch_size]
+        job_id = create_batch_job(chunk, {"sandbox": True, "post_only_ready": False}, "load_test")
+        tasks.append(asyncio.create_task(process(job_id, len(chunk), scheduled)))
+
+    _, pending = await asyncio.wait(tasks, timeout=options.drain_timeout)
+    for task in pending:
+        task.cancel()
+    return outcomes, time.perf_counter() - started
+
+
+def run_batch_scenario(options: LoadOptions) -> dict[str, Any]:
+    """Post seeded extraction runs through BatchJobProcessor to the CD stub."""
+    items = options.arrivals * options.batch_size
+    with (
+        scratch_database(),
+        CDStubServer(options.faults(), options.cd_rate_limit, options.retry_after) as cd,
+        _environ(CD_API_BASE_URL=cd.url),
+    ):
+        run_ids = _seed_runs(items, options.seed)
+        outcomes, elapsed = asyncio.run(_drive_batch(run_ids, options))
+        upstream = {"cd": _upstream_summary(cd.stats(), items, exclude=("token",))}
+    return _scenario_report("batch", items, outcomes, elapsed, upstream)
+
+
+# =============================================================================
+# SHEETS: CDSheetExporterV2 -> Sheets stub + CD stub
+# =============================================================================
+
+
+def _sheet_row(index: int, seed: int, headers: list[str]) -> list[str]:
+    """A READY sheet row that passes validate_row_for_ready."""
+    from tests.fixtures.generate_test_pdfs import CorpusOptions, build_document_spec
+
+    fields = build_document_spec(index, CorpusOptions(seed=seed, bundle_ratio=0.0))["fields"]
+    today = date.today()
+    values = {
+        "dispatch_id": f"DC-LOAD-{seed}-{index:06d}",
+        "row_status": "READY",
+        "trailer_type": "OPEN",
+        "available_date": today.isoformat(),
+        "expiration_date": (today + timedelta(days=7)).isoformat(),
+        "price_total": "450.00",
+        "marketplace_id": "10000",
+        "pickup_location_name": fields["pickup_name"],
+        "pickup_address": fields["pickup_address"],
+        "pickup_city": fields["pickup_city"],
+        "pickup_state": fields["pickup_state"],
+        "pickup_postal_code": fields["pickup_zip"],
+        "pickup_country": "US",
+        "dropoff_address": "100 Warehouse Way",
+        "dropoff_city": "Dallas",
+        "dropoff_state": "TX",
+        "dropoff_postal_code": "75201",
+        "dropoff_country": "US",
+        "vehicle_vin": fields["vehicle_vin"],
+        "vehicle_year": fields["vehicle_year"],
+        "vehicle_make": fields["vehicle_make"],
+        "vehicle_model": fields["vehicle_model"],
+        "vehicle_lot_number": fields["vehicle_lot"],
+    }
+    return [values.get(header, "") for header in headers]
+
+
+def _feed(count: int, qps: float, started: float, deliver) -> threading.Thread:
+    """Call deliver(index, scheduled) at qps on a background thread."""
+
+    def run():
+        for index in range(count):
+            scheduled = started + index / qps
+            time.sleep(max(0.0, scheduled - time.perf_counter()))
+            deliver(index, scheduled)
+
+    thread = threading.Thread(target=run, name="load-feeder", daemon=True)
+    thread.start()
+    return thread
+
+
+def _poll_until_done(poll, feeder: threading.Thread, outcomes: list, items: int, options):
+    """Call poll() every poll_interval until every item finished or the drain timeout."""
+    deadline = None
+    while len(outcomes) < items:
+        if deadline is None and not feeder.is_alive():
+            deadline = time.perf_counter() + options.drain_timeout
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        polled = time.perf_counter()
+        poll()
+        time.sleep(max(0.0, options.poll_interval - (time.perf_counter() - polled)))
+
+
+def run_sheets_scenario(options: LoadOptions) -> dict[str, Any]:
+    """Export READY rows appended to the Sheets stub at qps through CDSheetExporterV2."""
+    from core.config import CentralDispatchConfig, SheetsConfig
+    from schemas.sheets_schema_v3 import get_column_names
+    from services.cd_sheet_exporter_v2 import CDSheetExporterV2
+    from services.idempotency import IdempotencyStore
+
+    items = options.arrivals
+    headers = get_column_names()
+    arrivals: dict[str, float] = {}
+    outcomes: list[ItemOutcome] = []
+    poll_errors = Counter()
+    reposted = 0
+
+    with (
+        CDStubServer(options.faults(), options.cd_rate_limit, options.retry_after) as cd,
+        SheetsStubServer(options.faults(), options.sheets_quota, options.quota_window) as sheets,
+        tempfile.TemporaryDirectory() as state_path,
+    ):
+        sheets.load_rows(SHEET_NAME, [headers])
+        exporter = CDSheetExporterV2(
+            SheetsConfig(
+                enabled=True,
+                spreadsheet_id="load-test",
+                sheet_name=SHEET_NAME,
+                credentials_file="",
+                api_endpoint=sheets.url,
+            ),
+            CentralDispatchConfig(
+                enabled=True,
+                client_id="load-test",
+                client_secret="load-test",
+                api_base_url=cd.url,
+                token_url=cd.token_url,
+            ),
+            sheet_name=SHEET_NAME,
+            idempotency_store=IdempotencyStore(db_path=os.path.join(state_path, "idempotency.db")),
+        )
+        # Each poll looks for rows added since the previous one
+        exporter.sheets_exporter.check_interval = 0.0
+
+        def deliver(index: int, scheduled: float):
+            row = _sheet_row(index, options.seed, headers)
+            arrivals[row[0]] = scheduled
+            sheets.append_rows(SHEET_NAME, [row])
+
+        def poll():
+            nonlocal reposted
+            try:
+                results = exporter.export_ready_rows()
+            except Exception as e:
+                poll_errors[str(e)[:200]] += 1
+                return
+            if results.get("sheet_update_error"):
+                poll_errors[results["sheet_update_error"][:200]] += 1
+            now = time.perf_counter()
+            for row in results["results"]:
+                scheduled = arrivals.pop(row["dispatch_id"], None)
+                if scheduled is None:
+                    # Status update was lost; a duplicate only retries the write,
+                    # anything else means the row was exported again
+                    if not row.get("duplicate"):
+                        reposted += 1
+                    continue
+                outcomes.append(ItemOutcome((now - scheduled) * 1000, row["success"], row["error"]))
+
+        started = time.perf_counter()
+        feeder = _feed(items, options.qps, started, deliver)
+        _poll_until_done(poll, feeder, outcomes, items, options)
+        elapsed = time.perf_counter() - started
+        upstream = {
+            "cd": _upstream_summary(cd.stats(), items, exclude=("token",)),
+            "sheets": _upstream_summary(sheets.stats(), items),
+        }
+
+    report = _scenario_report("sheets", items, outcomes, elapsed, upstream)
+    report["poll_errors"] = dict(poll_errors.most_common(10))
+    report["reposted"] = reposted
+    return report
+
+
+# =============================================================================
+# EMAIL: EmailWorker -> IMAP stub
+# =============================================================================
+
+
+def _load_test_worker(imap: IMAPStubServer, upload_path: str):
+    """EmailWorker reading the IMAP stand-in with a catch-all PDF rule."""
+    from api.workers.email_worker import EmailWorker
+
+    class LoadTestEmailWorker(EmailWorker):
+        def _load_config(self) -> dict[str, Any]:
+            return {
+                "imap_server": imap.host,
+                "imap_port": imap.port,
+                "use_ssl": False,
+                "email_address": "load-test@example.com",
+                "password": "load-test",
+            }
+
+        def _load_rules(self) -> list[dict[str, Any]]:
+            return [
+                {
+                    "name": "load-test",
+                    "condition_type": "attachment_type",
+                    "condition_value": "pdf",
+                    "action": "process",
+                }
+            ]
+
+    return LoadTestEmailWorker({"upload_path": upload_path, "max_emails_per_poll": 1000})
+
+
+def _email(index: int, pdf: bytes) -> tuple[str, bytes]:
+    """A message with a PDF attachment made unique so duplicate detection stays out of the way."""
+    message_id = f"<load-{index}@load-test>"
+    msg = MIMEMultipart()
+    msg["Subject"] = f"Load test invoice {index}"
+    msg["From"] = "auction@example.com"
+    msg["Message-ID"] = message_id
+    part = MIMEApplication(pdf + f"\n%load-test {index}\n".encode(), _subtype="pdf")
+    part.add_header("Content-Disposition", "attachment", filename=f"invoice_{index}.pdf")
+    msg.attach(part)
+    return message_id, msg.as_bytes()
+
+
+def run_email_scenario(options: LoadOptions) -> dict[str, Any]:
+    """Deliver emails with a fixture PDF to the IMAP stub at qps and poll with EmailWorker."""
+    documents = discover_documents(["fixtures", "samples"])
+    if not documents:
+        raise RuntimeError("No PDFs found in tests/fixtures or tests/sample_docs")
+    pdf = documents[0].path.read_bytes()
+
+    items = options.arrivals
+    arrivals: dict[str, float] = {}
+    outcomes: list[ItemOutcome] = []
+
+    with (
+        scratch_database(),
+        IMAPStubServer(options.imap_latency_ms) as imap,
+        tempfile.TemporaryDirectory() as upload_path,
+    ):
+        worker = _load_test_worker(imap, upload_path)
+
+        def deliver(index: int, scheduled: float):
+            message_id, raw = _email(index, pdf)
+            arrivals[message_id] = scheduled
+            imap.deliver(raw)
+
+        def poll():
+            results = worker.poll_once()
+            now = time.perf_counter()
+            for result in results:
+                scheduled = arrivals.pop(result.message_id, None)
+                if scheduled is not None:
+                    ok = result.status == "processed"
+                    outcomes.append(ItemOutcome((now - scheduled) * 1000, ok, result.error))
+
+        started = time.perf_counter()
+        feeder = _feed(items, options.qps, started, deliver)
+        _poll_until_done(poll, feeder, outcomes, items, options)
+        elapsed = time.perf_counter() - started
+        upstream = {"imap": _upstream_summary(imap.stats(), items)}
+
+    report = _scenario_report("email", items, outcomes, elapsed, upstream)
+    report["stages"] = worker.get_stats()
+    return report
+
+
+SCENARIO_RUNNERS = {
+    "batch": run_batch_scenario,
+    "sheets": run_sheets_scenario,
+    "email": run_email_scenario,
+}
+
+
+def run_load_test(scenarios: list[str], options: LoadOptions) -> dict[str, Any]:
+    """
+    Run the given scenarios one after another.
+
+    Args:
+        scenarios: Names from SCENARIOS
+        options: Offered load and injected faults
+
+    Returns:
+        Report dict with config and one entry per scenario
+    """
+    results = []
+    for scenario in scenarios:
+        logger.info(f"Running {scenario} scenario at {options.qps} qps for {options.duration}s")
+        results.append(SCENARIO_RUNNERS[scenario](options))
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "config": {"scenarios": scenarios, **asdict(options)},
+        "scenarios": results,
+    }
+
+
+def print_report(report: dict[str, Any]):
+    """Print a summary table to stdout."""
+    config = report["config"]
+    print("\n" + "=" * 72)
+    print("OFFLINE LOAD TEST")
+    print("=" * 72)
+    print(
+        f"Offered load: {config['qps']} qps for {config['duration']}s  "
+        f"(stub latency {config['latency_ms']}+{config['jitter_ms']} ms, "
+        f"errors {config['error_rate']:.0%}, drops {config['drop_rate']:.0%})"
+    )
+    for result in report["scenarios"]:
+        latency = result["latency_ms"]
+        print("-" * 72)
+        print(
+            f"{result['scenario']:<8} {result['succeeded']}/{result['items']} ok  "
+            f"{result['throughput_per_sec']} items/sec  "
+            f"p50 {latency['p50']} ms  p95 {latency['p95']} ms  "
+            f"p99 {latency['p99']} ms  max {latency['max']} ms"
+        )
+        for name, upstream in result["upstream"].items():
+            print(
+                f"  {name:<7} {upstream['requests']} requests  "
+                f"{upstream['requests_per_item']} per item  "
+                f"rejected {upstream.get('rejected', 0)}  "
+                f"amplification x{upstream['retry_amplification']}"
+            )
+        for error, count in result["errors"].items():
+            print(f"  ERROR x{count}: {error}")
+    print("=" * 72)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test exports and the email worker offline")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="Scenario to run (repeatable, default: all)",
+    )
+    defaults = LoadOptions()
+    parser.add_argument("--qps", type=float, default=defaults.qps, help="Arrivals per second")
+    parser.add_argument(
+        "--duration", type=float, default=defaults.duration, help="Seconds of arrivals"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=defaults.batch_size, help="Runs per batch job"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=defaults.poll_interval,
+        help="Seconds between Sheets/email polls",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=defaults.drain_timeout,
+        help="Seconds to wait for outstanding work after the last arrival",
+    )
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of stub responses that are 503"
+    )
+    parser.add_argument(
+        "--drop-rate", type=float, default=0.0, help="Fraction of stub responses dropped"
+    )
+    parser.add_argument(
+        "--cd-rate-limit", type=float, default=0.0, help="CD requests/sec before 429 (0 = off)"
+    )
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds on CD 429s")
+    parser.add_argument(
+        "--sheets-quota", type=int, default=0, help="Sheets requests per window (0 = off)"
+    )
+    parser.add_argument("--quota-window", type=float, default=defaults.quota_window)
+    parser.add_argument("--imap-latency-ms", type=float, default=defaults.imap_latency_ms)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--output", "-o", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    # Rate-limit warnings from the clients would drown the report
+    logging.basicConfig(level=logging.ERROR)
+
+    options = LoadOptions(
+        qps=args.qps,
+        duration=args.duration,
+        batch_size=args.batch_size,
+        poll_interval=args.poll_interval,
+        drain_timeout=args.drain_timeout,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        cd_rate_limit=args.cd_rate_limit,
+        retry_after=args.retry_after,
+        sheets_quota=args.sheets_quota,
+        quota_window=args.quota_window,
+        imap_latency_ms=args.imap_latency_ms,
+        seed=args.seed,
+    )
+    report = run_load_test(args.scenario or list(SCENARIOS), options)
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
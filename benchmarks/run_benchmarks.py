@@ -0,0 +1,491 @@
+"""
+Extraction Pipeline Benchmarks
+
+Times the offline extraction pipeline per document and stage, without a
+running server, Central Dispatch or Google Sheets.
+
+Stages (names match stage_timings_ms on extraction runs where they overlap):
+    text_extraction, classification, spatial_parse, block_extraction,
+    address_parsing, field_resolution, payload_build
+
+Corpora:
+    golden    - tests/sample_docs PDFs that have a tests/golden_set expectation
+    samples   - every PDF in tests/sample_docs
+    fixtures  - generated PDFs in tests/fixtures
+
+Usage:
+    python -m benchmarks.run_benchmarks --output benchmark_report.json
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json --max-regression 20
+
+Exit code is 1 when --baseline is given and any metric regressed by more
+than --max-regression percent.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_DOCS_DIR = PROJECT_ROOT / "tests" / "sample_docs"
+GOLDEN_EXPECTED_DIR = PROJECT_ROOT / "tests" / "golden_set" / "expected"
+FIXTURES_DIR = PROJECT_ROOT / "tests" / "fixtures"
+
+CORPORA = ("golden", "samples", "fixtures")
+
+STAGES = (
+    "text_extraction",
+    "classification",
+    "spatial_parse",
+    "block_extraction",
+    "address_parsing",
+    "field_resolution",
+    "payload_build",
+)
+
+# Stages faster than this (baseline p95, ms) are too noisy to gate on
+DEFAULT_MIN_MS = 1.0
+
+
+@dataclass
+class BenchmarkDocument:
+    """A PDF in the benchmark corpus."""
+
+    path: Path
+    corpus: str
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+@dataclass
+class DocumentTiming:
+    """Timings for one pass over one document."""
+
+    name: str
+    corpus: str
+    auction_code: Optional[str] = None
+    pages: int = 0
+    total_ms: float = 0.0
+    stages_ms: dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def discover_documents(corpora: list[str]) -> list[BenchmarkDocument]:
+    """
+    Collect benchmark PDFs for the requested corpora.
+
+    A PDF is listed once, under the first requested corpus that contains it.
+
+    Args:
+        corpora: Corpus names from CORPORA or directories of PDFs (such as a
+            corpus written by tests/fixtures/generate_test_pdfs.py --corpus)
+
+    Returns:
+        Documents in a stable order
+    """
+    documents: list[BenchmarkDocument] = []
+    seen: set[Path] = set()
+
+    for corpus in corpora:
+        if corpus == "golden":
+            paths = [
+                SAMPLE_DOCS_DIR / (expected.name[: -len("_expected.json")] + ".pdf")
+                for expected in sorted(GOLDEN_EXPECTED_DIR.glob("*_expected.json"))
+            ]
+        elif corpus == "samples":
+            paths = sorted(SAMPLE_DOCS_DIR.glob("*.pdf"))
+        elif corpus == "fixtures":
+            paths = sorted(FIXTURES_DIR.glob("*.pdf"))
+        elif Path(corpus).is_dir():
+            paths = sorted(Path(corpus).glob("*.pdf"))
+        else:
+            raise ValueError(f"Unknown corpus: {corpus}")
+
+        for path in paths:
+            resolved = path.resolve()
+            if not path.exists() or resolved in seen:
+                continue
+            seen.add(resolved)
+            documents.append(BenchmarkDocument(path=path, corpus=corpus))
+
+    return documents
+
+
+@contextmanager
+def scratch_database():
+    """
+    Point the control panel database at a scratch file with the full schema.
+
+    Field resolution reads auction profiles and warehouse constants, so the
+    tables must exist; nothing is written to data/control_panel.db. The
+    original DB_PATH is restored on exit.
+    """
+    import api.database
+
+    original = api.database.DB_PATH
+    with tempfile.TemporaryDirectory() as db_dir:
+        api.database.DB_PATH = Path(db_dir) / "benchmark.db"
+        try:
+            _init_schema()
+            yield api.database.DB_PATH
+        finally:
+            api.database.DB_PATH = original
+
+
+def _init_schema():
+    from api.auction_profiles import init_auction_profiles_schema
+    from api.database import init_db
+    from api.models import init_schema, seed_base_auction_types
+    from api.warehouse_constants import init_warehouse_constants_schema
+
+    init_db()
+    init_schema()
+    seed_base_auction_types()
+    init_auction_profiles_schema()
+    init_warehouse_constants_schema()
+
+
+class PipelineBenchmark:
+    """
+    Runs the extraction stages on PDFs and records per-stage timings.
+
+    Stages are timed with core.timing spans, the same mechanism used by
+    extraction runs, so FieldResolver.resolve_all reports field_resolution
+    on its own.
+    """
+
+    def __init__(self):
+        from extractors import ExtractorManager
+        from extractors.block_extractor import get_block_extractor
+        from extractors.field_resolver import get_field_resolver
+
+        self.manager = ExtractorManager()
+        self.block_extractor = get_block_extractor()
+        self.resolver = get_field_resolver()
+
+    def run_document(self, document: BenchmarkDocument) -> DocumentTiming:
+        """
+        Run every stage on one document.
+
+        Args:
+            document: Document to process
+
+        Returns:
+            DocumentTiming (with error set if a stage raised)
+        """
+        import pdfplumber
+
+        from api.listing_fields import build_cd_payload
+        from core.timing import StageTimer, span
+        from extractors.address_parser import extract_pickup_address
+        from extractors.field_resolver import ResolutionContext
+        from extractors.spatial_parser import SpatialParser
+
+        timing = DocumentTiming(name=document.name, corpus=document.corpus)
+        start = time.perf_counter()
+
+        with StageTimer() as timer:
+            try:
+                with span("text_extraction"), pdfplumber.open(document.path) as pdf:
+                    timing.pages = len(pdf.pages)
+                    raw_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+
+                with span("classification"):
+                    extractor = self.manager.get_extractor_for_text(raw_text)
+                if extractor is not None:
+                    timing.auction_code = extractor.source.value
+
+                # The shared parser caches structures by path; production sees
+                # each upload once, so parse cold every iteration
+                with span("spatial_parse"):
+                    structure = SpatialParser().parse(str(document.path))
+
+                with span("block_extraction"):
+                    results = self.block_extractor.extract_all_fields(structure, use_fallback=True)
+                extracted = {
+                    key: result.value
+                    for key, result in results.items()
+                    if result.success and result.value
+                }
+
+                with span("address_parsing"):
+                    extract_pickup_address(raw_text, source=timing.auction_code)
+
+                context = ResolutionContext(
+                    auction_code=timing.auction_code,
+                    default_values={
+                        "trailer_type": "OPEN",
+                        "dropoff_country": "US",
+                        "pickup_country": "US",
+                    },
+                )
+                resolved = self.resolver.resolve_all(extracted, context)
+                values = {
+                    key: item.value for key, item in resolved.items() if item.value is not None
+                }
+
+                with span("payload_build"):
+                    build_cd_payload(values)
+            except Exception as e:
+                timing.error = f"{type(e).__name__}: {e}"
+
+        timing.total_ms = (time.perf_counter() - start) * 1000
+        timing.stages_ms = timer.to_dict()
+        return timing
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _stage_summary(values: list[float]) -> dict[str, float]:
+    from api.routes.metrics import _percentile
+
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50": round(_percentile(values, 50), 3),
+        "p95": round(_percentile(values, 95), 3),
+    }
+
+
+def run_benchmarks(
+    corpora: list[str],
+    iterations: int = 3,
+    warmup: bool = True,
+) -> dict[str, Any]:
+    """
+    Benchmark the pipeline over the given corpora.
+
+    Args:
+        corpora: Corpus names from CORPORA or directories of PDFs
+        iterations: Timed passes over the corpus
+        warmup: Run one untimed pass first (imports, regex compilation, caches)
+
+    Returns:
+        Report dict (see README.md for the layout)
+    """
+    documents = discover_documents(corpora)
+
+    with scratch_database():
+        bench = PipelineBenchmark()
+
+        if warmup:
+            for document in documents:
+                bench.run_document(document)
+
+        timings: list[DocumentTiming] = []
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for document in documents:
+                timings.append(bench.run_document(document))
+        elapsed = time.perf_counter() - start
+
+    # Stages completed before an error still count; the error is reported
+    ok = [t for t in timings if not t.error]
+    stage_values: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    for timing in timings:
+        for stage, ms in timing.stages_ms.items():
+            stage_values.setdefault(stage, []).append(ms)
+
+    document_summary = _stage_summary([t.total_ms for t in timings])
+
+    per_document: dict[str, DocumentTiming] = {}
+    for timing in timings:
+        per_document.setdefault(timing.name, timing)
+
+    return {
+        "run_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"corpora": list(corpora), "iterations": iterations, "warmup": warmup},
+        "summary": {
+            "documents": len(documents),
+            "runs": len(timings),
+            "errors": len(timings) - len(ok),
+            "total_seconds": round(elapsed, 3),
+            "docs_per_sec": round(len(timings) / elapsed, 3) if elapsed > 0 else 0.0,
+            "document_p50_ms": document_summary["p50"],
+            "document_p95_ms": document_summary["p95"],
+            "peak_rss_mb": peak_rss_mb(),
+        },
+        "stages": {stage: _stage_summary(values) for stage, values in stage_values.items()},
+        "documents": [
+            {
+                "name": t.name,
+                "corpus": t.corpus,
+                "auction_code": t.auction_code,
+                "pages": t.pages,
+                "total_ms": round(t.total_ms, 3),
+                "error": t.error,
+            }
+            for t in per_document.values()
+        ],
+        "errors": sorted({f"{t.name}: {t.error}" for t in timings if t.error}),
+    }
+
+
+def compare_to_baseline(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    max_regression_pct: float = 20.0,
+    min_ms: float = DEFAULT_MIN_MS,
+) -> list[str]:
+    """
+    Compare a report with a stored baseline.
+
+    Throughput regresses when it drops, latencies and peak RSS when they
+    grow, by more than max_regression_pct. Stages whose baseline p95 is
+    below min_ms are skipped as noise.
+
+    Args:
+        report: Report from run_benchmarks
+        baseline: Earlier report
+        max_regression_pct: Allowed slowdown in percent
+        min_ms: Noise floor for stage latencies
+
+    Returns:
+        Human-readable regression messages (empty if none)
+    """
+    regressions = []
+    limit = max_regression_pct / 100
+
+    def check(label: str, current, previous, higher_is_worse: bool = True):
+        if not current or not previous:
+            return
+        change = (current - previous) / previous
+        if not higher_is_worse:
+            change = -change
+        if change > limit:
+            regressions.append(
+                f"{label}: {previous} -> {current} ({change * 100:+.1f}% worse, "
+                f"limit {max_regression_pct:g}%)"
+            )
+
+    summary, base_summary = report["summary"], baseline.get("summary", {})
+    check(
+        "docs_per_sec",
+        summary.get("docs_per_sec"),
+        base_summary.get("docs_per_sec"),
+        higher_is_worse=False,
+    )
+    check("peak_rss_mb", summary.get("peak_rss_mb"), base_summary.get("peak_rss_mb"))
+
+    for stage, stats in report.get("stages", {}).items():
+        base_stats = baseline.get("stages", {}).get(stage)
+        if not base_stats or base_stats.get("p95", 0) < min_ms:
+            continue
+        for key in ("p50", "p95"):
+            check(f"{stage}.{key}_ms", stats.get(key), base_stats.get(key))
+
+    return regressions
+
+
+def print_report(report: dict[str, Any]):
+    """Print a summary table to stdout."""
+    summary = report["summary"]
+    print("\n" + "=" * 60)
+    print("EXTRACTION BENCHMARK")
+    print("=" * 60)
+    print(f"Corpora:      {', '.join(report['config']['corpora'])}")
+    print(f"Documents:    {summary['documents']} x {report['config']['iterations']} iterations")
+    print(f"Errors:       {summary['errors']}")
+    print(f"Throughput:   {summary['docs_per_sec']} docs/sec")
+    print(f"Document p50: {summary['document_p50_ms']} ms  p95: {summary['document_p95_ms']} ms")
+    print(f"Peak RSS:     {summary['peak_rss_mb']} MB")
+    print("-" * 60)
+    print(f"{'Stage':<20} {'p50 ms':>10} {'p95 ms':>10} {'mean ms':>10}")
+    for stage, stats in report["stages"].items():
+        print(f"{stage:<20} {stats['p50']:>10.2f} {stats['p95']:>10.2f} {stats['mean']:>10.2f}")
+    for error in report["errors"]:
+        print(f"ERROR {error}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the offline extraction pipeline")
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=CORPORA,
+        help="Corpus to include (repeatable, default: all unless --docs-dir is given)",
+    )
+    parser.add_argument(
+        "--docs-dir",
+        action="append",
+        default=[],
+        help="Directory of PDFs to include, e.g. a generated synthetic corpus (repeatable)",
+    )
+    parser.add_argument("--iterations", type=int, default=3, help="Timed passes over the corpus")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip the untimed first pass")
+    parser.add_argument("--output", "-o", help="Write the JSON report to this path")
+    parser.add_argument("--baseline", help="Baseline report to compare against")
+    parser.add_argument("--save-baseline", help="Write the report as a new baseline")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=20.0,
+        help="Allowed regression against the baseline in percent (default 20)",
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=DEFAULT_MIN_MS,
+        help="Ignore stages whose baseline p95 is below this many ms",
+    )
+    args = parser.parse_args()
+
+    # Extractors log per field at INFO; keep benchmark output readable
+    logging.basicConfig(level=logging.WARNING)
+
+    report = run_benchmarks(
+        corpora=(args.corpus or ([] if args.docs_dir else list(CORPORA))) + args.docs_dir,
+        iterations=args.iterations,
+        warmup=not args.no_warmup,
+    )
+    print_report(report)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(report, indent=2))
+            print(f"Report saved to: {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare_to_baseline(report, baseline, args.max_regression, args.min_ms)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.max_regression:g}% against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
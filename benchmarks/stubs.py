@@ -0,0 +1,662 @@
+"""
+Local stand-in servers for Central Dispatch, Google Sheets and IMAP.
+
+Used by the offline load test (benchmarks/load_test.py). Each server listens
+on 127.0.0.1 on a background thread, counts every request it receives and can
+inject latency, 503 errors, dropped responses and rate limiting.
+
+Point the application at them with:
+    CD_API_BASE_URL / CD_TOKEN_URL   -> CDStubServer.url, CDStubServer.token_url
+    SHEETS_API_ENDPOINT              -> SheetsStubServer.url
+    email settings (use_ssl=false)   -> IMAPStubServer.host / .port
+"""
+
+import json
+import math
+import random
+import re
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+@dataclass
+class FaultConfig:
+    """Faults injected into every request a stub server handles."""
+
+    latency_ms: float = 0.0  # Added to every request
+    jitter_ms: float = 0.0  # Uniform extra latency, 0..jitter_ms
+    error_rate: float = 0.0  # Fraction answered with 503
+    drop_rate: float = 0.0  # Fraction handled but closed without a response
+    seed: int = 0
+
+
+@dataclass
+class StubResponse:
+    """Response produced by a stub route."""
+
+    status: int
+    body: Any = None
+    headers: Optional[dict[str, str]] = None
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per `per` seconds, bursting to `burst`."""
+
+    def __init__(self, rate: float, per: float = 1.0, burst: Optional[float] = None):
+        self.fill_rate = rate / per
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """Take a token. Returns 0 on success, else seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.fill_rate
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802 - http.server method name
+        self.server.stub.dispatch(self)
+
+    def do_POST(self):  # noqa: N802 - http.server method name
+        self.server.stub.dispatch(self)
+
+    def do_PUT(self):  # noqa: N802 - http.server method name
+        self.server.stub.dispatch(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubHTTPServer:
+    """
+    Base class for the HTTP stand-ins.
+
+    Subclasses implement route() and handle(); faults, rate limiting and
+    request accounting are applied here.
+    """
+
+    def __init__(self, faults: Optional[FaultConfig] = None):
+        self.faults = faults or FaultConfig()
+        self.requests = Counter()  # (route, status) -> count
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubHTTPServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name=f"{type(self).__name__}",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # -------------------------------------------------------------------------
+    # Hooks
+    # -------------------------------------------------------------------------
+
+    def route(self, method: str, path: str) -> str:
+        """Stats label for a request (e.g. "create_listing")."""
+        raise NotImplementedError
+
+    def throttle(self, route: str) -> Optional[StubResponse]:
+        """Rate-limit response for this request, or None to serve it."""
+        return None
+
+    def handle(
+        self, method: str, route: str, path: str, query: dict, headers, body: Any
+    ) -> StubResponse:
+        raise NotImplementedError
+
+    # -------------------------------------------------------------------------
+    # Request handling
+    # -------------------------------------------------------------------------
+
+    def dispatch(self, handler: BaseHTTPRequestHandler) -> None:
+        """Apply faults, rate limits and the route handler to one request."""
+        parts = urlsplit(handler.path)
+        path = unquote(parts.path)
+        query = parse_qs(parts.query)
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+        body = None
+        if raw:
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                body = parse_qs(raw.decode(errors="replace"))
+
+        route = self.route(handler.command, path)
+        with self._lock:
+            delay = self.faults.latency_ms + self._rng.random() * self.faults.jitter_ms
+            fail = self._rng.random() < self.faults.error_rate
+            drop = self._rng.random() < self.faults.drop_rate
+        if delay:
+            time.sleep(delay / 1000)
+
+        if fail:
+            response = StubResponse(503, {"error": "Injected failure"})
+        else:
+            response = self.throttle(route) or self.handle(
+                handler.command, route, path, query, handler.headers, body
+            )
+
+        if drop:
+            # The request was processed but the client never sees a response
+            self._record(route, "dropped")
+            handler.close_connection = True
+            try:
+                handler.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+
+        self._record(route, response.status)
+        payload = b"" if response.body is None else json.dumps(response.body).encode()
+        handler.send_response(response.status)
+        for name, value in (response.headers or {}).items():
+            handler.send_header(name, value)
+        if payload:
+            handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        if payload:
+            handler.wfile.write(payload)
+
+    def _record(self, route: str, status) -> None:
+        with self._lock:
+            self.requests[(route, str(status))] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Request counts: total, by route, by status, and rejected (429/503/dropped)."""
+        with self._lock:
+            counts = dict(self.requests)
+        by_route, by_status = Counter(), Counter()
+        for (route, status), n in counts.items():
+            by_route[route] += n
+            by_status[status] += n
+        return {
+            "requests": sum(counts.values()),
+            "by_route": dict(by_route),
+            "by_status": dict(by_status),
+            "rejected": by_status["429"] + by_status["503"] + by_status["dropped"],
+        }
+
+
+class CDStubServer(StubHTTPServer):
+    """
+    Central Dispatch Listings API V2 stand-in.
+
+    POST /listings (201, Location + ETag), GET/PUT /listings/id/{id} with
+    If-Match (412 on a stale ETag), GET /listings?partnerReferenceId=,
+    POST /connect/token and GET /user/profile. With rate_limit set, requests
+    over the limit get 429 and a Retry-After header.
+    """
+
+    def __init__(
+        self,
+        faults: Optional[FaultConfig] = None,
+        rate_limit: float = 0.0,
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Args:
+            faults: Injected latency and failures
+            rate_limit: Requests per second before 429 (0 = unlimited)
+            retry_after: Retry-After seconds sent with 429 (default: time to next token)
+        """
+        super().__init__(faults)
+        self.bucket = TokenBucket(rate_limit) if rate_limit > 0 else None
+        self.retry_after = retry_after
+        self.listings: dict[str, dict[str, Any]] = {}
+
+    @property
+    def token_url(self) -> str:
+        return f"{self.url}/connect/token"
+
+    def route(self, method: str, path: str) -> str:
+        if path == "/connect/token":
+            return "token"
+        if path == "/listings":
+            return "create_listing" if method == "POST" else "find_listing"
+        if path.startswith("/listings/id/"):
+            return "update_listing" if method == "PUT" else "get_listing"
+        if path == "/user/profile":
+            return "profile"
+        return "unknown"
+
+    def throttle(self, route: str) -> Optional[StubResponse]:
+        if self.bucket is None or route == "token":
+            return None
+        wait = self.bucket.take()
+        if not wait:
+            return None
+        retry_after = self.retry_after if self.retry_after is not None else wait
+        return StubResponse(
+            429,
+            {"error": "Too Many Requests"},
+            {"Retry-After": f"{math.ceil(retry_after * 10) / 10:g}"},
+        )
+
+    def handle(self, method, route, path, query, headers, body) -> StubResponse:
+        if route == "token":
+            return StubResponse(
+                200, {"access_token": "stub-token", "token_type": "Bearer", "expires_in": 3600}
+            )
+        if route == "profile":
+            return StubResponse(200, {"username": "load-test"})
+        if route == "create_listing":
+            return self._create(body or {})
+        if route == "find_listing":
+            ref = (query.get("partnerReferenceId") or [""])[0]
+            with self._lock:
+                items = [
+                    {"id": listing_id}
+                    for listing_id, listing in self.listings.items()
+                    if ref and listing["payload"].get("partnerReferenceId") == ref
+                ]
+            return StubResponse(200, {"items": items})
+
+        listing_id = path.rstrip("/").split("/")[-1]
+        with self._lock:
+            listing = self.listings.get(listing_id)
+            if listing is None:
+                return StubResponse(404, {"error": f"Listing {listing_id} not found"})
+            if route == "get_listing":
+                return StubResponse(
+                    200, {"id": listing_id, **listing["payload"]}, {"ETag": listing["etag"]}
+                )
+            if route == "update_listing":
+                if headers.get("If-Match") != listing["etag"]:
+                    return StubResponse(412, {"error": "ETag mismatch"})
+                listing["payload"] = body or {}
+                listing["etag"] = _etag()
+                return StubResponse(204, None, {"ETag": listing["etag"]})
+        return StubResponse(405, {"error": "Method not allowed"})
+
+    def _create(self, payload: dict[str, Any]) -> StubResponse:
+        with self._lock:
+            listing_id = str(100000 + len(self.listings))
+            etag = _etag()
+            self.listings[listing_id] = {"payload": payload, "etag": etag}
+        return StubResponse(
+            201,
+            {"id": listing_id},
+            {"Location": f"/listings/id/{listing_id}", "ETag": etag},
+        )
+
+
+def _etag() -> str:
+    return f'"{uuid.uuid4().hex[:16]}"'
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index - 1
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+class SheetsStubServer(StubHTTPServer):
+    """
+    Google Sheets API v4 spreadsheets.values stand-in.
+
+    Implements values get/batchGet/update/batchUpdate/append over in-memory
+    grids (one per sheet name). With quota set, requests over the per-window
+    quota get 429 RESOURCE_EXHAUSTED, as the real API does per minute.
+    """
+
+    _VALUES = re.compile(r"^/v4/spreadsheets/([^/]+)/values(?::(\w+)|/(.+?))(?::(append))?$")
+
+    def __init__(
+        self,
+        faults: Optional[FaultConfig] = None,
+        quota: int = 0,
+        quota_window: float = 60.0,
+    ):
+        """
+        Args:
+            faults: Injected latency and failures
+            quota: Requests allowed per quota_window seconds (0 = unlimited)
+            quota_window: Quota window in seconds
+        """
+        super().__init__(faults)
+        self.bucket = TokenBucket(quota, per=quota_window) if quota > 0 else None
+        self.grids: dict[str, list[list[str]]] = {}
+
+    def load_rows(self, sheet: str, rows: list[list[Any]]) -> None:
+        """Replace a sheet's contents (not counted as API traffic)."""
+        with self._lock:
+            self.grids[sheet] = [[_cell(v) for v in row] for row in rows]
+
+    def append_rows(self, sheet: str, rows: list[list[Any]]) -> None:
+        """Append rows as an outside editor would (not counted as API traffic)."""
+        with self._lock:
+            self.grids.setdefault(sheet, []).extend([[_cell(v) for v in row] for row in rows])
+
+    def rows(self, sheet: str) -> list[list[str]]:
+        with self._lock:
+            return [list(row) for row in self.grids.get(sheet, [])]
+
+    def route(self, method: str, path: str) -> str:
+        match = self._VALUES.match(path)
+        if not match:
+            return "unknown"
+        _, batch_op, _, append = match.groups()
+        if append:
+            return "append"
+        if batch_op:
+            return batch_op
+        return "update" if method == "PUT" else "get"
+
+    def throttle(self, route: str) -> Optional[StubResponse]:
+        if self.bucket is None or not self.bucket.take():
+            return None
+        return StubResponse(
+            429,
+            {
+                "error": {
+                    "code": 429,
+                    "message": "Quota exceeded for quota metric 'Read requests'",
+                    "status": "RESOURCE_EXHAUSTED",
+                }
+            },
+        )
+
+    def handle(self, method, route, path, query, headers, body) -> StubResponse:
+        match = self._VALUES.match(path)
+        if not match:
+            return StubResponse(404, {"error": {"code": 404, "message": "Not found"}})
+        spreadsheet_id, _, a1, _ = match.groups()
+        body = body or {}
+        with self._lock:
+            if route == "get":
+                return StubResponse(200, self._value_range(a1, "ROWS"))
+            if route == "batchGet":
+                dimension = (query.get("majorDimension") or ["ROWS"])[0]
+                return StubResponse(
+                    200,
+                    {
+                        "spreadsheetId": spreadsheet_id,
+                        "valueRanges": [
+                            self._value_range(r, dimension) for r in query.get("ranges", [])
+                        ],
+                    },
+                )
+            if route == "update":
+                self._write(a1, body.get("values", []))
+                return StubResponse(200, {"spreadsheetId": spreadsheet_id, "updatedRange": a1})
+            if route == "batchUpdate":
+                for item in body.get("data", []):
+                    self._write(item["range"], item.get("values", []))
+                return StubResponse(
+                    200,
+                    {
+                        "spreadsheetId": spreadsheet_id,
+                        "totalUpdatedRanges": len(body.get("data", [])),
+                    },
+                )
+            if route == "append":
+                sheet = self._parse(a1)[0]
+                grid = self.grids.setdefault(sheet, [])
+                while grid and not any(grid[-1]):
+                    grid.pop()
+                start = len(grid) + 1
+                values = body.get("values", [])
+                grid.extend([[_cell(v) for v in row] for row in values])
+                end = start + max(len(values), 1) - 1
+                width = max((len(row) for row in values), default=1)
+                updated = f"{sheet}!A{start}:{_column_letter(width - 1)}{end}"
+                return StubResponse(
+                    200, {"spreadsheetId": spreadsheet_id, "updates": {"updatedRange": updated}}
+                )
+        return StubResponse(404, {"error": {"code": 404, "message": f"Unsupported {route}"}})
+
+    @staticmethod
+    def _parse(a1: str) -> tuple[str, int, Optional[int], int, Optional[int]]:
+        """(sheet, row_start, row_end, col_start, col_end); rows 1-based, None = open."""
+        sheet, _, ref = a1.rpartition("!")
+        sheet = sheet.strip("'") or "Sheet1"
+        start, _, end = ref.partition(":")
+        c1, r1 = re.fullmatch(r"([A-Z]*)(\d*)", start).groups()
+        c2, r2 = re.fullmatch(r"([A-Z]*)(\d*)", end).groups() if end else (c1, r1)
+        return (
+            sheet,
+            int(r1) if r1 else 1,
+            int(r2) if r2 else None,
+            _column_index(c1) if c1 else 0,
+            _column_index(c2) if c2 else None,
+        )
+
+    def _value_range(self, a1: str, dimension: str) -> dict[str, Any]:
+        sheet, row_start, row_end, col_start, col_end = self._parse(a1)
+        rows = []
+        for row in self.grids.get(sheet, [])[row_start - 1 : row_end]:
+            cells = row[col_start : None if col_end is None else col_end + 1]
+            while cells and cells[-1] == "":
+                cells = cells[:-1]
+            rows.append(cells)
+        while rows and not rows[-1]:
+            rows.pop()
+        if dimension == "COLUMNS":
+            width = max((len(row) for row in rows), default=0)
+            rows = [[row[c] if c < len(row) else "" for row in rows] for c in range(width)]
+        value_range = {"range": a1, "majorDimension": dimension}
+        if rows:
+            value_range["values"] = rows
+        return value_range
+
+    def _write(self, a1: str, values: list[list[Any]]) -> None:
+        sheet, row_start, _, col_start, _ = self._parse(a1)
+        grid = self.grids.setdefault(sheet, [])
+        for offset, row_values in enumerate(values):
+            index = row_start - 1 + offset
+            while len(grid) <= index:
+                grid.append([])
+            row = grid[index]
+            for c, value in enumerate(row_values):
+                while len(row) <= col_start + c:
+                    row.append("")
+                row[col_start + c] = _cell(value)
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+class _IMAPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.stub.serve(self)
+
+
+class IMAPStubServer:
+    """
+    Minimal IMAP4rev1 stand-in for EmailWorker (plain TCP, use_ssl=false).
+
+    Supports LOGIN, SELECT, CREATE, UID SEARCH UNSEEN, UID FETCH (RFC822),
+    UID COPY, UID STORE +FLAGS, EXPUNGE and LOGOUT on a single INBOX.
+    Messages are added with deliver().
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        """
+        Args:
+            latency_ms: Delay added to every command
+        """
+        self.latency_ms = latency_ms
+        self.commands = Counter()
+        self.moved = 0
+        self._messages: dict[int, dict[str, Any]] = {}
+        self._next_uid = 1
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "IMAPStubServer":
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _IMAPHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        threading.Thread(
+            target=self._server.serve_forever, name="IMAPStubServer", daemon=True
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def deliver(self, raw: bytes) -> int:
+        """Add a message to INBOX. Returns its UID."""
+        with self._lock:
+            uid = self._next_uid
+            self._next_uid += 1
+            self._messages[uid] = {"raw": raw, "flags": set()}
+            return uid
+
+    def pending(self) -> int:
+        """Messages still in INBOX."""
+        with self._lock:
+            return len(self._messages)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": sum(self.commands.values()),
+                "by_command": dict(self.commands),
+                "moved": self.moved,
+            }
+
+    def serve(self, handler: socketserver.StreamRequestHandler) -> None:
+        """Run one client session."""
+        write = handler.wfile.write
+        write(b"* OK [CAPABILITY IMAP4rev1] IMAP stand-in ready\r\n")
+        while True:
+            line = handler.rfile.readline()
+            if not line:
+                return
+            parts = line.decode(errors="replace").strip().split(" ")
+            if len(parts) < 2:
+                continue
+            tag, command, args = parts[0], parts[1].upper(), parts[2:]
+            if command == "UID" and args:
+                command, args = f"UID {args[0].upper()}", args[1:]
+            with self._lock:
+                self.commands[command] += 1
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000)
+
+            if command == "LOGOUT":
+                write(b"* BYE logging out\r\n" + f"{tag} OK LOGOUT completed\r\n".encode())
+                return
+            untagged = self._execute(command, args)
+            if untagged is None:
+                write(f"{tag} BAD unsupported command {command}\r\n".encode())
+                continue
+            write(untagged + f"{tag} OK {command} completed\r\n".encode())
+
+    def _execute(self, command: str, args: list[str]) -> Optional[bytes]:
+        """Untagged response bytes for a command, or None if unsupported."""
+        with self._lock:
+            if command == "CAPABILITY":
+                return b"* CAPABILITY IMAP4rev1\r\n"
+            if command in ("LOGIN", "CREATE", "NOOP"):
+                return b""
+            if command == "SELECT":
+                return f"* {len(self._messages)} EXISTS\r\n".encode()
+            if command == "EXPUNGE":
+                deleted = [u for u, m in self._messages.items() if "\\Deleted" in m["flags"]]
+                for uid in deleted:
+                    del self._messages[uid]
+                return b""
+            if command == "UID SEARCH":
+                uids = [str(u) for u, m in self._messages.items() if "\\Seen" not in m["flags"]]
+                return f"* SEARCH {' '.join(uids)}\r\n".encode()
+            if command == "UID FETCH":
+                out = b""
+                for seq, uid in enumerate(args[0].split(","), 1):
+                    message = self._messages.get(int(uid))
+                    if not message:
+                        continue
+                    message["flags"].add("\\Seen")
+                    raw = message["raw"]
+                    out += f"* {seq} FETCH (UID {uid} RFC822 {{{len(raw)}}}\r\n".encode()
+                    out += raw + b")\r\n"
+                return out
+            if command == "UID COPY":
+                self.moved += len(args[0].split(","))
+                return b""
+            if command == "UID STORE":
+                for uid in args[0].split(","):
+                    if int(uid) in self._messages:
+                        self._messages[int(uid)]["flags"].add("\\Deleted")
+                return b""
+        return None
@@ -20,6 +20,7 @@ from core.logging_config import (
     get_logger,
     set_context,
     setup_logging,
+    stop_logging,
 )
 
 __all__ = [
@@ -35,6 +36,7 @@ __all__ = [
     "get_config",
     "reset_config",
     "setup_logging",
+    "stop_logging",
     "get_logger",
     "LogContext",
     "generate_run_id",
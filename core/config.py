@@ -32,6 +32,8 @@ class EmailConfig:
     password: str = ""
     folder: str = "INBOX"
     check_interval: int = 60
+    imap_ssl: bool = True
+    idle: bool = False  # Daemon uses IMAP IDLE push instead of interval polling
     from_filter: Optional[str] = None
     subject_filter: Optional[str] = None
 
@@ -107,6 +109,10 @@ class CentralDispatchConfig:
     client_id: str = ""
     client_secret: str = ""
     marketplace_id: int = 10000
+    max_concurrent: int = 8  # Parallel CD requests during sheet exports
+    requests_per_second: float = 10.0  # Shared CD request rate limit
+    api_base_url: str = ""  # Overrides the CD API host (e.g. a local stand-in)
+    token_url: str = ""  # Overrides the CD OAuth token endpoint
 
     def validate(self) -> list[str]:
         """Validate CD configuration, return list of errors."""
@@ -154,6 +160,8 @@ class SheetsConfig:
     sheet_name: str = "Pickups"
     credentials_file: str = "credentials.json"
     token_file: str = "token.json"
+    sync_state_db_path: str = "sheets_sync_state.db"  # Per-row state for incremental CD sync
+    api_endpoint: str = ""  # Overrides the Sheets API root URL (e.g. a local stand-in)
 
     def validate(self) -> list[str]:
         """Validate Sheets configuration, return list of errors."""
@@ -161,7 +169,7 @@ class SheetsConfig:
         if self.enabled:
             if not self.spreadsheet_id:
                 errors.append("SHEETS_SPREADSHEET_ID is required when Sheets is enabled")
-            if not Path(self.credentials_file).exists():
+            if not self.api_endpoint and not Path(self.credentials_file).exists():
                 errors.append(f"Sheets credentials file not found: {self.credentials_file}")
         return errors
 
@@ -179,6 +187,11 @@ class WarehouseConfig:
     geocode_api_key: Optional[str] = None
     distance_mode: str = "driving"  # "driving" or "haversine"
     cache_db_path: str = "geocode_cache.db"
+    cache_ttl_days: Optional[int] = None  # Ignore/purge cached results older than this
+    cache_max_entries: Optional[int] = None  # Per-table row cap, oldest evicted first
+    top_k: int = 3  # Closest warehouses (by haversine) checked with driving distance
+    zip_centroids_file: str = "zip_centroids.csv"  # Offline geocoding table
+    geocode_precision: str = "zip3"  # "zip5", "city", "zip3" or "remote" (offline tier off)
 
     def validate(self) -> list[str]:
         """Validate warehouse configuration, return list of errors."""
@@ -187,6 +200,11 @@ class WarehouseConfig:
             if self.geocode_provider == "google" and not self.geocode_api_key:
                 # Warning but not error - will fall back to haversine
                 pass
+            if self.geocode_precision not in ("zip5", "city", "zip3", "remote"):
+                errors.append(
+                    f"GEOCODE_PRECISION must be zip5, city, zip3 or remote "
+                    f"(got {self.geocode_precision!r})"
+                )
         return errors
 
     def __repr__(self) -> str:
@@ -255,6 +273,8 @@ def load_config_from_env() -> AppConfig:
             password=os.getenv("EMAIL_PASSWORD", ""),
             folder=os.getenv("EMAIL_FOLDER", "INBOX"),
             check_interval=int(os.getenv("EMAIL_CHECK_INTERVAL", "60")),
+            imap_ssl=os.getenv("EMAIL_IMAP_SSL", "true").lower() in ("true", "1", "yes"),
+            idle=os.getenv("EMAIL_IDLE", "false").lower() in ("true", "1", "yes"),
             from_filter=os.getenv("EMAIL_FROM_FILTER"),
             subject_filter=os.getenv("EMAIL_SUBJECT_FILTER"),
             tenant_id=os.getenv("EMAIL_TENANT_ID"),
@@ -275,6 +295,10 @@ def load_config_from_env() -> AppConfig:
             client_id=os.getenv("CD_CLIENT_ID", ""),
             client_secret=os.getenv("CD_CLIENT_SECRET", ""),
             marketplace_id=int(os.getenv("CD_MARKETPLACE_ID", "10000")),
+            max_concurrent=int(os.getenv("CD_MAX_CONCURRENT", "8")),
+            requests_per_second=float(os.getenv("CD_REQUESTS_PER_SECOND", "10")),
+            api_base_url=os.getenv("CD_API_BASE_URL", ""),
+            token_url=os.getenv("CD_TOKEN_URL", ""),
         ),
         storage=StorageConfig(
             idempotency_db_path=os.getenv("IDEMPOTENCY_DB_PATH", "processed_emails.db"),
@@ -286,6 +310,8 @@ def load_config_from_env() -> AppConfig:
             sheet_name=os.getenv("SHEETS_SHEET_NAME", "Pickups"),
             credentials_file=os.getenv("SHEETS_CREDENTIALS_FILE", "credentials.json"),
             token_file=os.getenv("SHEETS_TOKEN_FILE", "token.json"),
+            sync_state_db_path=os.getenv("SHEETS_SYNC_STATE_DB", "sheets_sync_state.db"),
+            api_endpoint=os.getenv("SHEETS_API_ENDPOINT", ""),
         ),
         warehouse=WarehouseConfig(
             enabled=os.getenv("WAREHOUSE_ENABLED", "true").lower() in ("true", "1", "yes"),
@@ -294,6 +320,11 @@ def load_config_from_env() -> AppConfig:
             geocode_api_key=os.getenv("GEOCODE_API_KEY"),
             distance_mode=os.getenv("DISTANCE_MODE", "driving"),
             cache_db_path=os.getenv("GEOCODE_CACHE_DB", "geocode_cache.db"),
+            cache_ttl_days=int(os.getenv("GEOCODE_CACHE_TTL_DAYS", "0")) or None,
+            cache_max_entries=int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "0")) or None,
+            top_k=int(os.getenv("WAREHOUSE_TOP_K", "3")),
+            zip_centroids_file=os.getenv("ZIP_CENTROIDS_FILE", "zip_centroids.csv"),
+            geocode_precision=os.getenv("GEOCODE_PRECISION", "zip3"),
         ),
         dry_run=os.getenv("DRY_RUN", "false").lower() in ("true", "1", "yes"),
         log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
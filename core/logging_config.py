@@ -1,13 +1,27 @@
-"""Structured logging configuration with correlation fields."""
-
+"""
+Structured logging configuration with correlation fields.
+
+setup_logging() puts a QueueHandler on the logger and moves formatting and
+stream I/O to a QueueListener thread, so logging costs the calling thread a
+context capture and a put_nowait. The queue is bounded: when it is full the
+record is dropped and counted (log_records_dropped_total{sink="stream"})
+rather than blocking the pipeline. stop_logging() (also run at exit) drains
+the queue.
+"""
+
+import atexit
 import json
 import logging
+import queue
 import sys
 import uuid
 from contextvars import ContextVar
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Optional
 
+from core.telemetry import LOG_RECORDS_DROPPED
+
 # Context variables for log correlation
 current_run_id: ContextVar[str] = ContextVar("run_id", default="")
 current_message_id: ContextVar[str] = ContextVar("message_id", default="")
@@ -15,6 +29,20 @@ current_thread_root_id: ContextVar[str] = ContextVar("thread_root_id", default="
 current_attachment_name: ContextVar[str] = ContextVar("attachment_name", default="")
 current_attachment_hash: ContextVar[str] = ContextVar("attachment_hash", default="")
 
+_CONTEXT_VARS = (
+    ("run_id", current_run_id),
+    ("message_id", current_message_id),
+    ("thread_root_id", current_thread_root_id),
+    ("attachment_name", current_attachment_name),
+    ("attachment_hash", current_attachment_hash),
+)
+
+# Default bound on records waiting for the listener thread
+DEFAULT_QUEUE_SIZE = 10000
+
+# Active listeners by logger name (None = root)
+_listeners: dict[Optional[str], QueueListener] = {}
+
 
 def generate_run_id() -> str:
     """Generate a unique run ID for log correlation."""
@@ -50,28 +78,30 @@ def clear_context() -> None:
     current_attachment_hash.set("")
 
 
+def capture_context() -> dict[str, str]:
+    """Non-empty correlation fields of the current context."""
+    return {name: value for name, var in _CONTEXT_VARS if (value := var.get())}
+
+
+def _record_context(record: logging.LogRecord) -> dict[str, str]:
+    # Captured by AsyncQueueHandler on the logging thread; otherwise read here
+    context = getattr(record, "log_context", None)
+    return capture_context() if context is None else context
+
+
 class JSONFormatter(logging.Formatter):
     """JSON log formatter with correlation fields."""
 
     def format(self, record: logging.LogRecord) -> str:
         log_data: dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
         # Add correlation fields if present
-        if run_id := current_run_id.get():
-            log_data["run_id"] = run_id
-        if message_id := current_message_id.get():
-            log_data["message_id"] = message_id
-        if thread_root_id := current_thread_root_id.get():
-            log_data["thread_root_id"] = thread_root_id
-        if attachment_name := current_attachment_name.get():
-            log_data["attachment_name"] = attachment_name
-        if attachment_hash := current_attachment_hash.get():
-            log_data["attachment_hash"] = attachment_hash
+        log_data.update(_record_context(record))
 
         # Add exception info if present
         if record.exc_info:
@@ -88,15 +118,16 @@ class TextFormatter(logging.Formatter):
     """Human-readable text formatter with correlation fields."""
 
     def format(self, record: logging.LogRecord) -> str:
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = datetime.utcfromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
 
         # Build context string
+        context = _record_context(record)
         ctx_parts = []
-        if run_id := current_run_id.get():
+        if run_id := context.get("run_id"):
             ctx_parts.append(f"run={run_id[:16]}")
-        if message_id := current_message_id.get():
+        if message_id := context.get("message_id"):
             ctx_parts.append(f"msg={message_id[:20]}")
-        if attachment_name := current_attachment_name.get():
+        if attachment_name := context.get("attachment_name"):
             ctx_parts.append(f"file={attachment_name}")
 
         ctx_str = f" [{', '.join(ctx_parts)}]" if ctx_parts else ""
@@ -109,10 +140,38 @@ class TextFormatter(logging.Formatter):
         return msg
 
 
+class AsyncQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks and keeps correlation fields.
+
+    Context variables are per-thread, so they are captured here, on the
+    logging thread, for the formatter running on the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.log_context = capture_context()
+        # Merge args now: they could be mutated before the listener formats them
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc(sink="stream")
+
+
 def setup_logging(
     level: str = "INFO",
     format_type: str = "text",
     logger_name: Optional[str] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
 ) -> logging.Logger:
     """
     Configure logging for the application.
@@ -121,6 +180,8 @@ def setup_logging(
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         format_type: "json" for structured logs, "text" for human-readable
         logger_name: Specific logger name, or None for root logger
+        queue_size: Records buffered for the listener thread; 0 formats and
+            writes synchronously on the calling thread
 
     Returns:
         Configured logger instance
@@ -128,7 +189,8 @@ def setup_logging(
     logger = logging.getLogger(logger_name)
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    # Remove existing handlers
+    # Remove existing handlers (draining a listener from an earlier call)
+    _stop_listener(logger_name)
     logger.handlers.clear()
 
     # Create handler
@@ -142,7 +204,15 @@ def setup_logging(
         formatter = TextFormatter()
 
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+    if queue_size > 0:
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        _listeners[logger_name] = listener
+        logger.addHandler(AsyncQueueHandler(log_queue))
+    else:
+        logger.addHandler(handler)
 
     # Don't propagate to root logger
     logger.propagate = False
@@ -150,6 +220,21 @@ def setup_logging(
     return logger
 
 
+def _stop_listener(logger_name: Optional[str]):
+    listener = _listeners.pop(logger_name, None)
+    if listener is not None:
+        listener.stop()
+
+
+def stop_logging():
+    """Write out queued records and stop the listener threads."""
+    for logger_name in list(_listeners):
+        _stop_listener(logger_name)
+
+
+atexit.register(stop_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the given name."""
     return logging.getLogger(name)
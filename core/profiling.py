@@ -0,0 +1,265 @@
+"""
+Opt-in sampling profiler for individual API requests.
+
+When PROFILING_ENABLED is set, requests to PROFILE_PATHS that carry an
+``X-Profile: 1`` header (or fall into the PROFILE_SAMPLE_RATE fraction) are
+profiled: a background thread samples the stack of the thread serving the
+request every PROFILE_INTERVAL_MS and counts identical stacks. The result is
+stored in collapsed-stack format, one ``frame;frame;frame count`` line per
+stack, keyed by the request ID, ready for flamegraph.pl, speedscope or
+inferno:
+
+    curl -H "X-Profile: 1" -F file=@invoice.pdf localhost:8000/api/test/upload
+    curl localhost:8000/api/profiles/<X-Profile-ID> > upload.collapsed
+    flamegraph.pl upload.collapsed > upload.svg
+
+Sampling is wall-clock, so time the event loop spends waiting on I/O shows up
+as well as CPU time. Profiles are files under PROFILE_DIR, so any worker can
+serve a profile recorded by another; the oldest are removed beyond
+PROFILE_MAX_FILES. With profiling disabled (the default) nothing is started
+and requests only pay for one attribute check.
+
+Example usage outside HTTP:
+    with SamplingProfiler() as profiler:
+        run_extraction(...)
+    save_profile("manual-run", profiler, path="cli")
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_PATHS = ("/api/extractions/run", "/api/test/upload")
+
+# Request IDs come from the client (X-Request-ID), so only these become file names
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class ProfilingSettings:
+    """Profiling switches, read once at import (see from_env)."""
+
+    enabled: bool = False
+    sample_rate: float = 0.0
+    interval_ms: float = 5.0
+    paths: tuple[str, ...] = DEFAULT_PATHS
+    directory: Path = field(default_factory=lambda: PROJECT_ROOT / "data" / "profiles")
+    max_files: int = 200
+
+    @classmethod
+    def from_env(cls) -> "ProfilingSettings":
+        """Build settings from PROFILING_ENABLED, PROFILE_* environment variables."""
+        paths = os.getenv("PROFILE_PATHS")
+        directory = os.getenv("PROFILE_DIR")
+        return cls(
+            enabled=_env_flag("PROFILING_ENABLED"),
+            sample_rate=min(max(float(os.getenv("PROFILE_SAMPLE_RATE", "0")), 0.0), 1.0),
+            interval_ms=max(float(os.getenv("PROFILE_INTERVAL_MS", "5")), 1.0),
+            paths=(
+                tuple(p.strip().rstrip("/") for p in paths.split(",") if p.strip())
+                if paths
+                else DEFAULT_PATHS
+            ),
+            directory=(Path(directory) if directory else PROJECT_ROOT / "data" / "profiles"),
+            max_files=int(os.getenv("PROFILE_MAX_FILES", "200")),
+        )
+
+
+settings = ProfilingSettings.from_env()
+
+
+def should_profile(path: str, header: Optional[str] = None) -> bool:
+    """
+    Decide whether a request is profiled.
+
+    Args:
+        path: Request path
+        header: Value of the X-Profile request header, if any
+
+    Returns:
+        True if profiling is enabled, the path is profiled and the request
+        either asked for it or was sampled
+    """
+    if not settings.enabled or path.rstrip("/") not in settings.paths:
+        return False
+    if header is not None and header.strip().lower() in ("1", "true", "yes", "on"):
+        return True
+    return settings.sample_rate > 0 and random.random() < settings.sample_rate
+
+
+@lru_cache(maxsize=2048)
+def _short_path(filename: str) -> str:
+    """Project-relative or site-packages-relative file name for frame labels."""
+    try:
+        return Path(filename).relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        pass
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1].replace(os.sep, "/")
+    return os.path.basename(filename)
+
+
+def collapse_frame(frame) -> str:
+    """Render a frame and its callers as a root-first collapsed stack."""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        labels.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels).replace("\n", " ")
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's stack on a background thread.
+
+    Only the sampler thread does work while profiling; the profiled thread
+    runs unmodified (no sys.setprofile hook), so overhead stays low.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval_ms: Optional[float] = None):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = (interval_ms if interval_ms is not None else settings.interval_ms) / 1000
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.duration_ms = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.duration_ms = (time.perf_counter() - self.started_at) * 1000
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.stacks[collapse_frame(frame)] += 1
+            self.samples += 1
+            del frame
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+
+def profile_id_for(request_id: Optional[str]) -> str:
+    """Request ID if it is safe as a file name, otherwise a fresh ID."""
+    if request_id and _SAFE_ID.match(request_id):
+        return request_id
+    return os.urandom(4).hex()
+
+
+def _profile_path(profile_id: str) -> Optional[Path]:
+    if not _SAFE_ID.match(profile_id):
+        return None
+    return settings.directory / f"{profile_id}.collapsed"
+
+
+def save_profile(profile_id: str, profiler: SamplingProfiler, **meta) -> Path:
+    """
+    Write a profile and its metadata, then prune the oldest profiles.
+
+    Args:
+        profile_id: Key for the profile (normally the request ID)
+        profiler: Stopped profiler
+        **meta: Extra metadata stored alongside (path, method, status, ...)
+
+    Returns:
+        Path of the collapsed-stack file
+    """
+    path = _profile_path(profile_id)
+    if path is None:
+        raise ValueError(f"Invalid profile id: {profile_id!r}")
+    settings.directory.mkdir(parents=True, exist_ok=True)
+
+    path.write_text(profiler.collapsed())
+    info = {
+        "id": profile_id,
+        "created_at": datetime.utcnow().isoformat(),
+        "samples": profiler.samples,
+        "duration_ms": round(profiler.duration_ms, 2),
+        "interval_ms": round(profiler.interval * 1000, 2),
+        **meta,
+    }
+    path.with_suffix(".json").write_text(json.dumps(info))
+    _prune()
+    return path
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        # Pruned by another worker meanwhile
+        return 0.0
+
+
+def _prune():
+    files = sorted(settings.directory.glob("*.collapsed"), key=_mtime)
+    for old in files[: max(len(files) - settings.max_files, 0)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".json").unlink(missing_ok=True)
+
+
+def load_profile(profile_id: str) -> Optional[str]:
+    """Collapsed stacks for a profile, or None if there is none."""
+    path = _profile_path(profile_id)
+    if path is None or not path.is_file():
+        return None
+    return path.read_text()
+
+
+def list_profiles(limit: int = 50) -> list[dict]:
+    """Metadata of stored profiles, newest first."""
+    if not settings.directory.is_dir():
+        return []
+    infos = []
+    for meta_file in settings.directory.glob("*.json"):
+        try:
+            infos.append(json.loads(meta_file.read_text()))
+        except (OSError, ValueError):
+            # Pruned or half-written by another worker
+            continue
+    infos.sort(key=lambda info: info.get("created_at", ""), reverse=True)
+    return infos[:limit]
@@ -0,0 +1,351 @@
+"""
+In-process operational metrics with Prometheus text exposition.
+
+Counters, gauges and histograms live in one registry and are rendered by
+GET /metrics in the Prometheus text format (version 0.0.4). Recording is a
+dict lookup plus an increment under a per-metric lock; bucket cumulation,
+sorting and formatting only happen at scrape time. Values that already
+exist elsewhere (cache hit counts, queue depths) are read by collectors at
+scrape time instead of being mirrored on the hot path.
+
+Each process has its own registry; with several uvicorn workers, scrape
+each worker or run a single worker per metrics port.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for a named metric with a fixed set of label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def clear(self):
+        """Drop all recorded series."""
+        with self._lock:
+            self._values.clear()
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # [per-bucket counts incl. +Inf, sum]
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, **labels) -> "_HistogramTimer":
+        """Context manager observing the elapsed seconds of a block."""
+        return _HistogramTimer(self, labels)
+
+    def count(self, **labels) -> int:
+        series = self._values.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(
+                (key, (list(counts), total)) for key, (counts, total) in self._values.items()
+            )
+        lines = self.header()
+        bounds = list(self.buckets) + [float("inf")]
+        names = self.labelnames + ("le",)
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _HistogramTimer:
+    def __init__(self, histogram: Histogram, labels: dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self._start, **self.labels)
+        return False
+
+
+# A collector returns (name, kind, documentation, [(labels dict, value), ...])
+Collector = Callable[[], Iterable[tuple[str, str, str, list[tuple[dict, float]]]]]
+
+
+class Registry:
+    """Holds metrics and scrape-time collectors."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric and collector in the Prometheus text format."""
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            try:
+                families = list(collector())
+            except Exception:
+                # A broken collector must not take the whole scrape down
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    rendered = _format_labels(labels.keys(), labels.values())
+                    lines.append(f"{name}{rendered} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# HTTP
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "HTTP requests by route template and status",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+
+# Extraction pipeline
+EXTRACTIONS_IN_FLIGHT = REGISTRY.gauge("extractions_in_flight", "Extraction runs in progress")
+EXTRACTIONS = REGISTRY.counter("extractions_total", "Extraction runs finished")
+EXTRACTION_STAGE_LATENCY = REGISTRY.histogram(
+    "extraction_stage_duration_seconds", "Extraction time per pipeline stage", ("stage",)
+)
+
+# Central Dispatch
+CD_REQUESTS = REGISTRY.counter(
+    "cd_requests_total", "Central Dispatch API responses by method and status", ("method", "status")
+)
+CD_LATENCY = REGISTRY.histogram(
+    "cd_request_duration_seconds", "Central Dispatch API latency", ("method",)
+)
+CD_RATE_LIMITED = REGISTRY.counter("cd_rate_limited_total", "Central Dispatch API 429 responses")
+
+# Google Sheets
+SHEETS_CALLS = REGISTRY.counter(
+    "sheets_api_calls_total", "Google Sheets API calls by operation", ("operation", "status")
+)
+SHEETS_LATENCY = REGISTRY.histogram(
+    "sheets_api_call_duration_seconds", "Google Sheets API latency", ("operation",)
+)
+
+# Control panel database
+DB_QUERIES = REGISTRY.counter("db_queries_total", "Control panel SQLite statements", ("op",))
+DB_QUERY_LATENCY = REGISTRY.histogram(
+    "db_query_duration_seconds",
+    "Control panel SQLite statement execution time",
+    ("op",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+
+# Batch export
+BATCH_EXPORT_WAITING = REGISTRY.gauge(
+    "batch_export_items_waiting", "Batch export items waiting for a CD slot"
+)
+BATCH_EXPORT_IN_FLIGHT = REGISTRY.gauge(
+    "batch_export_items_in_flight", "Batch export items being sent to CD"
+)
+
+# Logging
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "log_records_dropped_total", "Log records dropped because a buffer was full", ("sink",)
+)
+LOG_BATCH_FLUSHES = REGISTRY.counter(
+    "run_log_flushes_total", "Batched run log inserts written to the database"
+)
+
+
+def cd_response_hook(response, *args, **kwargs):
+    """requests response hook recording CD latency, status and 429s."""
+    method = response.request.method if response.request is not None else "GET"
+    CD_REQUESTS.inc(method=method, status=response.status_code)
+    CD_LATENCY.observe(response.elapsed.total_seconds(), method=method)
+    if response.status_code == 429:
+        CD_RATE_LIMITED.inc()
+    return response
+
+
+@lru_cache(maxsize=1)
+def sheets_request_builder():
+    """
+    googleapiclient HttpRequest subclass that records every execute().
+
+    Pass as build("sheets", "v4", ..., requestBuilder=sheets_request_builder()).
+    """
+    from googleapiclient.http import HttpRequest
+
+    class MeteredHttpRequest(HttpRequest):
+        def execute(self, *args, **kwargs):
+            operation = self.methodId or "unknown"
+            start = time.perf_counter()
+            status = "error"
+            try:
+                result = super().execute(*args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                SHEETS_CALLS.inc(operation=operation, status=status)
+                SHEETS_LATENCY.observe(time.perf_counter() - start, operation=operation)
+
+    return MeteredHttpRequest
+
+
+def statement_op(sql: str) -> str:
+    """Leading keyword of a SQL statement, used as the db_* op label."""
+    head = sql.lstrip()[:8].split(None, 1)
+    op = head[0].upper() if head else ""
+    return op if op in ("SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "ALTER") else "OTHER"
+
+
+def render_latest(registry: Optional[Registry] = None) -> str:
+    """Text exposition of the registry (the default one if omitted)."""
+    return (registry or REGISTRY).render()
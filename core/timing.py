@@ -0,0 +1,78 @@
+"""Per-stage timing spans for pipeline runs."""
+
+import time
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from typing import Optional
+
+# Timer collecting spans for the current unit of work (None = not timing)
+current_timer: ContextVar[Optional["StageTimer"]] = ContextVar("stage_timer", default=None)
+
+
+class StageTimer:
+    """
+    Collects wall-clock milliseconds per stage for one unit of work.
+
+    Spans for the same stage are summed. Entering the timer makes it the
+    target of span() in the current context:
+
+        with StageTimer() as timer:
+            with span("text_extraction"):
+                ...
+        metrics["stage_timings_ms"] = timer.to_dict()
+    """
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self._token = None
+
+    def add(self, stage: str, duration_ms: float):
+        """Add duration_ms to a stage."""
+        self.stages[stage] = self.stages.get(stage, 0.0) + duration_ms
+
+    def to_dict(self) -> dict[str, float]:
+        """Stage durations in milliseconds, rounded for storage."""
+        return {stage: round(ms, 2) for stage, ms in self.stages.items()}
+
+    def __enter__(self):
+        self._token = current_timer.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        current_timer.reset(self._token)
+        return False
+
+
+class Span(ContextDecorator):
+    """Times a block or function as a named stage of the active StageTimer."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._start = 0.0
+
+    def _recreate_cm(self):
+        # Fresh instance per decorated call so recursion/threads don't share _start
+        return Span(self.stage)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        timer = current_timer.get()
+        if timer is not None:
+            timer.add(self.stage, (time.perf_counter() - self._start) * 1000)
+        return False
+
+
+def span(stage: str) -> Span:
+    """
+    Time a block or function as a named stage of the active StageTimer.
+
+    Usable as a context manager or decorator; does nothing when no timer
+    is active.
+
+        @span("field_resolution")
+        def resolve_all(...): ...
+    """
+    return Span(stage)
@@ -1,9 +1,12 @@
 """Extractor manager - auto-detects document type using scoring."""
 
 import logging
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
+import pdfplumber
+
 from extractors.base import BaseExtractor, ExtractionResult
 from extractors.copart import CopartExtractor
 from extractors.iaa import IAAExtractor
@@ -22,6 +25,8 @@ class ClassificationResult:
     extractor: Optional[BaseExtractor]
     matched_patterns: list[str]
     text: str = ""  # Cached text for subsequent extraction
+    pages_used: int = 0  # Pages read before the decision (0 = whole-text classification)
+    is_decisive: bool = False  # Winner cleared both the threshold and the margin
 
 
 class ExtractorManager:
@@ -34,6 +39,10 @@ class ExtractorManager:
     # the winner must be this much higher than second place
     SCORE_MARGIN = 0.1
 
+    # Upper bound on text sampled by classify_progressive() before giving up
+    # on an early exit and returning the best-so-far result
+    PROGRESSIVE_MAX_CHARS = 64 * 1024
+
     def __init__(self):
         self.extractors: list[BaseExtractor] = [
             IAAExtractor(),
@@ -49,13 +58,8 @@ class ExtractorManager:
             self._text_cache[pdf_path] = self.extractors[0].extract_text(pdf_path)
         return self._text_cache[pdf_path]
 
-    def classify(self, pdf_path: str) -> ClassificationResult:
-        """
-        Classify a document by scoring against all extractors.
-        Returns the best match with score and matched patterns.
-        """
-        text = self._get_text(pdf_path)
-
+    def _rank(self, text: str) -> list[ClassificationResult]:
+        """Score text against all extractors, best first."""
         results = []
         for extractor in self.extractors:
             score, patterns = extractor.score(text)
@@ -71,6 +75,28 @@ class ExtractorManager:
 
         # Sort by score descending
         results.sort(key=lambda r: r.score, reverse=True)
+        return results
+
+    def _is_decisive(self, results: list[ClassificationResult]) -> bool:
+        """True if the best result is above threshold and clear of the runner-up."""
+        best = results[0]
+        if best.score < self.MIN_SCORE_THRESHOLD:
+            return False
+        if len(results) > 1:
+            second = results[1]
+            if (
+                best.score - second.score < self.SCORE_MARGIN
+                and second.score > self.MIN_SCORE_THRESHOLD
+            ):
+                return False
+        return True
+
+    def classify_text(self, text: str) -> ClassificationResult:
+        """
+        Classify already-extracted text by scoring against all extractors.
+        Returns the best match with score and matched patterns.
+        """
+        results = self._rank(text)
 
         # Log all scores for debugging
         for r in results:
@@ -92,14 +118,13 @@ class ExtractorManager:
             )
 
         # Check margin against second place
-        if len(results) > 1:
+        best.is_decisive = self._is_decisive(results)
+        if not best.is_decisive:
             second = results[1]
-            margin = best.score - second.score
-            if margin < self.SCORE_MARGIN and second.score > self.MIN_SCORE_THRESHOLD:
-                logger.warning(
-                    f"Ambiguous classification: {best.source.value}={best.score:.2f} vs "
-                    f"{second.source.value}={second.score:.2f}"
-                )
+            logger.warning(
+                f"Ambiguous classification: {best.source.value}={best.score:.2f} vs "
+                f"{second.source.value}={second.score:.2f}"
+            )
 
         logger.info(
             f"Classified as {best.source.value} (score={best.score:.2f}, "
@@ -107,6 +132,83 @@ class ExtractorManager:
         )
         return best
 
+    def classify(self, pdf_path: str) -> ClassificationResult:
+        """
+        Classify a document by scoring against all extractors.
+        Returns the best match with score and matched patterns.
+        """
+        return self.classify_text(self._get_text(pdf_path))
+
+    def classify_pages(
+        self, pages: Iterable[str], max_chars: Optional[int] = None
+    ) -> ClassificationResult:
+        """
+        Classify page by page, stopping at the first decisive result.
+
+        Pages are consumed lazily: after each page the accumulated text is
+        scored, and if the winner clears MIN_SCORE_THRESHOLD and beats the
+        runner-up by SCORE_MARGIN no further pages are read. Ambiguous
+        documents fall through to the full text.
+
+        Args:
+            pages: Iterable of per-page text (may be a generator)
+            max_chars: Stop reading once this much text has been sampled
+
+        Returns:
+            ClassificationResult with pages_used set. Note that ``text`` holds
+            only the sampled pages, not necessarily the whole document.
+        """
+        parts: list[str] = []
+        pages_used = 0
+        text_length = 0
+
+        for page_text in pages:
+            pages_used += 1
+            if page_text:
+                parts.append(page_text)
+                text_length += len(page_text) + 1
+
+            if self._is_decisive(self._rank("\n".join(parts))):
+                break
+            if max_chars is not None and text_length >= max_chars:
+                break
+
+        result = self.classify_text("\n".join(parts))
+        result.pages_used = pages_used
+        logger.debug(f"Progressive classification read {pages_used} page(s)")
+        return result
+
+    def classify_progressive(
+        self, pdf_path: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None
+    ) -> ClassificationResult:
+        """
+        Classify a PDF reading as few pages as possible.
+
+        Auction headers ("Copart", "IAA", "Manheim") are almost always on
+        page 1, so large documents are triaged without parsing every page.
+        """
+        if pdf_path in self._text_cache:
+            # Full text already extracted - no parsing to save
+            return self.classify_text(self._text_cache[pdf_path])
+
+        pages = self._iter_pages_text(pdf_path, max_pages)
+        try:
+            return self.classify_pages(
+                pages,
+                max_chars=max_chars if max_chars is not None else self.PROGRESSIVE_MAX_CHARS,
+            )
+        finally:
+            # Close the PDF even when we stopped before the last page
+            pages.close()
+
+    @staticmethod
+    def _iter_pages_text(pdf_path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+        """Yield page text lazily so unread pages are never parsed."""
+        with pdfplumber.open(pdf_path) as pdf:
+            pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+            for page in pages:
+                yield page.extract_text() or ""
+
     def classify_pdf(self, pdf_path: str) -> ClassificationResult:
         """Alias for classify() - classify a PDF document."""
         return self.classify(pdf_path)
@@ -163,11 +265,7 @@ class ExtractorManager:
     def get_all_scores(self, pdf_path: str) -> list[tuple[AuctionSource, float, list[str]]]:
         """Get scores from all extractors for debugging."""
         text = self._get_text(pdf_path)
-        results = []
-        for extractor in self.extractors:
-            score, patterns = extractor.score(text)
-            results.append((extractor.source, score, patterns))
-        return sorted(results, key=lambda x: x[1], reverse=True)
+        return [(r.source, r.score, r.matched_patterns) for r in self._rank(text)]
 
     def get_extractor_for_text(self, text: str) -> Optional[BaseExtractor]:
         """Get best extractor for given text (legacy compatibility)."""
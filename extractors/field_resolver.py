@@ -11,6 +11,10 @@ Combines values from multiple sources according to precedence rules:
 
 This module provides a unified interface for resolving field values
 and tracking where each value came from.
+
+Auction and warehouse constants are compiled into a ResolutionPlan per
+(auction, warehouse, profile version, constants version) and cached, so
+resolving a run costs one profile and one constants lookup, not one per field.
 """
 
 import logging
@@ -18,6 +22,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
+from core.timing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,6 +76,31 @@ class ResolvedField:
         }
 
 
+@dataclass
+class ResolutionPlan:
+    """
+    Compiled constant sources for one auction/warehouse combination.
+
+    constants maps field_key -> ((source, value, confidence, apply_when), ...)
+    already in precedence order (warehouse before auction).
+    """
+
+    key: tuple
+    constants: dict[str, tuple[tuple[FieldValueSource, Any, float, str], ...]]
+    field_keys: frozenset[str]
+
+
+def _applies(apply_when: str, current_value: Any) -> bool:
+    """apply_when rule shared by auction profile defaults and warehouse constants."""
+    if apply_when == "always":
+        return True
+    if apply_when == "if_empty":
+        return not current_value
+    if apply_when == "if_missing":
+        return current_value is None
+    return False
+
+
 @dataclass
 class ResolutionContext:
     """Context for field resolution."""
@@ -94,10 +125,15 @@ class FieldResolver:
         resolved = resolver.resolve_all(extracted_fields, context)
     """
 
+    MAX_PLANS = 256
+
     def __init__(self):
         # Lazy import to avoid circular dependencies
         self._auction_service = None
         self._warehouse_service = None
+        self._plans: dict[tuple, ResolutionPlan] = {}
+        self.plan_hits = 0
+        self.plan_misses = 0
 
     @property
     def auction_service(self):
@@ -115,11 +151,70 @@ class FieldResolver:
             self._warehouse_service = get_constants_service()
         return self._warehouse_service
 
+    def get_plan(self, context: ResolutionContext) -> ResolutionPlan:
+        """
+        Get the compiled plan for the context's auction and warehouse.
+
+        Plans are keyed by the profile version and constants revision, so an
+        edited profile or constant set compiles a fresh plan.
+        """
+        profile = None
+        if context.auction_code:
+            profile = self.auction_service.get_profile(context.auction_code)
+        wc = None
+        if context.warehouse_code:
+            wc = self.warehouse_service.get_constants(context.warehouse_code)
+
+        key = (
+            (context.auction_code or "").upper(),
+            (context.warehouse_code or "").upper(),
+            (profile.id, profile.version) if profile else None,
+            (wc.id, wc.updated_at) if wc else None,
+        )
+        plan = self._plans.get(key)
+        if plan is not None:
+            self.plan_hits += 1
+            return plan
+
+        self.plan_misses += 1
+        constants: dict[str, list] = {}
+        if wc:
+            for field_key, const in wc.constants.items():
+                if const.value is not None:
+                    constants.setdefault(field_key, []).append(
+                        (FieldValueSource.WAREHOUSE_CONST, const.value, 0.95, const.apply_when)
+                    )
+        if profile:
+            for field_key, field_def in profile.field_defaults.items():
+                if field_def.value is not None:
+                    constants.setdefault(field_key, []).append(
+                        (FieldValueSource.AUCTION_CONST, field_def.value, 0.9, field_def.apply_when)
+                    )
+
+        field_keys = set(wc.constants) if wc else set()
+        if profile:
+            field_keys.update(profile.field_defaults)
+
+        plan = ResolutionPlan(
+            key=key,
+            constants={k: tuple(v) for k, v in constants.items()},
+            field_keys=frozenset(field_keys),
+        )
+        if len(self._plans) >= self.MAX_PLANS:
+            self._plans.clear()
+        self._plans[key] = plan
+        return plan
+
+    def clear_plans(self):
+        """Drop all compiled plans."""
+        self._plans.clear()
+
     def resolve_field(
         self,
         field_key: str,
         extracted_value: Any,
         context: ResolutionContext,
+        plan: Optional[ResolutionPlan] = None,
     ) -> ResolvedField:
         """
         Resolve a single field value using all available sources.
@@ -128,43 +223,35 @@ class FieldResolver:
             field_key: Field being resolved
             extracted_value: Value extracted from document
             context: Resolution context with auction/warehouse info
+            plan: Compiled plan for the context (looked up if omitted)
 
         Returns:
             ResolvedField with final value and source
         """
-        candidates = []  # List of (source, value, confidence)
+        if plan is None:
+            plan = self.get_plan(context)
+
+        # Candidates are collected in precedence order: (source, value, confidence)
+        candidates = []
 
         # 1. Check user overrides (highest priority)
-        if field_key in context.user_overrides:
-            override = context.user_overrides[field_key]
-            if override is not None:
-                candidates.append((FieldValueSource.USER_OVERRIDE, override, 1.0))
+        override = context.user_overrides.get(field_key)
+        if override is not None:
+            candidates.append((FieldValueSource.USER_OVERRIDE, override, 1.0))
 
-        # 2. Check warehouse constants
-        if context.warehouse_code:
-            wc = self.warehouse_service.get_constants(context.warehouse_code)
-            if wc and wc.should_apply(field_key, extracted_value):
-                value = wc.get_value(field_key)
-                if value is not None:
-                    candidates.append((FieldValueSource.WAREHOUSE_CONST, value, 0.95))
-
-        # 3. Check auction profile
-        if context.auction_code:
-            profile = self.auction_service.get_profile(context.auction_code)
-            if profile and profile.should_apply_default(field_key, extracted_value):
-                value = profile.get_default_value(field_key)
-                if value is not None:
-                    candidates.append((FieldValueSource.AUCTION_CONST, value, 0.9))
+        # 2-3. Warehouse constants, then auction profile defaults
+        for source, value, confidence, apply_when in plan.constants.get(field_key, ()):
+            if _applies(apply_when, extracted_value):
+                candidates.append((source, value, confidence))
 
         # 4. Use extracted value
         if extracted_value is not None and str(extracted_value).strip():
             candidates.append((FieldValueSource.EXTRACTED, extracted_value, 0.85))
 
         # 5. Check default values
-        if field_key in context.default_values:
-            default = context.default_values[field_key]
-            if default is not None:
-                candidates.append((FieldValueSource.DEFAULT, default, 0.5))
+        default = context.default_values.get(field_key)
+        if default is not None:
+            candidates.append((FieldValueSource.DEFAULT, default, 0.5))
 
         # Select highest-priority value
         if not candidates:
@@ -176,9 +263,6 @@ class FieldResolver:
                 extracted_value=extracted_value,
             )
 
-        # Sort by precedence order
-        candidates.sort(key=lambda c: PRECEDENCE_ORDER.index(c[0]))
-
         # Use highest-priority candidate
         best_source, best_value, best_confidence = candidates[0]
 
@@ -196,6 +280,7 @@ class FieldResolver:
             extracted_value=extracted_value,
         )
 
+    @span("field_resolution")
     def resolve_all(
         self,
         extracted_fields: dict[str, Any],
@@ -213,31 +298,22 @@ class FieldResolver:
         Returns:
             Dict of field_key -> ResolvedField
         """
-        # Collect all field keys to resolve
+        plan = self.get_plan(context)
+
+        # Collect all field keys to resolve (including constant fields from the plan)
         field_keys = set(extracted_fields.keys())
         field_keys.update(context.user_overrides.keys())
         field_keys.update(context.default_values.keys())
+        field_keys.update(plan.field_keys)
 
         if additional_fields:
             field_keys.update(additional_fields)
 
-        # Add fields from auction profile
-        if context.auction_code:
-            profile = self.auction_service.get_profile(context.auction_code)
-            if profile:
-                field_keys.update(profile.field_defaults.keys())
-
-        # Add fields from warehouse constants
-        if context.warehouse_code:
-            wc = self.warehouse_service.get_constants(context.warehouse_code)
-            if wc:
-                field_keys.update(wc.constants.keys())
-
         # Resolve each field
         results = {}
         for field_key in sorted(field_keys):
             extracted = extracted_fields.get(field_key)
-            results[field_key] = self.resolve_field(field_key, extracted, context)
+            results[field_key] = self.resolve_field(field_key, extracted, context, plan)
 
         return results
 
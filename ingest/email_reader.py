@@ -1,42 +1,185 @@
 """Email reader with IMAP and OAuth2/Graph support."""
 
+import base64
+import binascii
 import email
 import hashlib
 import imaplib
+import io
 import logging
+import os
+import shutil
+import tempfile
+import uuid
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 from email.header import decode_header
 from email.utils import parsedate_to_datetime
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from core.config import EmailConfig
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for decoding/hashing attachment payloads
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+
+def iter_decoded_payload(
+    part: email.message.Message, chunk_size: int = SPOOL_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield the decoded payload of a MIME part in chunks.
+
+    Base64 parts (virtually all PDF attachments) are decoded incrementally
+    so the whole decoded attachment never sits in memory at once. Other
+    transfer encodings are rare for binary parts and are decoded in one go.
+    """
+    cte = str(part.get("Content-Transfer-Encoding", "7bit")).strip().lower()
+    encoded = part.get_payload(decode=False)
+
+    if cte != "base64" or not isinstance(encoded, str):
+        payload = part.get_payload(decode=True)
+        if payload:
+            yield payload
+        return
+
+    buf = ""
+    for start in range(0, len(encoded), chunk_size):
+        buf += "".join(encoded[start : start + chunk_size].split())
+        usable = len(buf) - len(buf) % 4
+        if usable:
+            yield base64.b64decode(buf[:usable])
+            buf = buf[usable:]
+    if buf:
+        yield base64.b64decode(buf + "=" * (-len(buf) % 4))
+
+
+def spool_part(part: email.message.Message, dest_path: str) -> tuple[int, str]:
+    """
+    Stream a MIME part's decoded payload to dest_path, hashing as it goes.
+
+    Returns (size, sha256). The destination is removed if nothing was written.
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    def _write(chunks: Iterator[bytes]) -> None:
+        nonlocal size
+        with open(dest_path, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+
+    try:
+        _write(iter_decoded_payload(part))
+    except binascii.Error:
+        # Malformed base64 - let the email package apply its lenient decoder
+        logger.warning("Chunked base64 decode failed, falling back to full decode")
+        digest = hashlib.sha256()
+        size = 0
+        payload = part.get_payload(decode=True) or b""
+        _write(iter([payload]))
+
+    if size == 0 and os.path.exists(dest_path):
+        os.remove(dest_path)
+
+    return size, digest.hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = SPOOL_CHUNK_SIZE) -> str:
+    """SHA256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 @dataclass
 class Attachment:
-    """Email attachment data."""
+    """
+    Email attachment data.
+
+    Content is either held in memory (``content``) or spooled to disk
+    (``spool_path``, with ``content`` left as None). Use open()/as_file()
+    rather than ``content`` so both forms work.
+    """
 
     filename: str
     content_type: str
-    content: bytes
+    content: Optional[bytes]
     size: int
     is_inline: bool = False
+    spool_path: Optional[str] = None
+    sha256: Optional[str] = None  # Computed once, while spooling or on first access
 
     @property
     def hash(self) -> str:
-        """SHA256 hash of attachment content."""
-        return hashlib.sha256(self.content).hexdigest()
+        """SHA256 hash of attachment content (cached)."""
+        if self.sha256 is None:
+            if self.spool_path:
+                self.sha256 = hash_file(self.spool_path)
+            else:
+                self.sha256 = hashlib.sha256(self.content or b"").hexdigest()
+        return self.sha256
 
     @property
     def is_pdf(self) -> bool:
         """Check if attachment is a PDF."""
         return self.content_type == "application/pdf" or self.filename.lower().endswith(".pdf")
 
+    def open(self) -> BinaryIO:
+        """Open the attachment content as a binary file handle."""
+        if self.spool_path:
+            return open(self.spool_path, "rb")
+        return io.BytesIO(self.content or b"")
+
+    @contextmanager
+    def as_file(self, temp_dir: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield a filesystem path holding the attachment content.
+
+        Spooled attachments yield their spool file directly; in-memory ones
+        are written to a temporary file that is removed afterwards.
+        """
+        if self.spool_path:
+            yield self.spool_path
+            return
+
+        if temp_dir:
+            os.makedirs(temp_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=".pdf", dir=temp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.content or b"")
+            yield path
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def save_to(self, path: str) -> str:
+        """Copy the attachment content to path."""
+        if self.spool_path:
+            shutil.copyfile(self.spool_path, path)
+        else:
+            with open(path, "wb") as f:
+                f.write(self.content or b"")
+        return path
+
+    def release(self) -> None:
+        """Delete the spool file, if any. The attachment is unusable afterwards."""
+        if self.spool_path and os.path.exists(self.spool_path):
+            try:
+                os.remove(self.spool_path)
+            except OSError as e:
+                logger.warning(f"Could not remove spool file {self.spool_path}: {e}")
+        self.spool_path = None
+
 
 @dataclass
 class EmailMessage:
@@ -78,6 +221,11 @@ class EmailMessage:
         """Get only PDF attachments (non-inline)."""
         return [a for a in self.attachments if a.is_pdf and not a.is_inline]
 
+    def release_attachments(self) -> None:
+        """Delete spool files for all attachments."""
+        for attachment in self.attachments:
+            attachment.release()
+
 
 class BaseEmailReader(ABC):
     """Abstract base class for email readers."""
@@ -132,17 +280,26 @@ class BaseEmailReader(ABC):
 
 
 class IMAPEmailReader(BaseEmailReader):
-    """IMAP email reader with basic auth or OAuth2 XOAUTH2."""
+    """
+    IMAP email reader with basic auth or OAuth2 XOAUTH2.
 
-    def __init__(self, config: EmailConfig):
+    If spool_dir is set, attachments are streamed to spool files there
+    (hashed while writing) instead of being held in memory.
+    """
+
+    def __init__(self, config: EmailConfig, spool_dir: Optional[str] = None):
         self.config = config
-        self._connection: Optional[imaplib.IMAP4_SSL] = None
+        self.spool_dir = spool_dir
+        self._connection: Optional[imaplib.IMAP4] = None
 
     def connect(self) -> None:
         """Connect to IMAP server."""
         logger.info(f"Connecting to IMAP server: {self.config.imap_server}:{self.config.imap_port}")
 
-        self._connection = imaplib.IMAP4_SSL(self.config.imap_server, self.config.imap_port)
+        if self.config.imap_ssl:
+            self._connection = imaplib.IMAP4_SSL(self.config.imap_server, self.config.imap_port)
+        else:
+            self._connection = imaplib.IMAP4(self.config.imap_server, self.config.imap_port)
 
         # Try OAuth2 XOAUTH2 if we have client credentials
         if self.config.client_id and self.config.client_secret:
@@ -160,6 +317,11 @@ class IMAPEmailReader(BaseEmailReader):
 
         logger.info(f"Connected to IMAP, selected folder: {self.config.folder}")
 
+    @property
+    def connection(self) -> Optional[imaplib.IMAP4]:
+        """The underlying IMAP connection, if connected."""
+        return self._connection
+
     def disconnect(self) -> None:
         """Disconnect from IMAP server."""
         if self._connection:
@@ -227,8 +389,9 @@ class IMAPEmailReader(BaseEmailReader):
             logger.error(f"Failed to fetch message UID {uid}")
             return None
 
-        raw_email = data[0][1]
-        msg = email.message_from_bytes(raw_email)
+        msg = email.message_from_bytes(data[0][1])
+        # Drop the raw bytes before decoding attachments
+        del data
 
         return self._parse_message(msg, uid)
 
@@ -268,17 +431,11 @@ class IMAPEmailReader(BaseEmailReader):
 
             if filename:
                 # It's an attachment
-                payload = part.get_payload(decode=True)
-                if payload:
-                    attachments.append(
-                        Attachment(
-                            filename=self._decode_filename(filename),
-                            content_type=content_type,
-                            content=payload,
-                            size=len(payload),
-                            is_inline=is_inline,
-                        )
-                    )
+                attachment = self._read_attachment(
+                    part, self._decode_filename(filename), content_type, is_inline
+                )
+                if attachment:
+                    attachments.append(attachment)
             elif content_type == "text/plain" and not is_inline:
                 payload = part.get_payload(decode=True)
                 if payload:
@@ -304,6 +461,41 @@ class IMAPEmailReader(BaseEmailReader):
             uid=uid,
         )
 
+    def _read_attachment(
+        self,
+        part: email.message.Message,
+        filename: str,
+        content_type: str,
+        is_inline: bool,
+    ) -> Optional[Attachment]:
+        """Decode an attachment part, spooling it to disk if configured."""
+        if not self.spool_dir:
+            payload = part.get_payload(decode=True)
+            if not payload:
+                return None
+            return Attachment(
+                filename=filename,
+                content_type=content_type,
+                content=payload,
+                size=len(payload),
+                is_inline=is_inline,
+            )
+
+        os.makedirs(self.spool_dir, exist_ok=True)
+        spool_path = os.path.join(self.spool_dir, f"att_{uuid.uuid4().hex}")
+        size, sha256 = spool_part(part, spool_path)
+        if not size:
+            return None
+        return Attachment(
+            filename=filename,
+            content_type=content_type,
+            content=None,
+            size=size,
+            is_inline=is_inline,
+            spool_path=spool_path,
+            sha256=sha256,
+        )
+
     @staticmethod
     def _decode_filename(filename: str) -> str:
         """Decode potentially encoded filename."""
@@ -486,9 +678,13 @@ class GraphEmailReader(BaseEmailReader):
 EmailReader = BaseEmailReader
 
 
-def create_email_reader(config: EmailConfig) -> EmailReader:
-    """Factory function to create appropriate email reader based on config."""
+def create_email_reader(config: EmailConfig, spool_dir: Optional[str] = None) -> EmailReader:
+    """
+    Factory function to create appropriate email reader based on config.
+
+    spool_dir enables on-disk attachment spooling for IMAP readers.
+    """
     if config.provider == "graph":
         return GraphEmailReader(config)
     else:
-        return IMAPEmailReader(config)
+        return IMAPEmailReader(config, spool_dir=spool_dir)
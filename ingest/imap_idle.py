@@ -0,0 +1,279 @@
+"""
+IMAP IDLE push mode (RFC 2177).
+
+Keeps one authenticated connection open and blocks in IDLE until the server
+reports new mail (``* <n> EXISTS`` / ``RECENT``), so messages are picked up
+within seconds instead of up to one poll interval later.
+
+- IDLE is re-issued every ``idle_timeout`` seconds (servers drop idlers
+  after ~30 minutes)
+- Connection errors trigger reconnect with exponential backoff
+- Servers without the IDLE capability fall back to polling on the same
+  persistent connection
+
+imaplib (before Python 3.14) has no IDLE support, so the command is driven
+with imaplib's low-level send/readline on the existing connection.
+"""
+
+import imaplib
+import logging
+import re
+import select
+import ssl
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Untagged responses that mean the mailbox changed
+_NEW_MAIL_RE = re.compile(rb"^\* \d+ (EXISTS|RECENT)", re.IGNORECASE)
+
+# How often a blocked IDLE wakes up to check for a stop request
+_STOP_CHECK_SECONDS = 1.0
+
+
+def supports_idle(conn: imaplib.IMAP4) -> bool:
+    """Check whether the server advertised the IDLE capability."""
+    return "IDLE" in getattr(conn, "capabilities", ())
+
+
+def _has_buffered_data(conn: imaplib.IMAP4) -> bool:
+    """True if a response line is already buffered (socket select would miss it)."""
+    sock = conn.sock
+    if isinstance(sock, ssl.SSLSocket) and sock.pending():
+        return True
+
+    timeout = sock.gettimeout()
+    sock.setblocking(False)
+    try:
+        return bool(conn.file.peek(1))
+    except (BlockingIOError, ssl.SSLWantReadError):
+        return False
+    finally:
+        sock.settimeout(timeout)
+
+
+def take_new_mail_notices(conn: imaplib.IMAP4) -> bool:
+    """
+    Pop EXISTS/RECENT responses imaplib stashed while other commands ran.
+
+    A notification that arrives during a FETCH/STORE/EXPUNGE is kept in
+    conn.untagged_responses rather than read by idle_wait, so it has to be
+    checked before IDLE is re-entered.
+    """
+    found = False
+    for name in ("EXISTS", "RECENT"):
+        if conn.untagged_responses.pop(name, None):
+            found = True
+    return found
+
+
+def _wait_readable(conn: imaplib.IMAP4, timeout: float) -> bool:
+    if _has_buffered_data(conn):
+        return True
+    readable, _, _ = select.select([conn.sock], [], [], timeout)
+    return bool(readable)
+
+
+def idle_wait(
+    conn: imaplib.IMAP4,
+    timeout: float,
+    stop_event: Optional[threading.Event] = None,
+) -> bool:
+    """
+    Run one IDLE cycle on a selected mailbox.
+
+    Blocks until new mail is announced, timeout elapses, or stop_event is set,
+    then ends IDLE with DONE and reads the tagged completion.
+
+    Returns:
+        True if the server reported new mail (EXISTS/RECENT)
+
+    Raises:
+        imaplib.IMAP4.abort on protocol errors or a dropped connection
+    """
+    tag = conn._new_tag()
+    conn.send(tag + b" IDLE\r\n")
+
+    # Wait for the "+ idling" continuation
+    while True:
+        line = conn.readline()
+        if not line:
+            raise imaplib.IMAP4.abort("connection closed while starting IDLE")
+        if line.startswith(b"+"):
+            break
+        if line.startswith(tag):
+            raise imaplib.IMAP4.abort(f"IDLE rejected: {line.strip().decode(errors='replace')}")
+        # Untagged data before the continuation is fine to ignore
+
+    new_mail = False
+    deadline = time.monotonic() + timeout
+
+    while not new_mail:
+        if stop_event is not None and stop_event.is_set():
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if not _wait_readable(conn, min(remaining, _STOP_CHECK_SECONDS)):
+            continue
+
+        line = conn.readline()
+        if not line:
+            raise imaplib.IMAP4.abort("connection closed during IDLE")
+        if line.startswith(b"* BYE"):
+            raise imaplib.IMAP4.abort(line.strip().decode(errors="replace"))
+        if _NEW_MAIL_RE.match(line):
+            new_mail = True
+
+    # Leave IDLE and consume everything up to the tagged OK
+    conn.send(b"DONE\r\n")
+    while True:
+        line = conn.readline()
+        if not line:
+            raise imaplib.IMAP4.abort("connection closed while ending IDLE")
+        if _NEW_MAIL_RE.match(line):
+            new_mail = True
+        if line.startswith(tag):
+            if b" OK" not in line.upper():
+                raise imaplib.IMAP4.abort(line.strip().decode(errors="replace"))
+            break
+
+    return new_mail
+
+
+class IdleLoop:
+    """
+    Push-mode mail loop on a single persistent IMAP connection.
+
+    Args:
+        connect: Returns a logged-in connection with the mailbox selected
+        disconnect: Closes the connection returned by connect()
+        on_new_mail: Processes unseen mail; called once after every
+            (re)connect and then on each change notification. Return True
+            if more mail is waiting (it will be called again immediately).
+        poll_interval: Seconds between checks when IDLE is unsupported
+        idle_timeout: Seconds before IDLE is renewed (under the server's ~30 min limit)
+        backoff_initial / backoff_max: Reconnect delay bounds in seconds
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], imaplib.IMAP4],
+        disconnect: Callable[[], None],
+        on_new_mail: Callable[[], Optional[bool]],
+        poll_interval: float = 300,
+        idle_timeout: float = 25 * 60,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 300.0,
+    ):
+        self.connect = connect
+        self.disconnect = disconnect
+        self.on_new_mail = on_new_mail
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+
+        self._stop = threading.Event()
+        self.mode: str = "stopped"  # idle, poll, reconnecting, stopped
+        self.reconnects = 0
+        self.notifications = 0
+        self.last_error: Optional[str] = None
+
+    def stop(self) -> None:
+        """Request the loop to exit (takes effect within ~1 second)."""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def _drain(self) -> None:
+        """
+        Call on_new_mail until it reports nothing left.
+
+        Connection errors propagate so the loop reconnects. Any other error
+        (e.g. a locked database) is recorded in last_error and retried with
+        backoff on the same connection, so the thread never dies on it.
+        """
+        backoff = self.backoff_initial
+        while not self._stop.is_set():
+            try:
+                if not self.on_new_mail():
+                    return
+                backoff = self.backoff_initial
+            except (imaplib.IMAP4.error, OSError):
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(
+                    f"Processing new mail failed, retrying in {backoff:.0f}s: {e}", exc_info=True
+                )
+                if self._stop.wait(backoff):
+                    return
+                backoff = min(backoff * 2, self.backoff_max)
+
+    def _drain_until_quiet(self, conn: imaplib.IMAP4) -> None:
+        """Drain, then drain again while mail arrived during the previous pass."""
+        # Notices from before this pass (e.g. SELECT's EXISTS) are covered by it
+        take_new_mail_notices(conn)
+        self._drain()
+        while not self._stop.is_set() and take_new_mail_notices(conn):
+            logger.debug("New mail arrived while processing, draining again")
+            self._drain()
+
+    def _serve(self, conn: imaplib.IMAP4) -> None:
+        """Process mail on one connection until stopped or it fails."""
+        self._drain_until_quiet(conn)
+
+        if not supports_idle(conn):
+            self.mode = "poll"
+            logger.info("IMAP server does not support IDLE, polling on persistent connection")
+            while not self._stop.wait(self.poll_interval):
+                conn.noop()
+                self._drain_until_quiet(conn)
+            return
+
+        self.mode = "idle"
+        while not self._stop.is_set():
+            if idle_wait(conn, self.idle_timeout, self._stop):
+                self.notifications += 1
+                logger.debug("IDLE: new mail notification")
+                self._drain_until_quiet(conn)
+
+    def run(self) -> None:
+        """Run until stop() is called (including before it starts). Blocking - use a thread."""
+        backoff = self.backoff_initial
+
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self.connect()
+                if conn is None:
+                    raise ConnectionError("IMAP connect failed")
+                backoff = self.backoff_initial
+                self.last_error = None
+                self._serve(conn)
+            except Exception as e:
+                self.last_error = str(e)
+                self.mode = "reconnecting"
+                self.reconnects += 1
+                if isinstance(e, (imaplib.IMAP4.error, OSError)):
+                    logger.warning(f"IMAP connection lost ({e}), reconnecting in {backoff:.0f}s")
+                else:
+                    logger.error(
+                        f"IMAP loop error, reconnecting in {backoff:.0f}s: {e}", exc_info=True
+                    )
+                if self._stop.wait(backoff):
+                    break
+                backoff = min(backoff * 2, self.backoff_max)
+            finally:
+                if conn is not None:
+                    try:
+                        self.disconnect()
+                    except Exception:
+                        pass
+
+        self.mode = "stopped"
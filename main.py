@@ -20,6 +20,7 @@ Usage:
     python main.py batch-extract ./invoices --write-sheet
     python main.py once --dry-run
     python main.py daemon --interval 60
+    python main.py daemon --idle
     python main.py validate
     python main.py sheets-upsert invoice.pdf
     python main.py cd-export --from-sheet --dry-run
@@ -84,6 +85,7 @@ def cmd_doctor(args):
         ("google.oauth2", "Google Sheets", "google-auth"),
         ("googleapiclient", "Google Sheets API", "google-api-python-client"),
         ("streamlit", "Web UI", "streamlit"),
+        ("numpy", "Vectorised warehouse routing", "numpy"),
     ]
     for dep in optional_deps:
         module_name = dep[0]
@@ -539,10 +541,14 @@ def cmd_daemon(args):
         print(f"Configuration error: {e}")
         return 1
 
-    print(f"Starting daemon mode (interval: {args.interval or config.email.check_interval}s)")
+    idle = args.idle or config.email.idle
+    if idle:
+        print("Starting daemon mode (IMAP IDLE push)")
+    else:
+        print(f"Starting daemon mode (interval: {args.interval or config.email.check_interval}s)")
     print("Press Ctrl+C to stop")
 
-    run_daemon(config, interval=args.interval)
+    run_daemon(config, interval=args.interval, idle=idle)
     return 0
 
 
@@ -978,13 +984,7 @@ def cmd_idempotency(args):
             print("Error: --days required for purge")
             return 1
 
-        with store._get_connection() as conn:
-            cursor = conn.execute(
-                "DELETE FROM processed_items WHERE processed_at < datetime('now', ?)",
-                (f"-{args.days} days",),
-            )
-            deleted = cursor.rowcount
-            conn.commit()
+        deleted = store.compact(args.days)
 
         print(f"Purged {deleted} records older than {args.days} days")
 
@@ -1053,6 +1053,9 @@ Examples:
     # daemon command
     daemon_parser = subparsers.add_parser("daemon", help="Run continuously")
     daemon_parser.add_argument("--interval", type=int, help="Check interval in seconds")
+    daemon_parser.add_argument(
+        "--idle", action="store_true", help="Use IMAP IDLE push instead of interval polling"
+    )
 
     # validate command
     validate_parser = subparsers.add_parser("validate", help="Validate credentials")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Build the offline ZIP centroid table used by warehouse routing.
+
+Converts the Census ZCTA Gazetteer file (e.g. 2020_Gaz_zcta_national.txt,
+tab-separated with GEOID, INTPTLAT and INTPTLONG columns) into the
+zip,lat,lng[,city,state] CSV read by services/zip_geocoder.py.
+
+Usage:
+    python scripts/build_zip_centroids.py GAZETTEER_FILE [--cities ZIP_CITY_CSV] [-o OUT]
+
+--cities takes any CSV with zip, city and state columns and adds city/state
+names so addresses without a known ZIP can still be placed offline.
+"""
+
+import argparse
+import csv
+import gzip
+import os
+import sys
+
+
+def _open(path: str, mode: str = "rt"):
+    return (
+        gzip.open(path, mode, newline="")
+        if path.endswith(".gz")
+        else open(path, mode[0], newline="")
+    )
+
+
+def read_gazetteer(path: str) -> dict[str, tuple[str, str]]:
+    """Read ZCTA -> (lat, lng) from a Gazetteer file."""
+    centroids = {}
+    with _open(path) as f:
+        reader = csv.reader(f, delimiter="\t")
+        header = [h.strip() for h in next(reader)]
+        geoid, lat, lng = header.index("GEOID"), header.index("INTPTLAT"), header.index("INTPTLONG")
+        for row in reader:
+            centroids[row[geoid].strip().zfill(5)] = (row[lat].strip(), row[lng].strip())
+    return centroids
+
+
+def read_cities(path: str) -> dict[str, tuple[str, str]]:
+    """Read ZIP -> (city, state) from a CSV with zip, city and state columns."""
+    cities = {}
+    with _open(path) as f:
+        for row in csv.DictReader(f):
+            zip_code = (row.get("zip") or "").strip().zfill(5)
+            if zip_code.strip("0") and row.get("city") and row.get("state"):
+                cities.setdefault(zip_code, (row["city"].strip(), row["state"].strip().upper()))
+    return cities
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("gazetteer", help="Census ZCTA Gazetteer file (.txt or .txt.gz)")
+    parser.add_argument("--cities", help="CSV with zip, city, state columns")
+    parser.add_argument("-o", "--output", default="zip_centroids.csv", help="Output CSV")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.gazetteer):
+        print(f"ERROR: {args.gazetteer} not found")
+        return 1
+
+    centroids = read_gazetteer(args.gazetteer)
+    cities = read_cities(args.cities) if args.cities else {}
+
+    with _open(args.output, "wt") as f:
+        writer = csv.writer(f)
+        writer.writerow(["zip", "lat", "lng", "city", "state"])
+        for zip_code in sorted(centroids):
+            city, state = cities.get(zip_code, ("", ""))
+            writer.writerow([zip_code, *centroids[zip_code], city, state])
+
+    print(f"Wrote {len(centroids)} ZIP centroids ({len(cities)} with city names) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
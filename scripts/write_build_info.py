@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Write the build stamp read by the health endpoints.
+
+Run at build/deploy time so /api/health reports the deployed version without
+calling git on every process start (and works where .git is not shipped).
+
+Usage:
+    python scripts/write_build_info.py [--version 1.2.0] [-o build_info.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.check_output(["git", *args], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> int:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from api.routes.health import APP_VERSION
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--version", default=APP_VERSION, help="Application version")
+    parser.add_argument("-o", "--output", default="build_info.json", help="Stamp file path")
+    args = parser.parse_args()
+
+    info = {
+        "version": args.version,
+        "git_sha": _git("rev-parse", "--short", "HEAD"),
+        "git_branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+        "build_time": datetime.utcnow().isoformat() + "Z",
+    }
+    with open(args.output, "w") as f:
+        json.dump(info, f, indent=2)
+    print(f"Wrote {args.output}: {info}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,7 @@ Features:
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -18,6 +19,7 @@ from typing import Any, Optional
 import yaml
 
 from services.central_dispatch import CentralDispatchClient
+from services.idempotency import IdempotencyStore
 from services.sheets import PickupRecord, PickupStatus, SheetsClient
 
 logger = logging.getLogger(__name__)
@@ -552,12 +554,25 @@ class CDExporter:
         sheets_client: Optional[SheetsClient],
         defaults_loader: Optional[CDDefaultsLoader] = None,
         field_mapper: Optional[CDFieldMapper] = None,
+        idempotency_store: Optional[IdempotencyStore] = None,
     ):
         self.cd_client = cd_client
         self.sheets_client = sheets_client
         self.defaults_loader = defaults_loader or CDDefaultsLoader()
         self.field_mapper = field_mapper or CDFieldMapper()
         self.validator = CDPayloadValidator(field_mapper=self.field_mapper)
+        self._idempotency_store = idempotency_store
+
+    @property
+    def idempotency_store(self) -> IdempotencyStore:
+        """Lazy-load idempotency store (records posted listings)."""
+        if self._idempotency_store is None:
+            from core.config import get_config
+
+            self._idempotency_store = IdempotencyStore(
+                db_path=get_config().storage.idempotency_db_path
+            )
+        return self._idempotency_store
 
     def build_listing_payload(
         self,
@@ -714,38 +729,25 @@ class CDExporter:
 
         return payload
 
-    def export_record(
+    def _prepare_payload(
         self,
         record: PickupRecord,
         delivery_address: dict[str, str],
         price: float,
-        row_number: Optional[int] = None,
         extraction_score: Optional[float] = None,
-    ) -> dict[str, Any]:
-        """Export a single record to Central Dispatch.
-
-        Args:
-            record: PickupRecord with vehicle and pickup information
-            delivery_address: Destination warehouse/address dict
-            price: Transport price
-            row_number: Optional row number in Google Sheets for status updates
-            extraction_score: Optional parser confidence score (0.0-1.0)
+    ) -> tuple[Optional[dict[str, Any]], Optional[dict[str, Any]]]:
+        """Validate a record and build its payload.
 
         Returns:
-            Dict with success status and listing_id or error message
+            (payload, None) if the record can be sent, otherwise
+            (None, outcome) describing the failure (see _post_payload)
         """
         # Pre-validate record
         record_errors = self.validator.validate_record(record)
         if record_errors:
             error_msg = "; ".join(record_errors)
             logger.error(f"Record validation failed for {record.vin}: {error_msg}")
-
-            if self.sheets_client and row_number:
-                self.sheets_client.update_status(
-                    row_number, PickupStatus.ERROR, error_message=f"Record: {error_msg}"
-                )
-
-            return {"success": False, "error": error_msg}
+            return None, self._failure(error_msg, f"Record: {error_msg}")
 
         # Build payload
         payload = self.build_listing_payload(record, delivery_address, price, extraction_score)
@@ -755,63 +757,109 @@ class CDExporter:
         if payload_errors:
             error_msg = "; ".join(payload_errors)
             logger.error(f"Payload validation failed for {record.vin}: {error_msg}")
-
-            if self.sheets_client and row_number:
-                self.sheets_client.update_status(
-                    row_number, PickupStatus.ERROR, error_message=f"Payload: {error_msg}"
-                )
-
-            return {"success": False, "error": error_msg}
+            return None, self._failure(error_msg, f"Payload: {error_msg}")
 
         # Log payload for debugging
         logger.debug(f"CD payload for {record.vin}: {payload}")
+        return payload, None
 
-        # Send to CD
+    @staticmethod
+    def _failure(error: str, sheet_error: str) -> dict[str, Any]:
+        return {
+            "result": {"success": False, "error": error},
+            "status": PickupStatus.ERROR,
+            "fields": {"error_message": sheet_error},
+        }
+
+    def _post_payload(self, record: PickupRecord, payload: dict[str, Any]) -> dict[str, Any]:
+        """Send a payload to CD. Safe to call from worker threads; never raises.
+
+        Returns:
+            Outcome dict with the export ``result`` and the sheet ``status``
+            and ``fields`` to record for it
+        """
         try:
             result = self.cd_client.create_listing_raw(payload)
 
             if result.get("success"):
                 listing_id = result.get("listing_id", "")
                 logger.info(f"Created CD listing {listing_id} for {record.vin}")
-
-                if self.sheets_client and row_number:
-                    self.sheets_client.update_status(
-                        row_number,
-                        PickupStatus.CD_CREATED,
-                        cd_listing_id=listing_id,
-                    )
-
                 return {
-                    "success": True,
-                    "listing_id": listing_id,
-                    "etag": result.get("etag"),
-                    "location": result.get("location"),
+                    "result": {
+                        "success": True,
+                        "listing_id": listing_id,
+                        "etag": result.get("etag"),
+                        "location": result.get("location"),
+                    },
+                    "status": PickupStatus.CD_CREATED,
+                    "fields": {"cd_listing_id": listing_id},
                 }
-            else:
-                error_msg = result.get("error", "Unknown error")
-                logger.error(f"CD API error for {record.vin}: {error_msg}")
-
-                if self.sheets_client and row_number:
-                    self.sheets_client.update_status(
-                        row_number, PickupStatus.ERROR, error_message=f"CD API: {error_msg}"
-                    )
 
-                return {"success": False, "error": error_msg}
+            error_msg = result.get("error", "Unknown error")
+            logger.error(f"CD API error for {record.vin}: {error_msg}")
+            return self._failure(error_msg, f"CD API: {error_msg}")
 
         except Exception as e:
             logger.error(f"Exception exporting {record.vin}: {e}")
-            if self.sheets_client and row_number:
-                self.sheets_client.update_status(
-                    row_number, PickupStatus.ERROR, error_message=str(e)
-                )
-            return {"success": False, "error": str(e)}
+            return self._failure(str(e), str(e))
+
+    def export_record(
+        self,
+        record: PickupRecord,
+        delivery_address: dict[str, str],
+        price: float,
+        row_number: Optional[int] = None,
+        extraction_score: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """Export a single record to Central Dispatch.
+
+        Args:
+            record: PickupRecord with vehicle and pickup information
+            delivery_address: Destination warehouse/address dict
+            price: Transport price
+            row_number: Optional row number in Google Sheets for status updates
+            extraction_score: Optional parser confidence score (0.0-1.0)
+
+        Returns:
+            Dict with success status and listing_id or error message. A record
+            already posted by an earlier run is not sent again (``duplicate``),
+            and a failed status write is reported as ``sheet_update_error``.
+        """
+        key = self._cd_key(record)
+        posted = self.idempotency_store.get_result_ids([key]) if key else {}
+        if key in posted:
+            outcome = self._posted_outcome(record, posted[key])
+        else:
+            payload, outcome = self._prepare_payload(
+                record, delivery_address, price, extraction_score
+            )
+            if payload is not None:
+                outcome = self._post_and_record(record, payload)
+
+        if self.sheets_client and row_number:
+            try:
+                self.sheets_client.update_status(row_number, outcome["status"], **outcome["fields"])
+            except Exception as e:
+                logger.error(f"Failed to write CD export status for {record.vin}: {e}")
+                outcome["result"]["sheet_update_error"] = str(e)
+
+        return outcome["result"]
 
     def export_pending_from_sheets(
         self,
         delivery_address: dict[str, str],
         default_price: float = 500.0,
+        workers: int = 1,
     ) -> dict[str, Any]:
-        """Export all READY_FOR_CD records from Google Sheets."""
+        """Export all READY_FOR_CD records from Google Sheets.
+
+        With workers > 1, payloads are built and validated up front, posted
+        to CD in parallel (sharing the client's rate limit), and the status
+        updates are written back in a single batch. Either way each listing
+        is recorded in the idempotency store as soon as CD accepts it, so
+        rows whose status write failed (reported as ``sheet_update_error``)
+        or never happened are not posted again on the next run.
+        """
         if not self.sheets_client:
             return {"error": "Sheets client not configured"}
 
@@ -820,9 +868,17 @@ class CDExporter:
 
         results = {"exported": 0, "failed": 0, "errors": []}
 
-        for row_number, record in records:
-            result = self.export_record(record, delivery_address, default_price, row_number)
-
+        if workers > 1:
+            outcomes = self._export_concurrently(records, delivery_address, default_price, workers)
+        else:
+            outcomes = [
+                self.export_record(record, delivery_address, default_price, row_number)
+                for row_number, record in records
+            ]
+
+        for (_, record), result in zip(records, outcomes):
+            if result.get("sheet_update_error"):
+                results["sheet_update_error"] = result["sheet_update_error"]
             if result.get("success"):
                 results["exported"] += 1
             else:
@@ -836,6 +892,94 @@ class CDExporter:
 
         return results
 
+    @staticmethod
+    def _cd_key(record: PickupRecord) -> Optional[str]:
+        """Idempotency key of a record's CD listing, or None if the record has no identity."""
+        if not record.thread_root_id and not record.attachment_hash:
+            return None
+        return f"cd:{record.idempotency_key}"
+
+    @staticmethod
+    def _posted_outcome(record: PickupRecord, listing_id: Optional[str]) -> dict[str, Any]:
+        """Outcome for a record whose listing an earlier run already created."""
+        logger.info(f"CD listing {listing_id} for {record.vin} already posted")
+        return {
+            "result": {"success": True, "listing_id": listing_id, "duplicate": True},
+            "status": PickupStatus.CD_CREATED,
+            "fields": {"cd_listing_id": listing_id},
+        }
+
+    def _post_and_record(self, record: PickupRecord, payload: dict[str, Any]) -> dict[str, Any]:
+        """Post a payload and record the listing as soon as CD has accepted it."""
+        outcome = self._post_payload(record, payload)
+        key = self._cd_key(record)
+        if key and outcome["result"].get("success"):
+            try:
+                self.idempotency_store.mark_processed_many(
+                    [
+                        {
+                            "idempotency_key": key,
+                            "thread_root_id": record.thread_root_id,
+                            "attachment_hash": record.attachment_hash,
+                            "source_type": record.auction_source,
+                            "result_type": "cd_listing",
+                            "result_id": outcome["result"].get("listing_id") or "",
+                        }
+                    ]
+                )
+            except Exception as e:
+                logger.error(f"Failed to record CD listing for {record.vin}: {e}")
+        return outcome
+
+    def _export_concurrently(
+        self,
+        records: list[tuple[int, PickupRecord]],
+        delivery_address: dict[str, str],
+        price: float,
+        workers: int,
+    ) -> list[dict[str, Any]]:
+        """Export records with parallel CD requests. Returns results in record order."""
+        # Rows posted by an earlier run whose status write failed
+        keys = [self._cd_key(record) for _, record in records]
+        posted = self.idempotency_store.get_result_ids(k for k in keys if k)
+
+        outcomes: list[Optional[dict[str, Any]]] = []
+        to_post = []
+        for idx, ((_, record), key) in enumerate(zip(records, keys)):
+            if key in posted:
+                outcomes.append(self._posted_outcome(record, posted[key]))
+                continue
+            payload, outcome = self._prepare_payload(record, delivery_address, price)
+            outcomes.append(outcome)
+            if payload is not None:
+                to_post.append((idx, record, payload))
+
+        if to_post:
+            with ThreadPoolExecutor(
+                max_workers=min(workers, len(to_post)), thread_name_prefix="cd-export"
+            ) as pool:
+                futures = [
+                    (idx, pool.submit(self._post_and_record, record, payload))
+                    for idx, record, payload in to_post
+                ]
+                for idx, future in futures:
+                    outcomes[idx] = future.result()
+
+        # Write only the status, listing and error cells in one batch; other
+        # cells may have been edited since the rows were read
+        updates = []
+        for (row_number, _), outcome in zip(records, outcomes):
+            fields = {name: value for name, value in outcome["fields"].items() if value}
+            updates.append((row_number, {"status": outcome["status"].value, **fields}))
+        try:
+            self.sheets_client.update_fields(updates)
+        except Exception as e:
+            logger.error(f"Failed to write CD export statuses to sheet: {e}")
+            for outcome in outcomes:
+                outcome["result"]["sheet_update_error"] = str(e)
+
+        return [outcome["result"] for outcome in outcomes]
+
 
 # Add create_listing_raw method to CentralDispatchClient if not exists
 def _add_create_listing_raw():
@@ -293,12 +293,14 @@ class CDSheetExporter:
         from google.oauth2 import service_account
         from googleapiclient.discovery import build
 
+        from core.telemetry import sheets_request_builder
+
         creds_path = Path(self.sheets_config.credentials_file)
         creds = service_account.Credentials.from_service_account_file(
             str(creds_path),
             scopes=["https://www.googleapis.com/auth/spreadsheets"],
         )
-        service = build("sheets", "v4", credentials=creds)
+        service = build("sheets", "v4", credentials=creds, requestBuilder=sheets_request_builder())
 
         now = datetime.now().isoformat()
         updates = []
@@ -18,6 +18,7 @@ Schema Version: 3
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 from schemas.sheets_schema_v3 import (
@@ -26,6 +27,7 @@ from schemas.sheets_schema_v3 import (
     apply_all_overrides,
     validate_row_for_ready,
 )
+from services.idempotency import IdempotencyStore
 from services.sheets_exporter_v3 import SheetsExporterV3
 
 logger = logging.getLogger(__name__)
@@ -39,7 +41,8 @@ class CDSheetExporterV2:
     1. Query sheet for READY/RETRY rows
     2. Validate each row
     3. Build CD V2 payload with override resolution
-    4. Call CD API (or dry-run)
+    4. Call CD API (or dry-run), up to cd_config.max_concurrent at once,
+       recording each created listing by dispatch_id
     5. Update sheet with results
     """
 
@@ -48,6 +51,7 @@ class CDSheetExporterV2:
         sheets_config,
         cd_config,
         sheet_name: str = "Pickups",
+        idempotency_store: Optional[IdempotencyStore] = None,
     ):
         """
         Initialize the exporter.
@@ -56,12 +60,14 @@ class CDSheetExporterV2:
             sheets_config: Sheets configuration
             cd_config: Central Dispatch configuration
             sheet_name: Name of the sheet tab
+            idempotency_store: Records posted listings (default: configured store)
         """
         self.sheets_config = sheets_config
         self.cd_config = cd_config
         self.sheet_name = sheet_name
         self._sheets_exporter = None
         self._cd_client = None
+        self._idempotency_store = idempotency_store
 
     @property
     def sheets_exporter(self) -> SheetsExporterV3:
@@ -83,9 +89,29 @@ class CDSheetExporterV2:
                 client_id=self.cd_config.client_id,
                 client_secret=self.cd_config.client_secret,
                 marketplace_id=self.cd_config.marketplace_id,
+                max_concurrent=self.cd_config.max_concurrent,
+                requests_per_second=self.cd_config.requests_per_second,
+                api_base=self.cd_config.api_base_url or None,
+                token_url=self.cd_config.token_url or None,
             )
         return self._cd_client
 
+    @property
+    def idempotency_store(self) -> IdempotencyStore:
+        """Lazy-load idempotency store (records posted listings)."""
+        if self._idempotency_store is None:
+            from core.config import get_config
+
+            self._idempotency_store = IdempotencyStore(
+                db_path=get_config().storage.idempotency_db_path
+            )
+        return self._idempotency_store
+
+    @staticmethod
+    def _listing_key(dispatch_id: Optional[str]) -> Optional[str]:
+        """Idempotency key of a row's CD listing, or None without a dispatch_id."""
+        return f"cd:dispatch:{dispatch_id}" if dispatch_id else None
+
     def _get_final_value(self, row: dict[str, Any], base_field: str) -> Any:
         """
         Get final value for a field, considering overrides.
@@ -517,13 +543,22 @@ class CDSheetExporterV2:
         self,
         dry_run: bool = False,
         limit: Optional[int] = None,
+        workers: Optional[int] = None,
     ) -> dict[str, Any]:
         """
         Export READY and RETRY rows to Central Dispatch.
 
+        Rows are validated and their payloads built up front, then posted to
+        CD in parallel (sharing the client's rate limit), and the resulting
+        status updates are written to the sheet in batches. Each listing is
+        recorded by dispatch_id as soon as CD accepts it, so a row whose
+        status was never written (failed flush, crash) is not posted again:
+        the next run only retries its status write.
+
         Args:
             dry_run: If True, don't actually call CD API
             limit: Maximum number of rows to export
+            workers: Parallel CD requests (default: cd_config.max_concurrent)
 
         Returns:
             Dict with:
@@ -543,90 +578,190 @@ class CDSheetExporterV2:
             "results": [],
         }
 
-        for row in rows:
-            dispatch_id = row.get("dispatch_id")
-            row_result = {
-                "dispatch_id": dispatch_id,
-                "success": False,
-                "listing_id": None,
-                "error": None,
-            }
+        # Status and snapshot updates are queued and flushed in batches (one
+        # values.batchUpdate per batch of rows) instead of one write per call
+        try:
+            with self.sheets_exporter.buffered_writes():
+                self._export_rows(rows, dry_run, results, workers or self.cd_config.max_concurrent)
+        except Exception as e:
+            # CD calls already happened; only the sheet bookkeeping is missing
+            results["sheet_update_error"] = str(e)
+            logger.error(f"Failed to flush sheet updates: {e}")
 
-            try:
-                # Validate
-                errors = validate_row_for_ready(row)
-                if errors:
-                    row_result["error"] = f"Validation failed: {'; '.join(errors)}"
-                    row_result["success"] = False
-                    results["failed"] += 1
-
-                    if not dry_run:
-                        self.sheets_exporter.update_row_status(
-                            dispatch_id,
-                            RowStatus.ERROR,
-                            error_message=row_result["error"],
-                        )
+        return results
 
-                    results["results"].append(row_result)
-                    continue
+    def _prepare_row(self, row: dict[str, Any], dry_run: bool) -> dict[str, Any]:
+        """
+        Validate a row and build its payload.
 
-                # Build payload
-                payload = self.row_to_cd_payload(row)
+        Returns the row result; ``payload`` is set when the row should be posted.
+        """
+        dispatch_id = row.get("dispatch_id")
+        row_result = {
+            "dispatch_id": dispatch_id,
+            "success": False,
+            "listing_id": None,
+            "error": None,
+        }
 
-                # Save snapshot
-                if not dry_run:
-                    self.sheets_exporter.save_payload_snapshot(dispatch_id, payload)
+        # Validate
+        errors = validate_row_for_ready(row)
+        if errors:
+            row_result["error"] = f"Validation failed: {'; '.join(errors)}"
+
+            if not dry_run:
+                self.sheets_exporter.update_row_status(
+                    dispatch_id,
+                    RowStatus.ERROR,
+                    error_message=row_result["error"],
+                )
+            return row_result
+
+        # Build payload
+        payload = self.row_to_cd_payload(row)
+
+        if dry_run:
+            # Dry run - simulate success
+            row_result["success"] = True
+            row_result["listing_id"] = f"DRY_RUN_{dispatch_id}"
+            logger.info(f"[DRY RUN] Would export: {dispatch_id}")
+            return row_result
+
+        # Save snapshot
+        self.sheets_exporter.save_payload_snapshot(dispatch_id, payload)
+
+        if not self.cd_client:
+            row_result["error"] = "CD client not configured"
+            return row_result
+
+        row_result["payload"] = payload
+        return row_result
+
+    def _post_listing(
+        self, dispatch_id: Optional[str], payload: dict[str, Any]
+    ) -> tuple[Optional[str], Optional[str]]:
+        """
+        Create one CD listing and record it. Returns (listing_id, error).
 
-                if dry_run:
-                    # Dry run - simulate success
-                    row_result["success"] = True
-                    row_result["listing_id"] = f"DRY_RUN_{dispatch_id}"
-                    results["exported"] += 1
-                    logger.info(f"[DRY RUN] Would export: {dispatch_id}")
-                else:
-                    # Actually call CD API
-                    if self.cd_client:
-                        try:
-                            response = self.cd_client.create_listing(payload)
-                            listing_id = response.get("id") or response.get("listingId")
-
-                            row_result["success"] = True
-                            row_result["listing_id"] = listing_id
-                            results["exported"] += 1
-
-                            # Update status to EXPORTED
-                            self.sheets_exporter.update_row_status(
-                                dispatch_id,
-                                RowStatus.EXPORTED,
-                                cd_listing_id=listing_id,
-                            )
-
-                            logger.info(f"Exported: {dispatch_id} -> {listing_id}")
-
-                        except Exception as e:
-                            row_result["error"] = str(e)
-                            row_result["success"] = False
-                            results["failed"] += 1
-
-                            # Update status to ERROR
-                            self.sheets_exporter.update_row_status(
-                                dispatch_id,
-                                RowStatus.ERROR,
-                                error_message=str(e),
-                            )
-
-                            logger.error(f"Export failed: {dispatch_id} - {e}")
-                    else:
-                        row_result["error"] = "CD client not configured"
-                        row_result["success"] = False
-                        results["failed"] += 1
+        Runs on a worker thread.
+        """
+        try:
+            response = self.cd_client.create_listing(payload)
+            listing_id = response.get("listing_id") or response.get("id")
+            listing_id = listing_id or response.get("listingId")
+        except Exception as e:
+            return None, str(e)
+
+        key = self._listing_key(dispatch_id)
+        if key:
+            try:
+                self.idempotency_store.mark_processed_many(
+                    [
+                        {
+                            "idempotency_key": key,
+                            "source_type": "sheet",
+                            "result_type": "cd_listing",
+                            "result_id": listing_id or "",
+                        }
+                    ]
+                )
+            except Exception as e:
+                logger.error(f"Failed to record CD listing for {dispatch_id}: {e}")
+        return listing_id, None
+
+    def _mark_already_posted(self, dispatch_id: str, listing_id: Optional[str]) -> dict[str, Any]:
+        """Retry the status write for a row whose listing already exists in CD."""
+        logger.info(f"CD listing {listing_id} for {dispatch_id} already posted")
+        row_result = {
+            "dispatch_id": dispatch_id,
+            "success": True,
+            "listing_id": listing_id,
+            "error": None,
+            "duplicate": True,
+        }
+        try:
+            self.sheets_exporter.update_row_status(
+                dispatch_id, RowStatus.EXPORTED, cd_listing_id=listing_id
+            )
+        except Exception as e:
+            logger.exception(f"Error updating status for {dispatch_id}: {e}")
+        return row_result
 
+    def _export_rows(
+        self,
+        rows: list[dict[str, Any]],
+        dry_run: bool,
+        results: dict[str, Any],
+        workers: int = 1,
+    ) -> None:
+        """Export rows, recording per-row outcomes in results (in row order)."""
+        # Rows an earlier run posted but never marked EXPORTED
+        posted = {}
+        if not dry_run and self.cd_client:
+            keys = [self._listing_key(row.get("dispatch_id")) for row in rows]
+            posted = self.idempotency_store.get_result_ids(k for k in keys if k)
+
+        row_results = []
+        for row in rows:
+            key = self._listing_key(row.get("dispatch_id"))
+            if key in posted:
+                row_results.append(self._mark_already_posted(row["dispatch_id"], posted[key]))
+                continue
+            try:
+                row_result = self._prepare_row(row, dry_run)
             except Exception as e:
-                row_result["error"] = str(e)
-                row_result["success"] = False
-                results["failed"] += 1
+                dispatch_id = row.get("dispatch_id")
+                row_result = {
+                    "dispatch_id": dispatch_id,
+                    "success": False,
+                    "listing_id": None,
+                    "error": str(e),
+                }
                 logger.exception(f"Error exporting {dispatch_id}: {e}")
-
+            row_results.append(row_result)
+
+        # Post to CD in parallel; the client's rate limiter is shared by all workers
+        to_post = [r for r in row_results if "payload" in r]
+        if to_post:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(workers, len(to_post))),
+                thread_name_prefix="cd-export",
+            ) as pool:
+                outcomes = list(
+                    pool.map(
+                        self._post_listing,
+                        [r["dispatch_id"] for r in to_post],
+                        [r.pop("payload") for r in to_post],
+                    )
+                )
+
+            # Status updates are applied on this thread, in row order
+            for row_result, (listing_id, error) in zip(to_post, outcomes):
+                dispatch_id = row_result["dispatch_id"]
+                try:
+                    if error is None:
+                        row_result["success"] = True
+                        row_result["listing_id"] = listing_id
+                        self.sheets_exporter.update_row_status(
+                            dispatch_id,
+                            RowStatus.EXPORTED,
+                            cd_listing_id=listing_id,
+                        )
+                        logger.info(f"Exported: {dispatch_id} -> {listing_id}")
+                    else:
+                        row_result["error"] = error
+                        self.sheets_exporter.update_row_status(
+                            dispatch_id,
+                            RowStatus.ERROR,
+                            error_message=error,
+                        )
+                        logger.error(f"Export failed: {dispatch_id} - {error}")
+                except Exception as e:
+                    logger.exception(f"Error updating status for {dispatch_id}: {e}")
+
+        for row_result in row_results:
+            if row_result["success"]:
+                results["exported"] += 1
+            else:
+                results["failed"] += 1
             results["results"].append(row_result)
-
-        return results
@@ -2,13 +2,17 @@
 
 import logging
 import os
+import threading
 import time
+import weakref
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from core.telemetry import cd_response_hook
 from models.vehicle import TransportListing
 
 logger = logging.getLogger(__name__)
@@ -25,6 +29,70 @@ class TokenInfo:
         return datetime.utcnow() >= (self.expires_at - timedelta(minutes=5))
 
 
+class RateLimiter:
+    """
+    Thread-safe limiter shared by every caller of one client.
+
+    Caps in-flight requests at max_concurrent, spaces request starts at
+    least 1/requests_per_second apart, and lets a 429 pause all callers.
+    """
+
+    def __init__(self, max_concurrent: int = 4, requests_per_second: float = 10.0):
+        self.max_concurrent = max_concurrent
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self.in_flight = 0
+        self.waiting = 0
+        _LIMITERS.add(self)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all new requests for the given time (e.g. Retry-After)."""
+        with self._lock:
+            self._next_start = max(self._next_start, time.monotonic() + seconds)
+
+    def stats(self) -> dict[str, Any]:
+        """In-flight and waiting callers, and seconds until the next request may start."""
+        with self._lock:
+            delay = max(self._next_start - time.monotonic(), 0.0)
+            return {
+                "max_concurrent": self.max_concurrent,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "paused_for": round(delay, 3),
+            }
+
+    def __enter__(self):
+        with self._lock:
+            self.waiting += 1
+        self._slots.acquire()
+        with self._lock:
+            self.waiting -= 1
+            self.in_flight += 1
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+        return False
+
+
+# Live limiters, for readiness checks (clients are created per export run)
+_LIMITERS: "weakref.WeakSet[RateLimiter]" = weakref.WeakSet()
+
+
+def limiter_stats() -> list[dict[str, Any]]:
+    """Stats of every live CD rate limiter in this process."""
+    return [limiter.stats() for limiter in list(_LIMITERS)]
+
+
 class CentralDispatchClient:
     PROD_TOKEN_URL = "https://id.centraldispatch.com/connect/token"
     PROD_API_BASE = "https://marketplace-api.centraldispatch.com"
@@ -37,19 +105,40 @@ class CentralDispatchClient:
         client_secret: str,
         marketplace_id: Optional[int] = None,
         is_test: bool = False,
+        max_concurrent: int = 4,
+        requests_per_second: float = 10.0,
+        api_base: Optional[str] = None,
+        token_url: Optional[str] = None,
     ):
         self.client_id = client_id
         self.client_secret = client_secret
         self.marketplace_id = marketplace_id or self.PROD_MARKETPLACE_ID
-        self.token_url = self.PROD_TOKEN_URL
-        self.api_base = self.PROD_API_BASE
+        # Overridable for local stand-in servers (load tests)
+        self.token_url = token_url or self.PROD_TOKEN_URL
+        self.api_base = (api_base or self.PROD_API_BASE).rstrip("/")
         self._token_info: Optional[TokenInfo] = None
+        self._token_lock = threading.Lock()
         self._session = requests.Session()
+        # One pooled connection per concurrent request
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_concurrent)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.hooks["response"].append(cd_response_hook)
+        self.rate_limiter = RateLimiter(max_concurrent, requests_per_second)
 
     def _get_access_token(self) -> str:
-        if self._token_info and not self._token_info.is_expired:
-            return self._token_info.access_token
+        token_info = self._token_info
+        if token_info and not token_info.is_expired:
+            return token_info.access_token
+
+        # Concurrent callers wait for a single token refresh
+        with self._token_lock:
+            token_info = self._token_info
+            if token_info and not token_info.is_expired:
+                return token_info.access_token
+            return self._fetch_token()
 
+    def _fetch_token(self) -> str:
         data = {
             "grant_type": "client_credentials",
             "client_id": self.client_id,
@@ -91,12 +180,26 @@ class CentralDispatchClient:
                 }
                 if extra_headers:
                     headers.update(extra_headers)
-                response = self._session.request(
-                    method=method, url=url, headers=headers, json=data, params=params, timeout=60
-                )
+                with self.rate_limiter:
+                    response = self._session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        json=data,
+                        params=params,
+                        timeout=60,
+                    )
                 if response.status_code == 401:
                     self._token_info = None
                     continue
+                if response.status_code == 429 and attempt < retries - 1:
+                    try:
+                        retry_after = float(response.headers.get("Retry-After", 2**attempt))
+                    except ValueError:
+                        retry_after = float(2**attempt)
+                    logger.warning(f"CD rate limited, pausing requests for {retry_after}s")
+                    self.rate_limiter.pause(retry_after)
+                    continue
                 return response
             except requests.RequestException:
                 if attempt < retries - 1:
@@ -105,8 +208,12 @@ class CentralDispatchClient:
                     raise
         raise APIError("Max retries exceeded")
 
-    def create_listing(self, listing: TransportListing) -> dict[str, Any]:
-        listing_data = listing.to_cd_listing(self.marketplace_id)
+    def create_listing(self, listing: Union[TransportListing, dict[str, Any]]) -> dict[str, Any]:
+        # Sheet exports pass a ready-built V2 payload
+        if isinstance(listing, dict):
+            listing_data = listing
+        else:
+            listing_data = listing.to_cd_listing(self.marketplace_id)
         response = self._make_request("POST", "/listings", data=listing_data)
         if response.status_code == 201:
             location = response.headers.get("Location", "")
@@ -146,4 +253,6 @@ def create_client_from_env() -> CentralDispatchClient:
         client_id=client_id,
         client_secret=client_secret,
         marketplace_id=int(marketplace_id) if marketplace_id else None,
+        api_base=os.environ.get("CD_API_BASE_URL"),
+        token_url=os.environ.get("CD_TOKEN_URL"),
     )
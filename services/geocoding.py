@@ -0,0 +1,257 @@
+"""
+Async geocoding and distance client.
+
+Used by WarehouseRouter.route_many to resolve a batch of pickups at once:
+
+1. One pooled httpx.AsyncClient per batch (keep-alive across requests)
+2. Per-provider rate limiting (Nominatim's usage policy is ~1 req/s)
+3. Single-flight: concurrent lookups of the same normalized address share
+   one request
+4. Google Distance Matrix calls carry many destinations per request
+
+Provider URLs and the httpx transport are injectable so the client can be
+pointed at a local stub provider.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import httpx
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+GOOGLE_DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+
+# Distance Matrix accepts at most 25 destinations per request
+MAX_MATRIX_DESTINATIONS = 25
+
+_retry_http = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type(httpx.HTTPError),
+    reraise=True,
+)
+
+
+class AsyncRateLimiter:
+    """Spaces request starts at least 1/requests_per_second apart."""
+
+    def __init__(self, requests_per_second: float):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class AsyncGeocoder:
+    """
+    Pooled, rate-limited, coalescing client for geocoding and driving distances.
+
+    Use as an async context manager so the connection pool is closed:
+
+        async with AsyncGeocoder(api_key=key) as geocoder:
+            coords = await geocoder.geocode_many(addresses)
+    """
+
+    def __init__(
+        self,
+        provider: str = "google",
+        api_key: Optional[str] = None,
+        max_connections: int = 10,
+        google_rps: float = 25.0,
+        nominatim_rps: float = 1.0,
+        timeout: float = 10.0,
+        google_geocode_url: str = GOOGLE_GEOCODE_URL,
+        google_distance_url: str = GOOGLE_DISTANCE_MATRIX_URL,
+        nominatim_url: str = NOMINATIM_SEARCH_URL,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.provider = provider if provider == "google" and api_key else "nominatim"
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.google_geocode_url = google_geocode_url
+        self.google_distance_url = google_distance_url
+        self.nominatim_url = nominatim_url
+        self.transport = transport
+        self._limiters = {
+            "google": AsyncRateLimiter(google_rps),
+            "nominatim": AsyncRateLimiter(nominatim_rps),
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.requests_made = 0
+        self.coalesced = 0
+
+    async def __aenter__(self):
+        self._get_client()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+        return False
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+                headers={"User-Agent": "VehicleTransportAutomation/1.0"},
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def normalize(address: str) -> str:
+        """Key used to coalesce lookups of the same address."""
+        return " ".join(address.lower().split())
+
+    async def _get_json(self, provider: str, url: str, params: dict) -> dict:
+        async with self._limiters[provider]:
+            response = await self._get_client().get(url, params=params)
+        self.requests_made += 1
+        response.raise_for_status()
+        return response.json()
+
+    # =========================================================================
+    # GEOCODING
+    # =========================================================================
+
+    async def geocode(self, address: str) -> Optional[tuple[float, float]]:
+        """
+        Geocode one address; concurrent calls for the same address share a request.
+
+        Returns:
+            (lat, lng) or None if the provider found nothing
+        """
+        key = self.normalize(address)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._geocode_remote(address))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: one cancelled caller must not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def geocode_many(self, addresses: list[str]) -> dict[str, Optional[tuple[float, float]]]:
+        """
+        Geocode addresses concurrently.
+
+        Returns:
+            {address: (lat, lng) or None}; failed lookups are logged and None
+        """
+        results = await asyncio.gather(
+            *(self.geocode(address) for address in addresses), return_exceptions=True
+        )
+        coords = {}
+        for address, result in zip(addresses, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Geocode failed for {address[:50]}: {result}")
+                result = None
+            coords[address] = result
+        return coords
+
+    @_retry_http
+    async def _geocode_remote(self, address: str) -> Optional[tuple[float, float]]:
+        if self.provider == "google":
+            data = await self._get_json(
+                "google", self.google_geocode_url, {"address": address, "key": self.api_key}
+            )
+            if data.get("status") == "OK" and data.get("results"):
+                location = data["results"][0]["geometry"]["location"]
+                return location["lat"], location["lng"]
+            logger.warning(f"Google geocode failed for {address}: {data.get('status')}")
+            return None
+
+        data = await self._get_json(
+            "nominatim", self.nominatim_url, {"q": address, "format": "json", "limit": 1}
+        )
+        if data:
+            return float(data[0]["lat"]), float(data[0]["lon"])
+        logger.warning(f"Nominatim geocode failed for {address}")
+        return None
+
+    # =========================================================================
+    # DRIVING DISTANCE
+    # =========================================================================
+
+    async def distance_matrix(
+        self, origin: tuple[float, float], destinations: list[tuple[float, float]]
+    ) -> list[Optional[tuple[float, float]]]:
+        """
+        Driving distances from one origin to many destinations.
+
+        Sends one Distance Matrix request per MAX_MATRIX_DESTINATIONS
+        destinations.
+
+        Returns:
+            (distance_meters, duration_seconds) or None per destination, in
+            input order
+        """
+        if not self.api_key:
+            return [None] * len(destinations)
+
+        chunks = [
+            destinations[i : i + MAX_MATRIX_DESTINATIONS]
+            for i in range(0, len(destinations), MAX_MATRIX_DESTINATIONS)
+        ]
+        results = await asyncio.gather(*(self._distance_chunk(origin, c) for c in chunks))
+        return [element for chunk in results for element in chunk]
+
+    @_retry_http
+    async def _distance_chunk(
+        self, origin: tuple[float, float], destinations: list[tuple[float, float]]
+    ) -> list[Optional[tuple[float, float]]]:
+        data = await self._get_json(
+            "google",
+            self.google_distance_url,
+            {
+                "origins": f"{origin[0]},{origin[1]}",
+                "destinations": "|".join(f"{lat},{lng}" for lat, lng in destinations),
+                "mode": "driving",
+                "key": self.api_key,
+            },
+        )
+        return parse_distance_row(data, len(destinations))
+
+
+def parse_distance_row(data: dict, count: int) -> list[Optional[tuple[float, float]]]:
+    """Pull (meters, seconds) per destination from a one-origin Distance Matrix response."""
+    if data.get("status") != "OK" or not data.get("rows"):
+        return [None] * count
+    elements = data["rows"][0].get("elements", [])
+    results: list[Optional[tuple[float, float]]] = []
+    for i in range(count):
+        element = elements[i] if i < len(elements) else {}
+        if element.get("status") == "OK":
+            results.append((element["distance"]["value"], element["duration"]["value"]))
+        else:
+            results.append(None)
+    return results
@@ -2,19 +2,89 @@
 
 import hashlib
 import logging
+import math
 import sqlite3
+import threading
+from collections.abc import Iterable
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Max bound parameters per IN (...) query; larger lookups go through a temp table
+_MAX_IN_PARAMS = 900
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    No false negatives: if might_contain() is False the key was never added.
+    Uses double hashing over a single blake2b digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def might_contain(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
 
 class IdempotencyStore:
-    def __init__(self, db_path: str = "processed_emails.db"):
+    """
+    SQLite-backed record of processed items.
+
+    An in-memory Bloom filter (built at startup, updated on insert) fronts
+    the table. Other processes may write to the same database, so before a
+    "not present" answer is trusted the filter catches up on rows added
+    since its id high-water mark - one indexed range read, usually empty,
+    instead of a key lookup per candidate. Batch APIs (are_processed,
+    get_result_ids, mark_processed_many) use one connection and one query
+    per call.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "processed_emails.db",
+        use_bloom: bool = True,
+        ttl_days: Optional[int] = None,
+    ):
         self.db_path = Path(db_path)
+        self.use_bloom = use_bloom
+        self.ttl_days = ttl_days
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_lock = threading.Lock()
+        self._bloom_max_id = 0  # Highest processed_items.id the filter covers
+        self.bloom_skips = 0  # Lookups answered by the filter without disk access
         self._init_db()
+        if ttl_days:
+            self.compact(ttl_days)
+        elif use_bloom:
+            self._rebuild_bloom()
 
     def _init_db(self):
         with self._get_connection() as conn:
@@ -32,6 +102,10 @@ class IdempotencyStore:
                     metadata TEXT
                 )
             """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_processed_items_processed_at "
+                "ON processed_items(processed_at)"
+            )
             conn.commit()
 
     @contextmanager
@@ -43,6 +117,93 @@ class IdempotencyStore:
         finally:
             conn.close()
 
+    # =========================================================================
+    # BLOOM FILTER
+    # =========================================================================
+
+    @staticmethod
+    def _bloom_entries(key: str) -> list[str]:
+        """
+        Filter entries for a key: the key itself plus every ':'-component
+        prefix, so namespace lookups (namespace:hash[:auction...]) can be
+        answered too. Lowercased to match SQLite's case-insensitive LIKE.
+        """
+        key = key.lower()
+        parts = key.split(":")
+        return [":".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+    def _rebuild_bloom(self) -> None:
+        """(Re)build the filter from every stored key."""
+        max_id = 0
+        with self._get_connection() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM processed_items").fetchone()[0]
+            # Room for growth; each key contributes one entry per component
+            bloom = BloomFilter(capacity=max(10_000, total * 2) * 4)
+            for row_id, key in conn.execute("SELECT id, idempotency_key FROM processed_items"):
+                for entry in self._bloom_entries(key):
+                    bloom.add(entry)
+                max_id = max(max_id, row_id)
+
+        with self._bloom_lock:
+            self._bloom = bloom
+            self._bloom_max_id = max_id
+        logger.debug(f"Idempotency bloom filter built over {total} keys")
+
+    def _sync_bloom(self) -> None:
+        """
+        Add keys stored since the filter's high-water mark, by any process.
+
+        ids come from AUTOINCREMENT and SQLite has one writer at a time, so
+        every committed row above the mark is new to the filter.
+        """
+        if not self.use_bloom or self._bloom is None:
+            return
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, idempotency_key FROM processed_items WHERE id > ? ORDER BY id",
+                (self._bloom_max_id,),
+            ).fetchall()
+        if not rows:
+            return
+        with self._bloom_lock:
+            for row in rows:
+                for entry in self._bloom_entries(row["idempotency_key"]):
+                    self._bloom.add(entry)
+            self._bloom_max_id = max(self._bloom_max_id, rows[-1]["id"])
+            needs_rebuild = self._bloom.is_full
+        if needs_rebuild:
+            self._rebuild_bloom()
+
+    def _bloom_add(self, keys: Iterable[str]) -> None:
+        if not self.use_bloom:
+            return
+        with self._bloom_lock:
+            if self._bloom is None:
+                return
+            for key in keys:
+                for entry in self._bloom_entries(key):
+                    self._bloom.add(entry)
+            needs_rebuild = self._bloom.is_full
+        if needs_rebuild:
+            self._rebuild_bloom()
+
+    def _maybe_present(self, key: str, synced: bool = False) -> bool:
+        """
+        False only if the key (or key prefix) was definitely never stored.
+
+        Args:
+            key: Idempotency key or key prefix
+            synced: The filter was already caught up for this lookup
+        """
+        if not self.use_bloom or self._bloom is None:
+            return True
+        if not synced:
+            self._sync_bloom()
+        if self._bloom.might_contain(key.lower()):
+            return True
+        self.bloom_skips += 1
+        return False
+
     @staticmethod
     def compute_attachment_hash(content: bytes) -> str:
         return hashlib.sha256(content).hexdigest()
@@ -75,6 +236,8 @@ class IdempotencyStore:
         return f"{namespace}:{thread_root_id}:{attachment_hash}"
 
     def is_processed(self, idempotency_key: str) -> bool:
+        if not self._maybe_present(idempotency_key):
+            return False
         with self._get_connection() as conn:
             cursor = conn.execute(
                 "SELECT 1 FROM processed_items WHERE idempotency_key = ?", (idempotency_key,)
@@ -101,10 +264,15 @@ class IdempotencyStore:
 
         key_prefix = ":".join(key_parts)
 
+        if not self._maybe_present(key_prefix):
+            return False, None
+
+        # Match the prefix on whole ':' components
         with self._get_connection() as conn:
             cursor = conn.execute(
-                "SELECT result_id FROM processed_items WHERE idempotency_key LIKE ?",
-                (f"{key_prefix}%",),
+                """SELECT result_id FROM processed_items
+                   WHERE idempotency_key LIKE ? OR idempotency_key LIKE ?""",
+                (key_prefix, f"{key_prefix}:%"),
             )
             row = cursor.fetchone()
             if row:
@@ -138,8 +306,9 @@ class IdempotencyStore:
                     (key, attachment_hash, namespace, namespace, result_id, metadata),
                 )
                 conn.commit()
-                logger.debug(f"Marked as processed: {key} -> {result_id}")
-                return True
+            self._bloom_add([key])
+            logger.debug(f"Marked as processed: {key} -> {result_id}")
+            return True
         except sqlite3.IntegrityError:
             logger.debug(f"Already processed: {key}")
             return False
@@ -148,6 +317,8 @@ class IdempotencyStore:
         self, thread_root_id: str, attachment_hash: str
     ) -> tuple[bool, Optional[str]]:
         key = self.generate_idempotency_key(thread_root_id, attachment_hash)
+        if not self._maybe_present(key):
+            return False, None
         with self._get_connection() as conn:
             cursor = conn.execute(
                 "SELECT result_id FROM processed_items WHERE idempotency_key = ?", (key,)
@@ -185,6 +356,114 @@ class IdempotencyStore:
                     ),
                 )
                 conn.commit()
-                return True
+            self._bloom_add([key])
+            return True
         except sqlite3.IntegrityError:
             return False
+
+    # =========================================================================
+    # BATCH APIS
+    # =========================================================================
+
+    def get_result_ids(self, keys: Iterable[str]) -> dict[str, Optional[str]]:
+        """
+        Look up many idempotency keys at once.
+
+        Keys rejected by the Bloom filter (after one catch-up on keys stored
+        since it was built) are never queried; the rest are
+        resolved with one query (IN list, or a temp table for large batches).
+        Returns {key: result_id} for processed keys only.
+        """
+        self._sync_bloom()
+        candidates = list(dict.fromkeys(k for k in keys if self._maybe_present(k, synced=True)))
+        if not candidates:
+            return {}
+
+        with self._get_connection() as conn:
+            if len(candidates) <= _MAX_IN_PARAMS:
+                placeholders = ",".join("?" * len(candidates))
+                rows = conn.execute(
+                    f"SELECT idempotency_key, result_id FROM processed_items "
+                    f"WHERE idempotency_key IN ({placeholders})",
+                    candidates,
+                ).fetchall()
+            else:
+                conn.execute("CREATE TEMP TABLE lookup_keys (key TEXT PRIMARY KEY)")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO lookup_keys (key) VALUES (?)",
+                    ((k,) for k in candidates),
+                )
+                rows = conn.execute("""SELECT p.idempotency_key, p.result_id
+                       FROM lookup_keys l
+                       JOIN processed_items p ON p.idempotency_key = l.key""").fetchall()
+
+        return {row["idempotency_key"]: row["result_id"] for row in rows}
+
+    def are_processed(self, keys: Iterable[str]) -> set[str]:
+        """Return the subset of keys that have been processed."""
+        return set(self.get_result_ids(keys))
+
+    def mark_processed_many(self, items: Iterable[dict[str, Any]]) -> int:
+        """
+        Record many processed items in one transaction.
+
+        Each item is a dict with ``idempotency_key`` and any of thread_root_id,
+        message_id, attachment_hash, source_type, result_type, result_id,
+        metadata. Existing keys are left untouched.
+        Returns the number of newly inserted rows.
+        """
+        columns = (
+            "idempotency_key",
+            "thread_root_id",
+            "message_id",
+            "attachment_hash",
+            "source_type",
+            "result_type",
+            "result_id",
+            "metadata",
+        )
+        rows = [tuple(item.get(c) for c in columns) for item in items]
+        if not rows:
+            return 0
+
+        with self._get_connection() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO processed_items ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                rows,
+            )
+            conn.commit()
+            inserted = conn.total_changes - before
+
+        self._bloom_add(row[0] for row in rows)
+        return inserted
+
+    # =========================================================================
+    # COMPACTION
+    # =========================================================================
+
+    def compact(self, max_age_days: Optional[int] = None, vacuum: bool = False) -> int:
+        """
+        Delete keys older than max_age_days (default: ttl_days) and rebuild
+        the Bloom filter so it stops carrying expired keys.
+        Returns the number of deleted rows.
+        """
+        days = max_age_days or self.ttl_days
+        deleted = 0
+        if days:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    "DELETE FROM processed_items WHERE processed_at < datetime('now', ?)",
+                    (f"-{int(days)} days",),
+                )
+                deleted = cursor.rowcount
+                conn.commit()
+                if vacuum and deleted:
+                    conn.execute("VACUUM")
+            if deleted:
+                logger.info(f"Compacted {deleted} idempotency keys older than {days} days")
+
+        if self.use_bloom:
+            self._rebuild_bloom()
+        return deleted
@@ -12,6 +12,8 @@ Flow:
    f. Record in idempotency store
 """
 
+import imaplib
+import itertools
 import os
 import time
 from dataclasses import dataclass
@@ -21,7 +23,8 @@ from core.config import AppConfig, get_config
 from core.logging_config import LogContext, generate_run_id, get_logger
 from extractors import extract_from_pdf
 from extractors.gate_pass import GatePassExtractor
-from ingest.email_reader import Attachment, EmailMessage, create_email_reader
+from ingest.email_reader import Attachment, EmailMessage, EmailReader, create_email_reader
+from ingest.imap_idle import IdleLoop
 from models.vehicle import AuctionInvoice
 from services.clickup import ClickUpClient, ClickUpTask
 from services.idempotency import IdempotencyStore
@@ -58,6 +61,9 @@ class EmailProcessingResult:
 class Orchestrator:
     """Main orchestrator for email processing pipeline."""
 
+    # Unseen messages whose attachments are checked with one idempotency lookup
+    lookup_batch_size = 100
+
     def __init__(self, config: Optional[AppConfig] = None):
         self.config = config or get_config()
         self._clickup_client: Optional[ClickUpClient] = None
@@ -82,8 +88,27 @@ class Orchestrator:
             )
         return self._idempotency_store
 
-    def process_email(self, email_msg: EmailMessage) -> EmailProcessingResult:
-        """Process a single email message."""
+    def _idempotency_keys(self, email_msg: EmailMessage) -> dict[str, str]:
+        """Idempotency key per PDF attachment hash of a message."""
+        return {
+            attachment.hash: self.idempotency_store.generate_idempotency_key(
+                email_msg.thread_root_id, attachment.hash
+            )
+            for attachment in email_msg.pdf_attachments
+        }
+
+    def process_email(
+        self, email_msg: EmailMessage, processed: Optional[dict[str, Optional[str]]] = None
+    ) -> EmailProcessingResult:
+        """
+        Process a single email message.
+
+        Args:
+            email_msg: Message to process
+            processed: {idempotency_key: task_id} from a lookup covering this
+                message (run_once batches it across messages); looked up here
+                if omitted. Keys recorded while processing are added to it.
+        """
         logger.info(f"Processing email: {email_msg.subject}")
 
         result = EmailProcessingResult(
@@ -111,18 +136,28 @@ class Orchestrator:
 
         logger.info(f"Found {len(pdf_attachments)} PDF attachment(s)")
 
+        # Check idempotency for all attachments in one lookup
+        keys = self._idempotency_keys(email_msg)
+        if processed is None:
+            processed = self.idempotency_store.get_result_ids(keys.values())
+
         # Process each PDF attachment
         for attachment in pdf_attachments:
             with LogContext(
                 attachment_name=attachment.filename,
                 attachment_hash=attachment.hash[:16],
             ):
+                key = keys[attachment.hash]
                 att_result = self._process_attachment(
                     email_msg=email_msg,
                     attachment=attachment,
                     gate_pass=gate_pass,
+                    already_processed=(key in processed, processed.get(key)),
                 )
                 result.attachment_results.append(att_result)
+                if att_result.success and att_result.clickup_task_id is not None:
+                    # Later messages in the same batch see this attachment as done
+                    processed[key] = att_result.clickup_task_id
 
         return result
 
@@ -131,8 +166,14 @@ class Orchestrator:
         email_msg: EmailMessage,
         attachment: Attachment,
         gate_pass: Optional[str],
+        already_processed: Optional[tuple[bool, Optional[str]]] = None,
     ) -> ProcessingResult:
-        """Process a single PDF attachment."""
+        """
+        Process a single PDF attachment.
+
+        already_processed is the (is_processed, task_id) pair from a batch
+        idempotency lookup; if omitted the store is queried directly.
+        """
         logger.info(f"Processing attachment: {attachment.filename}")
 
         result = ProcessingResult(
@@ -143,10 +184,12 @@ class Orchestrator:
         )
 
         # Check idempotency
-        is_processed, existing_task_id = self.idempotency_store.is_attachment_processed_in_thread(
-            thread_root_id=email_msg.thread_root_id,
-            attachment_hash=attachment.hash,
-        )
+        if already_processed is None:
+            already_processed = self.idempotency_store.is_attachment_processed_in_thread(
+                thread_root_id=email_msg.thread_root_id,
+                attachment_hash=attachment.hash,
+            )
+        is_processed, existing_task_id = already_processed
 
         if is_processed:
             logger.info(f"Attachment already processed, task ID: {existing_task_id}")
@@ -156,31 +199,19 @@ class Orchestrator:
             result.skipped_duplicate = True
             return result
 
-        # Save PDF to temp file for processing
-        temp_dir = self.config.storage.temp_dir
-        os.makedirs(temp_dir, exist_ok=True)
-
-        temp_path = os.path.join(temp_dir, f"temp_{attachment.hash[:16]}.pdf")
-        try:
-            with open(temp_path, "wb") as f:
-                f.write(attachment.content)
-
-            # Extract data from PDF
-            invoice = extract_from_pdf(temp_path)
-            result.extracted_data = invoice
+        # Extract data from PDF (spooled attachments are read in place,
+        # in-memory ones go through a temp file that is cleaned up)
+        with attachment.as_file(self.config.storage.temp_dir) as pdf_path:
+            invoice = extract_from_pdf(pdf_path)
+        result.extracted_data = invoice
 
-            if invoice:
-                logger.info(
-                    f"Extracted invoice: source={invoice.source.value}, "
-                    f"vehicles={len(invoice.vehicles)}"
-                )
-            else:
-                logger.warning("Failed to extract data from PDF")
-
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        if invoice:
+            logger.info(
+                f"Extracted invoice: source={invoice.source.value}, "
+                f"vehicles={len(invoice.vehicles)}"
+            )
+        else:
+            logger.warning("Failed to extract data from PDF")
 
         # Create ClickUp task
         if not self.config.dry_run:
@@ -331,55 +362,111 @@ class Orchestrator:
         text = text.replace("&nbsp;", " ").replace("&amp;", "&")
         return text.strip()
 
-    def run_once(self) -> list[EmailProcessingResult]:
-        """Run a single pass: fetch and process all unseen emails."""
+    def run_once(self, email_reader: Optional[EmailReader] = None) -> list[EmailProcessingResult]:
+        """
+        Run a single pass: fetch and process all unseen emails.
+
+        If email_reader is given it must already be connected and is left
+        open (IDLE mode); otherwise a reader is opened for this pass.
+        """
         run_id = generate_run_id()
         results = []
 
         with LogContext(run_id=run_id):
             logger.info("Starting email processing run")
 
-            email_reader = create_email_reader(self.config.email)
-
-            with email_reader:
-                for email_msg in email_reader.fetch_unseen():
-                    with LogContext(
-                        message_id=email_msg.message_id,
-                        thread_root_id=email_msg.thread_root_id,
-                    ):
-                        try:
-                            result = self.process_email(email_msg)
-                            results.append(result)
-
-                            # Mark as seen only if at least one attachment was processed successfully
-                            # or if there were no PDF attachments (nothing to do)
-                            should_mark_seen = not email_msg.pdf_attachments or any(
-                                r.success for r in result.attachment_results
-                            )
-
-                            if should_mark_seen and email_msg.uid:
-                                email_reader.mark_seen(email_msg.uid)
-                                logger.info("Marked email as seen")
-
-                        except Exception as e:
-                            logger.error(f"Error processing email: {e}", exc_info=True)
-                            results.append(
-                                EmailProcessingResult(
-                                    message_id=email_msg.message_id,
-                                    subject=email_msg.subject,
-                                    gate_pass=None,
-                                    attachment_results=[],
-                                    error=str(e),
-                                )
-                            )
+            if email_reader is not None:
+                self._process_unseen(email_reader, results)
+            else:
+                with self._create_reader() as reader:
+                    self._process_unseen(reader, results)
 
             logger.info(f"Run complete. Processed {len(results)} emails")
 
         return results
 
-    def run_daemon(self, interval: Optional[int] = None) -> None:
-        """Run continuously, checking for new emails at regular intervals."""
+    def _create_reader(self) -> EmailReader:
+        return create_email_reader(
+            self.config.email,
+            spool_dir=os.path.join(self.config.storage.temp_dir, "spool"),
+        )
+
+    def _process_unseen(
+        self, email_reader: EmailReader, results: list[EmailProcessingResult]
+    ) -> None:
+        """
+        Process all unseen messages from a connected reader.
+
+        Messages are taken lookup_batch_size at a time so the idempotency
+        keys of all their attachments are checked with one query.
+        """
+        messages = email_reader.fetch_unseen()
+        while batch := list(itertools.islice(messages, self.lookup_batch_size)):
+            keys = [key for msg in batch for key in self._idempotency_keys(msg).values()]
+            try:
+                processed = self.idempotency_store.get_result_ids(keys)
+            except Exception as e:
+                # Fall back to per-message lookups
+                logger.error(f"Batch idempotency lookup failed: {e}", exc_info=True)
+                processed = None
+            for email_msg in batch:
+                self._process_message(email_reader, email_msg, processed, results)
+
+    def _process_message(
+        self,
+        email_reader: EmailReader,
+        email_msg: EmailMessage,
+        processed: Optional[dict[str, Optional[str]]],
+        results: list[EmailProcessingResult],
+    ) -> None:
+        """Process one message, mark it seen on success and release its attachments."""
+        with LogContext(
+            message_id=email_msg.message_id,
+            thread_root_id=email_msg.thread_root_id,
+        ):
+            try:
+                result = self.process_email(email_msg, processed)
+                results.append(result)
+
+                # Mark as seen only if at least one attachment was processed successfully
+                # or if there were no PDF attachments (nothing to do)
+                should_mark_seen = not email_msg.pdf_attachments or any(
+                    r.success for r in result.attachment_results
+                )
+
+                if should_mark_seen and email_msg.uid:
+                    email_reader.mark_seen(email_msg.uid)
+                    logger.info("Marked email as seen")
+
+            except Exception as e:
+                logger.error(f"Error processing email: {e}", exc_info=True)
+                results.append(
+                    EmailProcessingResult(
+                        message_id=email_msg.message_id,
+                        subject=email_msg.subject,
+                        gate_pass=None,
+                        attachment_results=[],
+                        error=str(e),
+                    )
+                )
+            finally:
+                email_msg.release_attachments()
+
+    def run_daemon(self, interval: Optional[int] = None, idle: Optional[bool] = None) -> None:
+        """
+        Run continuously.
+
+        With idle (default: config.email.idle) an IMAP IDLE connection is held
+        open and mail is processed as soon as the server announces it;
+        otherwise the inbox is checked at regular intervals.
+        """
         interval = interval or self.config.email.check_interval
+        idle = self.config.email.idle if idle is None else idle
+
+        if idle and self.config.email.provider == "imap":
+            self._run_idle_daemon(interval)
+            return
+
         logger.info(f"Starting daemon mode with {interval}s interval")
 
         while True:
@@ -394,6 +481,36 @@ class Orchestrator:
             logger.debug(f"Sleeping for {interval} seconds")
             time.sleep(interval)
 
+    def _run_idle_daemon(self, interval: int) -> None:
+        """Run in IMAP IDLE push mode, polling every interval if IDLE is unsupported."""
+        logger.info("Starting daemon mode with IMAP IDLE")
+        reader = self._create_reader()
+
+        def connect():
+            reader.connect()
+            return reader.connection
+
+        def on_new_mail() -> bool:
+            try:
+                self.run_once(email_reader=reader)
+            except (imaplib.IMAP4.error, OSError):
+                raise  # Connection problem - let the loop reconnect
+            except Exception as e:
+                logger.error(f"Error processing new mail: {e}", exc_info=True)
+            return False
+
+        loop = IdleLoop(
+            connect=connect,
+            disconnect=reader.disconnect,
+            on_new_mail=on_new_mail,
+            poll_interval=interval,
+        )
+        try:
+            loop.run()
+        except KeyboardInterrupt:
+            logger.info("Received interrupt, shutting down")
+            loop.stop()
+
 
 def run_once(config: Optional[AppConfig] = None) -> list[EmailProcessingResult]:
     """Convenience function to run a single processing pass."""
@@ -401,7 +518,11 @@ def run_once(config: Optional[AppConfig] = None) -> list[EmailProcessingResult]:
     return orchestrator.run_once()
 
 
-def run_daemon(config: Optional[AppConfig] = None, interval: Optional[int] = None) -> None:
+def run_daemon(
+    config: Optional[AppConfig] = None,
+    interval: Optional[int] = None,
+    idle: Optional[bool] = None,
+) -> None:
     """Convenience function to run in daemon mode."""
     orchestrator = Orchestrator(config)
-    orchestrator.run_daemon(interval)
+    orchestrator.run_daemon(interval, idle=idle)
@@ -0,0 +1,283 @@
+"""
+Local mirror of a Google Sheet tab.
+
+Holds the sheet's rows in memory with O(1) indexes on the columns used to
+match incoming records (dispatch_id, gate_pass, auction_reference, VIN,
+attachment_hash). The mirror is loaded with one full read and then kept in
+step with our own writes; external edits are detected by comparing a narrow
+set of watched columns (see SheetsExporterV3._check_mirror).
+
+The mirror itself never calls the Sheets API.
+"""
+
+import time
+from typing import Any, Optional
+
+from schemas.sheets_schema_v3 import get_lock_columns
+
+# Columns compared on every freshness check: row identity, match keys and
+# the protection flags that upsert rules depend on
+WATCHED_COLUMNS = [
+    "dispatch_id",
+    "auction_source",
+    "gate_pass",
+    "auction_reference",
+    "vehicle_vin",
+    "attachment_hash",
+    "row_status",
+    "warehouse_selected_mode",
+    *get_lock_columns(),
+]
+
+# Columns that feed the lookup indexes
+INDEXED_COLUMNS = {
+    "dispatch_id",
+    "auction_source",
+    "gate_pass",
+    "auction_reference",
+    "vehicle_vin",
+    "attachment_hash",
+}
+
+
+class SheetMirror:
+    """
+    In-memory copy of a sheet tab with lookup indexes.
+
+    Row numbers are 1-based sheet rows (row 1 is the header), matching the
+    Sheets API A1 notation.
+    """
+
+    def __init__(self):
+        self.headers: list[str] = []
+        self._rows: list[list[str]] = []  # _rows[0] is sheet row 2
+        self._col: dict[str, int] = {}
+        self._by_dispatch_id: dict[str, int] = {}
+        self._by_gate_pass: dict[tuple[str, str], int] = {}
+        self._by_reference: dict[tuple[str, str], int] = {}
+        self._by_vin: dict[str, int] = {}
+        self._by_hash: dict[str, int] = {}
+        self.loaded_at: Optional[float] = None
+        self.checked_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    @property
+    def row_count(self) -> int:
+        """Number of data rows (excluding the header)."""
+        return len(self._rows)
+
+    def load(self, values: list[list[Any]]) -> None:
+        """Replace the mirror with a full sheet read (header row first)."""
+        self.headers = [str(h) for h in values[0]] if values else []
+        self._col = {name: i for i, name in enumerate(self.headers)}
+        self._rows = [self._normalize(row) for row in values[1:]]
+        self._reindex()
+        self.loaded_at = self.checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Force a full reload on next use."""
+        self.loaded_at = None
+
+    def _normalize(self, row: list[Any]) -> list[str]:
+        cells = [str(v) for v in row[: len(self.headers)]]
+        cells.extend([""] * (len(self.headers) - len(cells)))
+        return cells
+
+    # =========================================================================
+    # INDEXES
+    # =========================================================================
+
+    def _cell(self, row: list[str], name: str) -> str:
+        idx = self._col.get(name)
+        return row[idx].strip() if idx is not None else ""
+
+    def _index_keys(self, row: list[str]) -> list[tuple[dict, Any]]:
+        """(index, key) pairs for one row; empty keys are not indexed."""
+        auction = self._cell(row, "auction_source")
+        keys = [
+            (self._by_dispatch_id, self._cell(row, "dispatch_id")),
+            (self._by_gate_pass, (auction, self._cell(row, "gate_pass").lower())),
+            (self._by_reference, (auction, self._cell(row, "auction_reference").lower())),
+            (self._by_vin, self._cell(row, "vehicle_vin").upper()),
+            (self._by_hash, self._cell(row, "attachment_hash").lower()),
+        ]
+        return [
+            (index, key) for index, key in keys if key and (not isinstance(key, tuple) or key[1])
+        ]
+
+    def _reindex(self) -> None:
+        for index in (
+            self._by_dispatch_id,
+            self._by_gate_pass,
+            self._by_reference,
+            self._by_vin,
+            self._by_hash,
+        ):
+            index.clear()
+        for row_number, row in enumerate(self._rows, start=2):
+            self._add_to_index(row_number, row)
+
+    def _add_to_index(self, row_number: int, row: list[str]) -> None:
+        # First row wins, like a top-down scan of the sheet
+        for index, key in self._index_keys(row):
+            index.setdefault(key, row_number)
+
+    def _update_index(self, row_number: int, old_row: list[str]) -> None:
+        """Move one row's index entries from its old values to its current ones."""
+        old_keys = {(id(index), key): index for index, key in self._index_keys(old_row)}
+        new_keys = {
+            (id(index), key): index for index, key in self._index_keys(self._rows[row_number - 2])
+        }
+        for (index_id, key), index in old_keys.items():
+            if (index_id, key) in new_keys or index.get(key) != row_number:
+                continue
+            del index[key]
+            # Another row may share the key; the first one takes over
+            for other, row in enumerate(self._rows, start=2):
+                if any(i is index and k == key for i, k in self._index_keys(row)):
+                    index[key] = other
+                    break
+        for (_, key), index in new_keys.items():
+            current = index.get(key)
+            if current is None or current > row_number:
+                index[key] = row_number
+
+    # =========================================================================
+    # LOOKUPS
+    # =========================================================================
+
+    def get(self, row_number: int) -> Optional[dict[str, Any]]:
+        """Row data as a dict, or None if the row does not exist."""
+        if not 2 <= row_number < len(self._rows) + 2:
+            return None
+        return dict(zip(self.headers, self._rows[row_number - 2]))
+
+    def _result(self, row_number: Optional[int]) -> Optional[tuple[int, dict[str, Any]]]:
+        if row_number is None:
+            return None
+        return (row_number, self.get(row_number))
+
+    def find_by_dispatch_id(self, dispatch_id: str) -> Optional[tuple[int, dict[str, Any]]]:
+        """Return (row_number, row_data) for a dispatch_id, or None."""
+        return self._result(self._by_dispatch_id.get(dispatch_id.strip()))
+
+    def find_fallback(
+        self,
+        auction_source: str,
+        gate_pass: Optional[str] = None,
+        auction_reference: Optional[str] = None,
+        vin: Optional[str] = None,
+        attachment_hash: Optional[str] = None,
+    ) -> Optional[tuple[int, dict[str, Any]]]:
+        """
+        Match by the first identifier present, in priority order:
+        gate_pass, auction_reference (both scoped to auction_source), VIN,
+        attachment_hash.
+        """
+        if gate_pass and gate_pass.strip():
+            key = (auction_source, gate_pass.strip().lower())
+            return self._result(self._by_gate_pass.get(key))
+        if auction_reference and auction_reference.strip():
+            key = (auction_source, auction_reference.strip().lower())
+            return self._result(self._by_reference.get(key))
+        if vin and vin.strip():
+            return self._result(self._by_vin.get(vin.strip().upper()))
+        if attachment_hash and attachment_hash.strip():
+            return self._result(self._by_hash.get(attachment_hash.strip().lower()))
+        return None
+
+    def rows(self) -> list[dict[str, Any]]:
+        """All data rows as dicts, in sheet order."""
+        return [dict(zip(self.headers, row)) for row in self._rows]
+
+    # =========================================================================
+    # WRITES (applied after the corresponding Sheets API call succeeds)
+    # =========================================================================
+
+    def apply_update(self, row_number: int, updates: dict[str, Any]) -> None:
+        """Apply cell updates written to the sheet."""
+        if not 2 <= row_number < len(self._rows) + 2:
+            return
+        row = self._rows[row_number - 2]
+        old_row = list(row)
+        reindex = False
+        for name, value in updates.items():
+            idx = self._col.get(name)
+            if idx is None:
+                continue
+            row[idx] = "" if value is None else str(value)
+            reindex = reindex or name in INDEXED_COLUMNS
+        if reindex:
+            self._update_index(row_number, old_row)
+
+    def apply_append(self, row_values: list[Any], row_number: Optional[int] = None) -> int:
+        """
+        Record a row appended to the sheet.
+
+        Args:
+            row_values: Cell values in header order
+            row_number: Row reported by the API; must be the next row
+
+        Returns:
+            The row number of the appended row
+        """
+        expected = len(self._rows) + 2
+        if row_number is not None and row_number != expected:
+            # Someone else appended in between - our view is out of date
+            self.invalidate()
+            return row_number
+        row = self._normalize(row_values)
+        self._rows.append(row)
+        self._add_to_index(expected, row)
+        return expected
+
+    def apply_rows(self, updates: dict[int, list[Any]]) -> None:
+        """Replace (or append, for the next row numbers) full rows from a delta read."""
+        for row_number in sorted(updates):
+            row = self._normalize(updates[row_number])
+            if row_number < len(self._rows) + 2:
+                old_row, self._rows[row_number - 2] = self._rows[row_number - 2], row
+                self._update_index(row_number, old_row)
+            else:
+                self._rows.append(row)
+                self._add_to_index(len(self._rows) + 1, row)
+
+    # =========================================================================
+    # FRESHNESS
+    # =========================================================================
+
+    def diff_watched(self, columns: dict[str, list[Any]]) -> Optional[list[int]]:
+        """
+        Compare watched column values read from the sheet with the mirror.
+
+        Args:
+            columns: {column_name: values for rows 2..N}
+
+        Returns:
+            Row numbers that changed or were appended, or None if rows were
+            removed or reordered (a full reload is needed).
+        """
+        sheet_rows = max((len(v) for v in columns.values()), default=0)
+        if sheet_rows < len(self._rows):
+            return None
+
+        changed = []
+        for offset in range(sheet_rows):
+            row_number = offset + 2
+            if offset >= len(self._rows):
+                changed.append(row_number)
+                continue
+            mirrored = self._rows[offset]
+            for name, values in columns.items():
+                sheet_value = str(values[offset]) if offset < len(values) else ""
+                if sheet_value.strip() != self._cell(mirrored, name):
+                    if name == "dispatch_id":
+                        return None
+                    changed.append(row_number)
+                    break
+
+        self.checked_at = time.monotonic()
+        return changed
@@ -15,6 +15,8 @@ from typing import Optional
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from schemas.sheets_schema_v3 import column_index_to_letter
+
 logger = logging.getLogger(__name__)
 
 
@@ -241,6 +243,8 @@ class SheetsClient:
         from google_auth_oauthlib.flow import InstalledAppFlow
         from googleapiclient.discovery import build
 
+        from core.telemetry import sheets_request_builder
+
         creds = None
 
         # Load existing token
@@ -259,7 +263,9 @@ class SheetsClient:
             with open(self.token_file, "w") as token:
                 token.write(creds.to_json())
 
-        self._service = build("sheets", "v4", credentials=creds)
+        self._service = build(
+            "sheets", "v4", credentials=creds, requestBuilder=sheets_request_builder()
+        )
         return self._service
 
     def _get_range(self, range_notation: str = "") -> str:
@@ -347,6 +353,49 @@ class SheetsClient:
         logger.info(f"Updated record at row {row_number}")
         return True
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True,  # Callers report the API error itself
+    )
+    def update_fields(self, updates: list[tuple[int, dict[str, str]]]) -> int:
+        """
+        Write only the given columns of many rows in one batchUpdate call.
+
+        Other cells are not touched, so manual edits made since the rows were
+        read are kept. updated_at is set on every row.
+
+        Args:
+            updates: (row_number, {column_name: value}) pairs
+
+        Returns:
+            Number of rows written
+        """
+        if not updates:
+            return 0
+        service = self._get_service()
+
+        headers = PickupRecord.get_headers()
+        now = datetime.utcnow().isoformat() + "Z"
+        data = []
+        for row_number, fields in updates:
+            for name, value in {**fields, "updated_at": now}.items():
+                letter = column_index_to_letter(headers.index(name))
+                data.append(
+                    {
+                        "range": self._get_range(f"{letter}{row_number}"),
+                        "values": [[value or ""]],
+                    }
+                )
+
+        service.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={"valueInputOption": "RAW", "data": data},
+        ).execute()
+
+        logger.info(f"Updated {len(updates)} records in one batch")
+        return len(updates)
+
     def find_row_by_key(self, idempotency_key: str) -> Optional[int]:
         """Find row number by idempotency key (thread_root_id:attachment_hash)."""
         # Check cache first
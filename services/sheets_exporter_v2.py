@@ -70,13 +70,17 @@ class SheetsExporterV2:
             from google.oauth2 import service_account
             from googleapiclient.discovery import build
 
+            from core.telemetry import sheets_request_builder
+
             creds_path = Path(self.config.credentials_file)
             if creds_path.exists():
                 creds = service_account.Credentials.from_service_account_file(
                     str(creds_path),
                     scopes=["https://www.googleapis.com/auth/spreadsheets"],
                 )
-                self._service = build("sheets", "v4", credentials=creds)
+                self._service = build(
+                    "sheets", "v4", credentials=creds, requestBuilder=sheets_request_builder()
+                )
                 return self._service
             else:
                 raise FileNotFoundError(f"Credentials file not found: {creds_path}")
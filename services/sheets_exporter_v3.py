@@ -11,12 +11,29 @@ Key behaviors:
 4. Lock flags protect groups of fields
 5. Override fields are NEVER written by ingestion
 
+Row lookups go through a local mirror of the sheet (services.sheet_mirror)
+loaded with one read and kept in step with our own writes. A narrow read of
+the watched columns detects external edits and refreshes only changed rows.
+Rows about to be updated, and rows handed to the CD export, are re-read
+first (one batchGet per upsert_records() call or export) so upsert rules and
+payloads see manual edits to any column.
+Inside buffered_writes(), cell updates are queued by dispatch_id and flushed
+with one values.batchUpdate per batch of rows; each row number is resolved
+at flush time, so a mirror reload in between doesn't misdirect them.
+
 Schema Version: 3
 """
 
+import atexit
 import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Optional
 
 from schemas.sheets_schema_v3 import (
@@ -24,16 +41,95 @@ from schemas.sheets_schema_v3 import (
     ColumnClass,
     RowStatus,
     WarehouseMode,
+    column_index_to_letter,
     generate_dispatch_id,
-    get_column_index,
     get_column_names,
     get_delivery_columns,
     get_release_notes_columns,
     get_system_audit_columns,
 )
+from services.sheet_mirror import WATCHED_COLUMNS, SheetMirror
 
 logger = logging.getLogger(__name__)
 
+# Above this many changed rows a delta refresh is no cheaper than a reload
+_MAX_DELTA_ROWS = 50
+
+
+class SheetWriteBuffer:
+    """
+    Write-behind buffer of cell updates.
+
+    Updates are keyed by row identity (dispatch_id), not row number, since
+    rows can move in the sheet while they wait. They are merged per key (a
+    later value for the same cell replaces the earlier one, so each row ends
+    up in the state of its last write) and handed to ``flush_fn`` by the
+    next add() once max_rows rows are pending (and the update is for a new
+    row) or the oldest pending update is max_delay seconds old. There is no
+    timer - flushes happen on the caller's thread, which owns the API
+    client - so call flush() to write the rest.
+
+    Args:
+        flush_fn: Called with {key: {column: value}} in first-write order
+        max_rows: Rows per flush
+        max_delay: Age in seconds after which the next add() flushes first
+    """
+
+    def __init__(self, flush_fn, max_rows: int = 50, max_delay: float = 5.0):
+        self.flush_fn = flush_fn
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._pending: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._oldest: Optional[float] = None
+        self._lock = threading.RLock()
+        self.flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._pending
+
+    def items(self) -> list[tuple[str, dict[str, Any]]]:
+        """Pending (key, updates) pairs, oldest first."""
+        with self._lock:
+            return [(key, dict(updates)) for key, updates in self._pending.items()]
+
+    def add(self, key: str, updates: dict[str, Any]) -> None:
+        """Queue updates for a row, flushing first if the batch is full or too old."""
+        with self._lock:
+            now = time.monotonic()
+            batch_full = key not in self._pending and len(self._pending) >= self.max_rows
+            too_old = self._oldest is not None and now - self._oldest >= self.max_delay
+            if batch_full or too_old:
+                try:
+                    self.flush()
+                except Exception as e:
+                    # Kept queued; retried on the next flush
+                    logger.warning(f"Buffered sheet flush failed, will retry: {e}")
+
+            self._pending.setdefault(key, {}).update(updates)
+            if self._oldest is None:
+                self._oldest = now
+
+    def flush(self) -> None:
+        """Write all pending updates. On failure they stay queued for the next flush."""
+        with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, OrderedDict()
+            self._oldest = None
+            try:
+                self.flush_fn(batch)
+            except Exception:
+                # Re-queue underneath anything added since, preserving order
+                for key, updates in self._pending.items():
+                    batch.setdefault(key, {}).update(updates)
+                self._pending = batch
+                self._oldest = time.monotonic()
+                raise
+            self.flushes += 1
+
 
 class SheetsExporterV3:
     """
@@ -44,18 +140,30 @@ class SheetsExporterV3:
     - UPDATE: Respects locks, override pattern, fill-only mode
     """
 
-    def __init__(self, sheets_config, sheet_name: str = "Pickups"):
+    def __init__(
+        self,
+        sheets_config,
+        sheet_name: str = "Pickups",
+        check_interval: float = 30.0,
+        max_mirror_age: float = 600.0,
+    ):
         """
         Initialize the exporter.
 
         Args:
             sheets_config: Sheets configuration with credentials and spreadsheet_id
             sheet_name: Name of the sheet tab to use
+            check_interval: Seconds between checks of the sheet for external edits
+            max_mirror_age: Seconds after which the mirror is fully reloaded
         """
         self.config = sheets_config
         self.sheet_name = sheet_name
+        self.check_interval = check_interval
+        self.max_mirror_age = max_mirror_age
         self._service = None
         self._headers_cache: Optional[list[str]] = None
+        self.mirror = SheetMirror()
+        self._write_buffer: Optional[SheetWriteBuffer] = None
 
     def _get_service(self):
         """Get or create Google Sheets API service."""
@@ -63,11 +171,26 @@ class SheetsExporterV3:
             from google.oauth2 import service_account
             from googleapiclient.discovery import build
 
-            credentials = service_account.Credentials.from_service_account_file(
-                self.config.credentials_file,
-                scopes=["https://www.googleapis.com/auth/spreadsheets"],
+            from core.telemetry import sheets_request_builder
+
+            # A local stand-in (SHEETS_API_ENDPOINT) needs no service account
+            api_endpoint = getattr(self.config, "api_endpoint", "")
+            if api_endpoint and not Path(self.config.credentials_file).is_file():
+                from google.auth.credentials import AnonymousCredentials
+
+                credentials = AnonymousCredentials()
+            else:
+                credentials = service_account.Credentials.from_service_account_file(
+                    self.config.credentials_file,
+                    scopes=["https://www.googleapis.com/auth/spreadsheets"],
+                )
+            self._service = build(
+                "sheets",
+                "v4",
+                credentials=credentials,
+                requestBuilder=sheets_request_builder(),
+                client_options={"api_endpoint": api_endpoint} if api_endpoint else None,
             )
-            self._service = build("sheets", "v4", credentials=credentials)
         return self._service
 
     def _get_headers(self) -> list[str]:
@@ -95,9 +218,14 @@ class SheetsExporterV3:
         Ensure sheet has correct headers.
         Returns True if headers were created/updated.
         """
-        service = self._get_service()
         expected_headers = get_column_names()
 
+        # Headers already verified (or loaded with the mirror)
+        if self._headers_cache == expected_headers:
+            return False
+
+        service = self._get_service()
+
         # Get current headers
         result = (
             service.spreadsheets()
@@ -112,6 +240,7 @@ class SheetsExporterV3:
         current_headers = result.get("values", [[]])[0]
 
         if current_headers == expected_headers:
+            self._headers_cache = current_headers
             return False
 
         # Update headers
@@ -123,52 +252,251 @@ class SheetsExporterV3:
         ).execute()
 
         self._headers_cache = expected_headers
+        self.mirror.invalidate()
         return True
 
-    def _find_row_by_dispatch_id(self, dispatch_id: str) -> Optional[tuple[int, dict[str, Any]]]:
+    # =========================================================================
+    # LOCAL MIRROR
+    # =========================================================================
+
+    def _load_mirror(self) -> None:
+        """Load the whole sheet into the mirror (one read)."""
+        service = self._get_service()
+        result = (
+            service.spreadsheets()
+            .values()
+            .get(
+                spreadsheetId=self.config.spreadsheet_id,
+                range=f"{self.sheet_name}!A:ZZ",
+            )
+            .execute()
+        )
+        self.mirror.load(result.get("values", []))
+        if self.mirror.headers:
+            self._headers_cache = self.mirror.headers
+        # Rows may have moved; show buffered values at the rows that now hold them
+        if self._write_buffer is not None:
+            for dispatch_id, updates in self._write_buffer.items():
+                found = self.mirror.find_by_dispatch_id(dispatch_id)
+                if found:
+                    self.mirror.apply_update(found[0], updates)
+        logger.debug(f"Loaded sheet mirror: {self.mirror.row_count} rows")
+
+    def _check_mirror(self) -> None:
         """
-        Find row by dispatch_id.
+        Detect external edits with one narrow read of the watched columns.
 
-        Returns:
-            Tuple of (row_number, row_data) or None if not found.
-            row_number is 1-based (for Sheets API).
+        Changed or appended rows are re-read in a single batchGet; removed or
+        reordered rows trigger a full reload.
         """
-        service = self._get_service()
-        headers = self._get_headers()
+        headers = self.mirror.headers
+        watched = [name for name in WATCHED_COLUMNS if name in headers]
+        if not watched:
+            self._load_mirror()
+            return
 
-        if "dispatch_id" not in headers:
-            return None
+        service = self._get_service()
+        ranges = []
+        for name in watched:
+            letter = column_index_to_letter(headers.index(name))
+            ranges.append(f"{self.sheet_name}!{letter}2:{letter}")
+        result = (
+            service.spreadsheets()
+            .values()
+            .batchGet(
+                spreadsheetId=self.config.spreadsheet_id,
+                ranges=ranges,
+                majorDimension="COLUMNS",
+            )
+            .execute()
+        )
+        columns = {}
+        for name, value_range in zip(watched, result.get("valueRanges", [])):
+            values = value_range.get("values", [])
+            columns[name] = values[0] if values else []
+
+        changed = self.mirror.diff_watched(columns)
+        if changed is None or len(changed) > _MAX_DELTA_ROWS:
+            logger.info("Sheet changed externally, reloading mirror")
+            self._load_mirror()
+            return
+        if not changed:
+            return
+
+        logger.info(f"Refreshing {len(changed)} externally changed row(s)")
+        self._refresh_rows(changed)
+
+    def _refresh_rows(self, row_numbers: list[int]) -> None:
+        """
+        Re-read whole rows from the sheet into the mirror (one batchGet).
 
-        dispatch_id_col = headers.index("dispatch_id")
+        Buffered updates for those rows are flushed first so the read
+        includes them.
+        """
+        if not row_numbers:
+            return
+        if self._write_buffer is not None and any(
+            self._row_key(n) in self._write_buffer for n in row_numbers
+        ):
+            self.flush_writes()
 
-        # Get all rows
+        service = self._get_service()
         result = (
             service.spreadsheets()
             .values()
-            .get(
+            .batchGet(
                 spreadsheetId=self.config.spreadsheet_id,
-                range=f"{self.sheet_name}!A:ZZ",
+                ranges=[f"{self.sheet_name}!A{n}:ZZ{n}" for n in row_numbers],
             )
             .execute()
         )
+        rows = {}
+        for row_number, value_range in zip(row_numbers, result.get("valueRanges", [])):
+            values = value_range.get("values", [])
+            rows[row_number] = values[0] if values else []
+        self.mirror.apply_rows(rows)
+
+    def _row_key(self, row_number: int) -> str:
+        """dispatch_id of a mirrored row ("" if unknown), the key of its buffered updates."""
+        row = self.mirror.get(row_number)
+        return str(row.get("dispatch_id", "")).strip() if row else ""
+
+    def _reread_rows(self, matches: list[tuple[int, dict[str, Any]]]) -> None:
+        """
+        Re-read matched rows (one batchGet) before writes that depend on them.
 
-        rows = result.get("values", [])
-        if len(rows) <= 1:
-            return None
+        Only the watched columns are checked every check_interval, so other
+        manually edited cells can be stale in the mirror; lock and fill-only
+        rules must see the sheet as it is now. If a row no longer holds the
+        record it was matched for, rows have moved and the mirror is reloaded.
+        """
+        expected = {row_number: self._row_key(row_number) for row_number, _ in matches}
+        if not expected:
+            return
+        self._refresh_rows(list(expected))
+        if any(self._row_key(n) != dispatch_id for n, dispatch_id in expected.items()):
+            self._load_mirror()
+
+    def sync(self, force: bool = False) -> None:
+        """
+        Bring the mirror up to date.
 
-        # Search for dispatch_id
-        for row_idx, row in enumerate(rows[1:], start=2):  # Skip header, 1-based
-            if len(row) > dispatch_id_col and row[dispatch_id_col] == dispatch_id:
-                # Convert to dict
-                row_dict = {}
-                for i, header in enumerate(headers):
-                    if i < len(row):
-                        row_dict[header] = row[i]
-                    else:
-                        row_dict[header] = ""
-                return (row_idx, row_dict)
+        Loads it on first use or when older than max_mirror_age, otherwise
+        checks for external edits at most every check_interval seconds.
 
-        return None
+        Args:
+            force: Check for external edits now regardless of check_interval
+        """
+        now = time.monotonic()
+        if not self.mirror.loaded or now - self.mirror.loaded_at > self.max_mirror_age:
+            self._load_mirror()
+        elif force or now - self.mirror.checked_at > self.check_interval:
+            self._check_mirror()
+
+    def _write_cells(self, row_number: int, updates: dict[str, Any]) -> None:
+        """
+        Write only the given cells of a row and apply them to the mirror.
+
+        Inside buffered_writes() the write is queued under the row's
+        dispatch_id; the mirror is updated immediately so later lookups see
+        the pending values. Rows without a dispatch_id are written at once.
+        """
+        if self._write_buffer is not None:
+            self.mirror.apply_update(row_number, updates)
+            dispatch_id = self._row_key(row_number)
+            if dispatch_id:
+                self._write_buffer.add(dispatch_id, updates)
+                return
+
+        self._batch_update({row_number: updates})
+        self.mirror.apply_update(row_number, updates)
+
+    def _batch_update(self, rows: dict[int, dict[str, Any]]) -> None:
+        """Write cell updates for many rows in one values.batchUpdate call."""
+        headers = self._get_headers()
+        data = []
+        for row_number, updates in rows.items():
+            for name, value in updates.items():
+                if name not in headers:
+                    continue
+                letter = column_index_to_letter(headers.index(name))
+                data.append(
+                    {
+                        "range": f"{self.sheet_name}!{letter}{row_number}",
+                        "values": [[str(value) if value else ""]],
+                    }
+                )
+        if not data:
+            return
+
+        service = self._get_service()
+        service.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.config.spreadsheet_id,
+            body={"valueInputOption": "RAW", "data": data},
+        ).execute()
+
+    @contextmanager
+    def buffered_writes(self, max_rows: int = 50, max_delay: float = 5.0):
+        """
+        Queue cell updates and flush them in batches.
+
+        Everything pending is flushed when the block exits (also on error),
+        or at interpreter shutdown if the process exits inside the block.
+        Nested use joins the outer buffer.
+
+        Args:
+            max_rows: Rows per values.batchUpdate call
+            max_delay: Seconds before pending updates are flushed on the next write
+        """
+        if self._write_buffer is not None:
+            yield self._write_buffer
+            return
+
+        self._write_buffer = SheetWriteBuffer(self._flush_buffer, max_rows, max_delay)
+        # Registered only for the life of the block, so the exporter (and its
+        # mirror) isn't kept alive by atexit afterwards
+        atexit.register(self.flush_writes)
+        try:
+            yield self._write_buffer
+        finally:
+            atexit.unregister(self.flush_writes)
+            try:
+                self.flush_writes()
+            finally:
+                self._write_buffer = None
+
+    def _flush_buffer(self, pending: dict[str, dict[str, Any]]) -> None:
+        """Write buffered updates to the rows that hold their dispatch_ids now."""
+        self.sync()
+        rows: dict[int, dict[str, Any]] = {}
+        for dispatch_id, updates in pending.items():
+            found = self.mirror.find_by_dispatch_id(dispatch_id)
+            if not found:
+                logger.warning(f"Row {dispatch_id} is gone, dropping buffered update")
+                continue
+            rows.setdefault(found[0], {}).update(updates)
+        self._batch_update(rows)
+        for row_number, updates in rows.items():
+            self.mirror.apply_update(row_number, updates)
+        logger.info(f"Flushed buffered updates for {len(rows)} row(s)")
+
+    def flush_writes(self) -> None:
+        """Flush any buffered cell updates now."""
+        if self._write_buffer is not None:
+            self._write_buffer.flush()
+
+    def _find_row_by_dispatch_id(self, dispatch_id: str) -> Optional[tuple[int, dict[str, Any]]]:
+        """
+        Find row by dispatch_id.
+
+        Returns:
+            Tuple of (row_number, row_data) or None if not found.
+            row_number is 1-based (for Sheets API).
+        """
+        self.sync()
+        if "dispatch_id" not in self.mirror.headers:
+            return None
+        return self.mirror.find_by_dispatch_id(dispatch_id)
 
     def _fallback_find_row(
         self,
@@ -190,81 +518,70 @@ class SheetsExporterV3:
         Returns:
             Tuple of (row_number, row_data) or None if not found.
         """
-        service = self._get_service()
-        headers = self._get_headers()
+        self.sync()
+        return self.mirror.find_fallback(
+            auction_source=auction_source,
+            gate_pass=gate_pass,
+            auction_reference=auction_reference,
+            vin=vin,
+            attachment_hash=attachment_hash,
+        )
 
-        # Get all rows
-        result = (
-            service.spreadsheets()
-            .values()
-            .get(
-                spreadsheetId=self.config.spreadsheet_id,
-                range=f"{self.sheet_name}!A:ZZ",
+    def _find_existing(self, record: dict[str, Any]) -> Optional[tuple[int, dict[str, Any]]]:
+        """Match a record to a row: dispatch_id first, then the fallback keys."""
+        found = None
+        if record.get("dispatch_id"):
+            found = self._find_row_by_dispatch_id(record["dispatch_id"])
+        if not found:
+            found = self._fallback_find_row(
+                auction_source=record.get("auction_source", "UNKNOWN"),
+                gate_pass=record.get("gate_pass"),
+                auction_reference=record.get("auction_reference"),
+                vin=record.get("vehicle_vin"),
+                attachment_hash=record.get("attachment_hash"),
             )
-            .execute()
-        )
+        return found
 
-        rows = result.get("values", [])
-        if len(rows) <= 1:
-            return None
+    def upsert_records(
+        self,
+        extracted_records: list[dict[str, Any]],
+        force_refresh: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Upsert many records using Source of Truth semantics.
 
-        # Get column indices
-        def get_col_idx(name: str) -> int:
-            return headers.index(name) if name in headers else -1
-
-        auction_idx = get_col_idx("auction_source")
-        gp_idx = get_col_idx("gate_pass")
-        ref_idx = get_col_idx("auction_reference")
-        vin_idx = get_col_idx("vehicle_vin")
-        hash_idx = get_col_idx("attachment_hash")
-
-        def get_cell(row: list[str], idx: int) -> str:
-            if idx < 0 or idx >= len(row):
-                return ""
-            return str(row[idx]).strip()
-
-        for row_idx, row in enumerate(rows[1:], start=2):
-            row_auction = get_cell(row, auction_idx)
-            row_gp = get_cell(row, gp_idx)
-            row_ref = get_cell(row, ref_idx)
-            row_vin = get_cell(row, vin_idx)
-            row_hash = get_cell(row, hash_idx)
-
-            matched = False
-
-            # Priority 1: auction_source + gate_pass
-            if gate_pass and gate_pass.strip():
-                if row_auction == auction_source and row_gp.lower() == gate_pass.strip().lower():
-                    matched = True
-
-            # Priority 2: auction_source + auction_reference
-            elif auction_reference and auction_reference.strip():
-                if (
-                    row_auction == auction_source
-                    and row_ref.lower() == auction_reference.strip().lower()
-                ):
-                    matched = True
-
-            # Priority 3: vin
-            elif vin and vin.strip():
-                if row_vin.upper() == vin.strip().upper():
-                    matched = True
-
-            # Priority 4: attachment_hash
-            elif attachment_hash and attachment_hash.strip():
-                if row_hash.lower() == attachment_hash.strip().lower():
-                    matched = True
-
-            if matched:
-                row_dict = {}
-                for i, header in enumerate(headers):
-                    if i < len(row):
-                        row_dict[header] = row[i]
-                    else:
-                        row_dict[header] = ""
-                return (row_idx, row_dict)
+        All matched rows are re-read with a single batchGet before any rule
+        is applied, so a sync of N records costs one read, not N.
 
-        return None
+        Args:
+            extracted_records: Data extracted from PDFs/emails
+            force_refresh: If True, overwrite even non-empty fields (dangerous, default OFF)
+
+        Returns:
+            One result per record, in order (see upsert_record)
+        """
+        self.ensure_headers()
+
+        # Update rules read the live rows, not the mirrored copies
+        matches = [self._find_existing(record) for record in extracted_records]
+        self._reread_rows([m for m in matches if m])
+        verified = {m[0] for m in matches if m}
+
+        results = []
+        for record in extracted_records:
+            existing = self._find_existing(record)
+            if existing and existing[0] not in verified:
+                # Matched a different row after the re-read; check it too
+                self._reread_rows([existing])
+                verified.add(existing[0])
+                existing = self._find_existing(record)
+            results.append(self._upsert(record, existing, force_refresh))
+            if not existing:
+                # Our own insert is current; later records may match it
+                inserted = self._find_existing(record)
+                if inserted:
+                    verified.add(inserted[0])
+        return results
 
     def upsert_record(
         self,
@@ -274,6 +591,9 @@ class SheetsExporterV3:
         """
         Upsert a record using Source of Truth semantics.
 
+        Use upsert_records() for several records; it re-reads all matched
+        rows in one call.
+
         Args:
             extracted_record: Data extracted from PDF/email
             force_refresh: If True, overwrite even non-empty fields (dangerous, default OFF)
@@ -286,31 +606,16 @@ class SheetsExporterV3:
             - skipped_fields: List of {field, reason} for fields not updated
             - protection_snapshot: {row_status, locks, warehouse_mode}
         """
-        self.ensure_headers()
+        return self.upsert_records([extracted_record], force_refresh)[0]
 
-        # Extract key fields for matching
+    def _upsert(
+        self,
+        extracted_record: dict[str, Any],
+        existing: Optional[tuple[int, dict[str, Any]]],
+        force_refresh: bool,
+    ) -> dict[str, Any]:
+        """Update the matched (freshly re-read) row, or insert a new one."""
         dispatch_id = extracted_record.get("dispatch_id")
-        auction_source = extracted_record.get("auction_source", "UNKNOWN")
-        gate_pass = extracted_record.get("gate_pass")
-        auction_reference = extracted_record.get("auction_reference")
-        vin = extracted_record.get("vehicle_vin")
-        attachment_hash = extracted_record.get("attachment_hash")
-
-        # Try to find existing row
-        existing = None
-
-        if dispatch_id:
-            existing = self._find_row_by_dispatch_id(dispatch_id)
-
-        if not existing:
-            # Fallback matching
-            existing = self._fallback_find_row(
-                auction_source=auction_source,
-                gate_pass=gate_pass,
-                auction_reference=auction_reference,
-                vin=vin,
-                attachment_hash=attachment_hash,
-            )
 
         if existing:
             # UPDATE
@@ -329,11 +634,11 @@ class SheetsExporterV3:
             # INSERT
             if not dispatch_id:
                 dispatch_id = generate_dispatch_id(
-                    auction_source=auction_source,
-                    gate_pass=gate_pass,
-                    auction_reference=auction_reference,
-                    vin=vin,
-                    attachment_hash=attachment_hash,
+                    auction_source=extracted_record.get("auction_source", "UNKNOWN"),
+                    gate_pass=extracted_record.get("gate_pass"),
+                    auction_reference=extracted_record.get("auction_reference"),
+                    vin=extracted_record.get("vehicle_vin"),
+                    attachment_hash=extracted_record.get("attachment_hash"),
                 )
                 extracted_record["dispatch_id"] = dispatch_id
             return self._insert_new_row(extracted_record)
@@ -387,13 +692,24 @@ class SheetsExporterV3:
 
         # Append to sheet
         service = self._get_service()
-        service.spreadsheets().values().append(
-            spreadsheetId=self.config.spreadsheet_id,
-            range=f"{self.sheet_name}!A:A",
-            valueInputOption="RAW",
-            insertDataOption="INSERT_ROWS",
-            body={"values": [row_values]},
-        ).execute()
+        response = (
+            service.spreadsheets()
+            .values()
+            .append(
+                spreadsheetId=self.config.spreadsheet_id,
+                range=f"{self.sheet_name}!A:A",
+                valueInputOption="RAW",
+                insertDataOption="INSERT_ROWS",
+                body={"values": [row_values]},
+            )
+            .execute()
+        )
+
+        # Keep the mirror in step; the API reports where the row landed
+        updated_range = (response or {}).get("updates", {}).get("updatedRange", "")
+        match = re.search(r"![A-Z]+(\d+)", updated_range)
+        if self.mirror.loaded:
+            self.mirror.apply_append(row_values, int(match.group(1)) if match else None)
 
         logger.info(f"Inserted new row: dispatch_id={row_data.get('dispatch_id')}")
 
@@ -518,22 +834,10 @@ class SheetsExporterV3:
         if "updated_at" not in updated_fields:
             updated_fields.append("updated_at")
 
-        # Write updates to sheet
+        # Write only the changed cells, so concurrent manual edits to other
+        # columns are never overwritten with mirrored values
         if updates:
-            row_values = []
-            for header in headers:
-                if header in updates:
-                    row_values.append(str(updates[header]) if updates[header] else "")
-                else:
-                    row_values.append(str(existing_data.get(header, "") or ""))
-
-            service = self._get_service()
-            service.spreadsheets().values().update(
-                spreadsheetId=self.config.spreadsheet_id,
-                range=f"{self.sheet_name}!A{row_number}",
-                valueInputOption="RAW",
-                body={"values": [row_values]},
-            ).execute()
+            self._write_cells(row_number, updates)
 
         logger.info(
             f"Updated row {row_number}: dispatch_id={record.get('dispatch_id')}, "
@@ -581,48 +885,29 @@ class SheetsExporterV3:
         Returns:
             List of row data dicts
         """
-        service = self._get_service()
-        headers = self._get_headers()
-
-        status_idx = get_column_index("row_status")
-        if status_idx < 0:
-            return []
-
-        # Get all rows
-        result = (
-            service.spreadsheets()
-            .values()
-            .get(
-                spreadsheetId=self.config.spreadsheet_id,
-                range=f"{self.sheet_name}!A:ZZ",
-            )
-            .execute()
-        )
-
-        rows = result.get("values", [])
-        if len(rows) <= 1:
+        self.sync()
+        if "row_status" not in self.mirror.headers:
             return []
 
         status_values = {s.value for s in statuses}
-        matching_rows = []
+        matching = []
 
-        for row in rows[1:]:
-            if status_idx >= len(row):
-                continue
-
-            row_status = row[status_idx]
-            if row_status in status_values:
-                row_dict = {}
-                for i, header in enumerate(headers):
-                    if i < len(row):
-                        row_dict[header] = row[i]
-                    else:
-                        row_dict[header] = ""
-                matching_rows.append(row_dict)
+        for row_number, row_dict in enumerate(self.mirror.rows(), start=2):
+            if row_dict.get("row_status") in status_values:
+                matching.append(row_number)
 
-                if limit and len(matching_rows) >= limit:
+                if limit and len(matching) >= limit:
                     break
 
+        # These rows feed CD payloads; re-read them so manual edits to
+        # unwatched columns since the last full load are included
+        self._refresh_rows(matching)
+        matching_rows = []
+        for row_number in matching:
+            row_dict = self.mirror.get(row_number)
+            if row_dict and row_dict.get("row_status") in status_values:
+                matching_rows.append(row_dict)
+
         return matching_rows
 
     def update_row_status(
@@ -649,8 +934,7 @@ class SheetsExporterV3:
             logger.warning(f"Row not found for status update: {dispatch_id}")
             return False
 
-        row_number, existing_data = result
-        headers = self._get_headers()
+        row_number, _ = result
         now = datetime.utcnow().isoformat() + "Z"
 
         # Build updates
@@ -671,22 +955,7 @@ class SheetsExporterV3:
         if new_status == RowStatus.RETRY:
             updates["cd_last_attempt_at"] = now
 
-        # Build row values
-        row_values = []
-        for header in headers:
-            if header in updates:
-                row_values.append(str(updates[header]) if updates[header] else "")
-            else:
-                row_values.append(str(existing_data.get(header, "") or ""))
-
-        # Write to sheet
-        service = self._get_service()
-        service.spreadsheets().values().update(
-            spreadsheetId=self.config.spreadsheet_id,
-            range=f"{self.sheet_name}!A{row_number}",
-            valueInputOption="RAW",
-            body={"values": [row_values]},
-        ).execute()
+        self._write_cells(row_number, updates)
 
         logger.info(f"Updated status: dispatch_id={dispatch_id}, status={new_status.value}")
         return True
@@ -710,8 +979,7 @@ class SheetsExporterV3:
         if not result:
             return False
 
-        row_number, existing_data = result
-        headers = self._get_headers()
+        row_number, _ = result
 
         # Build updates
         updates = {
@@ -719,21 +987,6 @@ class SheetsExporterV3:
             "cd_last_attempt_at": datetime.utcnow().isoformat() + "Z",
         }
 
-        # Build row values
-        row_values = []
-        for header in headers:
-            if header in updates:
-                row_values.append(str(updates[header]) if updates[header] else "")
-            else:
-                row_values.append(str(existing_data.get(header, "") or ""))
-
-        # Write to sheet
-        service = self._get_service()
-        service.spreadsheets().values().update(
-            spreadsheetId=self.config.spreadsheet_id,
-            range=f"{self.sheet_name}!A{row_number}",
-            valueInputOption="RAW",
-            body={"values": [row_values]},
-        ).execute()
+        self._write_cells(row_number, updates)
 
         return True
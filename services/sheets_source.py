@@ -9,9 +9,14 @@ Features:
 2. Build PickupRecordFinal from *_final columns
 3. Track payload changes via cd_payload_hash
 4. Update export status after CD operations
+5. Incremental sync: per-row content hashes are persisted (SyncStateStore)
+   so only rows edited since the last sync are re-checked for CD updates
 """
 
+import hashlib
 import logging
+import sqlite3
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -178,6 +183,140 @@ class PickupRecordFinal:
         return compute_payload_hash(final_fields)
 
 
+@dataclass
+class RowSyncState:
+    """Persisted sync state for one sheet row."""
+
+    row_key: str
+    content_hash: str = ""
+    exported_payload_hash: str = ""
+    revision: int = 0  # Sync revision in which the content last changed
+    pending: bool = False  # Changed payload not yet exported
+
+
+class SyncStateStore:
+    """
+    SQLite store of per-row sync state for incremental Sheets -> CD sync.
+
+    A sync hashes each row's raw cells and only rows whose hash differs
+    from the stored one (or that are still pending export) get a record
+    built and a payload hash compared.
+    """
+
+    def __init__(self, db_path: str = "sheets_sync_state.db"):
+        self.db_path = Path(db_path)
+        self._init_db()
+
+    def _init_db(self):
+        with self._get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sheet_row_state (
+                    row_key TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL DEFAULT '',
+                    exported_payload_hash TEXT NOT NULL DEFAULT '',
+                    revision INTEGER NOT NULL DEFAULT 0,
+                    pending INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sheet_sync_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            conn.commit()
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def load_all(self) -> dict[str, RowSyncState]:
+        """Load every row state in one query."""
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT row_key, content_hash, exported_payload_hash, revision, pending "
+                "FROM sheet_row_state"
+            ).fetchall()
+        return {
+            row["row_key"]: RowSyncState(
+                row_key=row["row_key"],
+                content_hash=row["content_hash"],
+                exported_payload_hash=row["exported_payload_hash"],
+                revision=row["revision"],
+                pending=bool(row["pending"]),
+            )
+            for row in rows
+        }
+
+    def next_revision(self) -> int:
+        """Increment and return the sync revision counter."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM sheet_sync_meta WHERE key = 'revision'"
+            ).fetchone()
+            revision = int(row["value"]) + 1 if row else 1
+            conn.execute(
+                "INSERT OR REPLACE INTO sheet_sync_meta (key, value) VALUES ('revision', ?)",
+                (str(revision),),
+            )
+            conn.commit()
+        return revision
+
+    def save(self, states: list[RowSyncState]) -> None:
+        """Upsert row states in one transaction."""
+        if not states:
+            return
+        with self._get_connection() as conn:
+            conn.executemany(
+                """INSERT INTO sheet_row_state
+                   (row_key, content_hash, exported_payload_hash, revision, pending, updated_at)
+                   VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                   ON CONFLICT(row_key) DO UPDATE SET
+                       content_hash = excluded.content_hash,
+                       exported_payload_hash = excluded.exported_payload_hash,
+                       revision = excluded.revision,
+                       pending = excluded.pending,
+                       updated_at = CURRENT_TIMESTAMP""",
+                [
+                    (
+                        s.row_key,
+                        s.content_hash,
+                        s.exported_payload_hash,
+                        s.revision,
+                        int(s.pending),
+                    )
+                    for s in states
+                ],
+            )
+            conn.commit()
+
+    def mark_exported(self, row_key: str, payload_hash: str) -> None:
+        """Record the payload hash sent to CD and clear the pending flag."""
+        with self._get_connection() as conn:
+            conn.execute(
+                """INSERT INTO sheet_row_state (row_key, exported_payload_hash, pending)
+                   VALUES (?, ?, 0)
+                   ON CONFLICT(row_key) DO UPDATE SET
+                       exported_payload_hash = excluded.exported_payload_hash,
+                       pending = 0,
+                       updated_at = CURRENT_TIMESTAMP""",
+                (row_key, payload_hash),
+            )
+            conn.commit()
+
+
+def compute_row_content_hash(row_values: list[Any]) -> str:
+    """Cheap hash of a row's raw cell values."""
+    content = "\x1f".join(str(v) for v in row_values)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
 class SheetsSource:
     """
     Read pickup data from Google Sheets (Source of Truth).
@@ -185,10 +324,18 @@ class SheetsSource:
     Used by CD exporter to get rows ready for export.
     """
 
-    def __init__(self, config: SheetsConfig):
+    def __init__(self, config: SheetsConfig, state_store: Optional[SyncStateStore] = None):
         self.config = config
         self.column_names = get_column_names()
         self._service = None
+        self._state_store = state_store
+
+    @property
+    def state_store(self) -> Optional[SyncStateStore]:
+        """Lazy-load the sync state store (None if disabled in config)."""
+        if self._state_store is None and self.config.sync_state_db_path:
+            self._state_store = SyncStateStore(self.config.sync_state_db_path)
+        return self._state_store
 
     def _get_service(self):
         """Get or create Google Sheets API service."""
@@ -199,13 +346,17 @@ class SheetsSource:
             from google.oauth2 import service_account
             from googleapiclient.discovery import build
 
+            from core.telemetry import sheets_request_builder
+
             creds_path = Path(self.config.credentials_file)
             if creds_path.exists():
                 creds = service_account.Credentials.from_service_account_file(
                     str(creds_path),
                     scopes=["https://www.googleapis.com/auth/spreadsheets"],
                 )
-                self._service = build("sheets", "v4", credentials=creds)
+                self._service = build(
+                    "sheets", "v4", credentials=creds, requestBuilder=sheets_request_builder()
+                )
                 return self._service
             else:
                 raise FileNotFoundError(f"Credentials file not found: {creds_path}")
@@ -240,13 +391,17 @@ class SheetsSource:
         # First row is header
         rows = []
         for i, row_values in enumerate(values[1:], start=2):  # Start at row 2
-            row_dict = {"_row_number": i}
+            row_dict = {"_row_number": i, "_content_hash": compute_row_content_hash(row_values)}
             for j, col_name in enumerate(self.column_names):
                 row_dict[col_name] = row_values[j] if j < len(row_values) else ""
             rows.append(row_dict)
 
         return rows
 
+    @staticmethod
+    def _row_key(row: dict[str, Any]) -> str:
+        return row.get("pickup_uid") or f"row:{row.get('_row_number')}"
+
     def _row_to_final_record(self, row: dict[str, Any]) -> PickupRecordFinal:
         """Convert a row dict to PickupRecordFinal using *_final columns."""
         return PickupRecordFinal(
@@ -319,14 +474,52 @@ class SheetsSource:
         - status = READY_FOR_CD OR cd_export_status = READY
         - If include_changed: also include rows where payload hash changed
 
+        With a sync state store, payload hashes are only recomputed for rows
+        whose content changed since the last sync (or that are still pending
+        export), so the cost scales with the number of edits.
+
         Returns list of PickupRecordFinal objects.
         """
         rows = self._read_all_rows()
+        store = self.state_store if include_changed else None
+        states = store.load_all() if store else {}
+        revision = store.next_revision() if store else 0
+        changed_states = []
         ready = []
 
         for row in rows:
+            record = None
+            has_changed = False
+
+            # Only rows edited since the last sync (or still pending) are diffed
+            state = states.get(self._row_key(row)) if store else None
+            content_changed = state is None or state.content_hash != row["_content_hash"]
+            needs_diff = store is None or content_changed or state.pending
+
+            enabled = str(row.get("cd_export_enabled", "")).upper() == "TRUE"
+
+            if include_changed and enabled and needs_diff and row.get("cd_listing_id"):
+                record = self._row_to_final_record(row)
+                new_hash = record.compute_payload_hash()
+                # The hash we last exported wins over a possibly stale sheet column
+                old_hash = (state.exported_payload_hash if state else "") or row.get(
+                    "cd_payload_hash", ""
+                )
+                has_changed = new_hash != old_hash
+
+            if store and (content_changed or (state and state.pending != has_changed)):
+                changed_states.append(
+                    RowSyncState(
+                        row_key=self._row_key(row),
+                        content_hash=row["_content_hash"],
+                        exported_payload_hash=state.exported_payload_hash if state else "",
+                        revision=revision if content_changed else state.revision,
+                        pending=has_changed,
+                    )
+                )
+
             # Skip if export disabled
-            if str(row.get("cd_export_enabled", "")).upper() != "TRUE":
+            if not enabled:
                 continue
 
             status = row.get("status", "")
@@ -335,16 +528,14 @@ class SheetsSource:
             # Check if ready for export
             is_ready = status == "READY_FOR_CD" or cd_status == "READY"
 
-            # Check if payload changed (for re-export)
-            has_changed = False
-            if include_changed and row.get("cd_listing_id"):
-                record = self._row_to_final_record(row)
-                new_hash = record.compute_payload_hash()
-                old_hash = row.get("cd_payload_hash", "")
-                has_changed = new_hash != old_hash
-
             if is_ready or has_changed:
-                ready.append(self._row_to_final_record(row))
+                ready.append(record or self._row_to_final_record(row))
+
+        if store:
+            store.save(changed_states)
+            logger.info(
+                f"Sync revision {revision}: {len(changed_states)} of {len(rows)} rows changed"
+            )
 
         logger.info(f"Found {len(ready)} rows ready for CD export")
         return ready
@@ -419,9 +610,11 @@ class SheetsSource:
         # Find row number
         rows = self._read_all_rows()
         row_number = None
+        row_key = None
         for row in rows:
             if row.get("pickup_uid") == pickup_uid:
                 row_number = row.get("_row_number")
+                row_key = self._row_key(row)
                 break
 
         if not row_number:
@@ -531,15 +724,18 @@ class SheetsSource:
         if payload_json:
             record = self.get_by_row_number(row_number)
             if record:
+                payload_hash = record.compute_payload_hash()
                 hash_idx = get_column_index("cd_payload_hash")
                 if hash_idx >= 0:
                     col_letter = column_index_to_letter(hash_idx)
                     updates.append(
                         {
                             "range": f"{self.config.sheet_name}!{col_letter}{row_number}",
-                            "values": [[record.compute_payload_hash()]],
+                            "values": [[payload_hash]],
                         }
                     )
+                if success and self.state_store:
+                    self.state_store.mark_exported(row_key, payload_hash)
 
         # Execute updates
         if updates:
@@ -4,24 +4,56 @@ Features:
 1. Load warehouse data from YAML/JSON
 2. Geocode addresses (Google Maps or Nominatim fallback)
 3. Calculate driving distance (Distance Matrix API or Haversine fallback)
-4. Cache geocoding results in SQLite
+4. Cache geocoding results in SQLite (WAL, in-memory LRU, batched writes)
+5. Offline ZIP-centroid tier ahead of the cache and remote providers
+6. Rank warehouses with one batched haversine pass over a precomputed
+   coordinate matrix; only the top-k candidates hit the distance API, in a
+   single Distance Matrix request per pickup
+7. Batch routing (route_many) geocodes and measures concurrently through
+   the async client in services/geocoding.py
 """
 
+import asyncio
+import atexit
 import hashlib
 import json
 import logging
 import math
 import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from core.telemetry import REGISTRY
+from services.geocoding import (
+    GOOGLE_DISTANCE_MATRIX_URL,
+    GOOGLE_GEOCODE_URL,
+    MAX_MATRIX_DESTINATIONS,
+    NOMINATIM_SEARCH_URL,
+    AsyncGeocoder,
+    parse_distance_row,
+)
+from services.zip_geocoder import load_zip_index
+
+try:
+    import numpy as np
+except ImportError:  # Optional: CoordinateMatrix falls back to pure Python
+    np = None
+
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_MILES = 3956
+HAVERSINE_MPH = 50  # Average speed assumed for haversine duration estimates
+
 
 @dataclass
 class Warehouse:
@@ -56,12 +88,105 @@ class RoutingResult:
     duration_minutes: Optional[float] = None
 
 
+class CoordinateMatrix:
+    """
+    Warehouse coordinates precomputed for batched haversine ranking.
+
+    Warehouses without coordinates are left out. Uses numpy when it is
+    installed and plain Python otherwise.
+    """
+
+    def __init__(self, warehouses: list[Warehouse]):
+        self.warehouses = [
+            w for w in warehouses if w.latitude is not None and w.longitude is not None
+        ]
+        lat = [math.radians(w.latitude) for w in self.warehouses]
+        lon = [math.radians(w.longitude) for w in self.warehouses]
+        cos_lat = [math.cos(v) for v in lat]
+        if np is not None:
+            self._lat, self._lon, self._cos_lat = np.array(lat), np.array(lon), np.array(cos_lat)
+        else:
+            self._lat, self._lon, self._cos_lat = lat, lon, cos_lat
+
+    def __len__(self) -> int:
+        return len(self.warehouses)
+
+    def distances(self, origins: list[tuple[float, float]]) -> list[list[float]]:
+        """
+        Haversine distances in miles from each origin to every warehouse.
+
+        Args:
+            origins: (lat, lng) pairs in degrees
+
+        Returns:
+            One row per origin, columns in self.warehouses order
+        """
+        if not origins or not self.warehouses:
+            return [[] for _ in origins]
+
+        if np is not None:
+            points = np.radians(np.asarray(origins, dtype=float))
+            lat1, lon1 = points[:, :1], points[:, 1:]
+            a = (
+                np.sin((self._lat - lat1) / 2) ** 2
+                + np.cos(lat1) * self._cos_lat * np.sin((self._lon - lon1) / 2) ** 2
+            )
+            return (2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))).tolist()
+
+        rows = []
+        for lat, lng in origins:
+            lat1, lon1 = math.radians(lat), math.radians(lng)
+            cos1 = math.cos(lat1)
+            row = []
+            for lat2, lon2, cos2 in zip(self._lat, self._lon, self._cos_lat):
+                a = (
+                    math.sin((lat2 - lat1) / 2) ** 2
+                    + cos1 * cos2 * math.sin((lon2 - lon1) / 2) ** 2
+                )
+                row.append(2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(min(a, 1.0))))
+            rows.append(row)
+        return rows
+
+
 class GeocodeCache:
-    """SQLite cache for geocoding results."""
+    """
+    SQLite cache for geocoding and distance results.
 
-    def __init__(self, db_path: str = "geocode_cache.db"):
+    Keeps one WAL-mode connection open, serves hot addresses and routes from
+    an in-process LRU, and writes new distances in batches (flushed when
+    write_batch rows are pending, after flush_interval seconds, on flush()
+    and at exit). Entries older than ttl_days are ignored and purged; tables
+    are trimmed to max_entries rows, oldest first.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "geocode_cache.db",
+        memory_size: int = 4096,
+        ttl_days: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        write_batch: int = 100,
+        flush_interval: float = 5.0,
+    ):
         self.db_path = Path(db_path)
+        self.memory_size = memory_size
+        self.ttl_days = ttl_days
+        self.max_entries = max_entries
+        self.write_batch = write_batch
+        self.flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._geocodes: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._distances: OrderedDict[str, tuple[float, float, str]] = OrderedDict()
+        self._pending: list[tuple] = []
+        self._pending_since: Optional[float] = None
+        self.hits = {"memory": 0, "db": 0}
+        self.misses = 0
+
         self._init_db()
+        self.expire()
+        _open_caches.add(self)
 
     def _init_db(self):
         with self._get_connection() as conn:
@@ -86,78 +211,253 @@ class GeocodeCache:
                     cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_geocode_cached_at ON geocode_cache(cached_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_distance_cached_at ON distance_cache(cached_at)"
+            )
             conn.commit()
 
     @contextmanager
     def _get_connection(self):
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                self._conn.row_factory = sqlite3.Row
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            yield self._conn
+
+    def close(self):
+        """Flush pending writes and close the connection."""
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     @staticmethod
+    @lru_cache(maxsize=8192)
     def _hash_address(address: str) -> str:
         normalized = address.lower().strip()
         return hashlib.md5(normalized.encode()).hexdigest()
 
+    def _route_hash(self, origin: str, dest: str) -> str:
+        return f"{self._hash_address(origin)}:{self._hash_address(dest)}"
+
+    def _fresh_clause(self) -> tuple[str, tuple]:
+        if not self.ttl_days:
+            return "", ()
+        return " AND cached_at >= datetime('now', ?)", (f"-{self.ttl_days} days",)
+
+    def _remember(self, lru: OrderedDict, key: str, value) -> None:
+        lru[key] = value
+        lru.move_to_end(key)
+        while len(lru) > self.memory_size:
+            lru.popitem(last=False)
+
+    def _recall(self, lru: OrderedDict, key: str):
+        value = lru.get(key)
+        if value is not None:
+            lru.move_to_end(key)
+            self.hits["memory"] += 1
+        return value
+
     def get_geocode(self, address: str) -> Optional[tuple[float, float]]:
         """Get cached geocode result."""
         addr_hash = self._hash_address(address)
-        with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT latitude, longitude FROM geocode_cache WHERE address_hash = ?", (addr_hash,)
-            )
-            row = cursor.fetchone()
+        with self._lock:
+            cached = self._recall(self._geocodes, addr_hash)
+            if cached is not None:
+                return cached
+
+            clause, params = self._fresh_clause()
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    "SELECT latitude, longitude FROM geocode_cache WHERE address_hash = ?" + clause,
+                    (addr_hash, *params),
+                )
+                row = cursor.fetchone()
             if row:
-                return row["latitude"], row["longitude"]
+                self.hits["db"] += 1
+                coords = (row["latitude"], row["longitude"])
+                self._remember(self._geocodes, addr_hash, coords)
+                return coords
+            self.misses += 1
         return None
 
     def set_geocode(self, address: str, lat: float, lng: float, provider: str):
         """Cache geocode result."""
         addr_hash = self._hash_address(address)
-        with self._get_connection() as conn:
-            conn.execute(
-                """INSERT OR REPLACE INTO geocode_cache
-                   (address_hash, address, latitude, longitude, provider)
-                   VALUES (?, ?, ?, ?, ?)""",
-                (addr_hash, address, lat, lng, provider),
-            )
-            conn.commit()
+        with self._lock:
+            self._remember(self._geocodes, addr_hash, (lat, lng))
+            with self._get_connection() as conn:
+                conn.execute(
+                    """INSERT OR REPLACE INTO geocode_cache
+                       (address_hash, address, latitude, longitude, provider)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (addr_hash, address, lat, lng, provider),
+                )
+                conn.commit()
 
     def get_distance(self, origin: str, dest: str) -> Optional[tuple[float, float, str]]:
         """Get cached distance result. Returns (distance_meters, duration_seconds, mode)."""
-        origin_hash = self._hash_address(origin)
-        dest_hash = self._hash_address(dest)
-        route_hash = f"{origin_hash}:{dest_hash}"
-
-        with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT distance_meters, duration_seconds, mode FROM distance_cache WHERE route_hash = ?",
-                (route_hash,),
-            )
-            row = cursor.fetchone()
+        route_hash = self._route_hash(origin, dest)
+        with self._lock:
+            cached = self._recall(self._distances, route_hash)
+            if cached is not None:
+                return cached
+
+            clause, params = self._fresh_clause()
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    "SELECT distance_meters, duration_seconds, mode FROM distance_cache "
+                    "WHERE route_hash = ?" + clause,
+                    (route_hash, *params),
+                )
+                row = cursor.fetchone()
             if row:
-                return row["distance_meters"], row["duration_seconds"], row["mode"]
+                self.hits["db"] += 1
+                result = (row["distance_meters"], row["duration_seconds"], row["mode"])
+                self._remember(self._distances, route_hash, result)
+                return result
+            self.misses += 1
         return None
 
     def set_distance(
         self, origin: str, dest: str, distance_meters: float, duration_seconds: float, mode: str
     ):
-        """Cache distance result."""
+        """Cache distance result (written to SQLite in batches)."""
         origin_hash = self._hash_address(origin)
         dest_hash = self._hash_address(dest)
         route_hash = f"{origin_hash}:{dest_hash}"
 
-        with self._get_connection() as conn:
-            conn.execute(
-                """INSERT OR REPLACE INTO distance_cache
-                   (route_hash, origin_hash, dest_hash, distance_meters, duration_seconds, mode)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (route_hash, origin_hash, dest_hash, distance_meters, duration_seconds, mode),
+        with self._lock:
+            self._remember(self._distances, route_hash, (distance_meters, duration_seconds, mode))
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(
+                (route_hash, origin_hash, dest_hash, distance_meters, duration_seconds, mode)
             )
+            if (
+                len(self._pending) >= self.write_batch
+                or time.monotonic() - self._pending_since >= self.flush_interval
+            ):
+                self.flush()
+
+    def flush(self) -> int:
+        """
+        Write pending distance results.
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            with self._get_connection() as conn:
+                conn.executemany(
+                    """INSERT OR REPLACE INTO distance_cache
+                       (route_hash, origin_hash, dest_hash, distance_meters, duration_seconds, mode)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    batch,
+                )
+                conn.commit()
+            return len(batch)
+
+    def expire(self) -> int:
+        """
+        Purge entries past ttl_days and trim each table to max_entries.
+
+        Returns:
+            Number of rows deleted
+        """
+        deleted = 0
+        with self._get_connection() as conn:
+            for table in ("geocode_cache", "distance_cache"):
+                if self.ttl_days:
+                    deleted += conn.execute(
+                        f"DELETE FROM {table} WHERE cached_at < datetime('now', ?)",
+                        (f"-{self.ttl_days} days",),
+                    ).rowcount
+                if self.max_entries:
+                    deleted += conn.execute(
+                        f"""DELETE FROM {table} WHERE rowid IN (
+                               SELECT rowid FROM {table} ORDER BY cached_at DESC, rowid DESC
+                               LIMIT -1 OFFSET ?)""",
+                        (self.max_entries,),
+                    ).rowcount
             conn.commit()
+        if deleted:
+            logger.info(f"Expired {deleted} geocode cache entries")
+        return deleted
+
+    def stats(self) -> dict:
+        """Hit/miss counters and sizes for this cache."""
+        with self._lock:
+            hits = self.hits["memory"] + self.hits["db"]
+            lookups = hits + self.misses
+            return {
+                "db_path": str(self.db_path),
+                "memory_hits": self.hits["memory"],
+                "db_hits": self.hits["db"],
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._geocodes) + len(self._distances),
+                "pending_writes": len(self._pending),
+            }
+
+
+# Caches alive in this process, for metrics and the exit-time flush
+_open_caches: "weakref.WeakSet[GeocodeCache]" = weakref.WeakSet()
+
+
+def geocode_cache_stats() -> dict:
+    """Combined hit ratio and per-database stats for all open geocode caches."""
+    caches = [cache.stats() for cache in list(_open_caches)]
+    hits = sum(c["memory_hits"] + c["db_hits"] for c in caches)
+    lookups = hits + sum(c["misses"] for c in caches)
+    return {
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        "lookups": lookups,
+        "caches": caches,
+    }
+
+
+def _collect_geocode_cache_stats():
+    caches = geocode_cache_stats()["caches"]
+    return [
+        (
+            "geocode_cache_hits_total",
+            "counter",
+            "Geocode/distance cache hits by tier",
+            [
+                ({"db": c["db_path"], "tier": tier}, c[f"{tier}_hits"])
+                for c in caches
+                for tier in ("memory", "db")
+            ],
+        ),
+        (
+            "geocode_cache_misses_total",
+            "counter",
+            "Geocode/distance cache misses",
+            [({"db": c["db_path"]}, c["misses"]) for c in caches],
+        ),
+    ]
+
+
+REGISTRY.add_collector(_collect_geocode_cache_stats)
+
+
+@atexit.register
+def _flush_open_caches() -> None:
+    for cache in list(_open_caches):
+        try:
+            cache.flush()
+        except Exception as e:
+            logger.warning(f"Failed to flush geocode cache {cache.db_path}: {e}")
 
 
 class WarehouseRouter:
@@ -206,12 +506,48 @@ class WarehouseRouter:
         geocode_api_key: Optional[str] = None,
         distance_mode: str = "driving",
         cache_db_path: str = "geocode_cache.db",
+        top_k: int = 3,
+        zip_centroids_file: Optional[str] = None,
+        geocode_precision: str = "zip3",
+        cache_ttl_days: Optional[int] = None,
+        cache_max_entries: Optional[int] = None,
+        http_transport=None,
     ):
         self.geocode_provider = geocode_provider
         self.geocode_api_key = geocode_api_key
         self.distance_mode = distance_mode
-        self.cache = GeocodeCache(cache_db_path)
+        self.top_k = max(1, top_k)
+        self.geocode_precision = geocode_precision
+        self.zip_index = load_zip_index(zip_centroids_file) if zip_centroids_file else None
+        self.cache = GeocodeCache(
+            cache_db_path, ttl_days=cache_ttl_days, max_entries=cache_max_entries
+        )
         self.warehouses = self._load_warehouses(data_file)
+        self._matrix: Optional[CoordinateMatrix] = None
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "VehicleTransportAutomation/1.0"
+        # httpx transport for the route_many client (e.g. a local stub provider)
+        self.http_transport = http_transport
+
+    @property
+    def matrix(self) -> CoordinateMatrix:
+        """Warehouse coordinate matrix; missing coordinates are geocoded once."""
+        if self._matrix is None:
+            for warehouse in self.warehouses:
+                if warehouse.latitude is not None and warehouse.longitude is not None:
+                    continue
+                coords = self.geocode(warehouse.full_address)
+                if coords:
+                    warehouse.latitude, warehouse.longitude = coords
+                else:
+                    logger.warning(f"Could not geocode warehouse: {warehouse.name}")
+            self._matrix = CoordinateMatrix(self.warehouses)
+        return self._matrix
+
+    @property
+    def driving_enabled(self) -> bool:
+        """Whether top-k candidates are resolved with the Distance Matrix API."""
+        return self.distance_mode == "driving" and bool(self.geocode_api_key)
 
     def _load_warehouses(self, data_file: Optional[str]) -> list[Warehouse]:
         """Load warehouses from file or use defaults."""
@@ -246,11 +582,9 @@ class WarehouseRouter:
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def geocode(self, address: str) -> Optional[tuple[float, float]]:
         """Geocode an address to lat/lng coordinates."""
-        # Check cache
-        cached = self.cache.get_geocode(address)
-        if cached:
-            logger.debug(f"Geocode cache hit for: {address[:50]}...")
-            return cached
+        local = self._geocode_local(address)
+        if local:
+            return local
 
         coords = None
 
@@ -265,12 +599,26 @@ class WarehouseRouter:
 
         return coords
 
+    def _geocode_local(self, address: str) -> Optional[tuple[float, float]]:
+        """Offline centroid table, then the cache; None means a remote lookup is needed."""
+        # Offline ZIP/city centroid table first - no I/O
+        if self.zip_index is not None:
+            offline = self.zip_index.lookup(address, self.geocode_precision)
+            if offline:
+                return offline[0], offline[1]
+
+        # Check cache
+        cached = self.cache.get_geocode(address)
+        if cached:
+            logger.debug(f"Geocode cache hit for: {address[:50]}...")
+            return cached
+        return None
+
     def _geocode_google(self, address: str) -> Optional[tuple[float, float]]:
         """Geocode using Google Maps API."""
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
         params = {"address": address, "key": self.geocode_api_key}
 
-        response = requests.get(url, params=params, timeout=10)
+        response = self.session.get(GOOGLE_GEOCODE_URL, params=params, timeout=10)
         response.raise_for_status()
 
         data = response.json()
@@ -283,11 +631,9 @@ class WarehouseRouter:
 
     def _geocode_nominatim(self, address: str) -> Optional[tuple[float, float]]:
         """Geocode using OpenStreetMap Nominatim (free, rate-limited)."""
-        url = "https://nominatim.openstreetmap.org/search"
         params = {"q": address, "format": "json", "limit": 1}
-        headers = {"User-Agent": "VehicleTransportAutomation/1.0"}
 
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = self.session.get(NOMINATIM_SEARCH_URL, params=params, timeout=10)
         response.raise_for_status()
 
         data = response.json()
@@ -333,31 +679,108 @@ class WarehouseRouter:
         )
         return distance_miles, duration_minutes, "haversine"
 
-    @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=1, min=2, max=5))
     def _get_driving_distance(
         self, origin: tuple[float, float], dest: tuple[float, float]
     ) -> Optional[tuple[float, float]]:
         """Get driving distance using Google Distance Matrix API."""
-        url = "https://maps.googleapis.com/maps/api/distancematrix/json"
+        return self._get_driving_distances(origin, [dest])[0]
+
+    @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=1, min=2, max=5))
+    def _get_driving_distances(
+        self, origin: tuple[float, float], dests: list[tuple[float, float]]
+    ) -> list[Optional[tuple[float, float]]]:
+        """
+        Driving distances from one origin to several destinations in one
+        Distance Matrix request (up to MAX_MATRIX_DESTINATIONS).
+
+        Returns (distance_meters, duration_seconds) or None per destination.
+        """
         params = {
             "origins": f"{origin[0]},{origin[1]}",
-            "destinations": f"{dest[0]},{dest[1]}",
+            "destinations": "|".join(f"{lat},{lng}" for lat, lng in dests),
             "mode": "driving",
             "key": self.geocode_api_key,
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = self.session.get(GOOGLE_DISTANCE_MATRIX_URL, params=params, timeout=10)
         response.raise_for_status()
 
-        data = response.json()
-        if data["status"] == "OK":
-            element = data["rows"][0]["elements"][0]
-            if element["status"] == "OK":
-                distance = element["distance"]["value"]  # meters
-                duration = element["duration"]["value"]  # seconds
-                return distance, duration
+        return parse_distance_row(response.json(), len(dests))
 
-        return None
+    def _store_distance(
+        self,
+        pickup_coords: tuple[float, float],
+        pickup_address: str,
+        warehouse: Warehouse,
+        driving: Optional[tuple[float, float]],
+    ) -> tuple[float, float, str]:
+        """
+        Cache a driving result, or the haversine fallback when the API found
+        no route; returns (miles, minutes, mode).
+        """
+        if driving:
+            distance_meters, duration_seconds = driving
+            self.cache.set_distance(
+                pickup_address, warehouse.full_address, distance_meters, duration_seconds, "driving"
+            )
+            return distance_meters / 1609.34, duration_seconds / 60, "driving"
+
+        distance_miles, duration_minutes, mode = self._haversine_estimate(pickup_coords, warehouse)
+        self.cache.set_distance(
+            pickup_address,
+            warehouse.full_address,
+            distance_miles * 1609.34,
+            duration_minutes * 60,
+            "haversine",
+        )
+        return distance_miles, duration_minutes, mode
+
+    def _haversine_estimate(
+        self, pickup_coords: tuple[float, float], warehouse: Warehouse
+    ) -> tuple[float, float, str]:
+        """Straight-line (miles, minutes, mode) for a warehouse, without caching it."""
+        distance_miles = self._haversine_distance(
+            pickup_coords, (warehouse.latitude, warehouse.longitude)
+        )
+        return distance_miles, (distance_miles / HAVERSINE_MPH) * 60, "haversine"
+
+    def _driving_distances(
+        self,
+        pickup_coords: tuple[float, float],
+        pickup_address: str,
+        warehouses: list[Warehouse],
+    ) -> list[tuple[float, float, str]]:
+        """
+        (miles, minutes, mode) per warehouse: cached results first, then one
+        Distance Matrix request for the rest.
+        """
+        results: list[Optional[tuple[float, float, str]]] = [None] * len(warehouses)
+        missing = []
+        for i, warehouse in enumerate(warehouses):
+            cached = self.cache.get_distance(pickup_address, warehouse.full_address)
+            if cached:
+                distance_meters, duration_seconds, mode = cached
+                results[i] = (distance_meters / 1609.34, duration_seconds / 60, mode)
+            else:
+                missing.append(i)
+
+        for start in range(0, len(missing), MAX_MATRIX_DESTINATIONS):
+            chunk = missing[start : start + MAX_MATRIX_DESTINATIONS]
+            dests = [(warehouses[i].latitude, warehouses[i].longitude) for i in chunk]
+            try:
+                fetched = self._get_driving_distances(pickup_coords, dests)
+            except Exception as e:
+                # Don't cache the fallback: the next request retries the API
+                logger.warning(f"Distance Matrix request failed for {pickup_address[:50]}: {e}")
+                for i in chunk:
+                    results[i] = self._haversine_estimate(pickup_coords, warehouses[i])
+                continue
+            for i, driving in zip(chunk, fetched):
+                results[i] = self._store_distance(
+                    pickup_coords, pickup_address, warehouses[i], driving
+                )
+
+        return results
 
     @staticmethod
     def _haversine_distance(origin: tuple[float, float], dest: tuple[float, float]) -> float:
@@ -371,9 +794,61 @@ class WarehouseRouter:
         a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
         c = 2 * math.asin(math.sqrt(a))
 
-        # Earth radius in miles
-        r = 3956
-        return c * r
+        return c * EARTH_RADIUS_MILES
+
+    def _rank(
+        self,
+        pickup_coords: tuple[float, float],
+        pickup_address: str,
+        miles: list[float],
+        limit: Optional[int] = None,
+    ) -> list[RoutingResult]:
+        """
+        Turn straight-line distances into routing results, closest first.
+
+        Only the top_k closest warehouses are resolved through the cache and
+        one Distance Matrix request; the rest keep the haversine figure.
+
+        Args:
+            pickup_coords: Pickup (lat, lng)
+            pickup_address: Pickup address (distance cache key)
+            miles: Haversine miles per warehouse, in self.matrix order
+            limit: Return at most this many results
+        """
+        warehouses = self.matrix.warehouses
+        order = sorted(range(len(miles)), key=miles.__getitem__)[:limit]
+
+        top = order[: self.top_k] if self.driving_enabled else []
+        driving = self._driving_distances(
+            pickup_coords, pickup_address, [warehouses[idx] for idx in top]
+        )
+
+        ranked = []
+        for rank, idx in enumerate(order):
+            if rank < len(top):
+                distance, duration, mode = driving[rank]
+            else:
+                distance = miles[idx]
+                duration, mode = (distance / HAVERSINE_MPH) * 60, "haversine"
+            ranked.append((distance, duration, mode, warehouses[idx]))
+
+        ranked.sort(key=lambda r: r[0])
+        return [
+            RoutingResult(
+                warehouse=warehouse,
+                distance_miles=round(distance, 1),
+                distance_mode=mode,
+                duration_minutes=round(duration, 0) if duration else None,
+            )
+            for distance, duration, mode, warehouse in ranked
+        ]
+
+    def _nearest(
+        self, pickup_coords: tuple[float, float], pickup_address: str, miles: list[float]
+    ) -> Optional[RoutingResult]:
+        candidates = self.top_k if self.driving_enabled else 1
+        results = self._rank(pickup_coords, pickup_address, miles, limit=candidates)
+        return results[0] if results else None
 
     def find_nearest_warehouse(self, pickup_address: str) -> Optional[RoutingResult]:
         """Find the nearest warehouse to a pickup address."""
@@ -383,35 +858,8 @@ class WarehouseRouter:
             logger.error(f"Could not geocode pickup address: {pickup_address}")
             return None
 
-        best_result: Optional[RoutingResult] = None
-        min_distance = float("inf")
-
-        for warehouse in self.warehouses:
-            # Get warehouse coordinates
-            if warehouse.latitude and warehouse.longitude:
-                wh_coords = (warehouse.latitude, warehouse.longitude)
-            else:
-                wh_coords = self.geocode(warehouse.full_address)
-                if wh_coords:
-                    warehouse.latitude, warehouse.longitude = wh_coords
-
-            if not wh_coords:
-                logger.warning(f"Could not geocode warehouse: {warehouse.name}")
-                continue
-
-            # Calculate distance
-            distance, duration, mode = self.get_distance(
-                pickup_coords, wh_coords, pickup_address, warehouse.full_address
-            )
-
-            if distance < min_distance:
-                min_distance = distance
-                best_result = RoutingResult(
-                    warehouse=warehouse,
-                    distance_miles=round(distance, 1),
-                    distance_mode=mode,
-                    duration_minutes=round(duration, 0) if duration else None,
-                )
+        miles = self.matrix.distances([pickup_coords])[0]
+        best_result = self._nearest(pickup_coords, pickup_address, miles)
 
         if best_result:
             logger.info(
@@ -422,38 +870,163 @@ class WarehouseRouter:
         return best_result
 
     def get_all_distances(self, pickup_address: str) -> list[RoutingResult]:
-        """Get distances to all warehouses, sorted by distance."""
+        """
+        Get distances to all warehouses, sorted by distance.
+
+        The top_k closest use driving distance when enabled; the rest are
+        haversine estimates.
+        """
         pickup_coords = self.geocode(pickup_address)
         if not pickup_coords:
             return []
 
-        results = []
+        miles = self.matrix.distances([pickup_coords])[0]
+        return self._rank(pickup_coords, pickup_address, miles)
 
-        for warehouse in self.warehouses:
-            if warehouse.latitude and warehouse.longitude:
-                wh_coords = (warehouse.latitude, warehouse.longitude)
-            else:
-                wh_coords = self.geocode(warehouse.full_address)
-                if wh_coords:
-                    warehouse.latitude, warehouse.longitude = wh_coords
+    def route_many(self, addresses: list[str]) -> list[Optional[RoutingResult]]:
+        """
+        Find the nearest warehouse for many pickup addresses.
 
-            if not wh_coords:
-                continue
+        Synchronous wrapper around route_many_async; from async code, await
+        route_many_async instead.
 
-            distance, duration, mode = self.get_distance(
-                pickup_coords, wh_coords, pickup_address, warehouse.full_address
-            )
+        Args:
+            addresses: Pickup addresses
 
-            results.append(
-                RoutingResult(
-                    warehouse=warehouse,
-                    distance_miles=round(distance, 1),
-                    distance_mode=mode,
-                    duration_minutes=round(duration, 0) if duration else None,
-                )
-            )
+        Returns:
+            One result per address, in input order (None if it could not be
+            geocoded)
+        """
+        return asyncio.run(self.route_many_async(addresses))
+
+    async def route_many_async(self, addresses: list[str]) -> list[Optional[RoutingResult]]:
+        """
+        Find the nearest warehouse for many pickup addresses.
+
+        Each distinct address is geocoded once (remote lookups run
+        concurrently and coalesce), all of them are ranked against the
+        warehouse matrix in a single haversine pass, and uncached top-k
+        driving distances are fetched with one Distance Matrix request per
+        pickup, concurrently. Everything else (cache reads and writes,
+        building the matrix, which geocodes warehouses on first use, the
+        haversine pass and ranking, which may fall back to synchronous
+        Distance Matrix calls) runs in a worker thread so it doesn't block
+        the event loop.
+        """
+        async with AsyncGeocoder(
+            provider=self.geocode_provider,
+            api_key=self.geocode_api_key,
+            transport=self.http_transport,
+        ) as geocoder:
+            coords = await self._geocode_many_async(geocoder, list(dict.fromkeys(addresses)))
+            located = list(coords)
+            points = [coords[a] for a in located]
+            rows = await asyncio.to_thread(lambda: self.matrix.distances(points))
+            if self.driving_enabled:
+                await self._prefetch_driving(geocoder, coords, located, rows)
+
+        routed = await asyncio.to_thread(self._nearest_many, coords, located, rows)
+
+        await asyncio.to_thread(self.cache.flush)
+        logger.info(f"Routed {len(routed)} of {len(addresses)} pickups ({len(located)} unique)")
+        return [routed.get(address) for address in addresses]
+
+    def _nearest_many(
+        self,
+        coords: dict[str, tuple[float, float]],
+        located: list[str],
+        rows: list[list[float]],
+    ) -> dict[str, Optional[RoutingResult]]:
+        """Rank warehouses for each located pickup against its matrix row."""
+        return {
+            address: self._nearest(coords[address], address, miles)
+            for address, miles in zip(located, rows)
+        }
 
-        return sorted(results, key=lambda r: r.distance_miles)
+    async def _geocode_many_async(
+        self, geocoder: AsyncGeocoder, addresses: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        """Geocode addresses: local tiers first, then concurrent remote lookups."""
+        coords = await asyncio.to_thread(self._geocode_local_many, addresses)
+        missing = [address for address in addresses if address not in coords]
+
+        if missing:
+            fetched = await geocoder.geocode_many(missing)
+            for address, point in fetched.items():
+                if point:
+                    coords[address] = point
+                else:
+                    logger.error(f"Could not geocode pickup address: {address}")
+            await asyncio.to_thread(self._store_geocodes, fetched, geocoder.provider)
+        return coords
+
+    def _geocode_local_many(self, addresses: list[str]) -> dict[str, tuple[float, float]]:
+        """Coordinates for the addresses the offline table or the cache can place."""
+        coords = {}
+        for address in addresses:
+            point = self._geocode_local(address)
+            if point:
+                coords[address] = point
+        return coords
+
+    def _store_geocodes(
+        self, points: dict[str, Optional[tuple[float, float]]], provider: str
+    ) -> None:
+        """Cache remote geocoding results."""
+        for address, point in points.items():
+            if point:
+                self.cache.set_geocode(address, point[0], point[1], provider)
+
+    async def _prefetch_driving(
+        self,
+        geocoder: AsyncGeocoder,
+        coords: dict[str, tuple[float, float]],
+        located: list[str],
+        rows: list[list[float]],
+    ) -> None:
+        """Fetch uncached top-k driving distances into the cache, one request per pickup."""
+        jobs = await asyncio.to_thread(self._driving_jobs, located, rows)
+
+        results = await asyncio.gather(
+            *(
+                geocoder.distance_matrix(coords[address], [(w.latitude, w.longitude) for w in ws])
+                for address, ws in jobs
+            ),
+            return_exceptions=True,
+        )
+        await asyncio.to_thread(self._store_driving, coords, jobs, results)
+
+    def _driving_jobs(
+        self, located: list[str], rows: list[list[float]]
+    ) -> list[tuple[str, list[Warehouse]]]:
+        """(address, top-k warehouses without a cached distance) per pickup that needs a request."""
+        warehouses = self.matrix.warehouses
+        jobs = []
+        for address, miles in zip(located, rows):
+            top = sorted(range(len(miles)), key=miles.__getitem__)[: self.top_k]
+            missing = [
+                warehouses[i]
+                for i in top
+                if self.cache.get_distance(address, warehouses[i].full_address) is None
+            ]
+            if missing:
+                jobs.append((address, missing))
+        return jobs
+
+    def _store_driving(
+        self,
+        coords: dict[str, tuple[float, float]],
+        jobs: list[tuple[str, list[Warehouse]]],
+        results: list,
+    ) -> None:
+        """Cache prefetched driving distances; failed pickups are left for _rank."""
+        for (address, ws), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                # _rank retries this pickup synchronously
+                logger.warning(f"Distance Matrix request failed for {address[:50]}: {result}")
+                continue
+            for warehouse, driving in zip(ws, result):
+                self._store_distance(coords[address], address, warehouse, driving)
 
 
 def create_router_from_config(config) -> WarehouseRouter:
@@ -464,4 +1037,9 @@ def create_router_from_config(config) -> WarehouseRouter:
         geocode_api_key=config.warehouse.geocode_api_key,
         distance_mode=config.warehouse.distance_mode,
         cache_db_path=config.warehouse.cache_db_path,
+        top_k=config.warehouse.top_k,
+        zip_centroids_file=config.warehouse.zip_centroids_file,
+        geocode_precision=config.warehouse.geocode_precision,
+        cache_ttl_days=config.warehouse.cache_ttl_days,
+        cache_max_entries=config.warehouse.cache_max_entries,
     )
@@ -0,0 +1,181 @@
+"""
+Offline ZIP-centroid geocoder.
+
+First geocoding tier for warehouse routing: resolves addresses that end in a
+US ZIP code (or a known city/state) from a local centroid table, so routing
+needs no network call and adds no per-pickup latency. Anything the table
+cannot place at the configured precision falls through to remote geocoding.
+
+The table is a CSV (optionally gzipped) with a header row:
+
+    zip,lat,lng[,city,state]
+
+Build one from the Census ZCTA Gazetteer with
+scripts/build_zip_centroids.py. Rows are held in compact, sorted typed arrays
+(about 12 bytes per ZIP) and looked up by binary search.
+"""
+
+import csv
+import gzip
+import logging
+import re
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from extractors.address_parser import parse_city_state_zip
+
+logger = logging.getLogger(__name__)
+
+# Precision policies, finest first. A policy accepts its own level and every
+# finer one: "zip5" = exact ZIP only, "city" = ZIP or city/state centroid,
+# "zip3" = any of those or the 3-digit ZIP prefix centroid. Any other value
+# (e.g. "remote") turns the offline tier off.
+PRECISION_LEVELS = ["zip5", "city", "zip3"]
+
+_TRAILING_ZIP = re.compile(r"\b(\d{5})(?:-\d{4})?\s*$")
+
+
+class ZipCentroidIndex:
+    """Sorted ZIP -> (lat, lng) arrays with city/state and ZIP3 rollups."""
+
+    def __init__(self):
+        self._zips = array("I")
+        self._lat = array("f")
+        self._lng = array("f")
+        self._by_city: dict[tuple[str, str], tuple[float, float]] = {}
+        self._by_zip3: dict[int, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._zips)
+
+    @classmethod
+    def load(cls, path: str) -> "ZipCentroidIndex":
+        """
+        Load a centroid table.
+
+        Args:
+            path: CSV or .csv.gz file with zip,lat,lng[,city,state] columns
+
+        Returns:
+            Populated index
+        """
+        opener = gzip.open if str(path).endswith(".gz") else open
+        rows = []
+        cities: dict[tuple[str, str], list[tuple[float, float]]] = {}
+        with opener(path, "rt", newline="") as f:
+            for record in csv.DictReader(f):
+                try:
+                    zip_code = int(record["zip"].strip()[:5])
+                    point = (float(record["lat"]), float(record["lng"]))
+                except (KeyError, ValueError, AttributeError):
+                    continue
+                rows.append((zip_code, *point))
+                city, state = (record.get("city") or "").strip(), (record.get("state") or "")
+                if city and state.strip():
+                    cities.setdefault((city.upper(), state.strip().upper()), []).append(point)
+
+        index = cls()
+        rows.sort()
+        zip3: dict[int, list[tuple[float, float]]] = {}
+        for zip_code, lat, lng in rows:
+            if index._zips and index._zips[-1] == zip_code:
+                continue  # First row wins on duplicates
+            index._zips.append(zip_code)
+            index._lat.append(lat)
+            index._lng.append(lng)
+            zip3.setdefault(zip_code // 100, []).append((lat, lng))
+
+        index._by_zip3 = {prefix: _centroid(points) for prefix, points in zip3.items()}
+        index._by_city = {key: _centroid(points) for key, points in cities.items()}
+        logger.info(f"Loaded {len(index)} ZIP centroids from {path}")
+        return index
+
+    def get_zip(self, zip_code: str) -> Optional[tuple[float, float]]:
+        """Centroid of an exact 5-digit ZIP, or None."""
+        try:
+            key = int(zip_code[:5])
+        except (TypeError, ValueError):
+            return None
+        i = bisect_left(self._zips, key)
+        if i < len(self._zips) and self._zips[i] == key:
+            return float(self._lat[i]), float(self._lng[i])
+        return None
+
+    def lookup(self, address: str, precision: str = "zip3") -> Optional[tuple[float, float, str]]:
+        """
+        Geocode an address from the table.
+
+        Args:
+            address: Free-form address, typically "street, city, ST 12345"
+            precision: Coarsest acceptable level (see PRECISION_LEVELS)
+
+        Returns:
+            (lat, lng, level) or None if the address is ambiguous at this
+            precision
+        """
+        if precision not in PRECISION_LEVELS or not address:
+            return None
+        allowed = PRECISION_LEVELS[: PRECISION_LEVELS.index(precision) + 1]
+        city, state, zip_code = _split_address(address)
+
+        if zip_code:
+            coords = self.get_zip(zip_code)
+            if coords:
+                return (*coords, "zip5")
+        if "city" in allowed and city and state:
+            coords = self._by_city.get((city.upper(), state.upper()))
+            if coords:
+                return (*coords, "city")
+        if "zip3" in allowed and zip_code:
+            coords = self._by_zip3.get(int(zip_code[:5]) // 100)
+            if coords:
+                return (*coords, "zip3")
+        return None
+
+
+def _centroid(points: list[tuple[float, float]]) -> tuple[float, float]:
+    return (
+        sum(p[0] for p in points) / len(points),
+        sum(p[1] for p in points) / len(points),
+    )
+
+
+def _split_address(address: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """Pull (city, state, zip) from the tail of an address."""
+    parts = [p.strip() for p in address.split(",") if p.strip()]
+    for tail in (", ".join(parts[-2:]), parts[-1] if parts else ""):
+        city, state, zip_code = parse_city_state_zip(tail)
+        if zip_code:
+            return city, state, zip_code
+    match = _TRAILING_ZIP.search(address)
+    if match:
+        return None, None, match.group(1)
+    return None, None, None
+
+
+def load_zip_index(path: str) -> Optional[ZipCentroidIndex]:
+    """
+    Load the centroid table at path, once per file version.
+
+    Returns None when the file does not exist, which disables the offline tier.
+    A missing file is not cached, and replacing the file (a new mtime or size)
+    loads it again, so a table installed after startup is picked up by the
+    next router.
+    """
+    try:
+        stat = Path(path).stat() if path else None
+    except OSError:
+        stat = None
+    if stat is None:
+        logger.info(f"ZIP centroid table not found at {path}; offline geocoding disabled")
+        return None
+    return _load_zip_index(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_zip_index(path: str, mtime_ns: int, size: int) -> ZipCentroidIndex:
+    """Load the table at path; the mtime and size only key the cache."""
+    return ZipCentroidIndex.load(path)
@@ -4,26 +4,45 @@ Generate valid test PDF fixtures for smoke testing.
 Run this script to create test PDFs that simulate auction invoices.
 These PDFs are used for integration testing of the extraction pipeline.
 
+With --corpus it instead generates a synthetic corpus of Copart/IAA/Manheim
+style invoices for load, memory and benchmark runs. Each PDF gets a
+ground-truth JSON next to it in the tests/regression_runner format, and
+every document is derived from (seed, index) alone, so any slice of a
+corpus can be regenerated identically.
+
 Usage:
     python tests/fixtures/generate_test_pdfs.py
+    python tests/fixtures/generate_test_pdfs.py --corpus /tmp/corpus --count 2000
+    python tests/fixtures/generate_test_pdfs.py --corpus /tmp/corpus --count 500 \\
+        --pages 1-6 --columns 1,2 --words-per-page 100-600 --scanned-ratio 0.2 --bundle-ratio 0.2
 """
 
+import argparse
+import json
+import random
+import string
+import sys
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
 from pathlib import Path
+from typing import Any, Callable, Optional
 
 # Try reportlab first, then fpdf2
 try:
     from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
     from reportlab.pdfgen import canvas
 
     USE_REPORTLAB = True
+    PDF_BACKEND = "reportlab"
 except ImportError:
     USE_REPORTLAB = False
     try:
         from fpdf import FPDF
+
+        PDF_BACKEND = "fpdf2"
     except ImportError:
-        print("ERROR: Neither reportlab nor fpdf2 is installed.")
-        print("Install with: pip install reportlab  OR  pip install fpdf2")
-        exit(1)
+        PDF_BACKEND = None
 
 FIXTURES_DIR = Path(__file__).parent
 
@@ -72,6 +91,7 @@ def create_pdf_fpdf(filepath: str, lines: list[str], title: str = "Test Document
 
 def create_pdf(filepath: str, lines: list[str], title: str = "Test Document"):
     """Create a PDF using the available library."""
+    _require_backend()
     if USE_REPORTLAB:
         create_pdf_reportlab(filepath, lines, title)
     else:
@@ -233,10 +253,602 @@ def generate_minimal_pdf():
     print(f"Created: {filepath}")
 
 
-def main():
+def _require_backend():
+    if PDF_BACKEND is None:
+        raise RuntimeError(
+            "Neither reportlab nor fpdf2 is installed. "
+            "Install with: pip install reportlab  OR  pip install fpdf2"
+        )
+
+
+# =============================================================================
+# SYNTHETIC CORPUS
+# =============================================================================
+
+# (name, street, city, state, zip, phone) per auction
+PICKUP_LOCATIONS = {
+    "COPART": [
+        ("Copart - Houston", "5678 Industrial Blvd", "Houston", "TX", "77001", "(281) 555-7890"),
+        (
+            "Copart - Littleton",
+            "8300 Blakeland Drive",
+            "Littleton",
+            "CO",
+            "80125",
+            "(303) 555-0142",
+        ),
+        ("Copart - Tampa", "77 Fitchburg Road", "Riverview", "FL", "33578", "(813) 555-0199"),
+        ("Copart - Sacramento", "8960 Kiefer Blvd", "Sacramento", "CA", "95826", "(916) 555-0117"),
+        ("Copart - Atlanta East", "6089 Lee Road", "Lithonia", "GA", "30058", "(770) 555-0164"),
+    ],
+    "IAA": [
+        ("Tampa South IAA", "1234 Auction Way", "Tampa", "FL", "33619", "(813) 555-4567"),
+        ("Dallas IAA", "4226 E Main St", "Grand Prairie", "TX", "75050", "(972) 555-0108"),
+        ("Chicago North IAA", "605 Healy Rd", "East Dundee", "IL", "60118", "(847) 555-0123"),
+        ("Phoenix IAA", "4201 W Buckeye Rd", "Phoenix", "AZ", "85009", "(602) 555-0186"),
+        ("Newark IAA", "105 Haynes Ave", "Newark", "NJ", "07114", "(973) 555-0131"),
+    ],
+    "MANHEIM": [
+        ("Manheim Dallas", "9001 Auction Lane", "Dallas", "TX", "75234", "(972) 555-3456"),
+        ("Manheim Atlanta", "4900 Buffington Rd", "Atlanta", "GA", "30349", "(404) 555-0177"),
+        ("Manheim Pennsylvania", "1190 Lancaster Rd", "Manheim", "PA", "17545", "(717) 555-0150"),
+        ("Manheim Denver", "14400 E 33rd Pl", "Aurora", "CO", "80011", "(303) 555-0159"),
+        ("Manheim Orlando", "11801 W Colonial Dr", "Ocoee", "FL", "34761", "(407) 555-0138"),
+    ],
+}
+
+VEHICLE_MODELS = [
+    ("TOYOTA", "COROLLA"),
+    ("TOYOTA", "CAMRY"),
+    ("HONDA", "CIVIC"),
+    ("HONDA", "ACCORD"),
+    ("FORD", "F-150 XLT"),
+    ("FORD", "EDGE"),
+    ("CHEVROLET", "MALIBU"),
+    ("NISSAN", "ALTIMA"),
+    ("JEEP", "GRAND CHEROKEE"),
+    ("HYUNDAI", "ELANTRA"),
+]
+
+COLORS = ["WHITE", "BLACK", "SILVER", "GRAY", "RED", "BLUE"]
+
+BUYER_NAMES = [
+    "TEST TRANSPORT LLC",
+    "TEST BUYERS INC",
+    "QUALITY AUTO SALES",
+    "SUNRISE MOTORS LLC",
+    "BLUE LINE AUTO GROUP",
+]
+
+# Vocabulary for terms-and-conditions filler text
+FILLER_WORDS = (
+    "vehicle buyer seller auction title release storage fees apply after days "
+    "pickup location hours monday friday gate pass required carrier must present "
+    "valid identification payment received in full no exceptions all sales final "
+    "as is where is lot yard member agreement terms conditions transport damage "
+    "inspection odometer disclosure statement federal law requires mileage"
+).split()
+
+# VIN transliteration and position weights (ISO 3779 check digit)
+_VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+_VIN_VALUES = {
+    **{str(d): d for d in range(10)},
+    **dict(zip("ABCDEFGH", range(1, 9))),
+    **dict(zip("JKLMN", range(1, 6))),
+    "P": 7,
+    "R": 9,
+    **dict(zip("STUVWXYZ", range(2, 10))),
+}
+_VIN_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2)
+
+
+def vin_check_digit(vin: str) -> str:
+    """ISO 3779 check digit (position 9) for a 17-character VIN."""
+    total = sum(_VIN_VALUES[c] * w for c, w in zip(vin, _VIN_WEIGHTS))
+    remainder = total % 11
+    return "X" if remainder == 10 else str(remainder)
+
+
+def random_vin(rng: random.Random) -> str:
+    """Random 17-character VIN with a valid check digit."""
+    chars = [rng.choice(_VIN_CHARS) for _ in range(17)]
+    chars[8] = "0"
+    vin = "".join(chars)
+    return vin[:8] + vin_check_digit(vin) + vin[9:]
+
+
+# Text lines that fit in one column of a page (by column count), shared by
+# all renderers so page breaks are the same whichever backend is installed
+LINES_PER_COLUMN = {1: 40, 2: 46}
+
+
+@dataclass
+class CorpusOptions:
+    """Parameters for a synthetic corpus; ranges are inclusive."""
+
+    count: int = 100
+    seed: int = 42
+    auctions: tuple[str, ...] = ("COPART", "IAA", "MANHEIM")
+    # Minimum pages; invoices that don't fit continue onto more
+    pages: tuple[int, int] = (1, 3)
+    columns: tuple[int, ...] = (1, 2)
+    words_per_page: tuple[int, int] = (0, 300)
+    # Share of documents with rasterised (scanned) pages
+    scanned_ratio: float = 0.1
+    # Share of documents that bundle several vehicles
+    bundle_ratio: float = 0.1
+    max_bundle_vehicles: int = 4
+
+
+@dataclass
+class PageContent:
+    """Text lines for one rendered page."""
+
+    lines: list[str]
+    columns: int = 1
+    scanned: bool = False
+    title: Optional[str] = None
+
+
+def _document_rng(options: CorpusOptions, index: int) -> random.Random:
+    # Seeded from (seed, index) so documents don't depend on corpus size
+    return random.Random(f"{options.seed}-{index}")
+
+
+def build_document_spec(index: int, options: CorpusOptions) -> dict[str, Any]:
+    """
+    Ground truth and layout for one synthetic document.
+
+    Args:
+        index: Document index within the corpus
+        options: Corpus options
+
+    Returns:
+        Dict in the tests/regression_runner expected-JSON format, with
+        extra "vehicles" and "layout" keys
+    """
+    rng = _document_rng(options, index)
+    auction = rng.choice(options.auctions)
+
+    vehicle_count = 1
+    if rng.random() < options.bundle_ratio:
+        vehicle_count = rng.randint(2, max(2, options.max_bundle_vehicles))
+
+    vehicles = []
+    for _ in range(vehicle_count):
+        make, model = rng.choice(VEHICLE_MODELS)
+        vehicles.append(
+            {
+                "vin": random_vin(rng),
+                "year": rng.randint(2012, 2025),
+                "make": make,
+                "model": model,
+                "color": rng.choice(COLORS),
+                "odometer": rng.randint(5_000, 180_000),
+                "lot": str(rng.randint(10_000_000, 99_999_999)),
+                "price": round(rng.randint(1_500, 45_000) / 50) * 50.0,
+            }
+        )
+
+    name, street, city, state, zip_code, phone = rng.choice(PICKUP_LOCATIONS[auction])
+    sale_date = date(2024, 1, 1) + timedelta(days=rng.randint(0, 700))
+    buyer_fee = round(sum(v["price"] for v in vehicles) * 0.08, 2)
+    total = sum(v["price"] for v in vehicles) + buyer_fee
+
+    first = vehicles[0]
+    spec = {
+        "source_file": f"synthetic_{index:05d}_{auction.lower()}.pdf",
+        "auction_type": auction,
+        "fields": {
+            "vehicle_vin": first["vin"],
+            "vehicle_year": str(first["year"]),
+            "vehicle_make": first["make"],
+            "vehicle_model": first["model"],
+            "vehicle_lot": first["lot"],
+            "reference_id": first["lot"],
+            "buyer_id": "".join(rng.choice(string.ascii_uppercase) for _ in range(3))
+            + str(rng.randint(10_000, 99_999)),
+            "buyer_name": rng.choice(BUYER_NAMES),
+            "pickup_name": name,
+            "pickup_address": street,
+            "pickup_city": city,
+            "pickup_state": state,
+            "pickup_zip": zip_code,
+            "sale_date": sale_date.strftime("%m/%d/%Y"),
+            "total_amount": f"{total:.2f}",
+        },
+        "vehicles": vehicles,
+        "pickup_phone": phone,
+        "buyer_fee": f"{buyer_fee:.2f}",
+        "layout": {
+            "min_pages": rng.randint(*options.pages),
+            "columns": rng.choice(options.columns),
+            "words_per_page": rng.randint(*options.words_per_page),
+        },
+        "seed": options.seed,
+        "index": index,
+    }
+
+    # Long invoices and bundles overflow onto extra pages
+    pages = len(_page_lines(spec))
+    scanned_pages = []
+    if rng.random() < options.scanned_ratio:
+        # Invoice page is always scanned; later pages half the time
+        scanned_pages = [1] + [p for p in range(2, pages + 1) if rng.random() < 0.5]
+    spec["layout"].update(pages=pages, scanned_pages=scanned_pages)
+    return spec
+
+
+def _money(value) -> str:
+    return f"${float(value):,.2f}"
+
+
+def _copart_lines(spec: dict) -> list[str]:
+    f = spec["fields"]
+    lines = [
+        "Copart",
+        "Sales Receipt/Bill of Sale",
+        "",
+        "SOLD THROUGH COPART",
+        "",
+        f"MEMBER: {f['buyer_id']}",
+        f"Member Name: {f['buyer_name']}",
+        "",
+        f"Date: {f['sale_date']}",
+        f"LOT# {f['vehicle_lot']}",
+    ]
+    for vehicle in spec["vehicles"]:
+        lines += [
+            "",
+            "VEHICLE DETAILS",
+            f"LOT# {vehicle['lot']}",
+            f"VIN: {vehicle['vin']}",
+            f"Year: {vehicle['year']}",
+            f"Make: {vehicle['make']}",
+            f"Model: {vehicle['model']}",
+            f"Color: {vehicle['color']}",
+            f"Odometer: {vehicle['odometer']:,} Miles",
+            f"High Bid: {_money(vehicle['price'])}",
+        ]
+    lines += [
+        "",
+        "PHYSICAL ADDRESS OF LOT",
+        f["pickup_name"],
+        f["pickup_address"],
+        f"{f['pickup_city']}, {f['pickup_state']} {f['pickup_zip']}",
+        f"Phone: {spec['pickup_phone']}",
+        "",
+        "FINANCIAL SUMMARY",
+        f"Buyer Premium: {_money(spec['buyer_fee'])}",
+        f"Total: {_money(f['total_amount'])}",
+    ]
+    return lines
+
+
+def _iaa_lines(spec: dict) -> list[str]:
+    f = spec["fields"]
+    lines = [
+        "Insurance Auto Auctions, Inc.",
+        "BUYER RECEIPT",
+        "",
+        f"IAAI Branch: {f['pickup_name']}",
+        f"Branch Phone: {spec['pickup_phone']}",
+        "",
+        f"Date: {f['sale_date']}",
+        f"Stock Number: {f['vehicle_lot']}",
+    ]
+    for vehicle in spec["vehicles"]:
+        lines += [
+            "",
+            "VEHICLE INFORMATION",
+            f"Stock Number: {vehicle['lot']}",
+            f"VIN: {vehicle['vin']}",
+            f"Year: {vehicle['year']}",
+            f"Make: {vehicle['make']}",
+            f"Model: {vehicle['model']}",
+            f"Color: {vehicle['color']}",
+            f"Odometer: {vehicle['odometer']:,} Miles",
+            f"Sale Price: {_money(vehicle['price'])}",
+        ]
+    lines += [
+        "",
+        "BUYER INFORMATION",
+        f"Buyer ID: {f['buyer_id']}",
+        f"Buyer Name: {f['buyer_name']}",
+        "",
+        "PICK-UP LOCATION",
+        f"Name: {f['pickup_name']}",
+        f"Address: {f['pickup_address']}",
+        f"City: {f['pickup_city']}",
+        f"State: {f['pickup_state']}",
+        f"ZIP: {f['pickup_zip']}",
+        f"Phone: {spec['pickup_phone']}",
+        "",
+        "SALE INFORMATION",
+        f"Sale Date: {f['sale_date']}",
+        f"Buyer Fee: {_money(spec['buyer_fee'])}",
+        f"Total Amount Due: {_money(f['total_amount'])}",
+    ]
+    return lines
+
+
+def _manheim_lines(spec: dict) -> list[str]:
+    f = spec["fields"]
+    first = spec["vehicles"][0]
+    lines = [
+        "Manheim Auto Auction",
+        "Cox Automotive",
+        "BILL OF SALE",
+        "",
+        "VEHICLE RELEASE",
+        f"Release ID: MAN{f['vehicle_lot']}",
+        "",
+        f"Sale Date: {f['sale_date']}",
+        "",
+        f"YMMT: {first['year']} {first['make']} {first['model']}",
+    ]
+    for vehicle in spec["vehicles"]:
+        lines += [
+            "",
+            "VEHICLE INFORMATION",
+            f"VIN: {vehicle['vin']}",
+            f"Year: {vehicle['year']}",
+            f"Make: {vehicle['make']}",
+            f"Model: {vehicle['model']}",
+            f"Color: {vehicle['color']}",
+            f"Mileage: {vehicle['odometer']:,}",
+            f"Hammer Price: {_money(vehicle['price'])}",
+        ]
+    lines += [
+        "",
+        "BUYER INFORMATION",
+        f"Dealer: {f['buyer_name']}",
+        f"Dealer ID: {f['buyer_id']}",
+        "",
+        "PICKUP LOCATION",
+        f["pickup_name"],
+        f["pickup_address"],
+        f"{f['pickup_city']}, {f['pickup_state']} {f['pickup_zip']}",
+        f"Contact: {spec['pickup_phone']}",
+        "",
+        "TRANSACTION",
+        f"Buy Fee: {_money(spec['buyer_fee'])}",
+        f"Total Due: {_money(f['total_amount'])}",
+    ]
+    return lines
+
+
+INVOICE_LAYOUTS: dict[str, tuple[str, Callable[[dict], list[str]]]] = {
+    "COPART": ("Copart - Sales Receipt", _copart_lines),
+    "IAA": ("Insurance Auto Auctions - Buyer Receipt", _iaa_lines),
+    "MANHEIM": ("Manheim - Bill of Sale", _manheim_lines),
+}
+
+
+def _filler_lines(rng: random.Random, words: int, width: int) -> list[str]:
+    """Terms-and-conditions style text of `words` words wrapped at `width` chars."""
+    if words <= 0:
+        return []
+    lines, current = ["", "TERMS AND CONDITIONS"], ""
+    for _ in range(words):
+        word = rng.choice(FILLER_WORDS)
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    lines.append(current)
+    return lines
+
+
+def _page_lines(spec: dict) -> list[list[str]]:
+    """
+    Lines per page: the invoice and its filler, continued onto as many pages
+    as needed, then filler-only pages up to layout["min_pages"].
+
+    Filler is seeded from the spec, so output is repeatable.
+    """
+    layout = spec["layout"]
+    columns = layout["columns"]
+    capacity = LINES_PER_COLUMN.get(columns, min(LINES_PER_COLUMN.values())) * columns
+    wrap = 90 // columns - 4 * (columns - 1)
+    rng = random.Random(f"{spec['seed']}-{spec['index']}-filler")
+    _, make_lines = INVOICE_LAYOUTS[spec["auction_type"]]
+
+    lines = make_lines(spec) + _filler_lines(rng, layout["words_per_page"], wrap)
+    pages = [lines[i : i + capacity] for i in range(0, len(lines), capacity)]
+    while len(pages) < layout["min_pages"]:
+        header = f"Page {len(pages) + 1}"
+        pages.append(([header] + _filler_lines(rng, layout["words_per_page"], wrap))[:capacity])
+    return pages
+
+
+def build_pages(spec: dict) -> list[PageContent]:
+    """Page contents for a document spec, ready to render."""
+    layout = spec["layout"]
+    title, _ = INVOICE_LAYOUTS[spec["auction_type"]]
+    return [
+        PageContent(
+            lines=lines,
+            columns=layout["columns"],
+            scanned=number in layout["scanned_pages"],
+            title=title if number == 1 else None,
+        )
+        for number, lines in enumerate(_page_lines(spec), start=1)
+    ]
+
+
+def _split_columns(lines: list[str], columns: int) -> list[list[str]]:
+    """Split a page's lines evenly into column streams."""
+    per_column = -(-len(lines) // columns) or 1
+    return [lines[i : i + per_column] for i in range(0, len(lines), per_column)]
+
+
+def rasterize_page(page: PageContent, seed: str, dpi: int = 150):
+    """
+    Render a page as a slightly skewed, noisy greyscale scan.
+
+    Requires Pillow. Returns a PIL image of a US Letter page at `dpi`.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    rng = random.Random(seed)
+    width, height = int(8.5 * dpi), int(11 * dpi)
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.load_default(size=int(dpi * 0.12))
+    except TypeError:  # Pillow < 10.1
+        font = ImageFont.load_default()
+
+    margin, line_height = dpi, int(dpi * 0.18)
+    column_width = (width - 2 * margin) // page.columns
+    top = margin
+    if page.title:
+        draw.text((margin, top), page.title, fill=0, font=font)
+        top += 2 * line_height
+    for column, stream in enumerate(_split_columns(page.lines, page.columns)):
+        y = top
+        for line in stream:
+            if y > height - margin:
+                break
+            draw.text((margin + column * column_width, y), line, fill=rng.randint(0, 60), font=font)
+            y += line_height
+
+    # Scanner artefacts: small skew and speckle
+    image = image.rotate(rng.uniform(-1.5, 1.5), fillcolor=255, resample=Image.BILINEAR)
+    pixels = image.load()
+    for _ in range(width * height // 2000):
+        pixels[rng.randrange(width), rng.randrange(height)] = rng.randint(0, 120)
+    return image
+
+
+def _render_reportlab(filepath: str, pages: list[PageContent], seed: str):
+    c = canvas.Canvas(filepath, pagesize=letter)
+    width, height = letter
+    for number, page in enumerate(pages, start=1):
+        if page.scanned:
+            image = rasterize_page(page, f"{seed}-{number}")
+            c.drawImage(ImageReader(image), 0, 0, width, height)
+        else:
+            top = height - 72
+            if page.title:
+                c.setFont("Helvetica-Bold", 16)
+                c.drawString(72, top, page.title)
+                top -= 38
+            font_size = 11 if page.columns == 1 else 9
+            c.setFont("Helvetica", font_size)
+            column_width = (width - 144) / page.columns
+            for column, stream in enumerate(_split_columns(page.lines, page.columns)):
+                y = top
+                for line in stream:
+                    if y < 72:
+                        break
+                    c.drawString(72 + column * column_width, y, line)
+                    y -= font_size + 4
+        c.showPage()
+    c.save()
+
+
+def _render_fpdf(filepath: str, pages: list[PageContent], seed: str):
+    pdf = FPDF(format="letter")
+    pdf.set_auto_page_break(False)
+    for number, page in enumerate(pages, start=1):
+        pdf.add_page()
+        if page.scanned:
+            image = rasterize_page(page, f"{seed}-{number}")
+            pdf.image(image, x=0, y=0, w=pdf.w, h=pdf.h)
+            continue
+        top = 20
+        if page.title:
+            pdf.set_font("Helvetica", "B", 16)
+            pdf.set_xy(20, top)
+            pdf.cell(0, 10, page.title)
+            top += 15
+        font_size = 11 if page.columns == 1 else 9
+        pdf.set_font("Helvetica", "", font_size)
+        column_width = (pdf.w - 40) / page.columns
+        for column, stream in enumerate(_split_columns(page.lines, page.columns)):
+            y = top
+            for line in stream:
+                if y > pdf.h - 20:
+                    break
+                pdf.set_xy(20 + column * column_width, y)
+                pdf.cell(column_width, 5, line)
+                y += font_size * 0.5
+    pdf.output(filepath)
+
+
+def render_pages(filepath: str, pages: list[PageContent], seed: str = ""):
+    """Write pages to a PDF with the available library."""
+    _require_backend()
+    if USE_REPORTLAB:
+        _render_reportlab(filepath, pages, seed)
+    else:
+        _render_fpdf(filepath, pages, seed)
+
+
+def generate_corpus(
+    output_dir: Path,
+    options: CorpusOptions,
+    start: int = 0,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> list[dict]:
+    """
+    Write a synthetic corpus of invoice PDFs with ground-truth JSON.
+
+    Each document produces <name>.pdf and <name>.json in output_dir, which
+    tests/regression_runner.py --dataset can read directly; manifest.json
+    records the options and per-document layout.
+
+    Args:
+        output_dir: Directory to write into (created if missing)
+        options: Corpus options
+        start: First document index (to extend or shard a corpus)
+        progress: Optional callback(done, total)
+
+    Returns:
+        Document specs that were written
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    specs = []
+    for offset in range(options.count):
+        spec = build_document_spec(start + offset, options)
+        pdf_path = output_dir / spec["source_file"]
+        render_pages(str(pdf_path), build_pages(spec), seed=f"{options.seed}-{spec['index']}")
+        pdf_path.with_suffix(".json").write_text(json.dumps(spec, indent=2))
+        specs.append(spec)
+        if progress:
+            progress(offset + 1, options.count)
+
+    manifest = {
+        "options": asdict(options),
+        "start": start,
+        "documents": [
+            {
+                "source_file": spec["source_file"],
+                "auction_type": spec["auction_type"],
+                "vehicles": len(spec["vehicles"]),
+                **spec["layout"],
+            }
+            for spec in specs
+        ],
+    }
+    (output_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return specs
+
+
+def _int_range(value: str) -> tuple[int, int]:
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def generate_fixtures():
     """Generate all test PDF fixtures."""
     print("Generating test PDF fixtures...")
-    print(f"Using: {'reportlab' if USE_REPORTLAB else 'fpdf2'}")
+    print(f"Using: {PDF_BACKEND}")
     print(f"Output directory: {FIXTURES_DIR}")
     print()
 
@@ -249,5 +861,52 @@ def main():
     print("Done! Test PDFs generated successfully.")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate test PDF fixtures or a synthetic corpus")
+    parser.add_argument("--corpus", help="Write a synthetic corpus to this directory")
+    parser.add_argument("--count", type=int, default=100, help="Documents to generate")
+    parser.add_argument("--start", type=int, default=0, help="First document index")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    parser.add_argument(
+        "--auctions", default="COPART,IAA,MANHEIM", help="Comma-separated auction styles"
+    )
+    parser.add_argument("--pages", default="1-3", help="Minimum page count range, e.g. 1-6")
+    parser.add_argument("--columns", default="1,2", help="Column counts to choose from")
+    parser.add_argument("--words-per-page", default="0-300", help="Filler words per page range")
+    parser.add_argument("--scanned-ratio", type=float, default=0.1)
+    parser.add_argument("--bundle-ratio", type=float, default=0.1)
+    parser.add_argument("--max-bundle-vehicles", type=int, default=4)
+    args = parser.parse_args()
+
+    if PDF_BACKEND is None:
+        print("ERROR: Neither reportlab nor fpdf2 is installed.")
+        print("Install with: pip install reportlab  OR  pip install fpdf2")
+        sys.exit(1)
+
+    if not args.corpus:
+        generate_fixtures()
+        return
+
+    options = CorpusOptions(
+        count=args.count,
+        seed=args.seed,
+        auctions=tuple(a.strip().upper() for a in args.auctions.split(",")),
+        pages=_int_range(args.pages),
+        columns=tuple(int(c) for c in args.columns.split(",")),
+        words_per_page=_int_range(args.words_per_page),
+        scanned_ratio=args.scanned_ratio,
+        bundle_ratio=args.bundle_ratio,
+        max_bundle_vehicles=args.max_bundle_vehicles,
+    )
+
+    def report(done: int, total: int):
+        if done % 100 == 0 or done == total:
+            print(f"  {done}/{total}")
+
+    print(f"Generating {options.count} synthetic invoices in {args.corpus} using {PDF_BACKEND}")
+    generate_corpus(Path(args.corpus), options, start=args.start, progress=report)
+    print("Done!")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,59 @@
+"""Tests for the offline extraction benchmark runner."""
+
+import api.database
+from benchmarks.run_benchmarks import (
+    STAGES,
+    compare_to_baseline,
+    discover_documents,
+    run_benchmarks,
+)
+
+
+def _report(docs_per_sec=10.0, rss=100.0, **stage_p95):
+    return {
+        "summary": {"docs_per_sec": docs_per_sec, "peak_rss_mb": rss},
+        "stages": {
+            stage: {"p50": p95 / 2, "p95": p95, "mean": p95 / 2, "count": 3}
+            for stage, p95 in stage_p95.items()
+        },
+    }
+
+
+class TestBaselineComparison:
+    """Tests for regression detection against a stored baseline."""
+
+    def test_flags_slowdowns_beyond_threshold(self):
+        """Test throughput drops and stage slowdowns over the limit are reported."""
+        baseline = _report(docs_per_sec=10.0, spatial_parse=100.0, block_extraction=10.0)
+        current = _report(docs_per_sec=7.0, spatial_parse=150.0, block_extraction=11.0)
+
+        regressions = compare_to_baseline(current, baseline, max_regression_pct=20)
+
+        assert any(r.startswith("docs_per_sec") for r in regressions)
+        assert any(r.startswith("spatial_parse.p95_ms") for r in regressions)
+        assert not any(r.startswith("block_extraction") for r in regressions)
+
+    def test_ignores_noise_and_improvements(self):
+        """Test sub-millisecond stages and faster runs never fail the gate."""
+        baseline = _report(docs_per_sec=10.0, classification=0.1, spatial_parse=100.0)
+        current = _report(docs_per_sec=12.0, classification=0.5, spatial_parse=60.0)
+
+        assert compare_to_baseline(current, baseline, max_regression_pct=20) == []
+
+
+class TestBenchmarkRun:
+    """Smoke test over the generated fixtures."""
+
+    def test_fixture_corpus_reports_every_stage(self):
+        """Test a run times every stage and leaves the configured database alone."""
+        db_path = api.database.DB_PATH
+        documents = discover_documents(["fixtures", "fixtures"])
+        assert documents and len({d.path for d in documents}) == len(documents)
+
+        report = run_benchmarks(["fixtures"], iterations=1, warmup=False)
+
+        assert api.database.DB_PATH == db_path
+        assert report["summary"]["runs"] == len(documents)
+        assert report["summary"]["docs_per_sec"] > 0
+        assert set(STAGES) <= set(report["stages"])
+        assert report["stages"]["spatial_parse"]["count"] > 0
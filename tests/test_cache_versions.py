@@ -0,0 +1,93 @@
+"""Tests for version-checked configuration caches."""
+
+import pytest
+
+import api.cache_versions as cache_versions
+import api.database
+from api.auction_profiles import (
+    AuctionProfile,
+    AuctionProfileRepository,
+    AuctionProfileService,
+    FieldDefault,
+    init_auction_profiles_schema,
+)
+from api.cache_versions import PROFILES, VersionedCache, bump_version
+from api.database import get_connection
+
+
+@pytest.fixture
+def board(tmp_path, monkeypatch):
+    """Point the caches at a fresh database and a board that checks every call."""
+    monkeypatch.setattr(api.database, "DB_PATH", tmp_path / "control_panel.db")
+    board = cache_versions._VersionBoard(check_interval=0)
+    monkeypatch.setattr(cache_versions, "_board", board)
+    return board
+
+
+def _counting_loader(values):
+    calls = []
+
+    def load(key):
+        calls.append(key)
+        return values.get(key)
+
+    return load, calls
+
+
+class TestVersionedCache:
+    """Tests for hits, negative caching and invalidation."""
+
+    def test_hits_and_cached_misses(self, board):
+        """Test repeated lookups, including ones that found nothing, hit the cache."""
+        cache = VersionedCache(PROFILES)
+        load, calls = _counting_loader({"COPART": "profile"})
+
+        for _ in range(3):
+            assert cache.get("COPART", load) == "profile"
+            assert cache.get("NOPE", load) is None
+
+        assert calls == ["COPART", "NOPE"]
+        assert cache.stats()["hits"] == 4
+        assert cache.stats()["misses"] == 2
+
+    def test_edit_in_another_process_invalidates(self, board):
+        """Test a version bump written by another worker empties the cache."""
+        cache = VersionedCache(PROFILES)
+        load, calls = _counting_loader({"COPART": "v1"})
+        cache.get("COPART", load)
+        bump_version(PROFILES)  # Creates the table
+
+        # Another worker's bump: only the table changes, this process isn't told
+        board.check_interval = 3600
+        cache.get("COPART", load)
+        with get_connection() as conn:
+            conn.execute("UPDATE cache_versions SET version = version + 1")
+            conn.commit()
+        assert cache.get("COPART", load) == "v1"
+        assert len(calls) == 2  # Still within the check interval
+
+        board.expire()
+        cache.get("COPART", load)
+        assert len(calls) == 3
+        assert cache.stats()["invalidations"] == 2
+
+    def test_profile_update_reaches_service(self, board):
+        """Test a profile edited through the repository is served fresh."""
+        init_auction_profiles_schema()
+        service = AuctionProfileService()
+        profile = AuctionProfile(
+            auction_type_id=1,
+            auction_code="COPART",
+            name="Copart",
+            field_defaults={"pickup_name": FieldDefault("pickup_name", "Copart")},
+        )
+        profile.id = AuctionProfileRepository.create(profile)
+        assert service.get_profile("copart").version == 1
+        assert service.get_profile("IAA") is None
+
+        profile.field_defaults["pickup_name"] = FieldDefault("pickup_name", "Copart Inc")
+        AuctionProfileRepository.update(profile)
+
+        fresh = service.get_profile("COPART")
+        assert fresh.version == 2
+        assert fresh.field_defaults["pickup_name"].value == "Copart Inc"
@@ -0,0 +1,84 @@
+"""Tests for email reader attachment spooling."""
+
+import hashlib
+import os
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from core.config import EmailConfig
+from ingest.email_reader import Attachment, IMAPEmailReader, spool_part
+
+
+def _build_message(payload: bytes, filename: str = "invoice.pdf") -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["Subject"] = "Copart invoice"
+    msg["From"] = "noreply@copart.com"
+    msg["Message-ID"] = "<abc@example.com>"
+    msg.attach(MIMEText("Gate Pass: ABC123"))
+    part = MIMEApplication(payload, _subtype="pdf")
+    part.add_header("Content-Disposition", "attachment", filename=filename)
+    msg.attach(part)
+    return msg
+
+
+class TestSpoolPart:
+    """Tests for streaming MIME part decoding."""
+
+    def test_spool_part_matches_full_decode(self, tmp_path):
+        """Test chunked decode produces identical bytes and hash."""
+        payload = os.urandom(300_000)
+        part = _build_message(payload).get_payload()[1]
+
+        dest = tmp_path / "att.bin"
+        size, sha256 = spool_part(part, str(dest))
+
+        assert size == len(payload)
+        assert sha256 == hashlib.sha256(payload).hexdigest()
+        assert dest.read_bytes() == payload
+
+    def test_spool_part_empty_payload_removes_file(self, tmp_path):
+        """Test empty attachments leave no spool file behind."""
+        part = _build_message(b"").get_payload()[1]
+
+        dest = tmp_path / "att.bin"
+        size, _ = spool_part(part, str(dest))
+
+        assert size == 0
+        assert not dest.exists()
+
+
+class TestAttachment:
+    """Tests for Attachment content access."""
+
+    def test_hash_is_cached(self):
+        """Test hash is computed once and reused."""
+        att = Attachment(filename="a.pdf", content_type="application/pdf", content=b"x", size=1)
+        first = att.hash
+        att.content = b"changed"
+        assert att.hash == first
+
+    def test_as_file_in_memory_cleans_up(self, tmp_path):
+        """Test in-memory attachments are written to a temp file and removed."""
+        att = Attachment(filename="a.pdf", content_type="application/pdf", content=b"pdf", size=3)
+        with att.as_file(str(tmp_path)) as path:
+            with open(path, "rb") as f:
+                assert f.read() == b"pdf"
+        assert not os.path.exists(path)
+
+    def test_imap_reader_spools_attachments(self, tmp_path):
+        """Test IMAP reader streams attachments to the spool directory."""
+        payload = os.urandom(10_000)
+        reader = IMAPEmailReader(EmailConfig(), spool_dir=str(tmp_path))
+
+        parsed = reader._parse_message(_build_message(payload), uid="1")
+        att = parsed.pdf_attachments[0]
+
+        assert att.content is None
+        assert att.size == len(payload)
+        assert att.hash == hashlib.sha256(payload).hexdigest()
+        with att.open() as f:
+            assert f.read() == payload
+
+        parsed.release_attachments()
+        assert list(tmp_path.iterdir()) == []
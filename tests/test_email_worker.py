@@ -0,0 +1,216 @@
+"""Tests for the email worker pipeline."""
+
+import threading
+import time
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+
+import pytest
+
+from api.workers.email_worker import EmailWorker
+from api.workers.pipeline import Stage, StagedPipeline
+
+
+def _raw_email(uid: int, with_pdf: bool = True) -> bytes:
+    msg = MIMEMultipart()
+    msg["Subject"] = f"Copart invoice {uid}"
+    msg["From"] = "noreply@copart.com"
+    msg["Message-ID"] = f"<{uid}@example.com>"
+    if with_pdf:
+        part = MIMEApplication(b"%PDF-1.4 fake " + str(uid).encode(), _subtype="pdf")
+        part.add_header("Content-Disposition", "attachment", filename=f"invoice{uid}.pdf")
+        msg.attach(part)
+    return msg.as_bytes()
+
+
+class FakeIMAP:
+    """In-memory stand-in for imaplib.IMAP4_SSL (UID commands only)."""
+
+    def __init__(self, messages: dict[str, bytes]):
+        self.messages = messages
+        self.fetch_calls = []
+        self.moved = []
+        self.expunges = 0
+
+    def select(self, folder):
+        return "OK", [str(len(self.messages)).encode()]
+
+    def create(self, folder):
+        return "OK", []
+
+    def expunge(self):
+        self.expunges += 1
+        return "OK", []
+
+    def logout(self):
+        return "BYE", []
+
+    def uid(self, command, *args):
+        if command == "SEARCH":
+            return "OK", [" ".join(self.messages).encode()]
+        if command == "FETCH":
+            uids = args[0].split(",")
+            self.fetch_calls.append(uids)
+            data = []
+            for seq, uid in enumerate(uids, 1):
+                raw = self.messages[uid]
+                data.append((f"{seq} (UID {uid} RFC822 {{{len(raw)}}}".encode(), raw))
+                data.append(b")")
+            return "OK", data
+        if command == "COPY":
+            self.moved.append(args[0])
+            return "OK", []
+        if command == "STORE":
+            return "OK", []
+        raise AssertionError(f"Unexpected IMAP command {command}")
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    w = EmailWorker(
+        {
+            "upload_path": str(tmp_path),
+            "fetch_batch_size": 4,
+            "extract_workers": 3,
+            "max_emails_per_poll": 50,
+        }
+    )
+    monkeypatch.setattr(
+        w,
+        "_load_rules",
+        lambda: [{"name": "pdfs", "condition_type": "attachment_type", "condition_value": "pdf"}],
+    )
+    monkeypatch.setattr(w, "_log_activity", lambda *a, **k: None)
+    return w
+
+
+class TestEmailWorkerPipeline:
+    """Tests for batched fetch and concurrent extraction."""
+
+    def test_poll_once_batches_fetch_and_processes_all(self, worker, monkeypatch):
+        """Test messages are fetched in batches and every PDF is processed."""
+        fake = FakeIMAP({str(u): _raw_email(u) for u in range(1, 11)})
+        monkeypatch.setattr(worker, "_connect", lambda: setattr(worker, "imap", fake) or True)
+
+        processed = []
+        lock = threading.Lock()
+
+        def fake_process(file_path, auction_type_id, file_size=None, sha256=None):
+            with lock:
+                processed.append(sha256)
+            return len(processed), None
+
+        monkeypatch.setattr(worker, "_process_pdf", fake_process)
+
+        results = worker.poll_once()
+
+        assert [len(c) for c in fake.fetch_calls] == [4, 4, 2]
+        assert len(results) == 10
+        assert all(r.status == "processed" for r in results)
+        assert len(set(processed)) == 10
+        assert sorted(fake.moved, key=int) == [str(u) for u in range(1, 11)]
+        assert fake.expunges == 1
+
+        stats = {s["name"]: s for s in worker.get_stats()["stages"]}
+        assert stats["extract"]["processed"] == 10
+        assert stats["fetch"]["processed"] == 3
+
+    def test_poll_once_records_backlog(self, worker, monkeypatch):
+        """Test unseen messages beyond max_emails_per_poll are reported as backlog."""
+        worker.max_emails_per_poll = 3
+        fake = FakeIMAP({str(u): _raw_email(u, with_pdf=False) for u in range(1, 6)})
+        monkeypatch.setattr(worker, "_connect", lambda: setattr(worker, "imap", fake) or True)
+
+        results = worker.poll_once()
+
+        assert len(results) == 3
+        assert all(r.status == "skipped" for r in results)
+        assert worker.backlog == 2
+
+    def test_extract_failure_is_reported(self, worker, monkeypatch):
+        """Test an extraction error marks only that message as failed."""
+        fake = FakeIMAP({"1": _raw_email(1), "2": _raw_email(2)})
+        monkeypatch.setattr(worker, "_connect", lambda: setattr(worker, "imap", fake) or True)
+
+        def fake_process(file_path, auction_type_id, file_size=None, sha256=None):
+            if "invoice1" in file_path.name:
+                raise RuntimeError("boom")
+            return 1, 1
+
+        monkeypatch.setattr(worker, "_process_pdf", fake_process)
+
+        results = worker.poll_once()
+        statuses = sorted(r.status for r in results)
+        assert statuses == ["failed", "processed"]
+
+    def test_same_pdf_in_one_batch_creates_one_document(self, worker, tmp_path, monkeypatch):
+        """Test concurrent extract workers don't both create a document for one hash."""
+        from api import database
+        from api.models import init_schema
+
+        monkeypatch.setattr(database, "DB_PATH", tmp_path / "control_panel.db")
+        database.init_db()
+        init_schema()
+        raw = _raw_email(7)
+        fake = FakeIMAP({str(u): raw for u in range(1, 7)})
+        monkeypatch.setattr(worker, "_connect", lambda: setattr(worker, "imap", fake) or True)
+
+        results = worker.poll_once()
+
+        assert len(results) == 6
+        assert len({r.document_id for r in results}) == 1
+        assert sum(r.run_id is not None for r in results) == 1
+        with database.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 1
+
+    def test_manual_poll_during_poll_is_refused(self, worker, monkeypatch):
+        """Test a second poll_once doesn't take over the connection of a running one."""
+        from api.workers.email_worker import PollInProgressError
+
+        started, release = threading.Event(), threading.Event()
+
+        def slow_connect():
+            started.set()
+            release.wait(5)
+            return False
+
+        monkeypatch.setattr(worker, "_connect", slow_connect)
+        thread = threading.Thread(target=worker.poll_once)
+        thread.start()
+        started.wait(5)
+        try:
+            with pytest.raises(PollInProgressError):
+                worker.poll_once()
+        finally:
+            release.set()
+            thread.join(5)
+        assert worker.poll_once() == []
+
+    def test_failed_poll_clears_backlog(self, worker, monkeypatch):
+        """Test a connect failure after a partial poll doesn't leave a stale backlog."""
+        worker.backlog = 5
+        monkeypatch.setattr(worker, "_connect", lambda: False)
+
+        assert worker.poll_once() == []
+        assert worker.backlog == 0
+
+
+class TestStagedPipeline:
+    """Tests for the generic staged pipeline."""
+
+    def test_stages_run_concurrently(self):
+        """Test a multi-worker stage overlaps slow items."""
+
+        def slow(item):
+            time.sleep(0.05)
+            return item
+
+        pipeline = StagedPipeline([Stage("slow", slow, workers=5, queue_size=10)]).start()
+        started = time.perf_counter()
+        for i in range(10):
+            pipeline.submit(i)
+        done = pipeline.close()
+
+        assert sorted(done) == list(range(10))
+        assert time.perf_counter() - started < 0.4
+        assert pipeline.stats["slow"].processed == 10
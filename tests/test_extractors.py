@@ -363,3 +363,37 @@ class TestExtractorManager:
         """
         extractor = manager.get_extractor_for_text(text)
         assert extractor is None
+
+    def test_classify_pages_stops_after_decisive_page(self):
+        """Test progressive classification does not read past a decisive page."""
+        manager = ExtractorManager()
+        pages_read = []
+
+        def pages():
+            for i, text in enumerate([self.COPART_SAMPLE, self.IAA_SAMPLE, self.MANHEIM_SAMPLE]):
+                pages_read.append(i)
+                yield text
+
+        result = manager.classify_pages(pages())
+        assert result.source == AuctionSource.COPART
+        assert result.is_decisive
+        assert result.pages_used == 1
+        assert pages_read == [0]
+
+    def test_classify_pages_reads_on_when_first_page_is_ambiguous(self):
+        """Test progressive classification keeps reading when page 1 has no indicators."""
+        manager = ExtractorManager()
+        filler = "Terms and conditions apply to this document. " * 5
+
+        result = manager.classify_pages([filler, self.MANHEIM_SAMPLE, self.COPART_SAMPLE])
+        assert result.source == AuctionSource.MANHEIM
+        assert result.pages_used == 2
+
+    def test_classify_pages_respects_max_chars(self):
+        """Test progressive classification stops sampling at max_chars."""
+        manager = ExtractorManager()
+        filler = "Terms and conditions apply to this document. " * 5
+
+        result = manager.classify_pages([filler, self.COPART_SAMPLE], max_chars=100)
+        assert result.pages_used == 1
+        assert result.extractor is None
@@ -0,0 +1,108 @@
+"""Tests for compiled resolution plans in FieldResolver."""
+
+from collections import Counter
+
+from api.auction_profiles import AuctionProfile, FieldDefault
+from api.warehouse_constants import WarehouseConstant, WarehouseConstants
+from extractors.field_resolver import FieldResolver, FieldValueSource, ResolutionContext
+
+
+class FakeProfileService:
+    def __init__(self, profiles):
+        self.profiles = profiles
+        self.calls = Counter()
+
+    def get_profile(self, code):
+        self.calls[code] += 1
+        return self.profiles.get(code.upper())
+
+
+class FakeConstantsService:
+    def __init__(self, constants):
+        self.constants = constants
+        self.calls = Counter()
+
+    def get_constants(self, code):
+        self.calls[code] += 1
+        return self.constants.get(code.upper())
+
+
+def _resolver():
+    profile = AuctionProfile(
+        id=1,
+        auction_code="COPART",
+        field_defaults={
+            "pickup_name": FieldDefault("pickup_name", "Copart", apply_when="if_empty"),
+            "auction_source": FieldDefault("auction_source", "COPART", apply_when="always"),
+            "delivery_phone": FieldDefault("delivery_phone", "000", apply_when="always"),
+        },
+    )
+    constants = WarehouseConstants(
+        id=7,
+        warehouse_code="DEN-01",
+        constants={
+            "delivery_phone": WarehouseConstant("delivery_phone", "303-555-1234", "always"),
+            "transport_notes": WarehouseConstant("transport_notes", "Call ahead", "if_missing"),
+        },
+        updated_at="2026-01-01T00:00:00",
+    )
+    resolver = FieldResolver()
+    resolver._auction_service = FakeProfileService({"COPART": profile})
+    resolver._warehouse_service = FakeConstantsService({"DEN-01": constants})
+    return resolver, profile, constants
+
+
+CONTEXT = ResolutionContext(
+    auction_code="COPART",
+    warehouse_code="DEN-01",
+    user_overrides={"vehicle_vin": "FIXED_VIN"},
+    default_values={"trailer_type": "OPEN"},
+)
+
+
+class TestResolutionPlans:
+    """Tests for plan compilation, reuse and invalidation."""
+
+    def test_precedence_from_plan(self):
+        """Test plan evaluation keeps the full precedence chain and alternatives."""
+        resolver, _, _ = _resolver()
+
+        results = resolver.resolve_all(
+            {"vehicle_vin": "PDF_VIN", "pickup_name": "Copart Dallas"}, CONTEXT
+        )
+
+        assert results["vehicle_vin"].source == FieldValueSource.USER_OVERRIDE
+        assert results["vehicle_vin"].alternatives == {"extracted": "PDF_VIN"}
+        assert results["delivery_phone"].value == "303-555-1234"
+        assert results["delivery_phone"].source == FieldValueSource.WAREHOUSE_CONST
+        assert results["delivery_phone"].alternatives == {"auction_const": "000"}
+        assert results["pickup_name"].source == FieldValueSource.EXTRACTED  # if_empty
+        assert results["auction_source"].value == "COPART"
+        assert results["transport_notes"].value == "Call ahead"
+        assert results["trailer_type"].source == FieldValueSource.DEFAULT
+
+    def test_one_lookup_per_run(self):
+        """Test a batch of runs compiles one plan and looks constants up once per run."""
+        resolver, _, _ = _resolver()
+
+        for i in range(200):
+            resolver.resolve_all({"vehicle_vin": f"VIN{i}", "pickup_city": "Dallas"}, CONTEXT)
+
+        assert resolver.plan_misses == 1
+        assert resolver.plan_hits == 199
+        assert resolver.auction_service.calls["COPART"] == 200
+        assert resolver.warehouse_service.calls["DEN-01"] == 200
+
+    def test_profile_or_constants_change_recompiles(self):
+        """Test a new profile version or constants revision yields a fresh plan."""
+        resolver, profile, constants = _resolver()
+        assert resolver.resolve_all({}, CONTEXT)["auction_source"].value == "COPART"
+
+        profile.field_defaults["auction_source"] = FieldDefault("auction_source", "CPRT")
+        profile.version += 1
+        assert resolver.resolve_all({}, CONTEXT)["auction_source"].value == "CPRT"
+
+        constants.constants["delivery_phone"] = WarehouseConstant("delivery_phone", "720", "always")
+        constants.updated_at = "2026-01-02T00:00:00"
+        assert resolver.resolve_all({}, CONTEXT)["delivery_phone"].value == "720"
+        assert resolver.plan_misses == 3
@@ -0,0 +1,107 @@
+"""Tests for the async geocoding client."""
+
+import asyncio
+import time
+
+import httpx
+
+from services.geocoding import AsyncGeocoder, AsyncRateLimiter
+
+
+class SlowStub:
+    """Stub Google provider that answers after a short delay."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(0.05)
+        if "distancematrix" in request.url.path:
+            count = len(request.url.params["destinations"].split("|"))
+            elements = [
+                {"status": "OK", "distance": {"value": 1000 * i}, "duration": {"value": 60 * i}}
+                for i in range(count)
+            ]
+            return httpx.Response(200, json={"status": "OK", "rows": [{"elements": elements}]})
+        return httpx.Response(
+            200,
+            json={
+                "status": "OK",
+                "results": [{"geometry": {"location": {"lat": 32.7, "lng": -96.8}}}],
+            },
+        )
+
+
+def _geocoder(stub, **kwargs) -> AsyncGeocoder:
+    return AsyncGeocoder(
+        provider="google", api_key="key", transport=httpx.MockTransport(stub), **kwargs
+    )
+
+
+class TestAsyncGeocoder:
+    """Tests for pooling, coalescing and batched distance requests."""
+
+    def test_concurrent_lookups_coalesce(self):
+        """Test concurrent lookups of the same normalized address share one request."""
+        stub = SlowStub()
+
+        async def run():
+            async with _geocoder(stub) as geocoder:
+                results = await asyncio.gather(
+                    *(geocoder.geocode(a) for a in ["Copart Dallas"] * 5 + ["  copart   DALLAS"])
+                )
+                return results, geocoder.coalesced
+
+        results, coalesced = asyncio.run(run())
+
+        assert results == [(32.7, -96.8)] * 6
+        assert len(stub.requests) == 1
+        assert coalesced == 5
+
+    def test_geocode_many_distinct_addresses(self):
+        """Test distinct addresses each get their own request."""
+        stub = SlowStub()
+
+        async def run():
+            async with _geocoder(stub) as geocoder:
+                return await geocoder.geocode_many(["A", "B", "C", "a"])
+
+        coords = asyncio.run(run())
+
+        assert set(coords) == {"A", "B", "C", "a"}
+        assert len(stub.requests) == 3
+
+    def test_distance_matrix_batches_destinations(self):
+        """Test destinations go out 25 per Distance Matrix request, results in order."""
+        stub = SlowStub()
+        destinations = [(30.0 + i / 100, -90.0) for i in range(30)]
+
+        async def run():
+            async with _geocoder(stub) as geocoder:
+                return await geocoder.distance_matrix((32.7, -96.8), destinations)
+
+        results = asyncio.run(run())
+
+        assert len(stub.requests) == 2
+        assert len(results) == 30
+        assert results[:2] == [(0, 0), (1000, 60)]
+        assert results[25] == (0, 0)  # First element of the second request
+
+    def test_rate_limiter_spaces_requests(self):
+        """Test request starts are spaced by the provider rate limit."""
+
+        async def run():
+            limiter = AsyncRateLimiter(requests_per_second=20)
+            starts = []
+
+            async def call():
+                async with limiter:
+                    starts.append(time.monotonic())
+
+            await asyncio.gather(*(call() for _ in range(4)))
+            return starts
+
+        starts = asyncio.run(run())
+
+        assert starts[-1] - starts[0] >= 3 * 0.05 - 0.01
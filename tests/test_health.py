@@ -0,0 +1,135 @@
+"""Tests for cached health and readiness checks."""
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from api.routes import health
+from services.central_dispatch import RateLimiter
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """Fresh monitor (no refresher thread) with a writable database."""
+    fresh = health.HealthMonitor(interval=60)
+    monkeypatch.setattr(health, "monitor", fresh)
+    monkeypatch.setattr(health, "check_database_writable", lambda: {"ok": True})
+    return fresh
+
+
+class TestBuildInfo:
+    """Tests for version info resolved once per process."""
+
+    def test_build_stamp_overrides_git(self, tmp_path, monkeypatch):
+        """Test the stamp file is read once and git is not called."""
+        stamp = tmp_path / "build_info.json"
+        stamp.write_text(
+            json.dumps({"version": "9.9.9", "git_sha": "abc1234", "git_branch": "rel"})
+        )
+        monkeypatch.setenv("BUILD_INFO_FILE", str(stamp))
+        monkeypatch.setattr(health, "get_git_info", lambda: pytest.fail("git called"))
+        health.get_build_info.cache_clear()
+        try:
+            info = health.get_build_info()
+            stamp.unlink()
+            assert health.get_build_info() is info
+        finally:
+            health.get_build_info.cache_clear()
+
+        assert info["version"] == "9.9.9"
+        assert info["git_sha"] == "abc1234" and info["git_branch"] == "rel"
+        assert info["build_time"] == health.BUILD_TIME
+
+
+class TestReadiness:
+    """Tests for /api/ready and /api/health served from the cached snapshot."""
+
+    def test_checks_run_once_not_per_request(self, client, monitor, monkeypatch):
+        """Test repeated probes reuse the snapshot taken on the first read."""
+        calls = []
+        monkeypatch.setattr(
+            health, "check_environment", lambda: calls.append(1) or ({"database": {}}, True)
+        )
+        monkeypatch.setattr(monitor, "start", lambda: None)
+
+        for _ in range(5):
+            assert client.get("/api/ready").status_code == 200
+            assert client.get("/api/health").json()["status"] == "healthy"
+
+        assert len(calls) == 1
+        checks = client.get("/api/ready").json()["checks"]
+        assert {"database", "batch_pool", "queue_depth", "cd_limiter", "fresh"} <= set(checks)
+
+    def test_queue_depth_over_threshold_is_not_ready(self, client, monitor, monkeypatch):
+        """Test queued batch items beyond READY_MAX_QUEUE_DEPTH fail readiness."""
+        from api.batch_queue import BatchQueue
+
+        queue = BatchQueue(max_workers=1)
+        queue.create_job([1, 2, 3])
+        monkeypatch.setattr("api.batch_queue._batch_queue", queue)
+        monkeypatch.setattr(health, "MAX_QUEUE_DEPTH", 2)
+        monitor.refresh()
+
+        response = client.get("/api/ready")
+
+        assert response.status_code == 503
+        body = response.json()
+        assert body["ready"] is False
+        assert body["checks"]["queue_depth"]["batch_items"] == 3
+        assert body["checks"]["batch_pool"]["ok"] is True
+
+    def test_paused_cd_limiter_and_stale_state_are_not_ready(self, client, monitor):
+        """Test a Retry-After pause and a stopped refresher both fail readiness."""
+        limiter = RateLimiter(max_concurrent=2)
+        limiter.pause(30)
+        monitor.refresh()
+
+        checks = client.get("/api/ready").json()["checks"]
+        assert checks["cd_limiter"]["ok"] is False
+        assert checks["cd_limiter"]["saturated"][0]["paused_for"] > 1
+
+        limiter.pause(0)
+        del limiter
+        snapshot = monitor.refresh()
+        snapshot["monotonic"] = time.monotonic() - 3600
+
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json()["checks"]["fresh"]["ok"] is False
+
+
+class TestDatabaseProbe:
+    """Tests for the short-timeout SQLite write probe."""
+
+    def test_held_write_lock_reports_busy_quickly(self, tmp_path, monkeypatch):
+        """Test a long write elsewhere is "busy", not a readiness failure."""
+        from api import database
+
+        db_file = tmp_path / "probe.db"
+        sqlite3.connect(str(db_file)).close()
+        monkeypatch.setattr(database, "DB_PATH", db_file)
+        monkeypatch.setattr(health, "DB_PROBE_TIMEOUT", 0.05)
+        assert health.check_database_writable() == {"ok": True, "state": "writable"}
+
+        writer = sqlite3.connect(str(db_file))
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            started = time.monotonic()
+            result = health.check_database_writable()
+            elapsed = time.monotonic() - started
+        finally:
+            writer.rollback()
+            writer.close()
+
+        assert result == {"ok": True, "state": "busy"}
+        assert elapsed < 1
+
+    def test_missing_database_is_not_ready(self, tmp_path, monkeypatch):
+        """Test a database file that does not exist still fails the probe."""
+        from api import database
+
+        monkeypatch.setattr(database, "DB_PATH", tmp_path / "missing.db")
+
+        assert health.check_database_writable() == {"ok": False, "error": "not_initialized"}
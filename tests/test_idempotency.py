@@ -0,0 +1,162 @@
+"""Tests for idempotency store batch lookups, Bloom filter and compaction."""
+
+from services.idempotency import BloomFilter, IdempotencyStore
+
+
+def _store(tmp_path, **kwargs) -> IdempotencyStore:
+    return IdempotencyStore(db_path=str(tmp_path / "idem.db"), **kwargs)
+
+
+class TestBloomFilter:
+    """Tests for the in-memory Bloom filter."""
+
+    def test_no_false_negatives(self):
+        """Test every added key is reported as possibly present."""
+        bloom = BloomFilter(capacity=1000)
+        keys = [f"email:thread-{i}:hash-{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(bloom.might_contain(k) for k in keys)
+
+    def test_false_positive_rate_is_low(self):
+        """Test unseen keys are mostly rejected."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"seen-{i}")
+
+        false_positives = sum(bloom.might_contain(f"unseen-{i}") for i in range(10000))
+        assert false_positives < 300
+
+
+class TestIdempotencyStore:
+    """Tests for IdempotencyStore."""
+
+    def test_batch_lookup_returns_processed_subset(self, tmp_path):
+        """Test are_processed/get_result_ids return only stored keys."""
+        store = _store(tmp_path)
+        store.mark_processed("t1", "m1", "h1", "COPART", "clickup_task", "task-1")
+        store.mark_processed("t2", "m2", "h2", "IAA", "clickup_task", "task-2")
+
+        k1 = store.generate_idempotency_key("t1", "h1")
+        k2 = store.generate_idempotency_key("t2", "h2")
+        k3 = store.generate_idempotency_key("t3", "h3")
+
+        assert store.are_processed([k1, k2, k3]) == {k1, k2}
+        assert store.get_result_ids([k1, k3]) == {k1: "task-1"}
+
+    def test_large_batch_uses_temp_table(self, tmp_path):
+        """Test lookups above the IN-list limit still resolve correctly."""
+        store = _store(tmp_path, use_bloom=False)
+        items = [{"idempotency_key": f"cd:row:{i}", "result_id": str(i)} for i in range(0, 2000, 2)]
+        assert store.mark_processed_many(items) == 1000
+
+        found = store.are_processed(f"cd:row:{i}" for i in range(2000))
+        assert found == {f"cd:row:{i}" for i in range(0, 2000, 2)}
+
+    def test_mark_processed_many_ignores_existing(self, tmp_path):
+        """Test duplicate keys are not re-inserted or overwritten."""
+        store = _store(tmp_path)
+        store.mark_processed_many([{"idempotency_key": "cd:a", "result_id": "first"}])
+
+        inserted = store.mark_processed_many(
+            [
+                {"idempotency_key": "cd:a", "result_id": "second"},
+                {"idempotency_key": "cd:b", "result_id": "b"},
+            ]
+        )
+
+        assert inserted == 1
+        assert store.get_result_ids(["cd:a", "cd:b"]) == {"cd:a": "first", "cd:b": "b"}
+
+    def test_bloom_skips_disk_for_unknown_keys(self, tmp_path):
+        """Test misses are answered by the filter and survive a restart."""
+        store = _store(tmp_path)
+        store.mark_processed("t1", "m1", "h1", "COPART", "clickup_task", "task-1")
+
+        assert store.is_processed("email:unknown:key") is False
+        assert store.bloom_skips >= 1
+
+        reopened = _store(tmp_path)
+        assert reopened.is_processed(reopened.generate_idempotency_key("t1", "h1"))
+
+    def test_namespace_lookup_matches_whole_components(self, tmp_path):
+        """Test namespace prefix lookups match the key or its ':' extensions only."""
+        store = _store(tmp_path)
+        store.mark_processed_in_namespace("abc", "google_sheets", "row-5", auction="COPART")
+
+        assert store.is_processed_in_namespace("abc", "google_sheets") == (True, "row-5")
+        assert store.is_processed_in_namespace("ab", "google_sheets") == (False, None)
+
+    def test_compact_removes_expired_keys(self, tmp_path):
+        """Test compaction deletes old rows and rebuilds the filter."""
+        store = _store(tmp_path)
+        store.mark_processed_many([{"idempotency_key": "cd:old"}, {"idempotency_key": "cd:new"}])
+        with store._get_connection() as conn:
+            conn.execute(
+                "UPDATE processed_items SET processed_at = datetime('now', '-40 days') "
+                "WHERE idempotency_key = 'cd:old'"
+            )
+            conn.commit()
+
+        assert store.compact(30) == 1
+        assert store.are_processed(["cd:old", "cd:new"]) == {"cd:new"}
+
+    def test_keys_from_another_process_are_seen(self, tmp_path):
+        """Test a filter built before another writer's insert doesn't report a false miss."""
+        store = _store(tmp_path)
+        other = _store(tmp_path)
+        other.mark_processed("t1", "m1", "h1", "COPART", "clickup_task", "task-1")
+        key = store.generate_idempotency_key("t1", "h1")
+
+        assert store.is_processed(key)
+        assert store.get_result_ids([key]) == {key: "task-1"}
+        assert store.is_processed_in_namespace("h1", "email") == (False, None)
+
+
+class TestOrchestratorLookups:
+    """Tests for idempotency lookups batched across the messages of a run."""
+
+    def test_one_lookup_per_message_batch(self, tmp_path, monkeypatch):
+        """Test run_once checks all messages' attachments together and sees in-run marks."""
+        from types import SimpleNamespace
+
+        from services.orchestrator import EmailProcessingResult, Orchestrator
+
+        orchestrator = Orchestrator(
+            SimpleNamespace(storage=SimpleNamespace(idempotency_db_path=str(tmp_path / "i.db")))
+        )
+        orchestrator.lookup_batch_size = 4
+        store = orchestrator.idempotency_store
+        store.mark_processed("t0", "m0", "h0", "COPART", "clickup_task", "task-0")
+
+        lookups = []
+        original = store.get_result_ids
+        monkeypatch.setattr(
+            store, "get_result_ids", lambda keys: lookups.append(1) or original(keys)
+        )
+        seen = {}
+
+        def fake_process(email_msg, processed=None):
+            key = orchestrator._idempotency_keys(email_msg)[email_msg.pdf_attachments[0].hash]
+            seen[email_msg.message_id] = processed.get(key)
+            processed.setdefault(key, f"task-{email_msg.message_id}")
+            return EmailProcessingResult(email_msg.message_id, "", None, [])
+
+        monkeypatch.setattr(orchestrator, "process_email", fake_process)
+        messages = [
+            SimpleNamespace(
+                message_id=str(i),
+                thread_root_id=f"t{i % 2}",
+                pdf_attachments=[SimpleNamespace(hash=f"h{i % 2}")],
+                uid=None,
+                release_attachments=lambda: None,
+            )
+            for i in range(5)
+        ]
+        reader = SimpleNamespace(fetch_unseen=lambda: iter(messages))
+
+        orchestrator._process_unseen(reader, [])
+
+        assert len(lookups) == 2
+        assert seen == {"0": "task-0", "1": None, "2": "task-0", "3": "task-1", "4": "task-0"}
@@ -0,0 +1,306 @@
+"""Tests for IMAP IDLE push mode against a local IMAP stand-in."""
+
+import imaplib
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+from ingest.imap_idle import IdleLoop, idle_wait, supports_idle
+
+
+class _IMAPStubHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough IMAP4rev1 for connect/login/select/IDLE/NOOP."""
+
+    def _send(self, line: str) -> None:
+        self.wfile.write(line.encode() + b"\r\n")
+        self.wfile.flush()
+
+    def handle(self):
+        server = self.server
+        caps = "IMAP4rev1 IDLE" if server.idle_supported else "IMAP4rev1"
+        self._send("* OK IMAP stub ready")
+
+        with server.lock:
+            server.clients.append(self)
+            server.connections += 1
+
+        try:
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                parts = line.decode().strip().split(" ", 2)
+                tag, command = parts[0], parts[1].upper()
+
+                if command == "CAPABILITY":
+                    self._send(f"* CAPABILITY {caps}")
+                    self._send(f"{tag} OK CAPABILITY completed")
+                elif command == "LOGIN":
+                    self._send(f"{tag} OK LOGIN completed")
+                elif command == "SELECT":
+                    self._send(f"* {server.exists} EXISTS")
+                    self._send(f"{tag} OK [READ-WRITE] SELECT completed")
+                elif command == "NOOP":
+                    if self.unannounced:
+                        self.unannounced = False
+                        self._send(f"* {server.exists} EXISTS")
+                    self._send(f"{tag} OK NOOP completed")
+                elif command == "IDLE":
+                    self._send("+ idling")
+                    self.idling = True
+                    done = self.rfile.readline()
+                    self.idling = False
+                    if not done:
+                        return
+                    self._send(f"{tag} OK IDLE terminated")
+                elif command == "LOGOUT":
+                    self._send("* BYE logging out")
+                    self._send(f"{tag} OK LOGOUT completed")
+                    return
+                else:
+                    self._send(f"{tag} BAD unknown command")
+        finally:
+            with server.lock:
+                if self in server.clients:
+                    server.clients.remove(self)
+
+    idling = False
+    unannounced = False  # New mail to report with the next command response
+
+
+class IMAPStub(socketserver.ThreadingTCPServer):
+    """Local IMAP stand-in that can push new-mail notifications."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, idle_supported: bool = True):
+        super().__init__(("127.0.0.1", 0), _IMAPStubHandler)
+        self.idle_supported = idle_supported
+        self.lock = threading.Lock()
+        self.clients: list[_IMAPStubHandler] = []
+        self.connections = 0
+        self.exists = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def wait_idling(self, timeout: float = 3.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.lock:
+                if any(c.idling for c in self.clients):
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def deliver(self) -> None:
+        """Simulate a new message arriving."""
+        with self.lock:
+            self.exists += 1
+            for client in self.clients:
+                if client.idling:
+                    client._send(f"* {self.exists} EXISTS")
+                else:
+                    client.unannounced = True
+
+    def drop_clients(self) -> None:
+        """Simulate the server dropping connections."""
+        with self.lock:
+            for client in self.clients:
+                client._send("* BYE server shutting down")
+                client.request.shutdown(socket.SHUT_RDWR)
+
+
+@pytest.fixture
+def stub():
+    server = IMAPStub()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _connect(server: IMAPStub) -> imaplib.IMAP4:
+    conn = imaplib.IMAP4("127.0.0.1", server.port)
+    conn.login("user", "pass")
+    conn.select("INBOX")
+    return conn
+
+
+class TestIdleWait:
+    """Tests for a single IDLE cycle."""
+
+    def test_notification_wakes_idle(self, stub):
+        """Test EXISTS push ends IDLE promptly with new mail reported."""
+        conn = _connect(stub)
+        assert supports_idle(conn)
+
+        threading.Timer(0.2, lambda: stub.wait_idling() and stub.deliver()).start()
+        started = time.monotonic()
+        assert idle_wait(conn, timeout=5) is True
+        assert time.monotonic() - started < 2
+        conn.noop()  # Connection still usable after DONE
+        conn.logout()
+
+    def test_timeout_without_mail(self, stub):
+        """Test IDLE returns False when nothing arrives before the timeout."""
+        conn = _connect(stub)
+        assert idle_wait(conn, timeout=0.3) is False
+        conn.logout()
+
+
+class TestIdleLoop:
+    """Tests for the persistent push loop."""
+
+    def _make_loop(self, server, calls, **kwargs):
+        holder = {}
+
+        def connect():
+            holder["conn"] = _connect(server)
+            return holder["conn"]
+
+        def disconnect():
+            try:
+                holder["conn"].logout()
+            except Exception:
+                pass
+
+        def on_new_mail():
+            calls.append(time.monotonic())
+            return False
+
+        return IdleLoop(connect, disconnect, on_new_mail, backoff_initial=0.05, **kwargs)
+
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def test_loop_processes_on_connect_and_push(self, stub):
+        """Test mail is processed after connect and again on each notification."""
+        calls = []
+        loop = self._make_loop(stub, calls)
+        thread = threading.Thread(target=loop.run, daemon=True)
+        thread.start()
+
+        assert self._wait_for(lambda: len(calls) == 1)
+        assert stub.wait_idling()
+        stub.deliver()
+        assert self._wait_for(lambda: len(calls) == 2)
+        assert loop.mode == "idle"
+        assert stub.connections == 1
+
+        loop.stop()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    def test_mail_arriving_during_processing_is_drained(self, stub):
+        """Test an EXISTS received mid-drain triggers another pass before IDLE."""
+        calls = []
+        loop = self._make_loop(stub, calls)
+        conns = []
+        original_connect = loop.connect
+
+        def connect():
+            conns.append(original_connect())
+            return conns[-1]
+
+        def on_new_mail():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                stub.deliver()
+                conns[-1].noop()  # Stands in for the FETCH/STORE of a drain
+            return False
+
+        loop.connect, loop.on_new_mail = connect, on_new_mail
+        thread = threading.Thread(target=loop.run, daemon=True)
+        thread.start()
+
+        assert self._wait_for(lambda: len(calls) == 2, timeout=2)
+        assert loop.notifications == 0
+        assert stub.wait_idling()
+
+        loop.stop()
+        thread.join(timeout=5)
+
+    def test_stop_before_run_is_kept(self, stub):
+        """Test stop() issued before run() starts makes run() return at once."""
+        calls = []
+        loop = self._make_loop(stub, calls)
+        loop.stop()
+
+        loop.run()
+
+        assert calls == [] and stub.connections == 0
+        assert loop.mode == "stopped"
+
+    def test_loop_reconnects_after_drop(self, stub):
+        """Test a dropped connection is re-established with backoff."""
+        calls = []
+        loop = self._make_loop(stub, calls)
+        thread = threading.Thread(target=loop.run, daemon=True)
+        thread.start()
+
+        assert stub.wait_idling()
+        stub.drop_clients()
+        assert self._wait_for(lambda: stub.connections == 2 and stub.wait_idling(0.1))
+        assert loop.reconnects >= 1
+        assert len(calls) >= 2  # Catch-up pass after reconnect
+
+        loop.stop()
+        thread.join(timeout=5)
+
+    def test_processing_error_backs_off_and_keeps_running(self, stub):
+        """Test a non-IMAP error in on_new_mail is retried instead of ending the thread."""
+        import sqlite3
+
+        calls = []
+        loop = self._make_loop(stub, calls)
+        attempts = []
+
+        def flaky_on_new_mail():
+            attempts.append(time.monotonic())
+            if len(attempts) <= 2:
+                raise sqlite3.OperationalError("database is locked")
+            calls.append(time.monotonic())
+            return False
+
+        loop.on_new_mail = flaky_on_new_mail
+        thread = threading.Thread(target=loop.run, daemon=True)
+        thread.start()
+
+        assert self._wait_for(lambda: len(calls) == 1)
+        assert loop.last_error == "database is locked"
+        assert attempts[2] - attempts[1] >= attempts[1] - attempts[0]  # Backed off
+        assert stub.wait_idling()
+        assert stub.connections == 1 and thread.is_alive()
+
+        loop.stop()
+        thread.join(timeout=5)
+
+    def test_loop_falls_back_to_polling(self):
+        """Test servers without IDLE are polled on the persistent connection."""
+        server = IMAPStub(idle_supported=False)
+        try:
+            calls = []
+            loop = self._make_loop(server, calls, poll_interval=0.1)
+            thread = threading.Thread(target=loop.run, daemon=True)
+            thread.start()
+
+            assert self._wait_for(lambda: len(calls) >= 3)
+            assert loop.mode == "poll"
+            assert server.connections == 1
+
+            loop.stop()
+            thread.join(timeout=5)
+        finally:
+            server.shutdown()
+            server.server_close()
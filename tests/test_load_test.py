@@ -0,0 +1,99 @@
+"""Tests for the offline load test and its stand-in servers."""
+
+from types import SimpleNamespace
+
+import requests
+
+from benchmarks.load_test import LoadOptions, run_batch_scenario, run_email_scenario
+from benchmarks.stubs import CDStubServer, FaultConfig, SheetsStubServer
+from schemas.sheets_schema_v3 import RowStatus, get_column_names
+from services.sheets_exporter_v3 import SheetsExporterV3
+
+FAST = {"latency_ms": 0.0, "jitter_ms": 0.0, "poll_interval": 0.2, "drain_timeout": 20.0}
+
+
+class TestCDStub:
+    """Tests for the Central Dispatch stand-in through the export helpers."""
+
+    def test_listing_lifecycle_via_configured_base_url(self, monkeypatch):
+        """Test create, partnerReferenceId lookup and If-Match updates hit CD_API_BASE_URL."""
+        from api.routes.exports import find_listing_by_partner_ref, send_to_cd
+
+        with CDStubServer() as cd:
+            monkeypatch.setenv("CD_API_BASE_URL", cd.url)
+
+            ok, _, etag, listing_id = send_to_cd({"partnerReferenceId": "CD-RUN-1"})
+            assert ok and etag and listing_id
+            assert find_listing_by_partner_ref("CD-RUN-1") == listing_id
+
+            ok, response, _, _ = send_to_cd({}, cd_listing_id=listing_id, etag='"stale"')
+            assert not ok and response["error_code"] == "ETAG_MISMATCH"
+
+            ok, _, new_etag, _ = send_to_cd({}, cd_listing_id=listing_id, etag=etag)
+            assert ok and new_etag != etag
+            assert cd.stats()["by_route"]["update_listing"] == 2
+
+    def test_rate_limit_and_injected_errors(self):
+        """Test requests over the limit get 429 + Retry-After and errors are counted."""
+        with CDStubServer(rate_limit=2, retry_after=0.5) as cd:
+            statuses = [requests.post(f"{cd.url}/listings", json={}).status_code for _ in range(4)]
+            limited = requests.post(f"{cd.url}/listings", json={})
+        assert statuses[:2] == [201, 201] and 429 in statuses
+        assert limited.headers["Retry-After"] == "0.5"
+
+        with CDStubServer(FaultConfig(error_rate=1.0)) as cd:
+            assert requests.get(f"{cd.url}/user/profile").status_code == 503
+            assert cd.stats()["rejected"] == 1
+
+
+class TestSheetsStub:
+    """Tests for the Sheets stand-in through googleapiclient."""
+
+    def test_exporter_reads_and_writes_through_api_endpoint(self):
+        """Test SheetsExporterV3 talks to SHEETS_API_ENDPOINT without credentials."""
+        with SheetsStubServer() as sheets:
+            sheets.load_rows("Pickups", [get_column_names(), ["DC-1", "READY"]])
+            config = SimpleNamespace(
+                spreadsheet_id="s", credentials_file="", api_endpoint=sheets.url
+            )
+            exporter = SheetsExporterV3(config)
+
+            rows = exporter.get_rows_by_status([RowStatus.READY])
+            exporter.update_row_status("DC-1", RowStatus.EXPORTED, cd_listing_id="L-1")
+
+            assert [r["dispatch_id"] for r in rows] == ["DC-1"]
+            assert sheets.rows("Pickups")[1][:2] == ["DC-1", "EXPORTED"]
+
+    def test_quota_exhaustion_returns_429(self):
+        """Test requests over the per-window quota are rejected."""
+        with SheetsStubServer(quota=1, quota_window=60) as sheets:
+            url = f"{sheets.url}/v4/spreadsheets/s/values/Pickups!A:ZZ"
+            first, second = requests.get(url), requests.get(url)
+        assert first.status_code == 200
+        assert second.status_code == 429
+        assert second.json()["error"]["status"] == "RESOURCE_EXHAUSTED"
+
+
+class TestScenarios:
+    """Short end-to-end runs of the load test scenarios."""
+
+    def test_batch_scenario_reports_amplification(self):
+        """Test rate-limited batch exports retry and report extra upstream requests."""
+        report = run_batch_scenario(
+            LoadOptions(qps=20, duration=0.3, cd_rate_limit=2, retry_after=0.2, **FAST)
+        )
+
+        cd = report["upstream"]["cd"]
+        assert report["items"] == 6
+        assert report["succeeded"] > 0
+        assert report["succeeded"] + report["failed"] == 6
+        assert cd["rejected"] > 0
+        assert cd["retry_amplification"] > 1
+        assert report["latency_ms"]["p99"] >= report["latency_ms"]["p50"] > 0
+
+    def test_email_scenario_drains_the_mailbox(self):
+        """Test EmailWorker processes every delivered message from the IMAP stand-in."""
+        report = run_email_scenario(LoadOptions(qps=10, duration=0.3, **FAST))
+
+        assert report["succeeded"] == report["items"] == 3
+        assert report["upstream"]["imap"]["by_command"]["UID FETCH"] >= 1
@@ -0,0 +1,117 @@
+"""Tests for queued logging and batched run log persistence."""
+
+import json
+import logging
+import queue
+import time
+
+import pytest
+
+from core.logging_config import (
+    AsyncQueueHandler,
+    LogContext,
+    setup_logging,
+    stop_logging,
+)
+
+
+@pytest.fixture
+def log_db(tmp_path, monkeypatch):
+    """Control panel database in tmp_path."""
+    from api import database
+
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "control_panel.db")
+    database.init_db()
+    return database
+
+
+class TestQueuedLogging:
+    """Tests for the QueueHandler/QueueListener pipeline."""
+
+    def test_context_captured_on_logging_thread(self, capsys):
+        """Test correlation fields survive formatting on the listener thread."""
+        logger = setup_logging(format_type="json", logger_name="tests.queued")
+        try:
+            with LogContext(run_id="run_1", attachment_name="inv.pdf"):
+                logger.info("extracted %s vehicles", 2)
+        finally:
+            stop_logging()
+
+        record = json.loads(capsys.readouterr().out.strip())
+        assert record["message"] == "extracted 2 vehicles"
+        assert record["run_id"] == "run_1"
+        assert record["attachment_name"] == "inv.pdf"
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test records beyond the queue bound are counted, not waited on."""
+        handler = AsyncQueueHandler(queue.Queue(maxsize=1))
+        logger = logging.getLogger("tests.queued.full")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            for n in range(3):
+                logger.warning(f"record {n}")
+        finally:
+            logger.removeHandler(handler)
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 2
+
+
+class TestRunLogBuffer:
+    """Tests for batched RunLogs inserts."""
+
+    def test_add_log_is_readable_immediately(self, log_db):
+        """Test get_logs flushes buffered entries before reading."""
+        log_db.RunLogs.add_log("run_a", "INFO", "first", details={"n": 1})
+        log_db.RunLogs.add_log("run_a", "ERROR", "second")
+
+        logs = log_db.RunLogs.get_logs("run_a")
+
+        assert [entry["message"] for entry in logs] == ["first", "second"]
+        assert logs[0]["details"] == {"n": 1}
+        assert logs[0]["timestamp"]
+
+    def test_batches_and_bounded_buffer(self, log_db):
+        """Test a full batch is written by the writer thread and overflow is dropped."""
+        buffer = log_db.RunLogBuffer(batch_size=3, flush_ms=60_000, max_entries=4)
+        row = ("run_b", "2026-01-01 00:00:00", "INFO", "m", None)
+
+        added = [buffer.add(row) for _ in range(3)]
+        deadline = time.monotonic() + 5
+        while buffer.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert all(added) and buffer.written == 3
+
+        results = [buffer.add(row) for _ in range(6)]
+        assert results.count(False) == 2 and buffer.dropped == 2
+        assert buffer.flush() == 4
+        with log_db.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM logs WHERE run_id = 'run_b'").fetchone()[0]
+        assert count == 7
+
+    def test_locked_database_requeues_batch(self, log_db, monkeypatch):
+        """Test a transient write error keeps the batch, in order, for the next flush."""
+        import sqlite3
+
+        buffer = log_db.RunLogBuffer(batch_size=100, flush_ms=60_000, max_entries=3)
+        buffer.add(("run_c", "2026-01-01 00:00:00", "INFO", "first", None))
+        buffer.add(("run_c", "2026-01-01 00:00:01", "INFO", "second", None))
+
+        def locked():
+            raise sqlite3.OperationalError("database is locked")
+
+        get_connection = log_db.get_connection
+
+        monkeypatch.setattr(log_db, "get_connection", locked)
+        assert buffer.flush() == 0
+        assert buffer.pending() == 2 and buffer.dropped == 0
+
+        buffer.add(("run_c", "2026-01-01 00:00:02", "INFO", "third", None))
+        assert buffer.add(("run_c", "2026-01-01 00:00:03", "INFO", "fourth", None)) is False
+        monkeypatch.setattr(log_db, "get_connection", get_connection)
+        assert buffer.flush() == 3
+        with log_db.get_connection() as conn:
+            rows = conn.execute("SELECT message FROM logs WHERE run_id = 'run_c' ORDER BY id")
+            assert [r[0] for r in rows] == ["first", "second", "third"]
+        assert buffer.dropped == 1
@@ -0,0 +1,99 @@
+"""Tests for opt-in request profiling."""
+
+import time
+
+import pytest
+
+from core import profiling
+from core.profiling import ProfilingSettings, SamplingProfiler
+
+
+def _busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def profiling_settings(tmp_path, monkeypatch):
+    """Profiling enabled for /api/live, storing profiles under tmp_path."""
+    settings = ProfilingSettings(enabled=True, paths=("/api/live",), directory=tmp_path)
+    monkeypatch.setattr(profiling, "settings", settings)
+    return settings
+
+
+class TestSamplingProfiler:
+    """Tests for stack sampling and the collapsed format."""
+
+    def test_collapsed_stacks_are_root_first_with_counts(self):
+        """Test samples of a busy function are attributed to it under its caller."""
+        with SamplingProfiler(interval_ms=1) as profiler:
+            _busy_wait(0.1)
+
+        assert profiler.samples > 10
+        lines = profiler.collapsed().splitlines()
+        stack, count = lines[0].rsplit(" ", 1)
+        frames = stack.split(";")
+        assert int(count) == max(profiler.stacks.values())
+        assert "tests/test_profiling.py" in frames[-1]
+        assert frames[-1].startswith("_busy_wait")
+        assert frames[-2].startswith("test_collapsed_stacks_are_root_first_with_counts")
+
+    def test_sampling_decision(self, profiling_settings, monkeypatch):
+        """Test the header and sample rate only apply to enabled, listed paths."""
+        assert profiling.should_profile("/api/live", "1")
+        assert not profiling.should_profile("/api/live", None)
+        assert not profiling.should_profile("/api/health", "1")
+
+        profiling_settings.sample_rate = 1.0
+        assert profiling.should_profile("/api/live/", None)
+
+        monkeypatch.setattr(profiling, "settings", ProfilingSettings(sample_rate=1.0))
+        assert not profiling.should_profile("/api/test/upload", "1")
+
+
+class TestProfilingMiddleware:
+    """Tests for per-request capture and download."""
+
+    def test_disabled_by_default(self, client, tmp_path, monkeypatch):
+        """Test nothing is recorded without PROFILING_ENABLED, even with the header."""
+        assert not ProfilingSettings.from_env().enabled
+        monkeypatch.setattr(
+            profiling, "settings", ProfilingSettings(paths=("/api/live",), directory=tmp_path)
+        )
+
+        response = client.get("/api/live", headers={"X-Profile": "1"})
+
+        assert "X-Profile-ID" not in response.headers
+        assert not list(tmp_path.iterdir())
+
+    def test_profile_stored_under_request_id_and_downloadable(self, client, profiling_settings):
+        """Test a profiled request can be downloaded by its request ID."""
+        response = client.get("/api/live", headers={"X-Profile": "1", "X-Request-ID": "req-42"})
+        assert response.headers["X-Profile-ID"] == "req-42"
+
+        download = client.get("/api/profiles/req-42")
+        assert download.status_code == 200
+        assert download.headers["content-type"].startswith("text/plain")
+        assert "req-42.collapsed" in download.headers["content-disposition"]
+
+        (info,) = client.get("/api/profiles").json()["profiles"]
+        assert info["id"] == "req-42"
+        assert info["path"] == "/api/live" and info["status"] == 200
+
+        assert client.get("/api/live").headers.get("X-Profile-ID") is None
+        assert client.get("/api/profiles/unknown").status_code == 404
+
+    def test_unsafe_request_ids_and_pruning(self, client, profiling_settings):
+        """Test client request IDs never become paths and old profiles are pruned."""
+        profiling_settings.max_files = 2
+        response = client.get(
+            "/api/live", headers={"X-Profile": "1", "X-Request-ID": "../../etc/passwd"}
+        )
+        profile_id = response.headers["X-Profile-ID"]
+        assert "/" not in profile_id and "." not in profile_id
+
+        for _ in range(3):
+            client.get("/api/live", headers={"X-Profile": "1"})
+        assert len(list(profiling_settings.directory.glob("*.collapsed"))) == 2
+        assert len(list(profiling_settings.directory.glob("*.json"))) == 2
@@ -0,0 +1,159 @@
+"""Tests for retention, archival and compaction."""
+
+import gzip
+import json
+
+import pytest
+
+from api import retention
+
+
+@pytest.fixture
+def retention_db(tmp_path, monkeypatch):
+    """Fresh control panel database and archive directory in tmp_path."""
+    from api import database
+    from api.models import init_schema
+
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "control_panel.db")
+    monkeypatch.setattr(retention, "ARCHIVE_DIR", tmp_path / "archive")
+    database.init_db()
+    init_schema()
+
+    with database.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO logs (run_id, timestamp, level, message) VALUES (?, ?, 'INFO', ?)",
+            [
+                ("run_old", "2020-01-01 08:00:00", "lot 58831234 posted"),
+                ("run_old", "2020-01-02 09:30:00", "gate pass attached"),
+                ("run_new", "2999-01-01 00:00:00", "still hot"),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO export_jobs (uuid, run_id, status, created_at) VALUES (?, 1, ?, ?)",
+            [
+                ("done", "completed", "2020-01-01 00:00:00"),
+                ("queued", "pending", "2020-01-01 00:00:00"),
+            ],
+        )
+        conn.commit()
+    return database
+
+
+class TestArchiving:
+    """Tests for moving cold rows into date-partitioned archives."""
+
+    def test_cold_rows_move_to_daily_partitions(self, retention_db):
+        """Test old rows are archived by day and deleted, hot rows stay."""
+        moved = retention.archive_table(retention.POLICIES["logs"])
+
+        assert moved == 2
+        with retention_db.get_connection() as conn:
+            remaining = [r[0] for r in conn.execute("SELECT run_id FROM logs").fetchall()]
+        assert remaining == ["run_new"]
+        assert retention_db.RunLogs.search_logs(query="58831234") == []
+
+        partitions = retention.list_partitions("logs")
+        assert [p["date"] for p in partitions] == ["2020-01-01", "2020-01-02"]
+        with gzip.open(retention.ARCHIVE_DIR / "logs" / "2020-01-01.jsonl.gz", "rt") as f:
+            (row,) = [json.loads(line) for line in f]
+        assert row["message"] == "lot 58831234 posted" and "_rowid" not in row
+
+    def test_only_finished_jobs_are_archived(self, retention_db):
+        """Test the policy condition keeps unfinished jobs whatever their age."""
+        assert retention.archive_table(retention.POLICIES["export_jobs"]) == 1
+
+        with retention_db.get_connection() as conn:
+            statuses = [r[0] for r in conn.execute("SELECT status FROM export_jobs").fetchall()]
+        assert statuses == ["pending"]
+
+    def test_archive_query_filters(self, retention_db):
+        """Test archived rows are found by day range, text and column value."""
+        retention.archive_table(retention.POLICIES["logs"])
+        # A second run appends a new gzip member to an existing partition
+        with retention_db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO logs (run_id, timestamp, level, message) "
+                "VALUES ('run_x', '2020-01-01 23:00:00', 'ERROR', 'late entry')"
+            )
+            conn.commit()
+        retention.archive_table(retention.POLICIES["logs"])
+
+        day_one = retention.query_archive("logs", start="2020-01-01", end="2020-01-01")
+        assert [r["message"] for r in day_one] == ["lot 58831234 posted", "late entry"]
+        assert retention.query_archive("logs", contains="GATE PASS")[0]["run_id"] == "run_old"
+        assert [
+            r["run_id"] for r in retention.query_archive("logs", filters={"level": "ERROR"})
+        ] == ["run_x"]
+        with pytest.raises(ValueError):
+            retention.query_archive("runs")
+
+    def test_referenced_layout_blocks_are_kept(self, retention_db):
+        """Test old blocks still cited by field evidence stay in the database."""
+        with retention_db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO layout_blocks (id, document_id, block_id, x0, y0, x1, y1, created_at) "
+                "VALUES (?, 1, ?, 0, 0, 1, 1, '2020-01-01 00:00:00')",
+                [(1, "b1"), (2, "b2")],
+            )
+            conn.execute(
+                "INSERT INTO field_evidence (run_id, field_key, block_id) VALUES (1, 'vin', 1)"
+            )
+            conn.commit()
+
+        assert retention.archive_table(retention.POLICIES["layout_blocks"]) == 1
+
+        with retention_db.get_connection() as conn:
+            ids = [r[0] for r in conn.execute("SELECT id FROM layout_blocks").fetchall()]
+        assert ids == [1]
+
+
+class TestRetentionRuns:
+    """Tests for full runs, compaction and the API."""
+
+    def test_dry_run_then_run_with_compaction(self, retention_db):
+        """Test dry runs only count, and a run reports archived rows and vacuum results."""
+        report = retention.run_retention(dry_run=True)
+        assert report["archived"]["logs"] == 2 and report["compaction"] is None
+        with retention_db.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0] == 3
+
+        report = retention.run_retention(full_vacuum=True)
+
+        assert report["error"] is None
+        assert report["archived"]["logs"] == 2 and report["archived"]["export_jobs"] == 1
+        assert report["compaction"]["vacuum"] == "full"
+        assert retention.database_size()["auto_vacuum"] == 2
+
+        # Now in incremental mode: pages freed by archiving go back to the OS
+        with retention_db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO logs (run_id, timestamp, level, message) VALUES (?, ?, 'INFO', ?)",
+                [("bulk", "2020-02-01 00:00:00", "x" * 2000) for _ in range(500)],
+            )
+            conn.commit()
+        report = retention.run_retention()
+
+        compaction = report["compaction"]
+        assert report["archived"]["logs"] == 500
+        assert compaction["vacuum"] == "incremental"
+        assert compaction["bytes_reclaimed"] > 500 * 2000 / 2
+        assert (
+            compaction["bytes_after"] == compaction["bytes_before"] - compaction["bytes_reclaimed"]
+        )
+        assert retention.list_runs()[0]["archived_json"]["logs"] == 500
+
+    def test_interval_claim_runs_once(self, retention_db):
+        """Test a second scheduled run within the interval is skipped."""
+        assert retention.run_retention(interval_hours=24) is not None
+        assert retention.run_retention(interval_hours=24) is None
+
+    def test_archive_endpoint(self, client, retention_db):
+        """Test archived rows are queryable over HTTP with column filters."""
+        assert client.post("/api/retention/run", params={"table": "logs"}).status_code == 200
+
+        body = client.get("/api/retention/archive/logs", params={"run_id": "run_old"}).json()
+        assert body["count"] == 2
+        assert client.get("/api/retention/archive").json()["partitions"]
+        assert client.get("/api/retention/archive/runs").status_code == 404
+        assert client.post("/api/retention/run", params={"table": "runs"}).status_code == 400
+        assert client.get("/api/retention/status").json()["runs"][0]["archived_json"] == {"logs": 2}
@@ -0,0 +1,132 @@
+"""Tests for full-text search over run logs and documents."""
+
+import pytest
+
+from api.database import fts_query
+
+
+@pytest.fixture
+def search_db(tmp_path, monkeypatch):
+    """Fresh control panel database with the full schema in tmp_path."""
+    from api import database
+    from api.models import init_schema
+
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "control_panel.db")
+    database.init_db()
+    init_schema()
+    return database
+
+
+def _add_document(filename, raw_text, **kwargs):
+    from api.models import DocumentRepository
+
+    return DocumentRepository.create(
+        auction_type_id=1, dataset_split="train", filename=filename, raw_text=raw_text, **kwargs
+    )
+
+
+class TestFtsQuery:
+    """Tests for turning user text into FTS5 syntax."""
+
+    def test_words_become_quoted_prefixes(self):
+        """Test operators and punctuation are neutralised."""
+        assert fts_query("lot 5883") == '"lot"* "5883"*'
+        assert fts_query('NEAR(x) "AND" -run_12:') == '"NEAR"* "x"* "AND"* "run"* "12"*'
+        assert fts_query(" -- ") is None
+        assert fts_query(None) is None
+
+
+class TestLogSearch:
+    """Tests for RunLogs.search_logs on logs_fts."""
+
+    def test_ranked_highlighted_and_filtered(self, search_db):
+        """Test matches are highlighted, filtered and kept in sync with deletes."""
+        run_logs = search_db.RunLogs
+        run_logs.add_log("run_1", "ERROR", "CD rejected listing for lot 58831234")
+        run_logs.add_log("run_1", "INFO", "Extracted VIN 1HGCM82633A004352", details={"n": 1})
+        run_logs.add_log("run_2", "ERROR", "Sheets quota exceeded")
+
+        (hit,) = run_logs.search_logs(query="lot 5883")
+        assert hit["run_id"] == "run_1"
+        assert "<mark>58831234</mark>" in hit["highlight"]
+
+        assert run_logs.search_logs(query="1hgcm")[0]["details"] == {"n": 1}
+        assert run_logs.search_logs(query="error") == []
+        assert {log["run_id"] for log in run_logs.search_logs(level="ERROR")} == {"run_1", "run_2"}
+        assert run_logs.search_logs(query="quota", run_id="run_1") == []
+        assert run_logs.search_logs(query="-") == []
+        assert len(run_logs.search_logs(query=" ")) == 3
+
+        with search_db.get_connection() as conn:
+            conn.execute("DELETE FROM logs WHERE run_id = 'run_2'")
+            conn.commit()
+        assert run_logs.search_logs(query="quota") == []
+
+    def test_existing_rows_are_indexed(self, tmp_path, monkeypatch):
+        """Test logs written before the index existed are searchable after init_db."""
+        from api import database
+
+        monkeypatch.setattr(database, "DB_PATH", tmp_path / "old.db")
+        with database.get_connection() as conn:
+            conn.execute(
+                "CREATE TABLE logs (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, "
+                "timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP, level TEXT NOT NULL, "
+                "message TEXT NOT NULL, details TEXT)"
+            )
+            conn.execute(
+                "INSERT INTO logs (run_id, level, message) VALUES ('r', 'INFO', 'gate pass')"
+            )
+            conn.commit()
+
+        database.init_db()
+
+        assert [log["message"] for log in database.RunLogs.search_logs(query="gate")] == [
+            "gate pass"
+        ]
+
+
+class TestDocumentSearch:
+    """Tests for documents_fts and GET /api/documents/search."""
+
+    def test_vin_and_lot_from_latest_run(self, search_db):
+        """Test extraction outputs reach the index and VIN/lot hits outrank body text."""
+        from api.models import DocumentRepository, ExtractionRunRepository
+
+        target = _add_document("copart_invoice.pdf", "Buyer fee 120.00 Lot 58831234")
+        other = _add_document("iaa.pdf", "Mentions 58831234 twice: 58831234 in body text only")
+        run_id = ExtractionRunRepository.create(document_id=target, auction_type_id=1)
+        ExtractionRunRepository.update(
+            run_id,
+            outputs_json={"vehicle_vin": "1HGCM82633A004352", "vehicle_lot": "58831234"},
+        )
+
+        hits = DocumentRepository.search("58831234")
+        assert [hit["id"] for hit in hits] == [target, other]
+        assert hits[0]["vin"] == "1HGCM82633A004352"
+        assert "<mark>58831234</mark>" in hits[1]["snippet"]
+
+        assert [hit["id"] for hit in DocumentRepository.search("1HGCM826")] == [target]
+
+        DocumentRepository.delete(target)
+        assert [hit["id"] for hit in DocumentRepository.search("58831234")] == [other]
+
+    def test_endpoint_excludes_test_lab_by_default(self, client, search_db):
+        """Test the search endpoint returns ranked hits and honours include_test_lab."""
+        from api.models import DocumentRepository
+
+        doc = _add_document("manheim.pdf", "Release for stock 7741")
+        lab = _add_document("lab.pdf", "stock 7741 sample", source="test_lab", is_test=True)
+        DocumentRepository.update(doc, raw_text="Gate pass for stock 7741")
+
+        body = client.get("/api/documents/search", params={"q": "gate 7741"}).json()
+        assert body["total"] == 1
+        assert body["items"][0]["id"] == doc
+        assert "<mark>" in body["items"][0]["snippet"]
+
+        params = {"q": "7741", "include_test_lab": "true"}
+        ids = [
+            hit["id"] for hit in client.get("/api/documents/search", params=params).json()["items"]
+        ]
+        assert sorted(ids) == sorted([doc, lab])
+
+        assert client.get("/api/documents/search", params={"q": "-"}).json()["total"] == 0
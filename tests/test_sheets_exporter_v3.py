@@ -0,0 +1,648 @@
+"""Tests for SheetsExporterV3 against an in-memory Sheets API stand-in."""
+
+import re
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from core.config import CentralDispatchConfig
+from schemas.sheets_schema_v3 import RowStatus, get_column_names
+from services.sheets_exporter_v3 import SheetsExporterV3
+
+HEADERS = get_column_names()
+
+
+def _col_to_index(letters: str) -> int:
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index - 1
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class FakeSheetsService:
+    """
+    Minimal spreadsheets().values() implementation over a list-of-rows grid.
+
+    Counts API calls per method in ``calls``.
+    """
+
+    def __init__(self, rows: list[list[str]]):
+        self.grid = [list(r) for r in rows]
+        self.calls = Counter()
+
+    # Chained resource accessors
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _parse(self, a1: str):
+        """Return (row_start, row_end, col_start, col_end), 1-based rows, None = open."""
+        ref = a1.split("!", 1)[1]
+        m = re.fullmatch(r"([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?", ref)
+        c1, r1, c2, r2 = m.groups()
+        if m.group(0).find(":") < 0:
+            c2, r2 = c1, r1
+        col_start = _col_to_index(c1) if c1 else 0
+        col_end = _col_to_index(c2) if c2 else None
+        row_start = int(r1) if r1 else 1
+        row_end = int(r2) if r2 else None
+        return row_start, row_end, col_start, col_end
+
+    def _read(self, a1: str) -> list[list[str]]:
+        row_start, row_end, col_start, col_end = self._parse(a1)
+        rows = self.grid[row_start - 1 : row_end]
+        out = []
+        for row in rows:
+            cells = row[col_start : None if col_end is None else col_end + 1]
+            while cells and cells[-1] == "":
+                cells = cells[:-1]
+            out.append(cells)
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def _write(self, a1: str, values: list[list[str]]) -> None:
+        row_start, _, col_start, _ = self._parse(a1)
+        for r, row_values in enumerate(values):
+            idx = row_start - 1 + r
+            while len(self.grid) <= idx:
+                self.grid.append([])
+            row = self.grid[idx]
+            for c, value in enumerate(row_values):
+                while len(row) <= col_start + c:
+                    row.append("")
+                row[col_start + c] = value
+
+    def get(self, **kwargs):
+        self.calls["get"] += 1
+        return _Request(lambda: {"values": self._read(kwargs["range"])})
+
+    def batchGet(self, **kwargs):  # noqa: N802 - Sheets API method name
+        self.calls["batchGet"] += 1
+        major_dimension = kwargs.get("majorDimension", "ROWS")
+
+        def run():
+            value_ranges = []
+            for a1 in kwargs["ranges"]:
+                values = self._read(a1)
+                if major_dimension == "COLUMNS":
+                    values = [[row[0] if row else "" for row in values]] if values else []
+                value_ranges.append({"range": a1, "values": values})
+            return {"valueRanges": value_ranges}
+
+        return _Request(run)
+
+    def update(self, **kwargs):
+        self.calls["update"] += 1
+        return _Request(lambda: self._write(kwargs["range"], kwargs["body"]["values"]))
+
+    def batchUpdate(self, **kwargs):  # noqa: N802 - Sheets API method name
+        self.calls["batchUpdate"] += 1
+
+        def run():
+            for item in kwargs["body"]["data"]:
+                self._write(item["range"], item["values"])
+
+        return _Request(run)
+
+    def append(self, **kwargs):
+        self.calls["append"] += 1
+
+        def run():
+            row_number = len(self.grid) + 1
+            self.grid.append(list(kwargs["body"]["values"][0]))
+            return {"updates": {"updatedRange": f"Pickups!A{row_number}:ZZ{row_number}"}}
+
+        return _Request(run)
+
+
+def _row(**values) -> list[str]:
+    return [str(values.get(h, "")) for h in HEADERS]
+
+
+def _exporter(rows: list[list[str]], **kwargs) -> tuple[SheetsExporterV3, FakeSheetsService]:
+    service = FakeSheetsService([HEADERS] + rows)
+    exporter = SheetsExporterV3(SimpleNamespace(spreadsheet_id="sheet-1"), **kwargs)
+    exporter._service = service
+    return exporter, service
+
+
+def _cell(service: FakeSheetsService, row_number: int, column: str) -> str:
+    row = service.grid[row_number - 1]
+    idx = HEADERS.index(column)
+    return row[idx] if idx < len(row) else ""
+
+
+class TestSheetMirror:
+    """Tests for the local sheet mirror used by SheetsExporterV3."""
+
+    def test_lookups_read_the_sheet_once(self):
+        """Test repeated lookups and status updates reuse the mirror."""
+        rows = [
+            _row(dispatch_id=f"DC-{i}", row_status="READY", vehicle_vin=f"VIN{i:014d}")
+            for i in range(20)
+        ]
+        exporter, service = _exporter(rows)
+
+        for i in range(20):
+            assert exporter.get_row_by_dispatch_id(f"DC-{i}")["vehicle_vin"] == f"VIN{i:014d}"
+            assert exporter.update_row_status(f"DC-{i}", RowStatus.EXPORTED, cd_listing_id=str(i))
+
+        assert service.calls["get"] == 1
+        assert _cell(service, 5, "row_status") == "EXPORTED"
+        assert _cell(service, 5, "cd_listing_id") == "3"
+        assert exporter.get_rows_by_status([RowStatus.READY]) == []
+
+    def test_fallback_matching_uses_indexes(self):
+        """Test gate pass, VIN and hash matches follow the priority order."""
+        rows = [
+            _row(dispatch_id="DC-1", auction_source="COPART", gate_pass="GP1"),
+            _row(dispatch_id="DC-2", vehicle_vin="1HGCM82633A004352"),
+            _row(dispatch_id="DC-3", attachment_hash="abc123"),
+        ]
+        exporter, _ = _exporter(rows)
+
+        assert exporter._fallback_find_row("COPART", gate_pass="gp1")[0] == 2
+        assert exporter._fallback_find_row("IAA", gate_pass="GP1") is None
+        assert exporter._fallback_find_row("X", vin="1hgcm82633a004352")[0] == 3
+        assert exporter._fallback_find_row("X", attachment_hash="ABC123")[0] == 4
+        # A gate pass that does not match does not fall through to VIN
+        assert exporter._fallback_find_row("X", gate_pass="nope", vin="1HGCM82633A004352") is None
+
+    def test_insert_is_visible_without_reread(self):
+        """Test an inserted row is indexed from our own write."""
+        exporter, service = _exporter([_row(dispatch_id="DC-1", row_status="NEW")])
+
+        result = exporter.upsert_record(
+            {"dispatch_id": "DC-2", "auction_source": "COPART", "vehicle_vin": "VIN2"}
+        )
+        assert result["action"] == "insert"
+
+        found = exporter._find_row_by_dispatch_id("DC-2")
+        assert found[0] == 3
+        assert found[1]["vehicle_vin"] == "VIN2"
+        assert service.calls["get"] == 2  # header check + mirror load
+
+    def test_external_edit_triggers_delta_refresh(self):
+        """Test a manual lock set in the sheet is picked up before the next write."""
+        exporter, service = _exporter(
+            [_row(dispatch_id="DC-1", row_status="NEW", pickup_city="Reno")],
+            check_interval=0,
+        )
+        exporter.sync()
+
+        # Operator locks the row and appends a new one directly in the sheet
+        service.grid[1][HEADERS.index("lock_all")] = "TRUE"
+        service.grid.append(_row(dispatch_id="DC-9"))
+
+        result = exporter.upsert_record({"dispatch_id": "DC-1", "pickup_city": "Boise"})
+
+        assert result["protection_snapshot"]["lock_all"] is True
+        assert _cell(service, 2, "pickup_city") == "Reno"
+        assert exporter._find_row_by_dispatch_id("DC-9")[0] == 3
+        assert service.calls["get"] <= 2  # no full reload after the first
+
+    def test_manual_edit_to_unwatched_column_is_not_overwritten(self):
+        """Test fill-only rules see a manual edit made after the mirror was loaded."""
+        exporter, service = _exporter(
+            [_row(dispatch_id="DC-1", row_status="READY", pickup_city="")],
+            check_interval=3600,
+        )
+        exporter.sync()
+        service.grid[1][HEADERS.index("pickup_city")] = "Reno"
+
+        result = exporter.upsert_record({"dispatch_id": "DC-1", "pickup_city": "Boise"})
+
+        assert {"field": "pickup_city", "reason": "fill_only_mode"} in result["skipped_fields"]
+        assert _cell(service, 2, "pickup_city") == "Reno"
+
+    def test_batch_upsert_rereads_rows_once(self):
+        """Test upsert_records re-reads every matched row in a single batchGet."""
+        rows = [_row(dispatch_id=f"DC-{i}", row_status="READY") for i in range(20)]
+        exporter, service = _exporter(rows, check_interval=3600)
+        exporter.sync()
+        service.grid[5][HEADERS.index("pickup_city")] = "Reno"
+
+        results = exporter.upsert_records(
+            [{"dispatch_id": f"DC-{i}", "pickup_city": "Boise"} for i in range(20)]
+            + [{"dispatch_id": "DC-NEW", "vehicle_vin": "VIN9"}]
+        )
+
+        assert [r["action"] for r in results] == ["update"] * 20 + ["insert"]
+        assert {"field": "pickup_city", "reason": "fill_only_mode"} in results[4]["skipped_fields"]
+        assert _cell(service, 6, "pickup_city") == "Reno"
+        assert _cell(service, 7, "pickup_city") == "Boise"
+        assert service.calls["batchGet"] == 1
+        assert service.calls["get"] == 1  # The mirror load
+
+    def test_index_updates_in_place(self, monkeypatch):
+        """Test writes to indexed columns move index entries without a full reindex."""
+        rows = [
+            _row(dispatch_id="DC-1", vehicle_vin="VIN1"),
+            _row(dispatch_id="DC-2", vehicle_vin="VIN2"),
+            _row(dispatch_id="DC-3", vehicle_vin="VIN1"),
+        ]
+        exporter, _ = _exporter(rows)
+        exporter.sync()
+        monkeypatch.setattr(exporter.mirror, "_reindex", lambda: pytest.fail("full reindex"))
+
+        exporter.mirror.apply_update(2, {"vehicle_vin": "VIN7"})
+        exporter.mirror.apply_rows({3: _row(dispatch_id="DC-2", vehicle_vin="VIN8")})
+
+        assert exporter._fallback_find_row("X", vin="VIN7")[0] == 2
+        assert exporter._fallback_find_row("X", vin="VIN1")[0] == 4  # Next row with the VIN
+        assert exporter._fallback_find_row("X", vin="VIN8")[0] == 3
+        assert exporter._fallback_find_row("X", vin="VIN2") is None
+        assert exporter._find_row_by_dispatch_id("DC-2")[0] == 3
+
+    def test_rows_by_status_are_reread(self):
+        """Test rows handed to the CD export carry the sheet's current values."""
+        exporter, service = _exporter(
+            [_row(dispatch_id="DC-1", row_status="READY", pickup_city="Reno")],
+            check_interval=3600,
+        )
+        exporter.sync()
+        service.grid[1][HEADERS.index("pickup_city")] = "Boise"
+
+        (row,) = exporter.get_rows_by_status([RowStatus.READY])
+
+        assert row["pickup_city"] == "Boise"
+        assert service.calls["get"] == 1
+
+    def test_removed_rows_force_full_reload(self):
+        """Test deleting rows in the sheet rebuilds the mirror."""
+        exporter, service = _exporter(
+            [_row(dispatch_id="DC-1"), _row(dispatch_id="DC-2")], check_interval=0
+        )
+        exporter.sync()
+        del service.grid[1]
+
+        assert exporter._find_row_by_dispatch_id("DC-2")[0] == 2
+        assert exporter._find_row_by_dispatch_id("DC-1") is None
+
+
+class TestBufferedWrites:
+    """Tests for the write-behind buffer of cell updates."""
+
+    def test_export_batches_updates(self):
+        """Test 300 snapshot + status updates take a handful of API calls."""
+        rows = [_row(dispatch_id=f"DC-{i}", row_status="READY") for i in range(300)]
+        exporter, service = _exporter(rows)
+
+        with exporter.buffered_writes(max_rows=50):
+            for i in range(300):
+                exporter.save_payload_snapshot(f"DC-{i}", {"externalId": f"DC-{i}"})
+                exporter.update_row_status(f"DC-{i}", RowStatus.EXPORTED, cd_listing_id=str(i))
+
+        assert service.calls["get"] == 1
+        assert service.calls["batchUpdate"] == 6
+        assert _cell(service, 301, "row_status") == "EXPORTED"
+        assert _cell(service, 301, "cd_payload_snapshot") == '{"externalId": "DC-299"}'
+
+    def test_last_write_per_row_wins(self):
+        """Test repeated updates to one row are merged in order."""
+        exporter, service = _exporter([_row(dispatch_id="DC-1", row_status="READY")])
+
+        with exporter.buffered_writes():
+            exporter.update_row_status("DC-1", RowStatus.ERROR, error_message="timeout")
+            exporter.update_row_status("DC-1", RowStatus.EXPORTED, cd_listing_id="L1")
+            # Lookups see pending values before the flush
+            assert exporter.get_row_by_dispatch_id("DC-1")["row_status"] == "EXPORTED"
+            assert service.calls["batchUpdate"] == 0
+
+        assert service.calls["batchUpdate"] == 1
+        assert _cell(service, 2, "row_status") == "EXPORTED"
+        assert _cell(service, 2, "cd_last_error") == "timeout"
+
+    def test_failed_flush_keeps_updates_queued(self):
+        """Test updates survive a failed flush and are written on retry."""
+        exporter, service = _exporter(
+            [_row(dispatch_id="DC-1", row_status="READY"), _row(dispatch_id="DC-2")]
+        )
+        original = service.batchUpdate
+        attempts = []
+
+        def flaky_batch_update(**kwargs):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("quota exceeded")
+            return original(**kwargs)
+
+        service.batchUpdate = flaky_batch_update
+
+        with exporter.buffered_writes(max_rows=1):
+            exporter.update_row_status("DC-1", RowStatus.EXPORTED, cd_listing_id="L1")
+            # Second row triggers a flush of the first, which fails
+            exporter.update_row_status("DC-2", RowStatus.ERROR, error_message="bad")
+            assert _cell(service, 2, "row_status") == "READY"
+
+        assert len(attempts) == 2
+        assert _cell(service, 2, "row_status") == "EXPORTED"
+        assert _cell(service, 3, "row_status") == "ERROR"
+
+    def test_pending_updates_follow_rows_moved_by_a_reload(self):
+        """Test a reload while writes are pending re-targets them by dispatch_id."""
+        rows = [_row(dispatch_id=f"DC-{i}", row_status="READY") for i in range(1, 4)]
+        exporter, service = _exporter(rows, check_interval=3600)
+
+        with exporter.buffered_writes():
+            exporter.update_row_status("DC-3", RowStatus.EXPORTED, cd_listing_id="L3")
+            exporter.save_payload_snapshot("DC-2", {"externalId": "DC-2"})
+            # An operator deletes DC-1, then the mirror expires and is reloaded
+            del service.grid[1]
+            exporter.max_mirror_age = 0
+            assert exporter._find_row_by_dispatch_id("DC-3")[0] == 3
+            assert exporter.get_row_by_dispatch_id("DC-3")["row_status"] == "EXPORTED"
+            assert service.calls["batchUpdate"] == 0
+
+        assert _cell(service, 3, "dispatch_id") == "DC-3"
+        assert _cell(service, 3, "row_status") == "EXPORTED"
+        assert _cell(service, 3, "cd_listing_id") == "L3"
+        assert _cell(service, 2, "row_status") == "READY"
+        assert _cell(service, 2, "cd_payload_snapshot") == '{"externalId": "DC-2"}'
+        assert len(service.grid) == 3
+
+    def test_exporter_is_released_after_the_block(self):
+        """Test the shutdown flush hook doesn't keep finished exporters alive."""
+        import gc
+        import weakref
+
+        exporter, service = _exporter([_row(dispatch_id="DC-1", row_status="READY")])
+        with exporter.buffered_writes():
+            exporter.update_row_status("DC-1", RowStatus.EXPORTED)
+        assert _cell(service, 2, "row_status") == "EXPORTED"
+
+        ref = weakref.ref(exporter)
+        del exporter
+        gc.collect()
+        assert ref() is None
+
+    def test_cd_export_flushes_error_statuses(self):
+        """Test export_ready_rows writes validation errors in one batch."""
+        from services.cd_sheet_exporter_v2 import CDSheetExporterV2
+
+        rows = [_row(dispatch_id=f"DC-{i}", row_status="READY") for i in range(10)]
+        sheets, service = _exporter(rows)
+        cd_exporter = CDSheetExporterV2(
+            SimpleNamespace(spreadsheet_id="sheet-1"), CentralDispatchConfig(enabled=False)
+        )
+        cd_exporter._sheets_exporter = sheets
+
+        results = cd_exporter.export_ready_rows()
+
+        assert results["failed"] == 10
+        assert service.calls["batchUpdate"] == 1
+        assert all(_cell(service, n, "row_status") == "ERROR" for n in range(2, 12))
+
+
+class _SlowCDClient:
+    """CD client stand-in that records how many calls overlap."""
+
+    def __init__(self, delay: float = 0.05, fail_ids: tuple[str, ...] = ()):
+        self.delay = delay
+        self.fail_ids = fail_ids
+        self.active = 0
+        self.max_active = 0
+        self.posted = []
+        self._lock = threading.Lock()
+
+    def create_listing(self, payload):
+        with self._lock:
+            self.posted.append(payload["externalId"])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if payload["externalId"] in self.fail_ids:
+                raise RuntimeError("400 Bad Request")
+            return {"id": f"L-{payload['externalId']}"}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestConcurrentExport:
+    """Tests for parallel CD posting from CDSheetExporterV2."""
+
+    def _cd_exporter(self, rows, monkeypatch, tmp_path, client=None):
+        from services import cd_sheet_exporter_v2
+        from services.cd_sheet_exporter_v2 import CDSheetExporterV2
+        from services.idempotency import IdempotencyStore
+
+        monkeypatch.setattr(
+            cd_sheet_exporter_v2,
+            "validate_row_for_ready",
+            lambda row: ["vin is required"] if row.get("vehicle_vin") == "BAD" else [],
+        )
+        sheets, service = _exporter(rows)
+        cd_exporter = CDSheetExporterV2(
+            SimpleNamespace(spreadsheet_id="sheet-1"),
+            CentralDispatchConfig(max_concurrent=8),
+            idempotency_store=IdempotencyStore(db_path=str(tmp_path / "idem.db")),
+        )
+        cd_exporter._sheets_exporter = sheets
+        cd_exporter._cd_client = client
+        return cd_exporter, service
+
+    def test_posts_in_parallel_and_keeps_row_order(self, monkeypatch, tmp_path):
+        """Test listings are posted concurrently and results stay in row order."""
+        rows = [_row(dispatch_id=f"DC-{i}", row_status="READY") for i in range(16)]
+        rows[3] = _row(dispatch_id="DC-3", row_status="READY", vehicle_vin="BAD")
+        client = _SlowCDClient(fail_ids=("DC-5",))
+        cd_exporter, service = self._cd_exporter(rows, monkeypatch, tmp_path, client)
+
+        started = time.perf_counter()
+        results = cd_exporter.export_ready_rows()
+        elapsed = time.perf_counter() - started
+
+        assert [r["dispatch_id"] for r in results["results"]] == [f"DC-{i}" for i in range(16)]
+        assert results["exported"] == 14
+        assert results["failed"] == 2
+        assert results["results"][0]["listing_id"] == "L-DC-0"
+        assert results["results"][3]["error"].startswith("Validation failed")
+        assert results["results"][5]["error"] == "400 Bad Request"
+        assert client.max_active > 1
+        assert elapsed < 15 * client.delay
+
+        assert _cell(service, 2, "row_status") == "EXPORTED"
+        assert _cell(service, 2, "cd_listing_id") == "L-DC-0"
+        assert _cell(service, 5, "row_status") == "ERROR"
+        assert _cell(service, 7, "cd_last_error") == "400 Bad Request"
+
+    def test_dry_run_posts_nothing(self, monkeypatch, tmp_path):
+        """Test dry run simulates success without CD calls or sheet writes."""
+        rows = [_row(dispatch_id=f"DC-{i}", row_status="READY") for i in range(4)]
+        client = _SlowCDClient()
+        cd_exporter, service = self._cd_exporter(rows, monkeypatch, tmp_path, client)
+
+        results = cd_exporter.export_ready_rows(dry_run=True)
+
+        assert results["exported"] == 4
+        assert results["results"][2]["listing_id"] == "DRY_RUN_DC-2"
+        assert client.max_active == 0
+        assert service.calls["batchUpdate"] == 0
+
+    def test_lost_status_write_is_not_reposted(self, monkeypatch, tmp_path):
+        """Test rows posted by a run whose sheet flush failed only get their status retried."""
+        rows = [_row(dispatch_id=f"DC-{i}", row_status="READY") for i in range(4)]
+        client = _SlowCDClient(delay=0)
+        cd_exporter, service = self._cd_exporter(rows, monkeypatch, tmp_path, client)
+        original = service.batchUpdate
+
+        def failing_batch_update(**kwargs):
+            raise OSError("quota exceeded")
+
+        service.batchUpdate = failing_batch_update
+        results = cd_exporter.export_ready_rows()
+
+        assert results["sheet_update_error"] == "quota exceeded"
+        assert len(client.posted) == 4
+        assert _cell(service, 2, "row_status") == "READY"
+
+        # The next run starts from the sheet as it is, as after a restart
+        service.batchUpdate = original
+        sheets = SheetsExporterV3(SimpleNamespace(spreadsheet_id="sheet-1"))
+        sheets._service = service
+        cd_exporter._sheets_exporter = sheets
+        results = cd_exporter.export_ready_rows()
+
+        assert len(client.posted) == 4
+        assert results["exported"] == 4 and "sheet_update_error" not in results
+        assert all(r["duplicate"] for r in results["results"])
+        assert _cell(service, 3, "row_status") == "EXPORTED"
+        assert _cell(service, 3, "cd_listing_id") == "L-DC-1"
+
+    def test_rate_limiter_caps_concurrency(self):
+        """Test the shared CD limiter bounds in-flight requests across threads."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from services.central_dispatch import RateLimiter
+
+        limiter = RateLimiter(max_concurrent=2, requests_per_second=0)
+        client = _SlowCDClient(delay=0.02)
+
+        def call(i):
+            with limiter:
+                return client.create_listing({"externalId": str(i)})
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(call, range(8)))
+
+        assert client.max_active == 2
+
+
+class TestLegacyConcurrentExport:
+    """Tests for CDExporter.export_pending_from_sheets with parallel posting."""
+
+    def _exporter(self, tmp_path, monkeypatch, count=3):
+        from services.cd_exporter import CDExporter
+        from services.idempotency import IdempotencyStore
+        from services.sheets import PickupRecord, PickupStatus, SheetsClient
+
+        rows = [
+            PickupRecord(
+                thread_root_id=f"t{i}",
+                attachment_hash=f"h{i}",
+                vin=f"VIN{i}",
+                pickup_city="Reno",
+                status=PickupStatus.READY_FOR_CD.value,
+            ).to_row()
+            for i in range(count)
+        ]
+        service = FakeSheetsService([PickupRecord.get_headers()] + rows)
+        sheets = SheetsClient("sheet-1")
+        sheets._service = service
+        posted = []
+
+        def create_listing_raw(payload):
+            posted.append(payload["externalId"])
+            # An operator edits the row while the export is running
+            service.grid[1][PickupRecord.get_headers().index("pickup_city")] = "Boise"
+            return {"success": True, "listing_id": f"L-{payload['externalId']}"}
+
+        exporter = CDExporter(
+            SimpleNamespace(create_listing_raw=create_listing_raw),
+            sheets,
+            idempotency_store=IdempotencyStore(db_path=str(tmp_path / "idem.db")),
+        )
+        monkeypatch.setattr(
+            exporter,
+            "_prepare_payload",
+            lambda record, *a, **k: ({"externalId": record.idempotency_key}, None),
+        )
+        monkeypatch.setattr(SheetsClient.update_fields.retry, "sleep", lambda _: None)
+        return exporter, service, posted
+
+    def test_writes_only_status_cells(self, tmp_path, monkeypatch):
+        """Test the status write keeps cells edited while listings were posted."""
+        from services.sheets import PickupRecord
+
+        exporter, service, posted = self._exporter(tmp_path, monkeypatch)
+
+        results = exporter.export_pending_from_sheets({}, workers=4)
+
+        headers = PickupRecord.get_headers()
+        assert results["exported"] == 3 and len(posted) == 3
+        assert service.grid[1][headers.index("pickup_city")] == "Boise"
+        assert service.grid[1][headers.index("status")] == "CD_CREATED"
+        assert service.grid[1][headers.index("cd_listing_id")] == "L-t0:h0"
+        assert service.calls["batchUpdate"] == 1
+
+    def test_failed_status_write_is_reported_and_not_reposted(self, tmp_path, monkeypatch):
+        """Test a failed sheet write surfaces per row and the next run doesn't post again."""
+        from services.sheets import PickupRecord
+
+        exporter, service, posted = self._exporter(tmp_path, monkeypatch)
+        original = service.batchUpdate
+
+        def failing_batch_update(**kwargs):
+            raise OSError("quota exceeded")
+
+        service.batchUpdate = failing_batch_update
+        results = exporter.export_pending_from_sheets({}, workers=4)
+
+        assert results["sheet_update_error"] == "quota exceeded"
+        assert len(posted) == 3
+
+        service.batchUpdate = original
+        results = exporter.export_pending_from_sheets({}, workers=4)
+
+        assert results["exported"] == 3 and "sheet_update_error" not in results
+        assert len(posted) == 3
+        status_col = PickupRecord.get_headers().index("status")
+        assert all(row[status_col] == "CD_CREATED" for row in service.grid[1:])
+
+    def test_sequential_export_is_not_reposted(self, tmp_path, monkeypatch):
+        """Test export_record records each listing so a lost status write isn't reposted."""
+        from services.sheets import PickupRecord
+
+        exporter, service, posted = self._exporter(tmp_path, monkeypatch)
+
+        def failing_update_status(*args, **kwargs):
+            raise OSError("quota exceeded")
+
+        monkeypatch.setattr(exporter.sheets_client, "update_status", failing_update_status)
+        results = exporter.export_pending_from_sheets({})
+
+        assert results["sheet_update_error"] == "quota exceeded"
+        assert len(posted) == 3
+
+        monkeypatch.delattr(exporter.sheets_client, "update_status")
+        results = exporter.export_pending_from_sheets({})
+
+        assert results["exported"] == 3 and len(posted) == 3
+        status_col = PickupRecord.get_headers().index("status")
+        assert all(row[status_col] == "CD_CREATED" for row in service.grid[1:])
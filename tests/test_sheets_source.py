@@ -0,0 +1,142 @@
+"""Tests for incremental Sheets -> CD sync in SheetsSource."""
+
+from types import SimpleNamespace
+
+from core.config import SheetsConfig
+from schemas.sheets_schema_v1 import get_column_names
+from services.sheets_source import SheetsSource, SyncStateStore
+
+COLUMNS = get_column_names()
+
+
+class _Request:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class FakeValuesService:
+    """Serves a whole-sheet values().get() from an in-memory grid."""
+
+    def __init__(self, rows: list[list[str]]):
+        self.grid = [COLUMNS] + rows
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        return _Request({"values": [list(r) for r in self.grid]})
+
+    def batchUpdate(self, **kwargs):  # noqa: N802 - Sheets API method name
+        return _Request({})
+
+
+def _row(**values) -> list[str]:
+    return [str(values.get(c, "")) for c in COLUMNS]
+
+
+def _exported_row(i: int) -> dict[str, str]:
+    values = {
+        "pickup_uid": f"P-{i}",
+        "cd_export_enabled": "TRUE",
+        "status": "EXPORTED_TO_CD",
+        "cd_export_status": "SENT",
+        "cd_listing_id": f"L-{i}",
+        "vin_final": f"VIN{i:014d}",
+        "pickup_city_final": "Reno",
+        "price_final": "500",
+    }
+    row = dict(zip(COLUMNS, _row(**values)))
+    record = SheetsSource(SheetsConfig(), state_store=None)._row_to_final_record(row)
+    values["cd_payload_hash"] = record.compute_payload_hash()
+    return values
+
+
+def _source(tmp_path, rows):
+    service = FakeValuesService([_row(**r) for r in rows])
+    source = SheetsSource(
+        SheetsConfig(spreadsheet_id="sheet-1"),
+        state_store=SyncStateStore(str(tmp_path / "sync.db")),
+    )
+    source._service = service
+
+    built = []
+    original = source._row_to_final_record
+
+    def counting(row):
+        built.append(row.get("pickup_uid"))
+        return original(row)
+
+    source._row_to_final_record = counting
+    return source, service, built
+
+
+class TestIncrementalSync:
+    """Tests for change-driven list_ready_for_cd."""
+
+    def test_only_edited_rows_are_diffed(self, tmp_path):
+        """Test a second sync builds records only for rows edited in between."""
+        source, service, built = _source(tmp_path, [_exported_row(i) for i in range(50)])
+
+        assert source.list_ready_for_cd() == []
+        assert len(built) == 50  # First sync has no state: every row is diffed
+
+        built.clear()
+        assert source.list_ready_for_cd() == []
+        assert built == []
+
+        # Edit the price on one row
+        service.grid[8][COLUMNS.index("price_final")] = "650"
+        built.clear()
+        ready = source.list_ready_for_cd()
+
+        assert [r.pickup_uid for r in ready] == ["P-7"]
+        assert built == ["P-7"]
+
+    def test_pending_rows_stay_queued_until_exported(self, tmp_path):
+        """Test a changed row is re-queued on every sync until marked exported."""
+        source, service, built = _source(tmp_path, [_exported_row(i) for i in range(5)])
+        source.list_ready_for_cd()
+        service.grid[2][COLUMNS.index("price_final")] = "900"
+
+        first = source.list_ready_for_cd()
+        second = source.list_ready_for_cd()
+        assert [r.pickup_uid for r in first] == [r.pickup_uid for r in second] == ["P-1"]
+
+        source.state_store.mark_exported("P-1", second[0].compute_payload_hash())
+        assert source.list_ready_for_cd() == []
+
+    def test_export_without_pickup_uid_uses_row_key(self, tmp_path):
+        """Test a row with no pickup_uid is recorded under row:N and not re-sent."""
+        rows = [_exported_row(i) for i in range(3)]
+        rows[1]["pickup_uid"] = ""
+        source, service, _ = _source(tmp_path, rows)
+        source.list_ready_for_cd()
+        service.grid[2][COLUMNS.index("price_final")] = "900"
+        assert [r.pickup_uid for r in source.list_ready_for_cd()] == [""]
+
+        source.update_cd_export_result("", True, listing_id="L-9", payload_json="{}")
+
+        assert source.state_store.load_all()["row:3"].exported_payload_hash
+        assert source.list_ready_for_cd() == []
+
+    def test_ready_rows_listed_without_diff(self, tmp_path):
+        """Test READY rows are returned even when their content is unchanged."""
+        rows = [
+            {"pickup_uid": "P-1", "cd_export_enabled": "TRUE", "status": "READY_FOR_CD"},
+            {"pickup_uid": "P-2", "cd_export_enabled": "FALSE", "status": "READY_FOR_CD"},
+        ]
+        source, _, _ = _source(tmp_path, rows)
+
+        for _ in range(2):
+            assert [r.pickup_uid for r in source.list_ready_for_cd()] == ["P-1"]
+
+    def test_state_disabled_falls_back_to_full_diff(self):
+        """Test an empty sync_state_db_path keeps the stateless behaviour."""
+        source = SheetsSource(SimpleNamespace(sync_state_db_path="", sheet_name="Pickups"))
+        assert source.state_store is None
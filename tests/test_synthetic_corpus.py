@@ -0,0 +1,96 @@
+"""Tests for the synthetic invoice corpus generator."""
+
+import json
+
+import pytest
+
+from tests.fixtures.generate_test_pdfs import (
+    PDF_BACKEND,
+    CorpusOptions,
+    build_document_spec,
+    build_pages,
+    generate_corpus,
+    vin_check_digit,
+)
+
+requires_pdf_backend = pytest.mark.skipif(PDF_BACKEND is None, reason="Requires reportlab or fpdf2")
+
+
+class TestDocumentSpec:
+    """Tests for ground truth and layout generation."""
+
+    def test_documents_depend_only_on_seed_and_index(self):
+        """Test a document is identical whatever the corpus size, and differs by seed."""
+        spec = build_document_spec(7, CorpusOptions(count=10))
+
+        assert spec == build_document_spec(7, CorpusOptions(count=5000))
+        assert spec != build_document_spec(7, CorpusOptions(count=10, seed=1))
+
+    def test_ground_truth_is_consistent(self):
+        """Test VINs carry valid check digits and fields match the first vehicle."""
+        options = CorpusOptions(bundle_ratio=1.0)
+        for index in range(20):
+            spec = build_document_spec(index, options)
+            fields, vehicles = spec["fields"], spec["vehicles"]
+
+            assert 2 <= len(vehicles) <= options.max_bundle_vehicles
+            for vehicle in vehicles:
+                assert len(vehicle["vin"]) == 17
+                assert vehicle["vin"][8] == vin_check_digit(vehicle["vin"])
+            assert fields["vehicle_vin"] == vehicles[0]["vin"]
+            assert fields["reference_id"] == vehicles[0]["lot"]
+            assert float(fields["total_amount"]) == pytest.approx(
+                sum(v["price"] for v in vehicles) + float(spec["buyer_fee"])
+            )
+
+    def test_layout_options_are_honoured(self):
+        """Test page, column, scan and bundle options reach the rendered pages."""
+        options = CorpusOptions(
+            pages=(3, 3),
+            columns=(2,),
+            words_per_page=(400, 400),
+            scanned_ratio=1.0,
+            bundle_ratio=1.0,
+        )
+        spec = build_document_spec(0, options)
+        pages = build_pages(spec)
+        text = "\n".join(line for page in pages for line in page.lines)
+
+        assert len(pages) == spec["layout"]["pages"] >= 3
+        assert all(page.columns == 2 for page in pages)
+        assert [n for n, page in enumerate(pages, 1) if page.scanned] == spec["layout"][
+            "scanned_pages"
+        ]
+        assert pages[0].scanned
+        assert all(vehicle["vin"] in text for vehicle in spec["vehicles"])
+
+
+class TestCorpusRendering:
+    """Tests for written PDFs and ground-truth files."""
+
+    @requires_pdf_backend
+    def test_text_pages_match_ground_truth(self, tmp_path):
+        """Test text-layer PDFs contain the ground-truth VIN next to a regression JSON."""
+        import pdfplumber
+
+        specs = generate_corpus(tmp_path, CorpusOptions(count=3, scanned_ratio=0.0))
+
+        for spec in specs:
+            pdf_path = tmp_path / spec["source_file"]
+            with pdfplumber.open(pdf_path) as pdf:
+                assert len(pdf.pages) == spec["layout"]["pages"]
+                text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+            assert spec["fields"]["vehicle_vin"] in text
+            assert json.loads(pdf_path.with_suffix(".json").read_text())["fields"]
+        assert len(json.loads((tmp_path / "manifest.json").read_text())["documents"]) == 3
+
+    @requires_pdf_backend
+    def test_scanned_pages_have_no_text_layer(self, tmp_path):
+        """Test rasterised pages need OCR."""
+        pytest.importorskip("PIL")
+        import pdfplumber
+
+        (spec,) = generate_corpus(tmp_path, CorpusOptions(count=1, scanned_ratio=1.0))
+
+        with pdfplumber.open(tmp_path / spec["source_file"]) as pdf:
+            assert not (pdf.pages[0].extract_text() or "").strip()
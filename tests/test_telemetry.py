@@ -0,0 +1,72 @@
+"""Tests for the in-process metrics registry and /metrics exposition."""
+
+from core.telemetry import HTTP_REQUESTS, Registry, statement_op
+
+
+class TestRegistry:
+    """Tests for recording and text exposition."""
+
+    def test_counter_and_histogram_exposition(self):
+        """Test counters render per label set and histograms render cumulative buckets."""
+        registry = Registry()
+        calls = registry.counter("cd_calls_total", "CD calls", ("status",))
+        latency = registry.histogram("cd_seconds", "CD latency", buckets=(0.1, 1.0))
+
+        calls.inc(status=200)
+        calls.inc(2, status=429)
+        for value in (0.05, 0.5, 3.0):
+            latency.observe(value)
+
+        text = registry.render()
+        assert "# TYPE cd_calls_total counter" in text
+        assert 'cd_calls_total{status="200"} 1' in text
+        assert 'cd_calls_total{status="429"} 2' in text
+        assert "# TYPE cd_seconds histogram" in text
+        assert 'cd_seconds_bucket{le="0.1"} 1' in text
+        assert 'cd_seconds_bucket{le="1"} 2' in text
+        assert 'cd_seconds_bucket{le="+Inf"} 3' in text
+        assert "cd_seconds_sum 3.55" in text
+        assert "cd_seconds_count 3" in text
+
+    def test_collectors_run_at_scrape_and_failures_are_isolated(self):
+        """Test collector samples are rendered and a failing collector is skipped."""
+        registry = Registry()
+
+        def broken():
+            raise RuntimeError("down")
+
+        registry.add_collector(broken)
+        registry.add_collector(
+            lambda: [("queue_items", "gauge", "Queue items", [({"status": "pending"}, 4)])]
+        )
+
+        text = registry.render()
+        assert 'queue_items{status="pending"} 4' in text
+
+    def test_statement_op(self):
+        """Test SQL statements are labelled by their leading keyword."""
+        assert statement_op("  select * from runs") == "SELECT"
+        assert statement_op("INSERT INTO logs VALUES (?)") == "INSERT"
+        assert statement_op("PRAGMA journal_mode=WAL") == "OTHER"
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_requests_recorded_by_route_template(self, client):
+        """Test requests are labelled by route template and unknown paths share a label."""
+        live_before = HTTP_REQUESTS.value(method="GET", route="/api/live", status=200)
+        unmatched_before = HTTP_REQUESTS.value(method="GET", route="unmatched", status=404)
+
+        client.get("/api/live")
+        client.get("/api/no-such-page/12345")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert HTTP_REQUESTS.value(method="GET", route="/api/live", status=200) == live_before + 1
+        assert (
+            HTTP_REQUESTS.value(method="GET", route="unmatched", status=404) == unmatched_before + 1
+        )
+        assert "http_request_duration_seconds_bucket" in response.text
+        assert "no-such-page" not in response.text
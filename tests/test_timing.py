@@ -0,0 +1,66 @@
+"""Tests for per-stage timing spans and latency summaries."""
+
+import time
+
+from api.routes.metrics import _latency_summary
+from core.timing import StageTimer, span
+
+
+@span("decorated")
+def _decorated_stage():
+    time.sleep(0.01)
+
+
+class TestStageTimer:
+    """Tests for span recording."""
+
+    def test_spans_sum_per_stage(self):
+        """Test context-manager and decorator spans add up under the active timer."""
+        with StageTimer() as timer:
+            for _ in range(2):
+                with span("db_write"):
+                    time.sleep(0.005)
+            _decorated_stage()
+
+        timings = timer.to_dict()
+        assert set(timings) == {"db_write", "decorated"}
+        assert timings["db_write"] >= 10
+        assert timings["decorated"] >= 10
+
+    def test_span_without_timer_is_noop(self):
+        """Test spans outside a timer record nothing and leave later timers clean."""
+        _decorated_stage()
+        with span("orphan"):
+            pass
+
+        with StageTimer() as timer:
+            pass
+        assert timer.to_dict() == {}
+
+    def test_span_records_on_exception(self):
+        """Test a failing stage still records its duration."""
+        with StageTimer() as timer:
+            try:
+                with span("ocr"):
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+        assert "ocr" in timer.to_dict()
+
+
+class TestLatencySummary:
+    """Tests for percentile and histogram aggregation."""
+
+    def test_percentiles_and_buckets(self):
+        """Test p50/p95/p99 interpolation and cumulative buckets."""
+        summary = _latency_summary([float(ms) for ms in range(1, 101)])
+
+        assert summary["count"] == 100
+        assert summary["p50"] == 50.5
+        assert summary["p95"] == 95.05
+        assert summary["p99"] == 99.01
+        assert summary["max"] == 100.0
+        assert summary["buckets"]["10"] == 10
+        assert summary["buckets"]["50"] == 50
+        assert summary["buckets"]["100"] == 100
+        assert summary["buckets"]["+Inf"] == 100
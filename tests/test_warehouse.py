@@ -0,0 +1,367 @@
+"""Tests for warehouse routing."""
+
+import json
+import threading
+
+import httpx
+import pytest
+import requests
+
+from services.warehouse import (
+    CoordinateMatrix,
+    GeocodeCache,
+    WarehouseRouter,
+    geocode_cache_stats,
+)
+from services.zip_geocoder import ZipCentroidIndex, load_zip_index
+
+WAREHOUSES = [
+    {"id": "NJ", "name": "NJ", "state": "NJ", "address": "1 A St", "city": "Newark",
+     "zip_code": "07102", "latitude": 40.7357, "longitude": -74.1724},
+    {"id": "GA", "name": "GA", "state": "GA", "address": "2 B St", "city": "Atlanta",
+     "zip_code": "30301", "latitude": 33.7490, "longitude": -84.3880},
+    {"id": "TX", "name": "TX", "state": "TX", "address": "3 C St", "city": "Houston",
+     "zip_code": "77001", "latitude": 29.7604, "longitude": -95.3698},
+    {"id": "CA", "name": "CA", "state": "CA", "address": "4 D St", "city": "Los Angeles",
+     "zip_code": "90001", "latitude": 34.0522, "longitude": -118.2437},
+]  # fmt: skip
+
+PICKUPS = {
+    "Philadelphia, PA": (39.9526, -75.1652),
+    "Dallas, TX": (32.7767, -96.7970),
+    "Phoenix, AZ": (33.4484, -112.0740),
+    "Orlando, FL": (28.5383, -81.3792),
+}
+
+
+class StubProvider:
+    """Local stand-in for Nominatim and the Distance Matrix API."""
+
+    def __init__(self, drive_meters=None):
+        self.requests = []
+        self.drive_meters = drive_meters or (lambda lat, lng: 100_000)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if "distancematrix" in request.url.path:
+            dests = request.url.params["destinations"].split("|")
+            elements = []
+            for dest in dests:
+                meters = self.drive_meters(*map(float, dest.split(",")))
+                elements.append(
+                    {"status": "OK", "distance": {"value": meters}, "duration": {"value": 60}}
+                )
+            return httpx.Response(200, json={"status": "OK", "rows": [{"elements": elements}]})
+        return httpx.Response(200, json=[])
+
+
+@pytest.fixture
+def router(tmp_path):
+    data_file = tmp_path / "warehouses.json"
+    data_file.write_text(json.dumps({"warehouses": WAREHOUSES}))
+    router = WarehouseRouter(
+        data_file=str(data_file),
+        distance_mode="haversine",
+        cache_db_path=str(tmp_path / "geocode.db"),
+    )
+    router.geocode_calls = []
+    router.stub = StubProvider()
+    router.http_transport = httpx.MockTransport(router.stub)
+
+    def geocode_local(address):
+        router.geocode_calls.append(address)
+        return PICKUPS.get(address)
+
+    router._geocode_local = geocode_local
+    return router
+
+
+class TestVectorisedRouting:
+    """Tests for matrix ranking and route_many."""
+
+    def test_matrix_matches_scalar_haversine(self, router):
+        """Test batched distances equal the scalar haversine formula."""
+        rows = router.matrix.distances(list(PICKUPS.values()))
+
+        for origin, row in zip(PICKUPS.values(), rows):
+            for warehouse, miles in zip(router.matrix.warehouses, row):
+                expected = WarehouseRouter._haversine_distance(
+                    origin, (warehouse.latitude, warehouse.longitude)
+                )
+                assert miles == pytest.approx(expected)
+
+    def test_route_many_matches_single_routing(self, router):
+        """Test route_many gives the same warehouse as find_nearest_warehouse."""
+        addresses = list(PICKUPS) + ["Philadelphia, PA", "Nowhere"]
+        results = router.route_many(addresses)
+
+        assert [r.warehouse.id if r else None for r in results] == [
+            "NJ", "TX", "CA", "GA", "NJ", None,
+        ]  # fmt: skip
+        for address, result in zip(PICKUPS, results):
+            single = router.find_nearest_warehouse(address)
+            assert single.warehouse.id == result.warehouse.id
+            assert single.distance_miles == result.distance_miles
+            assert result.distance_mode == "haversine"
+
+    def test_route_many_geocodes_each_address_once(self, router):
+        """Test duplicate pickups are geocoded once and warehouses not at all."""
+        router.route_many(["Dallas, TX"] * 500 + ["Orlando, FL"] * 500)
+        assert sorted(router.geocode_calls) == ["Dallas, TX", "Orlando, FL"]
+
+    def test_driving_distance_only_for_top_k(self, router):
+        """Test only the top-k candidates hit the API, in one request per pickup."""
+        router.distance_mode = "driving"
+        router.geocode_api_key = "key"
+        router.top_k = 2
+        calls = []
+
+        def driving(origin, dests):
+            calls.append(dests)
+            # GA is the straight-line winner for Orlando but has the longer drive
+            return [(900_000 if lat == 33.7490 else 700_000, 28_000) for lat, _ in dests]
+
+        router._get_driving_distances = driving
+
+        result = router.find_nearest_warehouse("Orlando, FL")
+
+        assert len(calls) == 1 and len(calls[0]) == 2
+        assert result.distance_mode == "driving"
+        assert result.warehouse.id != "GA"
+
+        all_results = router.get_all_distances("Orlando, FL")
+        assert len(calls) == 1  # Served from the distance cache
+        assert [r.distance_mode for r in all_results].count("driving") == 2
+        assert len(all_results) == len(WAREHOUSES)
+
+    def test_failed_driving_request_is_not_cached(self, router):
+        """Test an API error falls back to haversine without pinning it in the cache."""
+        router.distance_mode = "driving"
+        router.geocode_api_key = "key"
+        calls = []
+
+        def outage(origin, dests):
+            calls.append(dests)
+            raise requests.ConnectionError("timeout")
+
+        router._get_driving_distances = outage
+        result = router.find_nearest_warehouse("Orlando, FL")
+        assert result.distance_mode == "haversine"
+
+        router._get_driving_distances = lambda origin, dests: [(700_000, 28_000)] * len(dests)
+        result = router.find_nearest_warehouse("Orlando, FL")
+
+        assert len(calls) == 1
+        assert result.distance_mode == "driving"
+
+    def test_route_many_batches_driving_requests(self, router):
+        """Test route_many fetches top-k distances from the stub, one request per pickup."""
+        router.distance_mode = "driving"
+        router.geocode_api_key = "key"
+        router.stub.drive_meters = lambda lat, lng: 900_000 if lat == 33.749 else 700_000
+
+        results = router.route_many(list(PICKUPS) + ["Orlando, FL"])
+
+        matrix_requests = [r for r in router.stub.requests if "distancematrix" in r.url.path]
+        assert len(matrix_requests) == len(PICKUPS)
+        assert all(len(r.url.params["destinations"].split("|")) == 3 for r in matrix_requests)
+        assert all(r.distance_mode == "driving" for r in results)
+        assert results[3].warehouse.id != "GA"
+
+    def test_route_many_stays_off_the_event_loop(self, router):
+        """Test geocoding, matrix build, cache access and ranking run in worker threads."""
+        router.warehouses[0].latitude = router.warehouses[0].longitude = None
+        PICKUPS[router.warehouses[0].full_address] = (40.7357, -74.1724)
+        router.distance_mode = "driving"
+        router.geocode_api_key = "key"
+        threads = []
+
+        def record(func):
+            def wrapper(*args):
+                threads.append((func.__name__, threading.current_thread()))
+                return func(*args)
+
+            return wrapper
+
+        router._geocode_local = record(router._geocode_local)
+        router._nearest_many = record(router._nearest_many)
+        router.cache.get_distance = record(router.cache.get_distance)
+        router.cache.set_distance = record(router.cache.set_distance)
+        try:
+            results = router.route_many(["Dallas, TX"])
+        finally:
+            del PICKUPS[router.warehouses[0].full_address]
+
+        assert results[0].warehouse.id == "TX"
+        names = {name for name, _ in threads}
+        assert {"geocode_local", "_nearest_many", "get_distance", "set_distance"} <= names
+        assert all(thread is not threading.main_thread() for _, thread in threads)
+
+    def test_warehouses_without_coordinates_geocoded_once(self, router):
+        """Test the matrix geocodes missing warehouse coordinates on first use only."""
+        router.warehouses[0].latitude = router.warehouses[0].longitude = None
+        PICKUPS[router.warehouses[0].full_address] = (40.7357, -74.1724)
+        try:
+            router.route_many(["Dallas, TX"])
+            router.route_many(["Orlando, FL"])
+        finally:
+            del PICKUPS[router.warehouses[0].full_address]
+
+        assert router.geocode_calls.count(router.warehouses[0].full_address) == 1
+        assert len(router.matrix) == len(WAREHOUSES)
+
+    def test_empty_matrix(self):
+        """Test a matrix without coordinates returns empty rows."""
+        assert CoordinateMatrix([]).distances([(1.0, 2.0)]) == [[]]
+
+
+ZIP_TABLE = """zip,lat,lng,city,state
+75001,32.9600,-96.8380,Addison,TX
+75002,33.0900,-96.6100,Allen,TX
+07102,40.7360,-74.1760,Newark,NJ
+30301,33.7490,-84.3880,Atlanta,GA
+77001,29.8130,-95.3100,Houston,TX
+90001,33.9740,-118.2490,Los Angeles,CA
+"""
+
+
+@pytest.fixture
+def zip_table(tmp_path):
+    path = tmp_path / "zip_centroids.csv"
+    path.write_text(ZIP_TABLE)
+    return path
+
+
+class TestZipGeocoder:
+    """Tests for the offline ZIP-centroid tier."""
+
+    def test_lookup_by_zip(self, zip_table):
+        """Test an address ending in a known ZIP resolves to its centroid."""
+        index = ZipCentroidIndex.load(str(zip_table))
+
+        assert len(index) == 6
+        lat, lng, level = index.lookup("4000 Belt Line Rd, Addison, TX 75001-1234")
+        assert (lat, lng, level) == (pytest.approx(32.96), pytest.approx(-96.838), "zip5")
+        assert index.lookup("Flint Michigan 75002")[2] == "zip5"
+
+    def test_precision_policy(self, zip_table):
+        """Test coarser fallbacks are only used when the policy allows them."""
+        index = ZipCentroidIndex.load(str(zip_table))
+
+        # Unknown ZIP in a known city / known ZIP3 prefix
+        assert index.lookup("1 Main St, Allen, TX 75099", "zip5") is None
+        assert index.lookup("1 Main St, Allen, TX 75099", "city")[2] == "city"
+        assert index.lookup("1 Main St, Plano, TX 75099", "city") is None
+        lat, _, level = index.lookup("1 Main St, Plano, TX 75099", "zip3")
+        assert level == "zip3"
+        assert lat == pytest.approx((32.96 + 33.09) / 2)
+        assert index.lookup("1 Main St, Allen, TX 75001", "remote") is None
+
+    def test_missing_table_is_not_cached(self, tmp_path):
+        """Test a table installed after a miss is loaded, and reloaded when replaced."""
+        path = tmp_path / "late_centroids.csv"
+        assert load_zip_index(str(path)) is None
+
+        path.write_text(ZIP_TABLE)
+        index = load_zip_index(str(path))
+        assert len(index) == 6
+        assert load_zip_index(str(path)) is index
+
+        path.write_text(ZIP_TABLE + "10001,40.7500,-73.9970,New York,NY\n")
+        assert len(load_zip_index(str(path))) == 7
+
+    def test_router_routes_without_network(self, tmp_path, zip_table):
+        """Test warehouses and pickups with ZIPs are geocoded from the table only."""
+        router = WarehouseRouter(
+            distance_mode="haversine",
+            cache_db_path=str(tmp_path / "geocode.db"),
+            zip_centroids_file=str(zip_table),
+        )
+
+        def no_network(address):
+            raise AssertionError(f"remote geocode for {address}")
+
+        router._geocode_google = router._geocode_nominatim = no_network
+
+        results = router.route_many(["Addison, TX 75001", "Newark, NJ 07102"])
+        assert [r.warehouse.id for r in results] == ["TX", "NJ"]
+
+    def test_ambiguous_address_goes_remote(self, tmp_path, zip_table):
+        """Test addresses the table cannot place fall through to remote geocoding."""
+        router = WarehouseRouter(
+            distance_mode="haversine",
+            cache_db_path=str(tmp_path / "geocode.db"),
+            zip_centroids_file=str(zip_table),
+            geocode_precision="zip5",
+        )
+        remote = []
+
+        def nominatim(address):
+            remote.append(address)
+            return 35.0, -90.0
+
+        router._geocode_nominatim = nominatim
+
+        assert router.geocode("Copart Memphis") == (35.0, -90.0)
+        assert router.geocode("Allen, TX 75099") == (35.0, -90.0)
+        assert router.geocode("Allen, TX 75002") != (35.0, -90.0)
+        assert remote == ["Copart Memphis", "Allen, TX 75099"]
+
+
+class TestGeocodeCache:
+    """Tests for the LRU-fronted, batched GeocodeCache."""
+
+    def test_memory_hits_after_first_read(self, tmp_path):
+        """Test repeated lookups are served from memory, not SQLite."""
+        db = str(tmp_path / "cache.db")
+        GeocodeCache(db).set_geocode("1 Main St, Reno, NV 89501", 39.5, -119.8, "google")
+
+        cache = GeocodeCache(db)
+        for _ in range(10):
+            assert cache.get_geocode("1 main st, reno, nv 89501 ") == (39.5, -119.8)
+        assert cache.get_geocode("Nowhere") is None
+
+        stats = cache.stats()
+        assert (stats["db_hits"], stats["memory_hits"], stats["misses"]) == (1, 9, 1)
+        assert stats["hit_ratio"] == pytest.approx(10 / 11, abs=1e-4)
+        assert any(c["db_path"] == db for c in geocode_cache_stats()["caches"])
+
+    def test_distance_writes_are_batched(self, tmp_path):
+        """Test distances are readable at once but written to SQLite per batch."""
+        db = str(tmp_path / "cache.db")
+        cache = GeocodeCache(db, write_batch=3, flush_interval=60)
+
+        cache.set_distance("a", "x", 1000.0, 60.0, "driving")
+        cache.set_distance("b", "x", 2000.0, 120.0, "driving")
+        assert cache.get_distance("a", "x") == (1000.0, 60.0, "driving")
+        assert GeocodeCache(db).get_distance("a", "x") is None
+        assert cache.stats()["pending_writes"] == 2
+
+        cache.set_distance("c", "x", 3000.0, 180.0, "driving")
+        assert cache.stats()["pending_writes"] == 0
+        assert GeocodeCache(db).get_distance("b", "x") == (2000.0, 120.0, "driving")
+
+        cache.set_distance("d", "x", 4000.0, 240.0, "haversine")
+        cache.close()
+        assert GeocodeCache(db).get_distance("d", "x") == (4000.0, 240.0, "haversine")
+
+    def test_ttl_and_size_expiry(self, tmp_path):
+        """Test old rows are ignored and purged, and tables are trimmed to max_entries."""
+        db = str(tmp_path / "cache.db")
+        cache = GeocodeCache(db)
+        for i in range(5):
+            cache.set_geocode(f"addr {i}", float(i), float(i), "google")
+        with cache._get_connection() as conn:
+            conn.execute(
+                "UPDATE geocode_cache SET cached_at = datetime('now', '-40 days') "
+                "WHERE address = 'addr 0'"
+            )
+            conn.commit()
+
+        assert GeocodeCache(db, ttl_days=30).get_geocode("addr 0") is None
+
+        trimmed = GeocodeCache(db, max_entries=3)
+        with trimmed._get_connection() as conn:
+            remaining = conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+        assert remaining == 3
+        assert trimmed.get_geocode("addr 4") == (4.0, 4.0)